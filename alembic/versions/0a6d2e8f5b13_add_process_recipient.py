@@ -0,0 +1,58 @@
+"""add process recipient
+
+Revision ID: 0a6d2e8f5b13
+Revises: f1b7d4c9a36e
+Create Date: 2026-10-17 14:52:46.310725
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0a6d2e8f5b13"
+down_revision: Union[str, Sequence[str], None] = "f1b7d4c9a36e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "process_recipient",
+        sa.Column("process_id", sa.Integer(), nullable=False),
+        sa.Column("institution_id", sa.Integer(), nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=False),
+        sa.ForeignKeyConstraint(["process_id"], ["process.id"]),
+        sa.PrimaryKeyConstraint("process_id", "institution_id", "email"),
+    )
+
+    # Built with table constructs so the dialect quotes "user", a reserved word
+    user = sa.table(
+        "user", sa.column("id"), sa.column("institution_id"), sa.column("email")
+    )
+    user_process = sa.table(
+        "user_process", sa.column("user_id"), sa.column("process_id")
+    )
+    process_recipient = sa.table(
+        "process_recipient",
+        sa.column("process_id"),
+        sa.column("institution_id"),
+        sa.column("email"),
+    )
+    op.execute(
+        process_recipient.insert().from_select(
+            ["process_id", "institution_id", "email"],
+            sa.select(
+                user_process.c.process_id, user.c.institution_id, user.c.email
+            ).select_from(user_process.join(user, user.c.id == user_process.c.user_id)),
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("process_recipient")
@@ -0,0 +1,62 @@
+"""add digest mode
+
+Revision ID: c4e1f7a2d913
+Revises: b27ad9a1e3c7
+Create Date: 2026-10-17 10:12:44.318502
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e1f7a2d913"
+down_revision: Union[str, Sequence[str], None] = "b27ad9a1e3c7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "process",
+        sa.Column(
+            "digest_enabled", sa.Boolean(), server_default=sa.false(), nullable=False
+        ),
+    )
+    op.add_column(
+        "process", sa.Column("digest_window_minutes", sa.Integer(), nullable=True)
+    )
+    op.add_column("process", sa.Column("digest_max_rows", sa.Integer(), nullable=True))
+    op.create_table(
+        "digest_entry",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("process_id", sa.Integer(), nullable=False),
+        sa.Column("institution_id", sa.Integer(), nullable=False),
+        sa.Column("job_id", sa.String(length=255), nullable=False),
+        sa.Column("row_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["process_id"],
+            ["process.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_digest_entry_process_institution",
+        "digest_entry",
+        ["process_id", "institution_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_digest_entry_process_institution", table_name="digest_entry")
+    op.drop_table("digest_entry")
+    op.drop_column("process", "digest_max_rows")
+    op.drop_column("process", "digest_window_minutes")
+    op.drop_column("process", "digest_enabled")
@@ -0,0 +1,35 @@
+"""add processed job
+
+Revision ID: d8a3b5c6e270
+Revises: c4e1f7a2d913
+Create Date: 2026-10-17 11:02:17.604219
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d8a3b5c6e270"
+down_revision: Union[str, Sequence[str], None] = "c4e1f7a2d913"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "processed_job",
+        sa.Column("job_id", sa.String(length=255), nullable=False),
+        sa.Column("claimed_at", sa.DateTime(), nullable=False),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("job_id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("processed_job")
@@ -0,0 +1,31 @@
+"""add attachment threshold
+
+Revision ID: e5f9c2a7b184
+Revises: d8a3b5c6e270
+Create Date: 2026-10-17 11:48:09.227310
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5f9c2a7b184"
+down_revision: Union[str, Sequence[str], None] = "d8a3b5c6e270"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "process", sa.Column("attachment_threshold_rows", sa.Integer(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("process", "attachment_threshold_rows")
@@ -0,0 +1,35 @@
+"""add lookup indexes
+
+Revision ID: f1b7d4c9a36e
+Revises: e5f9c2a7b184
+Create Date: 2026-10-17 14:05:31.582046
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f1b7d4c9a36e"
+down_revision: Union[str, Sequence[str], None] = "e5f9c2a7b184"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Fails if process names are not already unique
+    op.create_index("ix_process_name", "process", ["name"], unique=True)
+    op.create_index(
+        "ix_user_process_process_user", "user_process", ["process_id", "user_id"]
+    )
+    op.create_index("ix_user_institution_email", "user", ["institution_id", "email"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_user_institution_email", table_name="user")
+    op.drop_index("ix_user_process_process_user", table_name="user_process")
+    op.drop_index("ix_process_name", table_name="process")
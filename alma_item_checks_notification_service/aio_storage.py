@@ -0,0 +1,207 @@
+"""Asyncio storage clients for the async notification pipeline
+
+AsyncStorageService mirrors the StorageService calls the notification path
+makes (download a JSON blob, upload blob data, send a queue message) on top of
+the aio Azure SDK clients, so an invocation awaiting storage doesn't hold up
+the others running on the worker's event loop.
+
+Services are cached per connection string like the sync ones in storage. The
+aio clients are created on first use and are bound to the event loop they
+were created on, which for the Functions host is the worker's single loop.
+"""
+
+import importlib.util
+import json
+import logging
+import threading
+from typing import TYPE_CHECKING, Any
+
+from alma_item_checks_notification_service.config import STORAGE_CONNECTION_STRING
+from alma_item_checks_notification_service.lazy_imports import lazy_import
+from alma_item_checks_notification_service.storage import get_http_session
+
+if TYPE_CHECKING:
+    from azure.core.pipeline.transport import AsyncHttpTransport
+    from azure.storage.blob import ContentSettings
+    from azure.storage.blob.aio import BlobServiceClient
+    from azure.storage.queue.aio import QueueClient
+
+azure_blob_aio = lazy_import("azure.storage.blob.aio")
+azure_queue = lazy_import("azure.storage.queue")
+azure_queue_aio = lazy_import("azure.storage.queue.aio")
+azure_transport = lazy_import("azure.core.pipeline.transport")
+
+_async_storage_services: "dict[str | None, AsyncStorageService]" = {}
+_lock = threading.Lock()
+
+
+def get_async_transport() -> "AsyncHttpTransport | None":
+    """Get the HTTP transport for aio storage clients
+
+    Returns:
+        AsyncHttpTransport | None: None to let the SDK use its aiohttp
+            transport when aiohttp is installed, otherwise a transport that
+            runs requests on the worker's shared keep-alive session in
+            executor threads
+    """
+    if importlib.util.find_spec("aiohttp") is not None:
+        return None
+    return azure_transport.AsyncioRequestsTransport(
+        session=get_http_session(), session_owner=False
+    )
+
+
+class AsyncStorageService:
+    """Asyncio counterpart of the StorageService calls used for notifications"""
+
+    def __init__(self, connection_string: str):
+        self.connection_string = connection_string
+        self._blob_service_client: "BlobServiceClient | None" = None
+        self._queue_clients: "dict[str, QueueClient]" = {}
+
+    def _client_options(self) -> dict[str, Any]:
+        """Keyword arguments shared by the aio clients"""
+        transport: "AsyncHttpTransport | None" = get_async_transport()
+        return {"transport": transport} if transport is not None else {}
+
+    def get_blob_service_client(self) -> "BlobServiceClient":
+        """Get the aio BlobServiceClient, creating it if necessary"""
+        if self._blob_service_client is None:
+            self._blob_service_client = (
+                azure_blob_aio.BlobServiceClient.from_connection_string(
+                    self.connection_string, **self._client_options()
+                )
+            )
+            logging.info(
+                "AsyncStorageService.get_blob_service_client: created new blob client"
+            )
+        return self._blob_service_client
+
+    def get_queue_client(self, queue_name: str) -> "QueueClient":
+        """Get the aio QueueClient for a queue, creating it if necessary
+
+        Messages are base64 encoded, matching storage.get_queue_client.
+        """
+        client: "QueueClient | None" = self._queue_clients.get(queue_name)
+        if client is None:
+            client = azure_queue_aio.QueueClient.from_connection_string(
+                self.connection_string,
+                queue_name,
+                message_encode_policy=azure_queue.BinaryBase64EncodePolicy(),
+                message_decode_policy=azure_queue.BinaryBase64DecodePolicy(),
+                **self._client_options(),
+            )
+            self._queue_clients[queue_name] = client
+            logging.info(
+                "AsyncStorageService.get_queue_client: created new queue client"
+            )
+        return client
+
+    async def download_blob_as_json(self, container_name: str, blob_name: str) -> Any:
+        """Download a blob and parse it as JSON
+
+        Args:
+            container_name (str): container holding the blob
+            blob_name (str): name of the blob
+
+        Returns:
+            Any: the parsed document
+        """
+        downloader = await (
+            self.get_blob_service_client()
+            .get_blob_client(container=container_name, blob=blob_name)
+            .download_blob()
+        )
+        return json.loads(await downloader.readall())
+
+    async def upload_blob_data(
+        self,
+        container_name: str,
+        blob_name: str,
+        data: str | bytes,
+        content_settings: "ContentSettings | None" = None,
+    ) -> None:
+        """Upload a blob, replacing any existing one
+
+        Args:
+            container_name (str): destination container
+            blob_name (str): name of the blob
+            data (str | bytes): blob content
+            content_settings (ContentSettings | None): content type and encoding
+        """
+        await (
+            self.get_blob_service_client()
+            .get_blob_client(container=container_name, blob=blob_name)
+            .upload_blob(data, overwrite=True, content_settings=content_settings)
+        )
+
+    async def send_queue_message(
+        self, queue_name: str, message_content: dict[str, Any] | str
+    ) -> None:
+        """Send a message to a queue, serializing dicts as JSON
+
+        Args:
+            queue_name (str): destination queue
+            message_content (dict[str, Any] | str): message body
+        """
+        body: str = (
+            json.dumps(message_content)
+            if isinstance(message_content, dict)
+            else message_content
+        )
+        await self.get_queue_client(queue_name).send_message(body.encode("utf-8"))
+
+    async def close(self) -> None:
+        """Close the aio clients this service created"""
+        if self._blob_service_client is not None:
+            await self._blob_service_client.close()
+            self._blob_service_client = None
+        for client in self._queue_clients.values():
+            await client.close()
+        self._queue_clients.clear()
+
+
+def get_async_storage_service(
+    connection_string: str | None = None,
+) -> AsyncStorageService:
+    """Get the worker's AsyncStorageService for a connection string, creating it if necessary
+
+    Args:
+        connection_string (str | None): storage account connection string, or
+            None for the function app's default storage account
+
+    Returns:
+        AsyncStorageService: shared async storage service
+    """
+    with _lock:
+        service: AsyncStorageService | None = _async_storage_services.get(
+            connection_string
+        )
+
+        if service is None:
+            resolved: str | None = connection_string or STORAGE_CONNECTION_STRING
+            if not resolved:
+                raise ValueError("Storage connection string not set")
+            service = AsyncStorageService(resolved)
+            _async_storage_services[connection_string] = service
+
+        return service
+
+
+def register_async_storage_service(connection_string: str | None, service: Any) -> None:
+    """Use a preconfigured async storage service for a connection string
+
+    Intended for benchmarks and local runs that serve storage from a stand-in.
+
+    Args:
+        connection_string (str | None): connection string the service answers for
+        service (Any): object with the AsyncStorageService methods
+    """
+    with _lock:
+        _async_storage_services[connection_string] = service
+
+
+def reset_async_storage_services() -> None:
+    """Drop all cached async storage services without closing them"""
+    with _lock:
+        _async_storage_services.clear()
@@ -0,0 +1,29 @@
+"""Digest flush blueprint"""
+
+import logging
+
+import azure.functions as func
+
+from alma_item_checks_notification_service.config import DIGEST_FLUSH_SCHEDULE
+from alma_item_checks_notification_service.database import SessionMaker
+from alma_item_checks_notification_service.services.notification_service import (
+    NotificationService,
+)
+
+bp = func.Blueprint()
+
+
+@bp.function_name("flush_digests")
+@bp.timer_trigger(
+    arg_name="timer",
+    schedule=DIGEST_FLUSH_SCHEDULE,
+    run_on_startup=False,
+    use_monitor=False,
+)
+def flush_digests(timer: func.TimerRequest) -> None:
+    """Digest flush function"""
+    with SessionMaker() as session:
+        sent: int = NotificationService().flush_digests(session)
+
+    if sent:
+        logging.info(f"flush_digests: sent {sent} digests")
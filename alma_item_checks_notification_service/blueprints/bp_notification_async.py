@@ -0,0 +1,26 @@
+"""Notification blueprint, asyncio variant"""
+
+import azure.functions as func
+
+from alma_item_checks_notification_service.config import (
+    NOTIFICATION_QUEUE,
+    STORAGE_CONNECTION_SETTING_NAME,
+)
+from alma_item_checks_notification_service.services.async_notification_service import (
+    AsyncNotificationService,
+)
+
+bp = func.Blueprint()
+
+
+@bp.function_name("send_notification")
+@bp.queue_trigger(
+    arg_name="notificationmsg",
+    queue_name=NOTIFICATION_QUEUE,
+    connection=STORAGE_CONNECTION_SETTING_NAME,
+)
+async def send_notification(notificationmsg: func.QueueMessage) -> None:
+    """Notification function, run on the worker's event loop"""
+    notification = AsyncNotificationService(notificationmsg)
+
+    await notification.send_notification_async()
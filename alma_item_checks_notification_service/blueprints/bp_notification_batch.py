@@ -0,0 +1,38 @@
+"""Batch notification blueprint"""
+
+import azure.functions as func
+
+from alma_item_checks_notification_service.config import (
+    NOTIFICATION_BATCH_MAX_MESSAGES,
+    NOTIFICATION_BATCH_QUEUE,
+    NOTIFICATION_BATCH_SCHEDULE,
+    NOTIFICATION_BATCH_SIZE,
+)
+from alma_item_checks_notification_service.database import SessionMaker
+from alma_item_checks_notification_service.services.batch_notification_service import (
+    BatchNotificationService,
+)
+from alma_item_checks_notification_service.storage import get_queue_client
+
+bp = func.Blueprint()
+
+
+@bp.function_name("drain_notification_batch_queue")
+@bp.timer_trigger(
+    arg_name="timer",
+    schedule=NOTIFICATION_BATCH_SCHEDULE,
+    run_on_startup=False,
+    use_monitor=False,
+)
+def drain_notification_batch_queue(timer: func.TimerRequest) -> None:
+    """Batch notification function"""
+    queue_client = get_queue_client(NOTIFICATION_BATCH_QUEUE)
+    poison_queue_client = get_queue_client(NOTIFICATION_BATCH_QUEUE + "-poison")
+
+    with SessionMaker() as session:
+        BatchNotificationService(session).drain_queue(
+            queue_client=queue_client,
+            poison_queue_client=poison_queue_client,
+            batch_size=NOTIFICATION_BATCH_SIZE,
+            max_messages=NOTIFICATION_BATCH_MAX_MESSAGES,
+        )
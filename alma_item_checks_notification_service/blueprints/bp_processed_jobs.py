@@ -0,0 +1,29 @@
+"""Processed job purge blueprint"""
+
+import logging
+
+import azure.functions as func
+
+from alma_item_checks_notification_service.config import IDEMPOTENCY_PURGE_SCHEDULE
+from alma_item_checks_notification_service.database import SessionMaker
+from alma_item_checks_notification_service.services.processed_job_service import (
+    ProcessedJobService,
+)
+
+bp = func.Blueprint()
+
+
+@bp.function_name("purge_processed_jobs")
+@bp.timer_trigger(
+    arg_name="timer",
+    schedule=IDEMPOTENCY_PURGE_SCHEDULE,
+    run_on_startup=False,
+    use_monitor=False,
+)
+def purge_processed_jobs(timer: func.TimerRequest) -> None:
+    """Processed job purge function"""
+    with SessionMaker() as session:
+        deleted: int | None = ProcessedJobService(session).purge()
+
+    if deleted is not None:
+        logging.info(f"purge_processed_jobs: deleted {deleted} job records")
@@ -0,0 +1,31 @@
+"""Recipient table rebuild blueprint"""
+
+import logging
+
+import azure.functions as func
+
+from alma_item_checks_notification_service.config import (
+    RECIPIENT_TABLE_REBUILD_SCHEDULE,
+)
+from alma_item_checks_notification_service.database import SessionMaker
+from alma_item_checks_notification_service.services.user_process_service import (
+    UserProcessService,
+)
+
+bp = func.Blueprint()
+
+
+@bp.function_name("rebuild_recipients")
+@bp.timer_trigger(
+    arg_name="timer",
+    schedule=RECIPIENT_TABLE_REBUILD_SCHEDULE,
+    run_on_startup=False,
+    use_monitor=False,
+)
+def rebuild_recipients(timer: func.TimerRequest) -> None:
+    """Recipient table rebuild function"""
+    with SessionMaker() as session:
+        written: int | None = UserProcessService(session).rebuild_recipients()
+
+    if written is not None:
+        logging.info(f"rebuild_recipients: wrote {written} recipients")
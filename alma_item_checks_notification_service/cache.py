@@ -0,0 +1,135 @@
+"""In-process caches shared by all invocations in a worker"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+MISSING: Any = object()  # returned by TTLCache.get when a key is absent or expired
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Point-in-time counters for a TTLCache"""
+
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of lookups served from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TTLCache(Generic[K, V]):
+    """Thread-safe, size-bounded LRU cache whose entries expire after a TTL
+
+    A ttl or maxsize of zero disables the cache: every lookup is a miss and
+    nothing is stored.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache stores anything at all"""
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get(self, key: K, default: Any = MISSING) -> V | Any:
+        """Get a cached value
+
+        Args:
+            key (K): cache key
+            default (Any): value returned on a miss
+
+        Returns:
+            V | Any: cached value, or default if absent or expired
+        """
+        with self._lock:
+            entry = self._data.get(key)
+
+            if entry is None:
+                self._misses += 1
+                return default
+
+            expires_at, value = entry
+
+            if expires_at <= self._clock():
+                del self._data[key]
+                self._expirations += 1
+                self._misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """Store a value, evicting the least recently used entry if full
+
+        Args:
+            key (K): cache key
+            value (V): value to store
+            ttl (float | None): entry lifetime in seconds, defaults to the cache TTL
+        """
+        ttl = self.ttl if ttl is None else ttl
+
+        if not self.enabled or ttl <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = (self._clock() + ttl, value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        """Drop a single entry if present"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters"""
+        with self._lock:
+            self._data.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+            self._expirations = 0
+
+    def stats(self) -> CacheStats:
+        """Get a snapshot of the cache counters"""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                size=len(self._data),
+                maxsize=self.maxsize,
+            )
@@ -2,10 +2,38 @@
 
 import os
 
+
+def _getenv_bool(name: str, default: bool) -> bool:
+    """Read a boolean flag from the environment"""
+    value: str | None = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 STORAGE_CONNECTION_SETTING_NAME = "AzureWebJobsStorage"
 STORAGE_CONNECTION_STRING = os.getenv(STORAGE_CONNECTION_SETTING_NAME)
 
 SQLALCHEMY_CONNECTION_STRING = os.getenv("SQLALCHEMY_CONNECTION_STRING")
+DB_ECHO = _getenv_bool("DB_ECHO", False)  # log every SQL statement
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))  # seconds to wait
+DB_POOL_RECYCLE = int(
+    os.getenv("DB_POOL_RECYCLE", 1800)
+)  # seconds; keep below the server's wait_timeout
+DB_POOL_PRE_PING = os.getenv(
+    "DB_POOL_PRE_PING", "idle"
+).lower()  # always | idle | never
+DB_POOL_PRE_PING_IDLE_SECONDS = float(
+    os.getenv("DB_POOL_PRE_PING_IDLE_SECONDS", 60)
+)  # with "idle", ping connections unused for this long
+DB_POOL_SLOW_CHECKOUT_MS = float(
+    os.getenv("DB_POOL_SLOW_CHECKOUT_MS", 100)
+)  # log checkouts that waited longer
+DB_POOL_STATS_LOG_SECONDS = float(
+    os.getenv("DB_POOL_STATS_LOG_SECONDS", 300)
+)  # log the pool counters at most this often; 0 = never
 
 NOTIFICATION_QUEUE = os.getenv(
     "NOTIFICATION_QUEUE", "notification-queue"
@@ -18,3 +46,107 @@ ACS_SENDER_QUEUE_NAME: str = os.getenv("ACS_SENDER_QUEUE_NAME", "")
 ACS_SENDER_CONTAINER_NAME: str = os.getenv("ACS_SENDER_CONTAINER_NAME", "")
 
 API_CLIENT_TIMEOUT = int(os.getenv("API_CLIENT_TIMEOUT", 90))
+
+PROCESS_CACHE_TTL_SECONDS = float(os.getenv("PROCESS_CACHE_TTL_SECONDS", 300))
+PROCESS_CACHE_NEGATIVE_TTL_SECONDS = float(
+    os.getenv("PROCESS_CACHE_NEGATIVE_TTL_SECONDS", 30)
+)
+PROCESS_CACHE_MAX_SIZE = int(os.getenv("PROCESS_CACHE_MAX_SIZE", 256))
+
+RECIPIENT_CACHE_TTL_SECONDS = float(os.getenv("RECIPIENT_CACHE_TTL_SECONDS", 300))
+RECIPIENT_CACHE_MAX_SIZE = int(os.getenv("RECIPIENT_CACHE_MAX_SIZE", 1024))
+RECIPIENT_TABLE_ENABLED = _getenv_bool(
+    "RECIPIENT_TABLE_ENABLED", False
+)  # resolve recipients from the denormalized process_recipient table
+RECIPIENT_TABLE_REBUILD_ENABLED = _getenv_bool(
+    "RECIPIENT_TABLE_REBUILD_ENABLED", RECIPIENT_TABLE_ENABLED
+)  # can be turned on first, so the table is current when reads switch to it
+RECIPIENT_TABLE_REBUILD_SCHEDULE = os.getenv(
+    "RECIPIENT_TABLE_REBUILD_SCHEDULE", "0 0 * * * *"
+)  # picks up user and subscription edits made outside the service
+
+JINJA_AUTO_RELOAD = _getenv_bool("JINJA_AUTO_RELOAD", False)
+JINJA_BYTECODE_CACHE_ENABLED = _getenv_bool("JINJA_BYTECODE_CACHE_ENABLED", True)
+JINJA_BYTECODE_CACHE_DIR: str | None = os.getenv(
+    "JINJA_BYTECODE_CACHE_DIR"
+)  # defaults to a per-user directory under the system temp dir
+JINJA_COMPILED_TEMPLATES_ENABLED = _getenv_bool(
+    "JINJA_COMPILED_TEMPLATES_ENABLED", True
+)
+
+HTML_TABLE_RENDERER = os.getenv("HTML_TABLE_RENDERER", "pandas")  # pandas | streaming
+
+REPORT_STREAMING_ENABLED = _getenv_bool("REPORT_STREAMING_ENABLED", False)
+REPORT_MAX_ROWS = int(os.getenv("REPORT_MAX_ROWS", 0))  # 0 = no limit
+REPORT_CHUNK_SIZE = int(os.getenv("REPORT_CHUNK_SIZE", 4 * 1024 * 1024))
+REPORT_PREFETCH_ENABLED = _getenv_bool(
+    "REPORT_PREFETCH_ENABLED", True
+)  # download the report while the database lookups run
+REPORT_PREFETCH_WORKERS = int(os.getenv("REPORT_PREFETCH_WORKERS", 8))
+
+STORAGE_HTTP_POOL_SIZE = int(os.getenv("STORAGE_HTTP_POOL_SIZE", 20))
+
+IMPORT_WARMUP_ENABLED = _getenv_bool(
+    "IMPORT_WARMUP_ENABLED", True
+)  # import deferred dependencies in a background thread at startup
+
+NOTIFICATION_BATCH_ENABLED = _getenv_bool(
+    "NOTIFICATION_BATCH_ENABLED", False
+)  # drain the queue on a timer instead of triggering per message
+NOTIFICATION_BATCH_QUEUE = os.getenv("NOTIFICATION_BATCH_QUEUE", NOTIFICATION_QUEUE)
+NOTIFICATION_BATCH_SCHEDULE = os.getenv("NOTIFICATION_BATCH_SCHEDULE", "0 */5 * * * *")
+NOTIFICATION_BATCH_SIZE = int(os.getenv("NOTIFICATION_BATCH_SIZE", 256))
+NOTIFICATION_BATCH_MAX_MESSAGES = int(
+    os.getenv("NOTIFICATION_BATCH_MAX_MESSAGES", 5000)
+)  # per timer run
+NOTIFICATION_BATCH_VISIBILITY_TIMEOUT = int(
+    os.getenv("NOTIFICATION_BATCH_VISIBILITY_TIMEOUT", 600)
+)
+NOTIFICATION_BATCH_MAX_DEQUEUE_COUNT = int(
+    os.getenv("NOTIFICATION_BATCH_MAX_DEQUEUE_COUNT", 5)
+)  # then moved to the -poison queue, like queue triggers
+
+DIGEST_FLUSH_ENABLED = _getenv_bool("DIGEST_FLUSH_ENABLED", False)
+DIGEST_FLUSH_SCHEDULE = os.getenv("DIGEST_FLUSH_SCHEDULE", "0 */1 * * * *")
+DIGEST_WINDOW_MINUTES = int(
+    os.getenv("DIGEST_WINDOW_MINUTES", 10)
+)  # for processes without digest_window_minutes
+DIGEST_MAX_ROWS = int(
+    os.getenv("DIGEST_MAX_ROWS", 5000)
+)  # for processes without digest_max_rows
+
+IDEMPOTENCY_ENABLED = _getenv_bool("IDEMPOTENCY_ENABLED", True)
+IDEMPOTENCY_CLAIM_TIMEOUT_SECONDS = int(
+    os.getenv("IDEMPOTENCY_CLAIM_TIMEOUT_SECONDS", 900)
+)  # an unfinished claim older than this is assumed abandoned
+IDEMPOTENCY_RETENTION_DAYS = int(
+    os.getenv("IDEMPOTENCY_RETENTION_DAYS", 7)
+)  # keep job records at least as long as a queue message can live
+IDEMPOTENCY_PURGE_SCHEDULE = os.getenv("IDEMPOTENCY_PURGE_SCHEDULE", "0 30 2 * * *")
+
+REPORT_ATTACHMENT_THRESHOLD_ROWS = int(
+    os.getenv("REPORT_ATTACHMENT_THRESHOLD_ROWS", 0)
+)  # for processes without attachment_threshold_rows; 0 = always inline
+REPORT_ATTACHMENT_PREVIEW_ROWS = int(os.getenv("REPORT_ATTACHMENT_PREVIEW_ROWS", 100))
+
+EMAIL_PAYLOAD_COMPRESSION_ENABLED = _getenv_bool(
+    "EMAIL_PAYLOAD_COMPRESSION_ENABLED", False
+)  # gzip email blobs; the ACS sender must understand payload version 2
+EMAIL_PAYLOAD_COMPRESSION_LEVEL = int(os.getenv("EMAIL_PAYLOAD_COMPRESSION_LEVEL", 6))
+EMAIL_PAYLOAD_INLINE_ENABLED = _getenv_bool(
+    "EMAIL_PAYLOAD_INLINE_ENABLED", False
+)  # embed small emails in the queue message; needs payload version 3 support
+EMAIL_PAYLOAD_INLINE_MAX_BYTES = int(
+    os.getenv("EMAIL_PAYLOAD_INLINE_MAX_BYTES", 64 * 1024)
+)  # largest queue message as sent (JSON, base64 encoded); the queue limit is 64 KiB
+
+NOTIFICATION_ASYNC_ENABLED = _getenv_bool(
+    "NOTIFICATION_ASYNC_ENABLED", False
+)  # serve send_notification from the asyncio pipeline
+
+TRACING_BACKEND = os.getenv(
+    "TRACING_BACKEND", "none"
+).lower()  # none | logging | opentelemetry; timing spans per pipeline stage
+TRACING_AZURE_MONITOR_ENABLED = _getenv_bool(
+    "TRACING_AZURE_MONITOR_ENABLED", True
+)  # with opentelemetry, export spans to APPLICATIONINSIGHTS_CONNECTION_STRING
@@ -1,13 +1,247 @@
-"""SQLAlchemy SessionMaker"""
+"""SQLAlchemy SessionMaker
 
-from sqlalchemy import create_engine, Engine
+The engine's connection pool is sized and tuned from config (DB_*). Its
+checkouts are instrumented so the pool can be sized against the worker's
+concurrency: pool_stats() reports checkout wait time, connections in use and
+how often the pool had to overflow or timed out. Each checkout is a
+"db_checkout" span, and the counters are logged every
+DB_POOL_STATS_LOG_SECONDS.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import create_engine, Engine, event, exc
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import ConnectionPoolEntry, QueuePool
 
-from alma_item_checks_notification_service.config import SQLALCHEMY_CONNECTION_STRING
+from alma_item_checks_notification_service.config import (
+    DB_ECHO,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_PRE_PING_IDLE_SECONDS,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_SLOW_CHECKOUT_MS,
+    DB_POOL_STATS_LOG_SECONDS,
+    DB_POOL_TIMEOUT,
+    SQLALCHEMY_CONNECTION_STRING,
+)
+from alma_item_checks_notification_service.tracing import span, tracing_enabled
 
 _db_engine: Engine | None = None
 _session_maker: sessionmaker | None = None
 
+_CHECKED_IN_AT = "checked_in_at"  # connection record info key for idle pings
+PRE_PING_MODES = ("always", "idle", "never")
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """Point-in-time counters for the engine's connection pool"""
+
+    checkouts: int
+    timeouts: int
+    overflows: int
+    in_use: int
+    peak_in_use: int
+    total_wait_ms: float
+    max_wait_ms: float
+
+    @property
+    def mean_wait_ms(self) -> float:
+        """Average time a checkout waited for a connection"""
+        return self.total_wait_ms / self.checkouts if self.checkouts else 0.0
+
+
+class _PoolMetrics:
+    """Thread-safe counters behind PoolStats"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Zero all counters"""
+        with self._lock:
+            self._checkouts = 0
+            self._timeouts = 0
+            self._overflows = 0
+            self._in_use = 0
+            self._peak_in_use = 0
+            self._total_wait_ms = 0.0
+            self._max_wait_ms = 0.0
+            self._logged_at = time.monotonic()
+
+    def record_checkout(self, wait_ms: float, in_use: int, overflowed: bool) -> None:
+        """Count a successful checkout"""
+        with self._lock:
+            self._checkouts += 1
+            self._overflows += overflowed
+            self._in_use = in_use
+            self._peak_in_use = max(self._peak_in_use, in_use)
+            self._total_wait_ms += wait_ms
+            self._max_wait_ms = max(self._max_wait_ms, wait_ms)
+
+    def record_timeout(self) -> None:
+        """Count a checkout that gave up waiting for a connection"""
+        with self._lock:
+            self._timeouts += 1
+
+    def record_checkin(self, in_use: int) -> None:
+        """Track connections in use after a checkin"""
+        with self._lock:
+            self._in_use = in_use
+
+    def log_due(self, interval: float) -> bool:
+        """Whether the counters were last logged at least interval seconds ago
+
+        Returns True to one caller only per interval, which then logs them.
+        """
+        if interval <= 0:
+            return False
+        now: float = time.monotonic()
+        with self._lock:
+            if now - self._logged_at < interval:
+                return False
+            self._logged_at = now
+            return True
+
+    def stats(self) -> PoolStats:
+        """Get a snapshot of the counters"""
+        with self._lock:
+            return PoolStats(
+                checkouts=self._checkouts,
+                timeouts=self._timeouts,
+                overflows=self._overflows,
+                in_use=self._in_use,
+                peak_in_use=self._peak_in_use,
+                total_wait_ms=self._total_wait_ms,
+                max_wait_ms=self._max_wait_ms,
+            )
+
+
+_pool_metrics = _PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records checkout wait time, connections in use and overflow"""
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        with span("db_checkout") as current:
+            overflow_before: int = self.overflow()
+            start: float = time.perf_counter()
+            try:
+                record: ConnectionPoolEntry = super()._do_get()
+            except exc.TimeoutError:
+                _pool_metrics.record_timeout()
+                current.set_attribute("timed_out", True)
+                logging.warning(
+                    f"database.InstrumentedQueuePool: checkout timed out, {self.status()}"
+                )
+                raise
+
+            wait_ms: float = (time.perf_counter() - start) * 1000
+            in_use: int = self.checkedout()
+            overflowed: bool = self.overflow() > max(overflow_before, 0)
+            _pool_metrics.record_checkout(wait_ms, in_use, overflowed)
+
+            if tracing_enabled():
+                current.set_attribute("wait_ms", round(wait_ms, 3))
+                current.set_attribute("in_use", in_use)
+                current.set_attribute("overflowed", overflowed)
+
+        if _pool_metrics.log_due(DB_POOL_STATS_LOG_SECONDS):
+            logging.info(f"database.InstrumentedQueuePool: {pool_stats()}")
+
+        if overflowed:
+            logging.info(f"database.InstrumentedQueuePool: overflow, {self.status()}")
+        if wait_ms >= DB_POOL_SLOW_CHECKOUT_MS:
+            logging.warning(
+                f"database.InstrumentedQueuePool: checkout waited {wait_ms:.1f} ms, "
+                f"{self.status()}"
+            )
+        return record
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        super()._do_return_conn(record)
+        _pool_metrics.record_checkin(self.checkedout())
+
+
+def pool_stats() -> PoolStats:
+    """Get counters for the engine's connection pool"""
+    return _pool_metrics.stats()
+
+
+def reset_pool_stats() -> None:
+    """Zero the connection pool counters"""
+    _pool_metrics.reset()
+
+
+def _ping_idle_connections(engine: Engine, idle_seconds: float) -> None:
+    """Ping connections that sat idle in the pool, replacing dead ones
+
+    A cheaper alternative to pool_pre_ping: connections checked out again
+    shortly after being returned are assumed alive.
+    """
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection: Any, connection_record: Any) -> None:
+        connection_record.info[_CHECKED_IN_AT] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(
+        dbapi_connection: Any, connection_record: Any, connection_proxy: Any
+    ) -> None:
+        checked_in_at: float | None = connection_record.info.get(_CHECKED_IN_AT)
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        try:
+            cursor = dbapi_connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+        except Exception as e:
+            # The pool discards this connection and checks out a fresh one
+            raise exc.DisconnectionError(f"idle connection failed ping: {e}") from e
+
+
+def engine_options(connection_string: str) -> dict[str, Any]:
+    """Keyword arguments for create_engine from the DB_* settings
+
+    Args:
+        connection_string (str): database URL
+
+    Returns:
+        dict[str, Any]: create_engine options
+
+    Raises:
+        ValueError: if DB_POOL_PRE_PING is not always, idle or never
+    """
+    if DB_POOL_PRE_PING not in PRE_PING_MODES:
+        raise ValueError(
+            f"DB_POOL_PRE_PING must be one of {', '.join(PRE_PING_MODES)}, "
+            f"not {DB_POOL_PRE_PING!r}"
+        )
+
+    options: dict[str, Any] = {
+        "echo": DB_ECHO,
+        "pool_pre_ping": DB_POOL_PRE_PING == "always",
+        "pool_recycle": DB_POOL_RECYCLE,
+    }
+    if connection_string.startswith("sqlite") and ":memory:" in connection_string:
+        return options  # each connection would be a separate database
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+    )
+    return options
+
 
 def get_engine() -> Engine:
     """Get database engine, creating it if necessary"""
@@ -18,8 +252,11 @@ def get_engine() -> Engine:
                 "SQLALCHEMY_CONNECTION_STRING environment variable not set"
             )
         _db_engine = create_engine(
-            SQLALCHEMY_CONNECTION_STRING, echo=True, pool_pre_ping=True
+            SQLALCHEMY_CONNECTION_STRING,
+            **engine_options(SQLALCHEMY_CONNECTION_STRING),
         )
+        if DB_POOL_PRE_PING == "idle":
+            _ping_idle_connections(_db_engine, DB_POOL_PRE_PING_IDLE_SECONDS)
     return _db_engine
 
 
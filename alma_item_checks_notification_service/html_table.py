@@ -0,0 +1,171 @@
+"""Pandas-free HTML table renderer for report records
+
+render_html_table walks the report records once, escaping each cell as it
+goes, and writes the table straight to an output buffer. For reports of
+string values (what the item check processors produce) the output is
+byte-for-byte identical to the pandas path in
+NotificationService.create_html_table:
+
+    pd.read_json(...).to_html(index=False, border=1, na_rep="")
+
+with the border style injected into the <table> tag. Cells are rendered the
+way pandas does: missing keys and nulls become empty cells, tab/newline/
+carriage-return characters are shown as escape sequences, surrounding
+whitespace is stripped and &, < and > are HTML-escaped.
+
+Documented differences from the pandas path, all of which come from the type
+inference pd.read_json applies and this renderer deliberately skips:
+
+- Numeric-looking strings are kept as-is ("00456" stays "00456"; pandas
+  renders 456).
+- Numbers are rendered with str(): an int column containing nulls stays
+  "1" (pandas upcasts to float and renders "1.0"), and floats are not
+  rounded to pandas' display precision.
+- Date-like columns (names such as "date" or ending in "_at") are not
+  parsed, so timestamps keep their original text.
+- The all-"0" placeholder column "0" is always dropped. pandas keeps it when
+  every column label is numeric, because read_json then converts the label
+  to the integer 0.
+"""
+
+import io
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+TABLE_OPEN_TAG = (
+    '<table border="1" style="border-collapse: collapse; border: 1px solid black;"'
+    ' class="dataframe">'
+)
+PLACEHOLDER_COLUMN = "0"
+
+_ESCAPE_SEQUENCES = str.maketrans({"\t": "\\t", "\n": "\\n", "\r": "\\r"})
+_HTML_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
+
+def format_cell(value: Any) -> str:
+    """Format a single value as escaped cell text
+
+    Args:
+        value (Any): JSON value from a report record
+
+    Returns:
+        str: cell text safe to place inside <td> or <th>
+    """
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    return str(value).translate(_ESCAPE_SEQUENCES).strip().translate(_HTML_ESCAPES)
+
+
+def render_html_table(records: Iterable[Mapping[str, Any]]) -> str | None:
+    """Render report records as an HTML table
+
+    Records are consumed in a single pass and each row is written to the
+    table body as soon as it is read, so a generator of records is never
+    materialized: memory held is the markup itself, plus one row's cells.
+
+    Args:
+        records (Iterable[Mapping[str, Any]]): report rows
+
+    Returns:
+        str | None: the table HTML, or None if there are no rows or columns
+            to display
+
+    Raises:
+        TypeError: if a record is not a mapping
+    """
+    columns: dict[str, int] = {}
+    visible: list[int] = []  # columns written to the body so far, in order
+    hidden: int | None = None  # the placeholder column, while it is all "0"
+    body: io.StringIO = io.StringIO()
+    row_count: int = 0
+    placeholder_only_zeros: bool = True
+
+    for record in records:
+        if not isinstance(record, Mapping):
+            raise TypeError(f"report record is not an object: {type(record).__name__}")
+
+        cells: dict[int, str] = {}
+        for key, value in record.items():
+            column: str = str(key)
+            index: int | None = columns.get(column)
+            if index is None:
+                index = columns[column] = len(columns)
+            cells[index] = format_cell(value)
+
+        if placeholder_only_zeros:
+            placeholder = record.get(PLACEHOLDER_COLUMN)
+            placeholder_only_zeros = placeholder is not None and str(placeholder) == "0"
+
+        now_hidden: int | None = (
+            columns.get(PLACEHOLDER_COLUMN) if placeholder_only_zeros else None
+        )
+        wanted: list[int] = [
+            index for index in range(len(columns)) if index != now_hidden
+        ]
+
+        if wanted != visible:
+            # A new column, or a placeholder column that has to be shown after
+            # all: rewrite the rows already written to the new layout
+            body = _relayout(body, visible, wanted, hidden)
+            visible = wanted
+        hidden = now_hidden
+
+        body.write("    <tr>\n")
+        for index in visible:
+            body.write(f"      <td>{cells.get(index, '')}</td>\n")
+        body.write("    </tr>\n")
+        row_count += 1
+
+    if not row_count or not visible:
+        return None
+
+    headers: list[str] = list(columns)
+    head: io.StringIO = io.StringIO()
+
+    head.write(TABLE_OPEN_TAG)
+    head.write('\n  <thead>\n    <tr style="text-align: right;">\n')
+    for index in visible:
+        head.write(f"      <th>{format_cell(headers[index])}</th>\n")
+    head.write("    </tr>\n  </thead>\n  <tbody>\n")
+
+    # The header is only known once every row is written; join without
+    # copying the body into a second buffer first
+    return "".join((head.getvalue(), body.getvalue(), "  </tbody>\n</table>"))
+
+
+def _relayout(
+    body: io.StringIO, old: list[int], new: list[int], hidden: int | None
+) -> io.StringIO:
+    """Rewrite table body rows from one column layout to another
+
+    Columns are only ever added, so a column missing from a row written
+    earlier is empty, except a hidden placeholder column: it was hidden
+    because every earlier row held "0".
+
+    Args:
+        body (io.StringIO): rows written with the old layout
+        old (list[int]): column indexes of the cells in each written row
+        new (list[int]): column indexes to write instead
+        hidden (int | None): index of the placeholder column if it was hidden
+
+    Returns:
+        io.StringIO: the rows with the new layout
+    """
+    relaid: io.StringIO = io.StringIO()
+    cells: dict[int, str] = {}
+
+    # Cell text is escaped, so it never contains a newline or a tag
+    for line in body.getvalue().split("\n")[:-1]:
+        if line == "    <tr>":
+            cells = {}
+        elif line == "    </tr>":
+            relaid.write("    <tr>\n")
+            for index in new:
+                default: str = "0" if index == hidden else ""
+                relaid.write(f"      <td>{cells.get(index, default)}</td>\n")
+            relaid.write("    </tr>\n")
+        else:
+            cells[old[len(cells)]] = line[len("      <td>") : -len("</td>")]
+
+    body.close()
+    return relaid
@@ -0,0 +1,109 @@
+"""Incremental JSON parsing for large report blobs"""
+
+import codecs
+import json
+import re
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER_CONTINUATIONS = frozenset("0123456789.eE+-")
+
+
+def _is_number(value: Any) -> bool:
+    """Whether a decoded value came from a JSON number"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def iter_json_array(chunks: Iterable[bytes | str]) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array as the document streams in
+
+    Chunks are decoded incrementally (UTF-8, optional BOM) and each array
+    element is parsed as soon as it is complete, so memory is bounded by the
+    chunk size plus the largest single element rather than the whole document.
+    Chunks are only pulled as elements are consumed, so closing the iterator
+    early stops reading the source.
+
+    Args:
+        chunks (Iterable[bytes | str]): pieces of a JSON document
+
+    Yields:
+        Any: each element of the array, in order
+
+    Raises:
+        ValueError: if the document is not a well-formed JSON array
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    source: Iterator[bytes | str] = iter(chunks)
+    buffer: str = ""
+    pos: int = 0
+    eof: bool = False
+
+    def fill() -> None:
+        """Append the next chunk to the unconsumed part of the buffer"""
+        nonlocal buffer, pos, eof
+        try:
+            chunk = next(source)
+        except StopIteration:
+            eof = True
+            text = text_decoder.decode(b"", final=True)
+        else:
+            text = text_decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        buffer = buffer[pos:] + text
+        pos = 0
+
+    def next_token() -> str | None:
+        """Skip whitespace and peek at the next character, reading as needed"""
+        nonlocal pos
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()  # type: ignore[union-attr]
+            if pos < len(buffer):
+                return buffer[pos]
+            if eof:
+                return None
+            fill()
+
+    if next_token() != "[":
+        raise ValueError("JSON document is not an array")
+    pos += 1
+
+    if next_token() == "]":
+        return
+
+    while True:
+        if next_token() is None:
+            raise ValueError("JSON array is truncated")
+
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                if eof:
+                    raise ValueError(f"Invalid JSON array element: {e}") from e
+                fill()
+                continue
+
+            # A number cut off by a chunk boundary ("2" of "2.5e3") parses as a
+            # shorter number, so only accept one once a delimiter has arrived.
+            if not eof and (
+                end == len(buffer)
+                or (_is_number(value) and buffer[end] in _NUMBER_CONTINUATIONS)
+            ):
+                fill()
+                continue
+
+            break
+
+        pos = end
+        yield value
+
+        token = next_token()
+        if token == ",":
+            pos += 1
+        elif token == "]":
+            return
+        elif token is None:
+            raise ValueError("JSON array is truncated")
+        else:
+            raise ValueError(f"Expected ',' or ']' in JSON array, found {token!r}")
@@ -0,0 +1,185 @@
+"""Deferred imports to keep the worker's cold start short
+
+Heavy third-party modules (pandas, the Azure storage SDKs, the pydantic email
+model) are bound as LazyModule proxies at import time and only imported on
+first attribute access, so indexing the function app doesn't pay for them.
+warm_imports() imports them in a background thread once the app is indexed,
+so by the time the first message arrives they are usually already loaded.
+
+Run as a module to print an import-time report for the function app:
+
+    python -m alma_item_checks_notification_service.lazy_imports [limit]
+"""
+
+import importlib
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+import types
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+WARM_IMPORTS: tuple[str, ...] = (
+    "pandas",
+    "acs_email_sender_message_model",
+    "wrlc_azure_storage_service",
+    "azure.storage.blob",
+    "azure.storage.queue",
+    "azure.core.pipeline.transport",
+    "requests",
+)
+
+_warm_thread: threading.Thread | None = None
+_warm_lock = threading.Lock()
+
+
+class LazyModule(types.ModuleType):
+    """Stand-in for a module that imports it on first attribute access
+
+    Imports go through importlib.import_module, so concurrent first use from
+    the warm-up thread and an invocation is serialized by the import lock.
+    Attributes set on the proxy (e.g. by unittest.mock.patch) shadow the real
+    module's without modifying it.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(importlib.import_module(self.__name__), name)
+
+    def __dir__(self) -> list[str]:
+        return dir(importlib.import_module(self.__name__))
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """Get a module, deferring its import until first use
+
+    Args:
+        name (str): fully qualified module name
+
+    Returns:
+        types.ModuleType: the module if already imported, otherwise a proxy
+    """
+    return sys.modules.get(name) or LazyModule(name)
+
+
+def is_loaded(name: str) -> bool:
+    """Whether a module has actually been imported in this worker"""
+    return name in sys.modules
+
+
+def _import_all(names: tuple[str, ...]) -> None:
+    """Import modules one by one, logging how long each took"""
+    for name in names:
+        if is_loaded(name):
+            continue
+        start: float = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            logging.warning(f"lazy_imports.warm_imports: failed to import {name}: {e}")
+            continue
+        logging.info(
+            f"lazy_imports.warm_imports: imported {name} in "
+            f"{(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+
+
+def warm_imports(names: tuple[str, ...] = WARM_IMPORTS) -> threading.Thread | None:
+    """Import deferred modules in a background daemon thread
+
+    Only one warm-up thread is started per worker.
+
+    Args:
+        names (tuple[str, ...]): modules to import, in order
+
+    Returns:
+        threading.Thread | None: the warm-up thread, or None if one was
+            already started
+    """
+    global _warm_thread
+    with _warm_lock:
+        if _warm_thread is not None:
+            return None
+        _warm_thread = threading.Thread(
+            target=_import_all, args=(names,), name="warm-imports", daemon=True
+        )
+        _warm_thread.start()
+        return _warm_thread
+
+
+@dataclass(frozen=True)
+class ImportTime:
+    """Import cost of one module, as reported by python -X importtime"""
+
+    module: str
+    self_ms: float
+    cumulative_ms: float
+
+
+def parse_importtime(output: str) -> list[ImportTime]:
+    """Parse python -X importtime output
+
+    Args:
+        output (str): stderr of a python -X importtime run
+
+    Returns:
+        list[ImportTime]: one entry per imported module, in import order
+    """
+    timings: list[ImportTime] = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields: list[str] = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header row
+        timings.append(
+            ImportTime(
+                module=fields[2].strip(),
+                self_ms=int(fields[0]) / 1000,
+                cumulative_ms=int(fields[1]) / 1000,
+            )
+        )
+    return timings
+
+
+def import_time_report(target: str = "function_app", limit: int = 25) -> str:
+    """Measure the import cost of a module in a fresh interpreter
+
+    The background warm-up is disabled so only the startup path is measured.
+
+    Args:
+        target (str): module to import
+        limit (int): number of most expensive modules to list
+
+    Returns:
+        str: the report, most expensive (cumulative) modules first
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).resolve().parent.parent,
+        env={**os.environ, "IMPORT_WARMUP_ENABLED": "false"},
+        check=True,
+    )
+    timings: list[ImportTime] = parse_importtime(result.stderr)
+    total: float = next(
+        (t.cumulative_ms for t in reversed(timings) if t.module == target), 0.0
+    )
+
+    lines: list[str] = [
+        f"import {target}: {total:.1f} ms, {len(timings)} modules",
+        f"{'cumulative ms':>14}  {'self ms':>9}  module",
+    ]
+    for timing in sorted(timings, key=lambda t: t.cumulative_ms, reverse=True)[:limit]:
+        lines.append(
+            f"{timing.cumulative_ms:>14.1f}  {timing.self_ms:>9.1f}  {timing.module}"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    print(import_time_report(limit=int(sys.argv[1]) if len(sys.argv) > 1 else 25))
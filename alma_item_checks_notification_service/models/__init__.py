@@ -1,11 +1,19 @@
 from alma_item_checks_notification_service.models.base import Base
+from alma_item_checks_notification_service.models.digest_entry import DigestEntry
 from alma_item_checks_notification_service.models.process import Process
+from alma_item_checks_notification_service.models.process_recipient import (
+    ProcessRecipient,
+)
+from alma_item_checks_notification_service.models.processed_job import ProcessedJob
 from alma_item_checks_notification_service.models.user import User
 from alma_item_checks_notification_service.models.user_process import UserProcess
 
 __all__ = [
     "Base",
+    "DigestEntry",
     "Process",
+    "ProcessRecipient",
+    "ProcessedJob",
     "User",
     "UserProcess",
 ]
@@ -1,5 +1,7 @@
 """Base model for SQLAlchemy ORM."""
 
+from datetime import datetime, timezone
+
 from sqlalchemy.orm import DeclarativeBase
 
 
@@ -9,3 +11,8 @@ class Base(DeclarativeBase):
     """
 
     pass
+
+
+def utcnow() -> datetime:
+    """Current UTC time as stored in the models' DateTime columns"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
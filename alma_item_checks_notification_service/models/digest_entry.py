@@ -0,0 +1,23 @@
+"""DigestEntry model"""
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
+
+from alma_item_checks_notification_service.models.base import Base
+from alma_item_checks_notification_service.models.process import Process
+
+
+class DigestEntry(Base):
+    """DigestEntry model: a job buffered for its process's next digest email"""
+
+    __tablename__ = "digest_entry"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    process_id = Column(Integer, ForeignKey(Process.id), nullable=False)
+    institution_id = Column(Integer, nullable=False)
+    job_id = Column(String(255), nullable=False)
+    row_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False)  # UTC
+
+    __table_args__ = (
+        Index("ix_digest_entry_process_institution", "process_id", "institution_id"),
+    )
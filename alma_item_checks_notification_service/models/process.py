@@ -1,6 +1,6 @@
 """Process model"""
 
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Boolean, Column, Index, Integer, String, false
 
 from alma_item_checks_notification_service.models.base import Base
 
@@ -15,3 +15,15 @@ class Process(Base):
     email_subject = Column(String(255), nullable=False)
     email_body = Column(String(255), nullable=False)
     email_addendum = Column(String(255), nullable=True)
+    digest_enabled = Column(
+        Boolean, nullable=False, default=False, server_default=false()
+    )  # buffer jobs and send one combined email per window
+    digest_window_minutes = Column(
+        Integer, nullable=True
+    )  # default DIGEST_WINDOW_MINUTES
+    digest_max_rows = Column(Integer, nullable=True)  # default DIGEST_MAX_ROWS
+    attachment_threshold_rows = Column(
+        Integer, nullable=True
+    )  # reports with more rows go out as CSV; default REPORT_ATTACHMENT_THRESHOLD_ROWS
+
+    __table_args__ = (Index("ix_process_name", "name", unique=True),)
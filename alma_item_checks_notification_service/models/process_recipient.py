@@ -0,0 +1,20 @@
+"""ProcessRecipient model"""
+
+from sqlalchemy import Column, ForeignKey, Integer, String
+
+from alma_item_checks_notification_service.models.base import Base
+from alma_item_checks_notification_service.models.process import Process
+
+
+class ProcessRecipient(Base):
+    """ProcessRecipient model: a recipient of a process's emails at an institution
+
+    Denormalized from user_process joined to user, so resolving recipients is
+    a range scan of the primary key. Kept in sync by ProcessRecipientRepository.
+    """
+
+    __tablename__ = "process_recipient"
+
+    process_id = Column(Integer, ForeignKey(Process.id), primary_key=True)
+    institution_id = Column(Integer, primary_key=True)
+    email = Column(String(255), primary_key=True)
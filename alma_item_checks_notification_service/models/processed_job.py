@@ -0,0 +1,15 @@
+"""ProcessedJob model"""
+
+from sqlalchemy import Column, DateTime, String
+
+from alma_item_checks_notification_service.models.base import Base
+
+
+class ProcessedJob(Base):
+    """ProcessedJob model: a job whose notification has been claimed or sent"""
+
+    __tablename__ = "processed_job"
+
+    job_id = Column(String(255), primary_key=True)
+    claimed_at = Column(DateTime, nullable=False)  # UTC
+    completed_at = Column(DateTime, nullable=True)  # UTC, None while in progress
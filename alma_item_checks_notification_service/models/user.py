@@ -1,6 +1,6 @@
 """User model"""
 
-from sqlalchemy import Column, String, Integer, UniqueConstraint
+from sqlalchemy import Column, Index, String, Integer, UniqueConstraint
 
 from alma_item_checks_notification_service.models.base import Base
 
@@ -14,4 +14,9 @@ class User(Base):
     email = Column(String(255), nullable=False)
     institution_id = Column(Integer, nullable=False)
 
-    __table_args__ = (UniqueConstraint("email", "institution_id"),)
+    __table_args__ = (
+        UniqueConstraint("email", "institution_id"),
+        Index(
+            "ix_user_institution_email", "institution_id", "email"
+        ),  # covers the recipient query's user side
+    )
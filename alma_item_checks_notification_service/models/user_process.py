@@ -1,6 +1,6 @@
 """UserProcess model"""
 
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Index, Integer, ForeignKey
 
 from alma_item_checks_notification_service.models.base import Base
 from alma_item_checks_notification_service.models.process import Process
@@ -14,3 +14,9 @@ class UserProcess(Base):
 
     user_id = Column(Integer, ForeignKey(User.id), primary_key=True)
     process_id = Column(Integer, ForeignKey(Process.id), primary_key=True)
+
+    __table_args__ = (
+        Index(
+            "ix_user_process_process_user", "process_id", "user_id"
+        ),  # recipients are looked up by process
+    )
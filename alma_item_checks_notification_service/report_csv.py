@@ -0,0 +1,79 @@
+"""CSV export of report records
+
+Large reports are sent as a CSV attachment rather than an inline table. The
+CSV is produced in chunks so it can be streamed straight into a blob upload.
+Columns follow the same rules as the HTML table: first-appearance order, and
+the all-"0" placeholder column is dropped.
+"""
+
+import csv
+import io
+from collections.abc import Iterator, Mapping, Sequence
+from typing import Any
+
+from alma_item_checks_notification_service.html_table import PLACEHOLDER_COLUMN
+
+CSV_CONTENT_TYPE = "text/csv; charset=utf-8"
+CSV_CHUNK_SIZE = 64 * 1024
+
+
+def report_columns(records: Sequence[Mapping[str, Any]]) -> list[str]:
+    """Column names of a report, in first-appearance order
+
+    Args:
+        records (Sequence[Mapping[str, Any]]): report rows
+
+    Returns:
+        list[str]: column names
+    """
+    columns: dict[str, None] = {}
+    placeholder_only_zeros: bool = bool(records)
+
+    for record in records:
+        for key in record:
+            columns.setdefault(str(key), None)
+        if placeholder_only_zeros:
+            placeholder = record.get(PLACEHOLDER_COLUMN)
+            placeholder_only_zeros = placeholder is not None and str(placeholder) == "0"
+
+    if placeholder_only_zeros:
+        columns.pop(PLACEHOLDER_COLUMN, None)
+
+    return list(columns)
+
+
+def _cell(value: Any) -> str:
+    """Format a JSON value as CSV cell text"""
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    return str(value)
+
+
+def iter_csv_chunks(
+    records: Sequence[Mapping[str, Any]], chunk_size: int = CSV_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Encode report records as UTF-8 CSV (with BOM, for Excel), a chunk at a time
+
+    Args:
+        records (Sequence[Mapping[str, Any]]): report rows
+        chunk_size (int): approximate size of each yielded chunk in bytes
+
+    Yields:
+        bytes: consecutive pieces of the CSV document
+    """
+    columns: list[str] = report_columns(records)
+    buffer: io.StringIO = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\r\n")
+
+    buffer.write("\ufeff")
+    writer.writerow(columns)
+
+    for record in records:
+        writer.writerow([_cell(record.get(column)) for column in columns])
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
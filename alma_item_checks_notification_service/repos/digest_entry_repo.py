@@ -0,0 +1,144 @@
+"""Repository for the digest_entry table"""
+
+import logging
+from typing import cast
+
+from sqlalchemy import CursorResult, Delete, Row, Select, and_, func
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from alma_item_checks_notification_service.models.digest_entry import DigestEntry
+from alma_item_checks_notification_service.models.process import Process
+
+
+class DigestEntryRepository:
+    """Repository for the digest_entry table"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def add_entries(self, entries: list[DigestEntry]) -> bool:
+        """Buffer jobs for digests
+
+        Args:
+            entries (list[DigestEntry]): entries to insert
+
+        Returns:
+            bool: whether the entries were committed
+        """
+        try:
+            self.session.add_all(entries)
+            self.session.commit()
+            return True
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            logging.error(f"DigestEntryRepository.add_entries: SQLAlchemyError: {e}")
+            return False
+        except Exception as e:
+            self.session.rollback()
+            logging.error(f"DigestEntryRepository.add_entries: Exception: {e}")
+            return False
+
+    def get_entries(
+        self, process_id: int, institution_id: int
+    ) -> list[DigestEntry] | None:
+        """Get the jobs buffered for one process and institution, oldest first
+
+        Args:
+            process_id (int): id of the process
+            institution_id (int): institution id
+
+        Returns:
+            list[DigestEntry] | None: buffered entries or None on error
+        """
+        stmt: Select = (
+            Select(DigestEntry)
+            .where(
+                and_(
+                    DigestEntry.process_id == process_id,
+                    DigestEntry.institution_id == institution_id,
+                )
+            )
+            .order_by(DigestEntry.id)
+        )
+
+        try:
+            return list(self.session.execute(stmt).scalars().all())
+        except SQLAlchemyError as e:
+            logging.error(f"DigestEntryRepository.get_entries: SQLAlchemyError: {e}")
+            return None
+        except Exception as e:
+            logging.error(f"DigestEntryRepository.get_entries: Exception: {e}")
+            return None
+
+    def get_pending_groups(self) -> list[Row] | None:
+        """Summarize buffered jobs per process and institution
+
+        Returns:
+            list[Row] | None: rows of (process_id, institution_id, oldest,
+                row_count, job_count, digest_window_minutes, digest_max_rows),
+                or None on error
+        """
+        stmt: Select = (
+            Select(
+                DigestEntry.process_id,
+                DigestEntry.institution_id,
+                func.min(DigestEntry.created_at).label("oldest"),
+                func.sum(DigestEntry.row_count).label("row_count"),
+                func.count(DigestEntry.id).label("job_count"),
+                Process.digest_window_minutes,
+                Process.digest_max_rows,
+            )
+            .join(Process, Process.id == DigestEntry.process_id)
+            .group_by(
+                DigestEntry.process_id,
+                DigestEntry.institution_id,
+                Process.digest_window_minutes,
+                Process.digest_max_rows,
+            )
+        )
+
+        try:
+            return list(self.session.execute(stmt).all())
+        except SQLAlchemyError as e:
+            logging.error(
+                f"DigestEntryRepository.get_pending_groups: SQLAlchemyError: {e}"
+            )
+            return None
+        except Exception as e:
+            logging.error(f"DigestEntryRepository.get_pending_groups: Exception: {e}")
+            return None
+
+    def claim_entries(self, entry_ids: list[int]) -> list[int] | None:
+        """Delete buffered entries, reporting which ones this session removed
+
+        Entries are deleted one by one in a single transaction, so when two
+        flushes race for the same jobs each job is claimed by exactly one.
+
+        Args:
+            entry_ids (list[int]): ids of the entries to claim
+
+        Returns:
+            list[int] | None: ids actually deleted, or None on error
+        """
+        try:
+            claimed: list[int] = [
+                entry_id
+                for entry_id in entry_ids
+                if cast(
+                    CursorResult,
+                    self.session.execute(
+                        Delete(DigestEntry).where(DigestEntry.id == entry_id)
+                    ),
+                ).rowcount
+            ]
+            self.session.commit()
+            return claimed
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            logging.error(f"DigestEntryRepository.claim_entries: SQLAlchemyError: {e}")
+            return None
+        except Exception as e:
+            self.session.rollback()
+            logging.error(f"DigestEntryRepository.claim_entries: Exception: {e}")
+            return None
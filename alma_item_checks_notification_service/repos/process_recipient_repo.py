@@ -0,0 +1,129 @@
+"""Repository for the process_recipient table"""
+
+import logging
+from typing import cast
+
+from sqlalchemy import CursorResult, Delete, Insert, Select, and_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from alma_item_checks_notification_service.models.process_recipient import (
+    ProcessRecipient,
+)
+from alma_item_checks_notification_service.models.user import User
+from alma_item_checks_notification_service.models.user_process import UserProcess
+
+
+class ProcessRecipientRepository:
+    """Repository for the process_recipient table
+
+    process_recipient is derived from user_process joined to user. Subscription
+    changes made through UserProcessRepository keep it in sync; rebuild()
+    recomputes it after changes made any other way.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get_recipient_emails(
+        self, process_id: int, institution_id: int
+    ) -> list[str] | None:
+        """Get the recipients of a process at an institution
+
+        Args:
+            process_id (int): Process ID
+            institution_id (int): Institution ID
+
+        Returns:
+            list[str] | None: List of user emails or None on error
+        """
+        stmt: Select = Select(ProcessRecipient.email).where(
+            and_(
+                ProcessRecipient.process_id == process_id,
+                ProcessRecipient.institution_id == institution_id,
+            )
+        )
+
+        try:
+            return [str(email) for email in self.session.execute(stmt).scalars().all()]
+        except SQLAlchemyError as e:
+            logging.error(
+                f"ProcessRecipientRepository.get_recipient_emails: SQLAlchemyError: {e}"
+            )
+            return None
+        except Exception as e:
+            logging.error(
+                f"ProcessRecipientRepository.get_recipient_emails: Exception: {e}"
+            )
+            return None
+
+    def rebuild(self, process_id: int | None = None) -> int | None:
+        """Recompute recipients from user_process and user in one transaction
+
+        Args:
+            process_id (int | None): process to rebuild, or None for all of them
+
+        Returns:
+            int | None: number of recipients written, or None on error
+        """
+        delete: Delete = Delete(ProcessRecipient)
+        source: Select = Select(
+            UserProcess.process_id, User.institution_id, User.email
+        ).join(User, User.id == UserProcess.user_id)
+
+        if process_id is not None:
+            delete = delete.where(ProcessRecipient.process_id == process_id)
+            source = source.where(UserProcess.process_id == process_id)
+
+        try:
+            self.session.execute(delete)
+            inserted: int = cast(
+                CursorResult,
+                self.session.execute(
+                    Insert(ProcessRecipient).from_select(
+                        ["process_id", "institution_id", "email"], source
+                    )
+                ),
+            ).rowcount
+            self.session.commit()
+            return inserted
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            logging.error(f"ProcessRecipientRepository.rebuild: SQLAlchemyError: {e}")
+            return None
+        except Exception as e:
+            self.session.rollback()
+            logging.error(f"ProcessRecipientRepository.rebuild: Exception: {e}")
+            return None
+
+    def add_recipient(self, user: User, process_id: int) -> None:
+        """Stage a user's row for a process; the caller commits
+
+        Args:
+            user (User): subscribed user
+            process_id (int): Process ID
+        """
+        self.session.merge(
+            ProcessRecipient(
+                process_id=process_id,
+                institution_id=user.institution_id,
+                email=user.email,
+            )
+        )
+
+    def remove_recipient(self, user: User, process_id: int) -> None:
+        """Stage deleting a user's row for a process; the caller commits
+
+        Args:
+            user (User): unsubscribed user
+            process_id (int): Process ID
+        """
+        self.session.execute(
+            Delete(ProcessRecipient).where(
+                and_(
+                    ProcessRecipient.process_id == process_id,
+                    ProcessRecipient.institution_id == user.institution_id,
+                    ProcessRecipient.email == user.email,
+                )
+            )
+        )
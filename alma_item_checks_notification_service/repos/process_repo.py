@@ -50,6 +50,32 @@ class ProcessRepository:
             logging.error(f"ProcessRepository.get_process_id_by_name: Exception: {e}")
             return None
 
+    def get_process_by_id(self, process_id: int) -> Process | None:
+        """Get process by id
+
+        Args:
+            process_id (int): id of the process to get
+
+        Returns:
+            Process | None: process object or None
+        """
+        try:
+            process: Process | None = self.session.get(Process, process_id)
+
+            if not process:
+                logging.error(
+                    f"ProcessRepository.get_process_by_id: process {process_id} not found"
+                )
+
+            return process
+
+        except SQLAlchemyError as e:
+            logging.error(f"ProcessRepository.get_process_by_id: SQLAlchemyError: {e}")
+            return None
+        except Exception as e:
+            logging.error(f"ProcessRepository.get_process_by_id: Exception: {e}")
+            return None
+
     def get_process_id_by_name(self, name: str) -> int | None:
         """Get process id by name
 
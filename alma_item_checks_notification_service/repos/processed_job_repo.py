@@ -0,0 +1,203 @@
+"""Repository for the processed_job table"""
+
+import logging
+from datetime import datetime
+from typing import cast
+
+from sqlalchemy import (
+    ColumnElement,
+    CursorResult,
+    Delete,
+    Select,
+    Update,
+    and_,
+    or_,
+)
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from alma_item_checks_notification_service.models.processed_job import ProcessedJob
+
+
+class ProcessedJobRepository:
+    """Repository for the processed_job table"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def insert_claim(self, job_id: str, claimed_at: datetime) -> bool | None:
+        """Record that a job is being processed
+
+        Args:
+            job_id (str): job to claim
+            claimed_at (datetime): claim time (UTC)
+
+        Returns:
+            bool | None: True if claimed, False if the job already has a
+                record, None on other errors
+        """
+        try:
+            self.session.add(ProcessedJob(job_id=job_id, claimed_at=claimed_at))
+            self.session.commit()
+            return True
+        except IntegrityError:
+            self.session.rollback()
+            return False
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            logging.error(f"ProcessedJobRepository.insert_claim: SQLAlchemyError: {e}")
+            return None
+        except Exception as e:
+            self.session.rollback()
+            logging.error(f"ProcessedJobRepository.insert_claim: Exception: {e}")
+            return None
+
+    def get_job(self, job_id: str) -> ProcessedJob | None:
+        """Get a job's record
+
+        Args:
+            job_id (str): job to look up
+
+        Returns:
+            ProcessedJob | None: the record, or None if there is none or on error
+        """
+        stmt: Select = Select(ProcessedJob).where(ProcessedJob.job_id == job_id)
+
+        try:
+            return self.session.execute(stmt).scalars().first()
+        except SQLAlchemyError as e:
+            logging.error(f"ProcessedJobRepository.get_job: SQLAlchemyError: {e}")
+            return None
+        except Exception as e:
+            logging.error(f"ProcessedJobRepository.get_job: Exception: {e}")
+            return None
+
+    def take_over_claim(
+        self, job_id: str, stale_before: datetime, claimed_at: datetime
+    ) -> bool:
+        """Re-claim a job whose earlier claim was never completed
+
+        Args:
+            job_id (str): job to claim
+            stale_before (datetime): unfinished claims older than this are abandoned
+            claimed_at (datetime): new claim time (UTC)
+
+        Returns:
+            bool: True if the abandoned claim was taken over
+        """
+        stmt: Update = (
+            Update(ProcessedJob)
+            .where(
+                and_(
+                    ProcessedJob.job_id == job_id,
+                    ProcessedJob.completed_at.is_(None),
+                    cast(ColumnElement[bool], ProcessedJob.claimed_at < stale_before),
+                )
+            )
+            .values(claimed_at=claimed_at)
+        )
+
+        try:
+            updated: int = cast(CursorResult, self.session.execute(stmt)).rowcount
+            self.session.commit()
+            return updated == 1
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            logging.error(
+                f"ProcessedJobRepository.take_over_claim: SQLAlchemyError: {e}"
+            )
+            return False
+        except Exception as e:
+            self.session.rollback()
+            logging.error(f"ProcessedJobRepository.take_over_claim: Exception: {e}")
+            return False
+
+    def mark_completed(self, job_id: str, completed_at: datetime) -> bool:
+        """Record that a job's notification has been handled
+
+        Args:
+            job_id (str): claimed job
+            completed_at (datetime): completion time (UTC)
+
+        Returns:
+            bool: whether the record was updated
+        """
+        stmt: Update = (
+            Update(ProcessedJob)
+            .where(ProcessedJob.job_id == job_id)
+            .values(completed_at=completed_at)
+        )
+
+        try:
+            updated: int = cast(CursorResult, self.session.execute(stmt)).rowcount
+            self.session.commit()
+            return updated == 1
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            logging.error(
+                f"ProcessedJobRepository.mark_completed: SQLAlchemyError: {e}"
+            )
+            return False
+        except Exception as e:
+            self.session.rollback()
+            logging.error(f"ProcessedJobRepository.mark_completed: Exception: {e}")
+            return False
+
+    def delete_claim(self, job_id: str) -> bool:
+        """Drop an unfinished claim so a retry can process the job
+
+        Args:
+            job_id (str): claimed job
+
+        Returns:
+            bool: whether a claim was removed
+        """
+        stmt: Delete = Delete(ProcessedJob).where(
+            and_(ProcessedJob.job_id == job_id, ProcessedJob.completed_at.is_(None))
+        )
+
+        try:
+            deleted: int = cast(CursorResult, self.session.execute(stmt)).rowcount
+            self.session.commit()
+            return deleted == 1
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            logging.error(f"ProcessedJobRepository.delete_claim: SQLAlchemyError: {e}")
+            return False
+        except Exception as e:
+            self.session.rollback()
+            logging.error(f"ProcessedJobRepository.delete_claim: Exception: {e}")
+            return False
+
+    def purge(self, before: datetime) -> int | None:
+        """Delete the records of jobs finished, or abandoned, before a time
+
+        Args:
+            before (datetime): records completed, or claimed and never
+                completed, before this time (UTC) are deleted
+
+        Returns:
+            int | None: number of records deleted, or None on error
+        """
+        stmt: Delete = Delete(ProcessedJob).where(
+            or_(
+                cast(ColumnElement[bool], ProcessedJob.completed_at < before),
+                and_(
+                    ProcessedJob.completed_at.is_(None),
+                    cast(ColumnElement[bool], ProcessedJob.claimed_at < before),
+                ),
+            )
+        )
+
+        try:
+            deleted: int = cast(CursorResult, self.session.execute(stmt)).rowcount
+            self.session.commit()
+            return deleted
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            logging.error(f"ProcessedJobRepository.purge: SQLAlchemyError: {e}")
+            return None
+        except Exception as e:
+            self.session.rollback()
+            logging.error(f"ProcessedJobRepository.purge: Exception: {e}")
+            return None
@@ -1,12 +1,17 @@
 """Repository for the UserProcess table"""
 
 import logging
+from typing import Iterator
 
-from sqlalchemy import Select
+from sqlalchemy import Delete, Select, and_
 from sqlalchemy.exc import NoResultFound, SQLAlchemyError
 from sqlalchemy.orm import Session
 
+from alma_item_checks_notification_service.models.user import User
 from alma_item_checks_notification_service.models.user_process import UserProcess
+from alma_item_checks_notification_service.repos.process_recipient_repo import (
+    ProcessRecipientRepository,
+)
 
 
 class UserProcessRepository:
@@ -49,3 +54,172 @@ class UserProcessRepository:
                 f"UserProcessRepository.get_users_for_process: Exception: {e}"
             )
             return None
+
+    def get_user_emails_for_process(
+        self, process_id: int, institution_id: int
+    ) -> list[str] | None:
+        """Get the email addresses of all users subscribed to a process at an institution
+
+        Resolves the whole recipient list with a single query joining user_process to user.
+
+        Args:
+            process_id (int): Process ID
+            institution_id (int): Institution ID
+
+        Returns:
+            list[str] | None: List of user emails or None
+        """
+        stmt: Select = self._user_emails_stmt(process_id, institution_id)
+
+        try:
+            emails: list[str] = [
+                str(email) for email in self.session.execute(stmt).scalars().all()
+            ]
+
+            return emails
+
+        except NoResultFound:
+            logging.error(
+                "UserProcessRepository.get_user_emails_for_process: NoResultFound"
+            )
+            return None
+        except SQLAlchemyError as e:
+            logging.error(
+                f"UserProcessRepository.get_user_emails_for_process: SQLAlchemyError: {e}"
+            )
+            return None
+        except Exception as e:
+            logging.error(
+                f"UserProcessRepository.get_user_emails_for_process: Exception: {e}"
+            )
+            return None
+
+    def iter_user_emails_for_process(
+        self, process_id: int, institution_id: int, batch_size: int = 500
+    ) -> Iterator[str]:
+        """Stream the email addresses of all users subscribed to a process at an institution
+
+        Same query as get_user_emails_for_process, but rows are fetched from a
+        server-side cursor in batches so very large subscriber lists are never
+        held in memory at once.
+
+        Args:
+            process_id (int): Process ID
+            institution_id (int): Institution ID
+            batch_size (int): number of rows fetched per round trip
+
+        Yields:
+            str: user email
+
+        Raises:
+            Exception: a database error, re-raised after logging so the caller
+                fails rather than using a truncated recipient list
+        """
+        stmt: Select = self._user_emails_stmt(process_id, institution_id)
+
+        try:
+            result = self.session.execute(
+                stmt.execution_options(yield_per=batch_size)
+            ).scalars()
+
+            for email in result:
+                yield str(email)
+
+        except SQLAlchemyError as e:
+            logging.error(
+                f"UserProcessRepository.iter_user_emails_for_process: SQLAlchemyError: {e}"
+            )
+            raise
+        except Exception as e:
+            logging.error(
+                f"UserProcessRepository.iter_user_emails_for_process: Exception: {e}"
+            )
+            raise
+
+    def add_subscription(self, user_id: int, process_id: int) -> bool:
+        """Subscribe a user to a process, updating process_recipient to match
+
+        Args:
+            user_id (int): User ID
+            process_id (int): Process ID
+
+        Returns:
+            bool: whether the subscription was committed
+        """
+        try:
+            user: User | None = self.session.get(User, user_id)
+
+            if user is None:
+                logging.error(
+                    f"UserProcessRepository.add_subscription: user {user_id} not found"
+                )
+                return False
+
+            self.session.merge(UserProcess(user_id=user_id, process_id=process_id))
+            ProcessRecipientRepository(self.session).add_recipient(user, process_id)
+            self.session.commit()
+            return True
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            logging.error(
+                f"UserProcessRepository.add_subscription: SQLAlchemyError: {e}"
+            )
+            return False
+        except Exception as e:
+            self.session.rollback()
+            logging.error(f"UserProcessRepository.add_subscription: Exception: {e}")
+            return False
+
+    def remove_subscription(self, user_id: int, process_id: int) -> bool:
+        """Unsubscribe a user from a process, updating process_recipient to match
+
+        Args:
+            user_id (int): User ID
+            process_id (int): Process ID
+
+        Returns:
+            bool: whether the change was committed; unsubscribing a user who
+                isn't subscribed succeeds
+        """
+        try:
+            self.session.execute(
+                Delete(UserProcess).where(
+                    and_(
+                        UserProcess.user_id == user_id,
+                        UserProcess.process_id == process_id,
+                    )
+                )
+            )
+
+            user: User | None = self.session.get(User, user_id)
+            if user is not None:
+                ProcessRecipientRepository(self.session).remove_recipient(
+                    user, process_id
+                )
+
+            self.session.commit()
+            return True
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            logging.error(
+                f"UserProcessRepository.remove_subscription: SQLAlchemyError: {e}"
+            )
+            return False
+        except Exception as e:
+            self.session.rollback()
+            logging.error(f"UserProcessRepository.remove_subscription: Exception: {e}")
+            return False
+
+    @staticmethod
+    def _user_emails_stmt(process_id: int, institution_id: int) -> Select:
+        """Build the recipient query for a process and institution"""
+        return (
+            Select(User.email)
+            .join(UserProcess, UserProcess.user_id == User.id)
+            .where(
+                and_(
+                    UserProcess.process_id == process_id,
+                    User.institution_id == institution_id,
+                )
+            )
+        )
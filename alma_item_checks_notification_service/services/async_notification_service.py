@@ -0,0 +1,338 @@
+"""Asyncio variant of the notification service"""
+
+import asyncio
+import logging
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+import azure.functions as func
+from sqlalchemy.orm import Session
+
+from alma_item_checks_notification_service.aio_storage import (
+    AsyncStorageService,
+    get_async_storage_service,
+)
+from alma_item_checks_notification_service.config import (
+    ACS_SENDER_CONTAINER_NAME,
+    ACS_SENDER_QUEUE_NAME,
+    ACS_STORAGE_CONNECTION_STRING,
+    EMAIL_PAYLOAD_COMPRESSION_ENABLED,
+    IDEMPOTENCY_ENABLED,
+    REPORTS_CONTAINER,
+)
+from alma_item_checks_notification_service.database import SessionMaker
+from alma_item_checks_notification_service.models.process import Process
+from alma_item_checks_notification_service.services.digest_service import (
+    digest_active,
+)
+from alma_item_checks_notification_service.services.notification_service import (
+    EMAIL_PAYLOAD_GZIP_VERSION,
+    NotificationService,
+    queue_message_bytes,
+    record_recipient_cache_stats,
+)
+from alma_item_checks_notification_service.services.process_service import (
+    ProcessService,
+)
+from alma_item_checks_notification_service.services.processed_job_service import (
+    COMPLETED,
+    IN_PROGRESS,
+    JobInProgressError,
+    ProcessedJobService,
+)
+from alma_item_checks_notification_service.services.user_process_service import (
+    UserProcessService,
+)
+from alma_item_checks_notification_service.storage import azure_blob
+from alma_item_checks_notification_service.tracing import span, tracing_enabled
+
+T = TypeVar("T")
+
+
+class AsyncNotificationService(NotificationService):
+    """Asyncio variant of NotificationService
+
+    Storage calls go through the aio Azure clients, and the report download
+    runs concurrently with the process and recipient lookups, so one worker
+    can have many notifications in flight. SQLAlchemy is synchronous, so
+    database work runs in threads, each with its own session; email rendering
+    and digests reuse the synchronous NotificationService code in a thread.
+    """
+
+    def __init__(
+        self,
+        msg: func.QueueMessage | None = None,
+        session_maker: Callable[[], Session] = SessionMaker,
+    ):
+        super().__init__(msg)
+        self.session_maker = session_maker
+
+    async def run_in_session(self, work: Callable[[Session], T]) -> T:
+        """Run database work in a thread with its own session
+
+        Args:
+            work (Callable[[Session], T]): function of the session to run
+
+        Returns:
+            T: what work returned
+        """
+
+        def run() -> T:
+            with self.session_maker() as session:
+                return work(session)
+
+        return await asyncio.to_thread(run)
+
+    async def send_notification_async(self) -> None:
+        """Send an email notification"""
+        fields: tuple[str, int, str] | None = self.parse_message()
+
+        if fields is None:
+            return
+
+        job_id, institution_id, process_type = fields
+
+        with span(
+            "notification",
+            job_id=job_id,
+            process_type=process_type,
+            institution_id=institution_id,
+        ):
+            # Queue messages are delivered at least once: skip jobs already handled
+            if IDEMPOTENCY_ENABLED:
+                claim: str = await self.run_in_session(
+                    lambda session: ProcessedJobService(session).claim(job_id)
+                )
+                if claim == COMPLETED:
+                    return
+                if claim == IN_PROGRESS:
+                    delay: int = await self.run_in_session(
+                        lambda session: ProcessedJobService(session).retry_delay(job_id)
+                    )
+                    if await asyncio.to_thread(self.requeue, delay):
+                        return
+                    raise JobInProgressError(f"job {job_id} is still being processed")
+
+            try:
+                await self.process_job_async(job_id, institution_id, process_type)
+            except Exception:
+                if IDEMPOTENCY_ENABLED:
+                    await self.run_in_session(
+                        lambda session: ProcessedJobService(session).release(job_id)
+                    )
+                raise
+
+            if IDEMPOTENCY_ENABLED:
+                await self.run_in_session(
+                    lambda session: ProcessedJobService(session).complete(job_id)
+                )
+
+    async def process_job_async(
+        self, job_id: str, institution_id: int, process_type: str
+    ) -> None:
+        """
+        Send, or buffer for a digest, the notification for one job.
+
+        The process is looked up first, so an unknown process type is turned
+        away before any storage I/O; the report download and the recipient
+        lookup then run concurrently.
+
+        Args:
+            job_id (str): job whose report is sent
+            institution_id (int): institution the job belongs to
+            process_type (str): name of the process that produced the report
+        """
+        process: Process | None = await self.run_in_session(
+            lambda session: self.lookup_process(session, process_type)
+        )
+
+        if not process:
+            logging.error(
+                f"AsyncNotificationService.process_job_async: process type {process_type} not found"
+            )
+            return
+
+        if digest_active(process):
+            report: Any = await self.download_report_async(job_id)
+            if await self.run_in_session(
+                lambda session: self.buffer_for_digest(
+                    session, process, institution_id, job_id, report=report
+                )
+            ):
+                return
+            user_emails: list[str] = await self.run_in_session(
+                lambda session: self.resolve_recipients(
+                    session, process, institution_id
+                )
+            )
+        else:
+            report, user_emails = await asyncio.gather(
+                self.download_report_async(job_id),
+                self.run_in_session(
+                    lambda session: self.resolve_recipients(
+                        session, process, institution_id
+                    )
+                ),
+            )
+
+        await self.send_email_async(
+            process=process,
+            report=report,
+            blob_name=job_id + ".json",
+            user_emails=user_emails,
+        )
+
+    @staticmethod
+    def lookup_process(session: Session, process_type: str) -> Process | None:
+        """
+        Look up a job's process.
+
+        Args:
+            session (Session): database session
+            process_type (str): name of the process that produced the report
+
+        Returns:
+            Process | None: the process, or None if not found
+        """
+        with span("lookup_process"):
+            return ProcessService(session).get_process_by_name(process_type)
+
+    @staticmethod
+    def resolve_recipients(
+        session: Session, process: Process, institution_id: int
+    ) -> list[str]:
+        """
+        Look up the recipients of a job's process at its institution.
+
+        Args:
+            session (Session): database session
+            process (Process): the job's process
+            institution_id (int): institution the job belongs to
+
+        Returns:
+            list[str]: the recipient emails
+        """
+        with span("resolve_recipients") as current:
+            user_emails: list[str] = UserProcessService(session).get_recipient_emails(
+                int(process.id), institution_id
+            )
+            current.set_attribute("recipient_count", len(user_emails))
+            record_recipient_cache_stats(current)
+
+        return user_emails
+
+    async def download_report_async(self, job_id: str) -> Any:
+        """
+        Download the JSON report for a job.
+
+        Args:
+            job_id (str): The job ID the report was saved under.
+
+        Returns:
+            Any: The report data.
+        """
+        with span("download_report") as current:
+            report: Any = await get_async_storage_service().download_blob_as_json(
+                container_name=REPORTS_CONTAINER, blob_name=job_id + ".json"
+            )
+            if isinstance(report, list):
+                current.set_attribute("row_count", len(report))
+
+        return report
+
+    async def send_email_async(
+        self,
+        process: Process,
+        report: Any,
+        blob_name: str,
+        user_emails: list[str],
+    ) -> None:
+        """
+        Render the email for a report and hand it to the ACS email sender.
+
+        Args:
+            process (Process): process the report belongs to
+            report (Any): report records
+            blob_name (str): name of the email blob for the sender
+            user_emails (list[str]): recipients
+        """
+        storage_service: AsyncStorageService = get_async_storage_service(
+            ACS_STORAGE_CONNECTION_STRING
+        )
+
+        email_json_content, attachment = await asyncio.to_thread(
+            self.prepare_email,
+            process=process,
+            report=report,
+            blob_name=blob_name,
+            user_emails=user_emails,
+        )
+
+        with span("store_payload", payload_chars=len(email_json_content)):
+            message_content: dict[str, Any] = await self.store_email_payload_async(
+                storage_service, blob_name, email_json_content, attachment
+            )
+
+        with span("send_queue_message") as current:
+            if tracing_enabled():
+                current.set_attribute(
+                    "payload_bytes", queue_message_bytes(message_content)
+                )
+            await storage_service.send_queue_message(
+                queue_name=ACS_SENDER_QUEUE_NAME, message_content=message_content
+            )
+
+    async def store_email_payload_async(
+        self,
+        storage_service: AsyncStorageService,
+        blob_name: str,
+        email_json: str,
+        attachment: dict[str, str] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Store an email for the ACS sender; see NotificationService.store_email_payload.
+
+        Args:
+            storage_service (AsyncStorageService): ACS storage service
+            blob_name (str): name of the email blob
+            email_json (str): serialized EmailMessage
+            attachment (dict[str, str] | None): queue message fields
+                describing the attachment, if any
+
+        Returns:
+            dict[str, Any]: the queue message, carrying or locating the payload
+        """
+        attachment = attachment or {}
+        inline: dict[str, Any] | None = self.inline_email_payload(
+            email_json, attachment
+        )
+
+        if inline is not None:
+            return inline
+
+        if not EMAIL_PAYLOAD_COMPRESSION_ENABLED:
+            await storage_service.upload_blob_data(
+                container_name=ACS_SENDER_CONTAINER_NAME,
+                blob_name=blob_name,
+                data=email_json,
+            )
+            return {"blob_name": blob_name, **attachment}
+
+        compressed_blob_name, compressed = self.compress_email_payload(
+            blob_name, email_json
+        )
+
+        await storage_service.upload_blob_data(
+            container_name=ACS_SENDER_CONTAINER_NAME,
+            blob_name=compressed_blob_name,
+            data=compressed,
+            content_settings=azure_blob.ContentSettings(
+                content_type="application/json", content_encoding="gzip"
+            ),
+        )
+
+        return {
+            "blob_name": compressed_blob_name,
+            "version": EMAIL_PAYLOAD_GZIP_VERSION,
+            **attachment,
+        }
@@ -0,0 +1,300 @@
+"""Service class for sending notifications in batches"""
+
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import azure.functions as func
+from azure.core.exceptions import (
+    HttpResponseError,
+    ResourceExistsError,
+    ResourceNotFoundError,
+)
+from sqlalchemy.orm import Session
+
+from alma_item_checks_notification_service.config import (
+    IDEMPOTENCY_ENABLED,
+    NOTIFICATION_BATCH_MAX_DEQUEUE_COUNT,
+    NOTIFICATION_BATCH_VISIBILITY_TIMEOUT,
+)
+from alma_item_checks_notification_service.models.process import Process
+from alma_item_checks_notification_service.services.notification_service import (
+    NotificationService,
+)
+from alma_item_checks_notification_service.services.processed_job_service import (
+    COMPLETED,
+    IN_PROGRESS,
+    ProcessedJobService,
+)
+from alma_item_checks_notification_service.services.process_service import (
+    ProcessService,
+)
+from alma_item_checks_notification_service.services.user_process_service import (
+    UserProcessService,
+)
+
+if TYPE_CHECKING:
+    from azure.storage.queue import QueueClient
+
+SENT = "sent"
+SKIPPED = "skipped"  # can never succeed; consumed, as the queue trigger does
+FAILED = "failed"  # may succeed on retry
+
+QUEUE_PAGE_SIZE = 32  # most messages a queue receive call returns
+
+
+@dataclass(frozen=True)
+class NotificationResult:
+    """Outcome of one message in a batch"""
+
+    message_id: str | None
+    status: str
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class DrainStats:
+    """Counters for one drain of a notification queue"""
+
+    received: int
+    sent: int
+    skipped: int
+    failed: int
+    poisoned: int
+    undeleted: int = 0  # sent, skipped or poisoned, but still on the queue
+
+
+class BatchNotificationService:
+    """Service class for sending notifications in batches
+
+    Messages are grouped by process type and institution; each group shares one
+    process lookup and one recipient resolution, while every message is
+    delivered, and succeeds or fails, on its own.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def send_notifications(
+        self, messages: Iterable[func.QueueMessage]
+    ) -> list[NotificationResult]:
+        """Send an email notification for each message
+
+        Args:
+            messages (Iterable[func.QueueMessage]): notification messages
+
+        Returns:
+            list[NotificationResult]: one result per message, in input order
+        """
+        results: list[NotificationResult] = []
+        processed_jobs: ProcessedJobService | None = (
+            ProcessedJobService(self.session) if IDEMPOTENCY_ENABLED else None
+        )
+        groups: dict[
+            tuple[str, int], list[tuple[int, str | None, NotificationService, str]]
+        ] = {}
+
+        for index, msg in enumerate(messages):
+            # Replaced once the message is handled, so every message has a result
+            results.append(NotificationResult(msg.id, FAILED, "message not processed"))
+            try:
+                notification: NotificationService = NotificationService(msg)
+                fields: tuple[str, int, str] | None = notification.parse_message()
+            except Exception as e:
+                logging.error(
+                    f"BatchNotificationService.send_notifications: unreadable message {msg.id}: {e}"
+                )
+                results[index] = NotificationResult(msg.id, SKIPPED, str(e))
+                continue
+
+            if fields is None:
+                results[index] = NotificationResult(
+                    msg.id, SKIPPED, "message body missing required fields"
+                )
+                continue
+
+            job_id, institution_id, process_type = fields
+
+            claim: str | None = processed_jobs.claim(job_id) if processed_jobs else None
+
+            if claim == COMPLETED:
+                results[index] = NotificationResult(
+                    msg.id, SKIPPED, f"job {job_id} already handled"
+                )
+                continue
+
+            if claim == IN_PROGRESS:
+                # Kept for a retry: the claim is taken over once it goes stale
+                results[index] = NotificationResult(
+                    msg.id, FAILED, f"job {job_id} is still being processed"
+                )
+                continue
+
+            groups.setdefault((process_type, institution_id), []).append(
+                (index, msg.id, notification, job_id)
+            )
+
+        process_service: ProcessService = ProcessService(self.session)
+        user_process_service: UserProcessService = UserProcessService(self.session)
+
+        for (process_type, institution_id), members in groups.items():
+            process: Process | None = process_service.get_process_by_name(process_type)
+
+            if not process:
+                logging.error(
+                    f"BatchNotificationService.send_notifications: process type {process_type} not found"
+                )
+                for index, msg_id, _, job_id in members:
+                    if processed_jobs:
+                        processed_jobs.complete(job_id)
+                    results[index] = NotificationResult(
+                        msg_id,
+                        SKIPPED,
+                        f"process type {process_type} not found",
+                    )
+                continue
+
+            try:
+                user_emails: list[str] = user_process_service.get_recipient_emails(
+                    int(process.id), institution_id
+                )
+            except Exception as e:
+                logging.exception(
+                    f"BatchNotificationService.send_notifications: recipients for {process_type} failed: {e}"
+                )
+                for index, msg_id, _, job_id in members:
+                    if processed_jobs:
+                        processed_jobs.release(job_id)
+                    results[index] = NotificationResult(msg_id, FAILED, str(e))
+                continue
+
+            for index, msg_id, notification, job_id in members:
+                try:
+                    if not notification.buffer_for_digest(
+                        self.session, process, institution_id, job_id
+                    ):
+                        notification.deliver(
+                            process=process, job_id=job_id, user_emails=user_emails
+                        )
+                except Exception as e:
+                    logging.exception(
+                        f"BatchNotificationService.send_notifications: job {job_id} failed: {e}"
+                    )
+                    if processed_jobs:
+                        processed_jobs.release(job_id)
+                    results[index] = NotificationResult(msg_id, FAILED, str(e))
+                else:
+                    if processed_jobs:
+                        processed_jobs.complete(job_id)
+                    results[index] = NotificationResult(msg_id, SENT)
+
+        return results
+
+    def drain_queue(
+        self,
+        queue_client: "QueueClient",
+        poison_queue_client: "QueueClient",
+        batch_size: int,
+        max_messages: int,
+    ) -> DrainStats:
+        """Send notifications for messages waiting on a queue, a batch at a time
+
+        Sent and skipped messages are deleted. Failed messages are left to
+        reappear after the visibility timeout, and are moved to the poison
+        queue once they have been dequeued NOTIFICATION_BATCH_MAX_DEQUEUE_COUNT
+        times. A message that can't be moved is left on the queue too, and one
+        that can't be deleted is counted as undeleted and will be seen again.
+
+        Args:
+            queue_client (QueueClient): queue to drain
+            poison_queue_client (QueueClient): queue for messages that keep failing
+            batch_size (int): messages grouped and sent together
+            max_messages (int): stop after receiving this many messages
+
+        Returns:
+            DrainStats: counters for this drain
+        """
+        received = sent = skipped = failed = poisoned = undeleted = 0
+
+        while received < max_messages:
+            wanted: int = min(batch_size, max_messages - received)
+            batch = list(
+                queue_client.receive_messages(
+                    messages_per_page=min(wanted, QUEUE_PAGE_SIZE),
+                    max_messages=wanted,
+                    visibility_timeout=NOTIFICATION_BATCH_VISIBILITY_TIMEOUT,
+                )
+            )
+            if not batch:
+                break
+            received += len(batch)
+
+            results: list[NotificationResult] = self.send_notifications(
+                func.QueueMessage(
+                    id=queue_message.id,
+                    body=queue_message.content,
+                    pop_receipt=queue_message.pop_receipt,
+                )
+                for queue_message in batch
+            )
+
+            for queue_message, result in zip(batch, results, strict=True):
+                if result.status == SENT:
+                    sent += 1
+                elif result.status == SKIPPED:
+                    skipped += 1
+                else:
+                    failed += 1
+                    if (
+                        queue_message.dequeue_count or 0
+                    ) < NOTIFICATION_BATCH_MAX_DEQUEUE_COUNT:
+                        continue
+                    if not self.move_to_poison_queue(
+                        poison_queue_client, queue_message.content
+                    ):
+                        continue
+                    poisoned += 1
+                try:
+                    queue_client.delete_message(queue_message)
+                except (ResourceNotFoundError, HttpResponseError) as e:
+                    # e.g. the pop receipt went stale after the visibility timeout
+                    logging.error(
+                        f"BatchNotificationService.drain_queue: could not delete message {queue_message.id}: {e}"
+                    )
+                    undeleted += 1
+
+        stats: DrainStats = DrainStats(
+            received, sent, skipped, failed, poisoned, undeleted
+        )
+        logging.info(f"BatchNotificationService.drain_queue: {stats}")
+        return stats
+
+    @staticmethod
+    def move_to_poison_queue(poison_queue_client: "QueueClient", content: str) -> bool:
+        """Copy a message that keeps failing to the poison queue
+
+        The poison queue is created if it doesn't exist yet.
+
+        Args:
+            poison_queue_client (QueueClient): queue for messages that keep failing
+            content (str): message content
+
+        Returns:
+            bool: whether the message was copied
+        """
+        try:
+            try:
+                poison_queue_client.send_message(content)
+            except ResourceNotFoundError:
+                try:
+                    poison_queue_client.create_queue()
+                except ResourceExistsError:
+                    pass
+                poison_queue_client.send_message(content)
+        except Exception as e:
+            logging.error(
+                f"BatchNotificationService.move_to_poison_queue: could not move message: {e}"
+            )
+            return False
+        return True
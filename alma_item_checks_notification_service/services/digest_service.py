@@ -0,0 +1,204 @@
+"""Service class for digest buffering"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import Row
+from sqlalchemy.orm import Session
+
+from alma_item_checks_notification_service.config import (
+    DIGEST_FLUSH_ENABLED,
+    DIGEST_MAX_ROWS,
+    DIGEST_WINDOW_MINUTES,
+)
+from alma_item_checks_notification_service.models.base import utcnow
+from alma_item_checks_notification_service.models.digest_entry import DigestEntry
+from alma_item_checks_notification_service.models.process import Process
+from alma_item_checks_notification_service.repos.digest_entry_repo import (
+    DigestEntryRepository,
+)
+
+
+@dataclass(frozen=True)
+class BufferedJob:
+    """A job claimed from the digest buffer"""
+
+    job_id: str
+    row_count: int
+    created_at: datetime
+
+
+@dataclass(frozen=True)
+class DigestGroup:
+    """Jobs buffered for one process and institution"""
+
+    process_id: int
+    institution_id: int
+    oldest: datetime
+    row_count: int
+    job_count: int
+    window_minutes: int
+    max_rows: int
+
+    def is_due(self, now: datetime) -> bool:
+        """Whether the window has elapsed or the row cap has been reached"""
+        return (
+            self.oldest + timedelta(minutes=self.window_minutes) <= now
+            or self.row_count >= self.max_rows
+        )
+
+    @classmethod
+    def from_row(cls, row: Row) -> "DigestGroup":
+        """Build a group from a DigestEntryRepository.get_pending_groups row"""
+        return cls(
+            process_id=int(row.process_id),
+            institution_id=int(row.institution_id),
+            oldest=row.oldest,
+            row_count=int(row.row_count or 0),
+            job_count=int(row.job_count),
+            window_minutes=(
+                DIGEST_WINDOW_MINUTES
+                if row.digest_window_minutes is None
+                else int(row.digest_window_minutes)
+            ),
+            max_rows=(
+                DIGEST_MAX_ROWS
+                if row.digest_max_rows is None
+                else int(row.digest_max_rows)
+            ),
+        )
+
+
+def digest_active(process: Process) -> bool:
+    """Whether a process's jobs are buffered: only while the flush timer runs"""
+    return bool(process.digest_enabled) and DIGEST_FLUSH_ENABLED
+
+
+def digest_max_rows(process: Process) -> int:
+    """Row cap that triggers an early flush for a process"""
+    return (
+        DIGEST_MAX_ROWS
+        if process.digest_max_rows is None
+        else int(process.digest_max_rows)
+    )
+
+
+class DigestService:
+    """Service class for digest buffering"""
+
+    def __init__(self, session: Session):
+        self.digest_entry_repo = DigestEntryRepository(session)
+
+    def buffer_job(
+        self,
+        process: Process,
+        institution_id: int,
+        job_id: str,
+        row_count: int,
+        now: datetime | None = None,
+    ) -> bool:
+        """Buffer a job for its process's next digest
+
+        Args:
+            process (Process): digest-enabled process
+            institution_id (int): institution the job belongs to
+            job_id (str): job whose report will be included
+            row_count (int): rows in the job's report
+            now (datetime | None): buffering time, defaults to the current UTC time
+
+        Returns:
+            bool: whether the job was buffered
+        """
+        entry: DigestEntry = DigestEntry(
+            process_id=int(process.id),
+            institution_id=institution_id,
+            job_id=job_id,
+            row_count=row_count,
+            created_at=now or utcnow(),
+        )
+        return self.digest_entry_repo.add_entries([entry])
+
+    def buffered_rows(self, process_id: int, institution_id: int) -> int:
+        """Total report rows buffered for a process and institution"""
+        entries: list[DigestEntry] | None = self.digest_entry_repo.get_entries(
+            process_id, institution_id
+        )
+        return sum(int(entry.row_count) for entry in entries or [])
+
+    def get_due_groups(self, now: datetime | None = None) -> list[DigestGroup]:
+        """Get the buffered groups whose digest should be sent now
+
+        Args:
+            now (datetime | None): current UTC time
+
+        Returns:
+            list[DigestGroup]: groups past their window or over their row cap
+        """
+        now = now or utcnow()
+        rows: list[Row] | None = self.digest_entry_repo.get_pending_groups()
+        groups: list[DigestGroup] = [DigestGroup.from_row(row) for row in rows or []]
+        return [group for group in groups if group.is_due(now)]
+
+    def claim_jobs(self, process_id: int, institution_id: int) -> list[BufferedJob]:
+        """Remove and return the jobs buffered for a process and institution
+
+        Jobs claimed by a concurrent flush are left out.
+
+        Args:
+            process_id (int): id of the process
+            institution_id (int): institution id
+
+        Returns:
+            list[BufferedJob]: claimed jobs, oldest first
+        """
+        entries: list[DigestEntry] | None = self.digest_entry_repo.get_entries(
+            process_id, institution_id
+        )
+        if not entries:
+            return []
+
+        jobs: dict[int, BufferedJob] = {
+            int(entry.id): BufferedJob(
+                job_id=str(entry.job_id),
+                row_count=int(entry.row_count),
+                created_at=entry.created_at,  # type: ignore[arg-type]
+            )
+            for entry in entries
+        }
+        claimed: list[int] | None = self.digest_entry_repo.claim_entries(list(jobs))
+
+        if claimed is None:
+            return []
+        if len(claimed) < len(jobs):
+            logging.warning(
+                f"DigestService.claim_jobs: {len(jobs) - len(claimed)} jobs for "
+                f"process {process_id}, institution {institution_id} claimed by another flush"
+            )
+        return [jobs[entry_id] for entry_id in claimed]
+
+    def restore_jobs(
+        self, process_id: int, institution_id: int, jobs: list[BufferedJob]
+    ) -> bool:
+        """Put claimed jobs back in the buffer after a failed send
+
+        Args:
+            process_id (int): id of the process
+            institution_id (int): institution id
+            jobs (list[BufferedJob]): jobs returned by claim_jobs
+
+        Returns:
+            bool: whether the jobs were restored
+        """
+        return self.digest_entry_repo.add_entries(
+            [
+                DigestEntry(
+                    process_id=process_id,
+                    institution_id=institution_id,
+                    job_id=job.job_id,
+                    row_count=job.row_count,
+                    created_at=job.created_at,
+                )
+                for job in jobs
+            ]
+        )
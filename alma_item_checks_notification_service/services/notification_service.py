@@ -1,68 +1,294 @@
 """Service class for notifications"""
 
+import contextvars
+import gzip
 import io
 import json
 import logging
-import pathlib
-from typing import Any
+import threading
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
 
-from acs_email_sender_message_model import EmailMessage  # type: ignore
 import azure.functions as func
 from jinja2 import (
     Environment,
-    FileSystemLoader,
-    select_autoescape,
     Template,
     TemplateNotFound,
 )
-import pandas as pd
 from sqlalchemy.orm import Session
-from wrlc_azure_storage_service import StorageService  # type: ignore
 
+from alma_item_checks_notification_service.cache import CacheStats
 from alma_item_checks_notification_service.config import (
     ACS_STORAGE_CONNECTION_STRING,
     ACS_SENDER_CONTAINER_NAME,
     ACS_SENDER_QUEUE_NAME,
+    EMAIL_PAYLOAD_COMPRESSION_ENABLED,
+    EMAIL_PAYLOAD_COMPRESSION_LEVEL,
+    EMAIL_PAYLOAD_INLINE_ENABLED,
+    EMAIL_PAYLOAD_INLINE_MAX_BYTES,
+    HTML_TABLE_RENDERER,
+    IDEMPOTENCY_ENABLED,
+    NOTIFICATION_QUEUE,
+    REPORT_ATTACHMENT_PREVIEW_ROWS,
+    REPORT_ATTACHMENT_THRESHOLD_ROWS,
+    REPORT_MAX_ROWS,
+    REPORT_PREFETCH_ENABLED,
+    REPORT_PREFETCH_WORKERS,
+    REPORT_STREAMING_ENABLED,
     REPORTS_CONTAINER,
 )
+from alma_item_checks_notification_service.html_table import render_html_table
+from alma_item_checks_notification_service.lazy_imports import lazy_import
 from alma_item_checks_notification_service.models.process import Process
+from alma_item_checks_notification_service.report_csv import CSV_CONTENT_TYPE
+from alma_item_checks_notification_service.services.digest_service import (
+    BufferedJob,
+    DigestService,
+    digest_active,
+    digest_max_rows,
+)
 from alma_item_checks_notification_service.services.process_service import (
     ProcessService,
 )
+from alma_item_checks_notification_service.services.processed_job_service import (
+    COMPLETED,
+    IN_PROGRESS,
+    JobInProgressError,
+    ProcessedJobService,
+)
+from alma_item_checks_notification_service.services.report_service import (
+    ReportService,
+)
 from alma_item_checks_notification_service.services.user_process_service import (
     UserProcessService,
+    recipient_cache_stats,
+)
+from alma_item_checks_notification_service.storage import (
+    azure_blob,
+    get_blob_service_client,
+    get_queue_client,
+    get_storage_service,
 )
+from alma_item_checks_notification_service.templating import get_jinja_env
+from alma_item_checks_notification_service.tracing import Span, span, tracing_enabled
+
+if TYPE_CHECKING:
+    from acs_email_sender_message_model import EmailMessage  # type: ignore
+    from wrlc_azure_storage_service import StorageService  # type: ignore
+
+# Imported on first use to keep cold start short
+pd = lazy_import("pandas")
+email_model = lazy_import("acs_email_sender_message_model")
+
+# Sent as "version" in the sender queue message; messages without a version
+# refer to a plain JSON email blob
+EMAIL_PAYLOAD_GZIP_VERSION = 2  # gzip-compressed blob
+EMAIL_PAYLOAD_INLINE_VERSION = 3  # email embedded in the message, no blob
+
+_prefetch_executor: ThreadPoolExecutor | None = None
+_prefetch_lock = threading.Lock()
+
+
+def get_prefetch_executor() -> ThreadPoolExecutor:
+    """Get the worker's thread pool for report downloads, creating it if necessary"""
+    global _prefetch_executor
+    with _prefetch_lock:
+        if _prefetch_executor is None:
+            _prefetch_executor = ThreadPoolExecutor(
+                max_workers=REPORT_PREFETCH_WORKERS,
+                thread_name_prefix="report-prefetch",
+            )
+        return _prefetch_executor
+
+
+def queue_message_bytes(message_content: dict[str, Any]) -> int:
+    """Size of a queue message as sent: JSON with non-ASCII escaped, base64 encoded"""
+    return (len(json.dumps(message_content)) + 2) // 3 * 4
+
+
+def record_recipient_cache_stats(current: Span) -> None:
+    """Add the worker's recipient cache counters to a recorded span"""
+    if tracing_enabled():
+        stats: CacheStats = recipient_cache_stats()
+        current.set_attribute("cache_hit_ratio", stats.hit_ratio)
+        current.set_attribute("cache_size", stats.size)
 
 
 # noinspection PyMethodMayBeStatic
 class NotificationService:
     """Service class for notifications"""
 
-    def __init__(self, msg: func.QueueMessage):
+    def __init__(self, msg: func.QueueMessage | None = None):
         self.msg = msg
-        self.storage_service = StorageService()
+        self.storage_service: "StorageService" = get_storage_service()
         self.jinja_env: Environment | None = None
 
-        # Initialize the Jinja2 environment once in the constructor for efficiency
+        # Reuse the worker-wide Jinja2 environment so templates compile once per process
         try:
-            template_dir = pathlib.Path(__file__).parent.parent / "templates"
-            if not template_dir.is_dir():
-                logging.error(f"Jinja template directory not found at: {template_dir}")
-                raise FileNotFoundError(
-                    f"Jinja template directory not found: {template_dir}"
-                )
-
-            self.jinja_env = Environment(
-                loader=FileSystemLoader(template_dir),
-                autoescape=select_autoescape(["html", "xml"]),
-            )
-            logging.info(f"Jinja2 environment loaded successfully from: {template_dir}")
+            self.jinja_env = get_jinja_env()
         except Exception as e:
             logging.exception(f"Failed to initialize Jinja2 environment: {e}")
             # The service can continue, but render_email_body will fail gracefully.
 
     def send_notification(self, session: Session) -> None:
         """Send an email notification"""
+        fields: tuple[str, int, str] | None = self.parse_message()
+
+        if fields is None:
+            return
+
+        job_id, institution_id, process_type = fields
+
+        with span(
+            "notification",
+            job_id=job_id,
+            process_type=process_type,
+            institution_id=institution_id,
+        ):
+            # Queue messages are delivered at least once: skip jobs already handled
+            processed_jobs: ProcessedJobService | None = (
+                ProcessedJobService(session) if IDEMPOTENCY_ENABLED else None
+            )
+
+            if processed_jobs:
+                claim: str = processed_jobs.claim(job_id)
+                if claim == COMPLETED:
+                    return
+                if claim == IN_PROGRESS:
+                    if self.requeue(processed_jobs.retry_delay(job_id)):
+                        return
+                    raise JobInProgressError(f"job {job_id} is still being processed")
+
+            try:
+                self.process_job(session, job_id, institution_id, process_type)
+            except Exception:
+                if processed_jobs:
+                    processed_jobs.release(job_id)
+                raise
+
+            if processed_jobs:
+                processed_jobs.complete(job_id)
+
+    def process_job(
+        self, session: Session, job_id: str, institution_id: int, process_type: str
+    ) -> None:
+        """
+        Send, or buffer for a digest, the notification for one job.
+
+        Args:
+            session (Session): database session
+            job_id (str): job whose report is sent
+            institution_id (int): institution the job belongs to
+            process_type (str): name of the process that produced the report
+        """
+        # Cached, so an unknown process type is turned away before any storage I/O
+        with span("lookup_process"):
+            process_service: ProcessService = ProcessService(session)
+            process: Process | None = process_service.get_process_by_name(process_type)
+
+        if not process:
+            logging.error(
+                f"NotificationService.send_notification: process type {process_type} not found"
+            )
+            return
+
+        # Download the report while the recipient lookup runs
+        report_future: Future | None = self.prefetch_report(job_id)
+
+        try:
+            report: dict[str, Any] | list | Iterator[Any] | None = None
+
+            if digest_active(process):
+                report = report_future.result() if report_future else None
+                # A streamed report can be read once: collect it so the rows can
+                # be counted and still sent if the job can't be buffered
+                if report is not None and not isinstance(report, (dict, list)):
+                    report = list(report)
+                if self.buffer_for_digest(
+                    session, process, institution_id, job_id, report=report
+                ):
+                    return
+
+            with span("resolve_recipients") as current:
+                user_process_service: UserProcessService = UserProcessService(session)
+                user_emails: list[str] = user_process_service.get_recipient_emails(
+                    int(process.id), institution_id
+                )
+                current.set_attribute("recipient_count", len(user_emails))
+                record_recipient_cache_stats(current)
+
+            if report is None and report_future:
+                report = report_future.result()
+
+            self.deliver(
+                process=process,
+                job_id=job_id,
+                user_emails=user_emails,
+                report=report,
+            )
+        finally:
+            if report_future:
+                report_future.cancel()
+
+    def prefetch_report(self, job_id: str) -> Future | None:
+        """
+        Start downloading a job's report on the worker's prefetch thread pool.
+
+        With the streaming table renderer the report is a lazy iterator, so
+        the download only starts when the table is rendered. The download runs
+        in a copy of the caller's context so its span nests in the caller's.
+
+        Args:
+            job_id (str): job whose report is downloaded
+
+        Returns:
+            Future | None: the pending download, or None if prefetching is off
+        """
+        if not REPORT_PREFETCH_ENABLED:
+            return None
+        return get_prefetch_executor().submit(
+            contextvars.copy_context().run, self.download_report, job_id
+        )
+
+    def requeue(self, delay: int) -> bool:
+        """Put the queue message back on the queue, to arrive after a delay
+
+        Used for a message redelivered while its job is still claimed, so it
+        comes back once the claim can be taken over, without changing the
+        host's retry settings for every queue trigger.
+
+        Args:
+            delay (int): seconds before the message becomes visible
+
+        Returns:
+            bool: whether the message was requeued
+        """
+        if self.msg is None:
+            raise ValueError("NotificationService.requeue: no queue message")
+
+        try:
+            get_queue_client(NOTIFICATION_QUEUE).send_message(
+                self.msg.get_body(), visibility_timeout=delay
+            )
+        except Exception as e:
+            logging.error(
+                f"NotificationService.requeue: could not requeue message: {e}"
+            )
+            return False
+        return True
+
+    def parse_message(self) -> tuple[str, int, str] | None:
+        """
+        Read the notification fields from the queue message.
+
+        Returns:
+            tuple[str, int, str] | None: job_id, institution_id and process_type,
+                or None if any of them is missing
+        """
+        if self.msg is None:
+            raise ValueError("NotificationService.parse_message: no queue message")
+
         message_data: dict[str, Any] = json.loads(self.msg.get_body().decode())
 
         job_id: str | None = message_data["job_id"]
@@ -73,66 +299,474 @@ class NotificationService:
             logging.error(
                 "NotificationService.send_notification: message body missing required fields"
             )
-            return
+            return None
 
-        process_service: ProcessService = ProcessService(session)
-        process: Process | None = process_service.get_process_by_name(process_type)
+        return job_id, institution_id, process_type
 
-        if not process:
-            logging.error(
-                f"NotificationService.send_notification: process type {process_type} not found"
+    def deliver(
+        self,
+        process: Process,
+        job_id: str,
+        user_emails: list[str],
+        report: dict[str, Any] | list | Iterator[Any] | None = None,
+    ) -> None:
+        """
+        Build the email for a job's report and hand it to the ACS email sender.
+
+        Args:
+            process (Process): process the report belongs to
+            job_id (str): job whose report is sent
+            user_emails (list[str]): recipients
+            report (dict[str, Any] | list | Iterator[Any] | None): the job's
+                report if already downloaded
+        """
+        if report is None:
+            report = self.download_report(job_id)
+
+        self.send_email(
+            process=process,
+            report=report,
+            blob_name=job_id + ".json",
+            user_emails=user_emails,
+        )
+
+    def send_email(
+        self,
+        process: Process,
+        report: dict[str, Any] | list | Iterator[Any] | None,
+        blob_name: str,
+        user_emails: list[str],
+    ) -> None:
+        """
+        Render the email for a report and hand it to the ACS email sender.
+
+        Args:
+            process (Process): process the report belongs to
+            report (dict[str, Any] | list | Iterator[Any] | None): report records
+            blob_name (str): name of the email blob for the sender
+            user_emails (list[str]): recipients
+        """
+        storage_service: "StorageService" = get_storage_service(
+            ACS_STORAGE_CONNECTION_STRING
+        )
+
+        email_json_content, attachment = self.prepare_email(
+            process=process, report=report, blob_name=blob_name, user_emails=user_emails
+        )
+
+        with span("store_payload", payload_chars=len(email_json_content)):
+            message_content: dict[str, Any] = self.store_email_payload(
+                storage_service, blob_name, email_json_content, attachment
             )
-            return
 
-        report: dict[str, Any] | list | None = (
-            self.storage_service.download_blob_as_json(
-                container_name=REPORTS_CONTAINER,
-                blob_name=job_id + ".json",
+        with span("send_queue_message") as current:
+            if tracing_enabled():
+                current.set_attribute(
+                    "payload_bytes", queue_message_bytes(message_content)
+                )
+            storage_service.send_queue_message(
+                queue_name=ACS_SENDER_QUEUE_NAME, message_content=message_content
             )
-        )
 
-        user_process_service: UserProcessService = UserProcessService(session)
-        user_emails: list[str] = user_process_service.get_user_emails_for_process(
-            int(process.id), institution_id
+    def prepare_email(
+        self,
+        process: Process,
+        report: dict[str, Any] | list | Iterator[Any] | None,
+        blob_name: str,
+        user_emails: list[str],
+    ) -> tuple[str, dict[str, str]]:
+        """
+        Render and serialize the email for a report.
+
+        Reports above the process's attachment threshold are uploaded as a CSV
+        next to the email blob and only previewed in the body.
+
+        Args:
+            process (Process): process the report belongs to
+            report (dict[str, Any] | list | Iterator[Any] | None): report records
+            blob_name (str): name of the email blob for the sender
+            user_emails (list[str]): recipients
+
+        Returns:
+            tuple[str, dict[str, str]]: the serialized EmailMessage, and queue
+                message fields describing the attachment, if any
+        """
+        attachment: dict[str, str] = {}
+        report_summary: str | None = None
+        threshold: int = self.attachment_threshold(process)
+
+        if threshold:
+            records: list[Any] = self.report_records(report)
+            report = records
+
+            if len(records) > threshold:
+                attachment_blob_name: str = blob_name.removesuffix(".json") + ".csv"
+                with span("upload_attachment", row_count=len(records)):
+                    ReportService(
+                        get_blob_service_client(ACS_STORAGE_CONNECTION_STRING)
+                    ).upload_csv(
+                        container_name=ACS_SENDER_CONTAINER_NAME,
+                        blob_name=attachment_blob_name,
+                        records=records,
+                    )
+                attachment["attachment_blob_name"] = attachment_blob_name
+                attachment["attachment_content_type"] = CSV_CONTENT_TYPE
+
+                report = records[:REPORT_ATTACHMENT_PREVIEW_ROWS]
+                report_summary = (
+                    f"The full report of {len(records)} rows is attached as a CSV "
+                    f"file; the first {len(report)} rows are shown below."
+                )
+                logging.info(
+                    f"NotificationService.prepare_email: {len(records)} rows sent as "
+                    f"attachment {attachment_blob_name}"
+                )
+
+        with span(
+            "render_table",
+            renderer=HTML_TABLE_RENDERER,
+            row_count=len(report) if isinstance(report, list) else None,
+        ) as current:
+            html_table: str | None = self.create_html_table(
+                report=report, process=process
+            )
+            current.set_attribute("payload_chars", len(html_table or ""))
+
+        with span("render_template") as current:
+            html_content_body: str | None = self.render_email_body(
+                template_name="email_template.html.j2",
+                process=process,
+                html_table=html_table,
+                report_summary=report_summary,
+            )
+            current.set_attribute("payload_chars", len(html_content_body or ""))
+
+        with span("serialize_email") as current:
+            email_to_send: "EmailMessage" = email_model.EmailMessage(
+                to=user_emails,
+                subject=str(process.email_subject),
+                html=html_content_body,
+            )
+            email_json: str = email_to_send.model_dump_json()
+            current.set_attribute("payload_chars", len(email_json))
+
+        return email_json, attachment
+
+    def store_email_payload(
+        self,
+        storage_service: "StorageService",
+        blob_name: str,
+        email_json: str,
+        attachment: dict[str, str] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Store an email for the ACS sender.
+
+        With EMAIL_PAYLOAD_INLINE_ENABLED, an email is embedded in the queue
+        message, and no blob is written, if the message as sent stays within
+        EMAIL_PAYLOAD_INLINE_MAX_BYTES. Otherwise the email is uploaded as a blob:
+        compressed payloads are stored as <blob_name>.gz with Content-Encoding
+        gzip, while plain payloads keep the original unversioned message so
+        existing senders are unaffected.
+
+        Args:
+            storage_service (StorageService): ACS storage service
+            blob_name (str): name of the email blob
+            email_json (str): serialized EmailMessage
+            attachment (dict[str, str] | None): queue message fields
+                describing the attachment, if any
+
+        Returns:
+            dict[str, Any]: the queue message, carrying or locating the payload
+        """
+        attachment = attachment or {}
+        inline: dict[str, Any] | None = self.inline_email_payload(
+            email_json, attachment
         )
 
-        storage_service: StorageService = StorageService(ACS_STORAGE_CONNECTION_STRING)
+        if inline is not None:
+            return inline
 
-        html_table: str | None = self.create_html_table(report=report, process=process)
+        if not EMAIL_PAYLOAD_COMPRESSION_ENABLED:
+            storage_service.upload_blob_data(
+                container_name=ACS_SENDER_CONTAINER_NAME,
+                blob_name=blob_name,
+                data=email_json,
+            )
+            return {"blob_name": blob_name, **attachment}
 
-        html_content_body: str | None = self.render_email_body(
-            template_name="email_template.html.j2",
-            process=process,
-            html_table=html_table,
+        compressed_blob_name, compressed = self.compress_email_payload(
+            blob_name, email_json
         )
 
-        email_to_send: EmailMessage = EmailMessage(
-            to=user_emails,
-            subject=str(process.email_subject),
-            html=html_content_body,
+        get_blob_service_client(ACS_STORAGE_CONNECTION_STRING).get_blob_client(
+            container=ACS_SENDER_CONTAINER_NAME, blob=compressed_blob_name
+        ).upload_blob(
+            compressed,
+            overwrite=True,
+            content_settings=azure_blob.ContentSettings(
+                content_type="application/json", content_encoding="gzip"
+            ),
         )
 
-        email_json_content = email_to_send.model_dump_json()
+        return {
+            "blob_name": compressed_blob_name,
+            "version": EMAIL_PAYLOAD_GZIP_VERSION,
+            **attachment,
+        }
 
-        storage_service.upload_blob_data(
-            container_name=ACS_SENDER_CONTAINER_NAME,
-            blob_name=job_id + ".json",
-            data=email_json_content,
-        )
+    @staticmethod
+    def inline_email_payload(
+        email_json: str, attachment: dict[str, str] | None = None
+    ) -> dict[str, Any] | None:
+        """
+        Queue message embedding the email, or None if it must go in a blob.
+
+        The limit applies to the message as sent: re-serialized with
+        json.dumps, which escapes non-ASCII characters, and base64 encoded.
+        Neither step makes it smaller, so emails already over the limit are
+        not parsed.
 
-        message_content: dict[str, str] = {
-            "blob_name": job_id + ".json",
+        Args:
+            email_json (str): serialized EmailMessage
+            attachment (dict[str, str] | None): queue message fields
+                describing the attachment, if any
+
+        Returns:
+            dict[str, Any] | None: the queue message, or None
+        """
+        if (
+            not EMAIL_PAYLOAD_INLINE_ENABLED
+            or len(email_json) > EMAIL_PAYLOAD_INLINE_MAX_BYTES
+        ):
+            return None
+
+        message_content: dict[str, Any] = {
+            "email": json.loads(email_json),
+            "version": EMAIL_PAYLOAD_INLINE_VERSION,
+            **(attachment or {}),
         }
+        if queue_message_bytes(message_content) > EMAIL_PAYLOAD_INLINE_MAX_BYTES:
+            return None
+        return message_content
+
+    @staticmethod
+    def compress_email_payload(blob_name: str, email_json: str) -> tuple[str, bytes]:
+        """Gzip an email, returning the compressed blob's name and content"""
+        data: bytes = email_json.encode("utf-8")
+        compressed: bytes = gzip.compress(
+            data, compresslevel=EMAIL_PAYLOAD_COMPRESSION_LEVEL
+        )
+        compressed_blob_name: str = blob_name + ".gz"
+        logging.debug(
+            f"NotificationService.compress_email_payload: {compressed_blob_name} "
+            f"{len(data)} -> {len(compressed)} bytes"
+        )
+        return compressed_blob_name, compressed
+
+    def buffer_for_digest(
+        self,
+        session: Session,
+        process: Process,
+        institution_id: int,
+        job_id: str,
+        report: dict[str, Any] | list | Iterator[Any] | None = None,
+    ) -> bool:
+        """
+        Buffer a job for its process's digest instead of emailing it now.
+
+        The job's report rows are counted so a burst that reaches the process's
+        row cap is flushed straight away rather than waiting for the timer.
+        Without DIGEST_FLUSH_ENABLED nothing would flush the buffer, so the job
+        is sent now.
 
-        storage_service.send_queue_message(
-            queue_name=ACS_SENDER_QUEUE_NAME, message_content=message_content
+        Args:
+            session (Session): database session
+            process (Process): process the job belongs to
+            institution_id (int): institution the job belongs to
+            job_id (str): job to buffer
+            report (dict[str, Any] | list | Iterator[Any] | None): the job's
+                report if already downloaded
+
+        Returns:
+            bool: True if the job was buffered, False if it should be sent now
+        """
+        if not digest_active(process):
+            return False
+
+        if report is None:
+            report = self.download_report(job_id)
+        row_count: int = len(self.report_records(report))
+
+        with span("buffer_for_digest", row_count=row_count):
+            digest_service: DigestService = DigestService(session)
+
+            if not digest_service.buffer_job(
+                process, institution_id, job_id, row_count
+            ):
+                logging.error(
+                    f"NotificationService.buffer_for_digest: could not buffer job {job_id}, sending now"
+                )
+                return False
+
+            if digest_service.buffered_rows(
+                int(process.id), institution_id
+            ) >= digest_max_rows(process):
+                self.send_digest(session, process, institution_id)
+
+        return True
+
+    def send_digest(
+        self, session: Session, process: Process, institution_id: int
+    ) -> bool:
+        """
+        Send one email combining the reports of every buffered job.
+
+        Claimed jobs are put back in the buffer if the email can't be sent.
+
+        Args:
+            session (Session): database session
+            process (Process): process whose digest is sent
+            institution_id (int): institution whose digest is sent
+
+        Returns:
+            bool: whether a digest was sent
+        """
+        digest_service: DigestService = DigestService(session)
+        jobs: list[BufferedJob] = digest_service.claim_jobs(
+            int(process.id), institution_id
         )
 
+        if not jobs:
+            return False
+
+        try:
+            records: list[Any] = []
+            for job in jobs:
+                records.extend(self.report_records(self.download_report(job.job_id)))
+
+            user_emails: list[str] = UserProcessService(session).get_recipient_emails(
+                int(process.id), institution_id
+            )
+
+            self.send_email(
+                process=process,
+                report=records,
+                blob_name=f"digest-{jobs[0].job_id}.json",
+                user_emails=user_emails,
+            )
+        except Exception as e:
+            logging.exception(
+                f"NotificationService.send_digest: digest for process {process.name}, "
+                f"institution {institution_id} failed: {e}"
+            )
+            digest_service.restore_jobs(int(process.id), institution_id, jobs)
+            return False
+
+        logging.info(
+            f"NotificationService.send_digest: sent {len(jobs)} jobs, {len(records)} rows "
+            f"for process {process.name}, institution {institution_id}"
+        )
+        return True
+
+    def flush_digests(self, session: Session) -> int:
+        """
+        Send every digest whose window has elapsed or whose row cap is reached.
+
+        Args:
+            session (Session): database session
+
+        Returns:
+            int: number of digests sent
+        """
+        process_service: ProcessService = ProcessService(session)
+        sent: int = 0
+
+        for group in DigestService(session).get_due_groups():
+            process: Process | None = process_service.get_process_by_id(
+                group.process_id
+            )
+
+            if not process:
+                logging.error(
+                    f"NotificationService.flush_digests: process {group.process_id} not found"
+                )
+                continue
+
+            if self.send_digest(session, process, group.institution_id):
+                sent += 1
+
+        return sent
+
+    @staticmethod
+    def attachment_threshold(process: Process) -> int:
+        """Row count above which a process's reports are attached as CSV, or 0 for never"""
+        threshold: int | None = process.attachment_threshold_rows  # type: ignore[assignment]
+        if threshold is None:
+            threshold = REPORT_ATTACHMENT_THRESHOLD_ROWS
+        return max(threshold, 0)
+
+    @staticmethod
+    def report_records(
+        report: dict[str, Any] | list | Iterator[Any] | None,
+    ) -> list[Any]:
+        """Collect a downloaded report's records into a list"""
+        if report is None:
+            return []
+        if isinstance(report, dict):
+            return [report] if report else []
+        return list(report)
+
+    def download_report(
+        self, job_id: str
+    ) -> dict[str, Any] | list | Iterator[Any] | None:
+        """
+        Download the JSON report for a job.
+
+        With REPORT_STREAMING_ENABLED the blob is read in chunks and parsed
+        incrementally, optionally stopping after REPORT_MAX_ROWS records. The
+        streaming table renderer consumes those records lazily; the pandas
+        renderer needs them collected into a list first.
+
+        Args:
+            job_id (str): The job ID the report was saved under.
+
+        Returns:
+            dict[str, Any] | list | Iterator[Any] | None: The report data.
+        """
+        blob_name: str = job_id + ".json"
+
+        with span("download_report", streaming=REPORT_STREAMING_ENABLED) as current:
+            report: dict[str, Any] | list | Iterator[Any] | None
+
+            if not REPORT_STREAMING_ENABLED:
+                report = self.storage_service.download_blob_as_json(
+                    container_name=REPORTS_CONTAINER,
+                    blob_name=blob_name,
+                )
+            else:
+                report = ReportService().iter_report_records(
+                    container_name=REPORTS_CONTAINER,
+                    blob_name=blob_name,
+                    max_rows=REPORT_MAX_ROWS or None,
+                )
+                # Streamed to the table renderer, which then does the download.
+                # pandas needs every record at once, so with it memory still
+                # grows with the report
+                if HTML_TABLE_RENDERER != "streaming":
+                    report = list(report)
+
+            if isinstance(report, list):
+                current.set_attribute("row_count", len(report))
+
+        return report
+
     def render_email_body(
         self,
         template_name: str,
         process: Process,
         html_table: str | None = None,
+        report_summary: str | None = None,
     ) -> str | None:
         """
         Render the email body using the provided template and context.
@@ -141,6 +775,8 @@ class NotificationService:
             template_name (str): The name of the email template file.
             process (Process): The process object containing email subject and body.
             html_table (str): The HTML table to include in the email body.
+            report_summary (str): Note shown above the table, e.g. when the
+                full report is attached.
 
         Returns:
              The rendered email body as a string, or None on failure.
@@ -157,6 +793,7 @@ class NotificationService:
                 "email_body": process.email_body,
                 "body_addendum": process.email_addendum,
                 "data_table_html": html_table,
+                "report_summary": report_summary,
             }
             html_content_body: str = template.render(template_context)
             logging.debug(
@@ -177,7 +814,7 @@ class NotificationService:
             return None
 
     def create_html_table(
-        self, report: dict[str, Any] | list | None, process: Process
+        self, report: dict[str, Any] | list | Iterator[Any] | None, process: Process
     ) -> str | None:
         """
         Create an HTML table from JSON data stored in Azure Blob Storage.
@@ -190,18 +827,24 @@ class NotificationService:
             str | None: The HTML table as a string, or None if an error occurs.
 
         """
+        if HTML_TABLE_RENDERER == "streaming":
+            return self.create_html_table_streaming(report)
+
         html_table: str = "Error generating table from data."
         # noinspection PyUnusedLocal
         record_count = 0
 
-        json_report = json.dumps(report)
+        with span("serialize_report") as current:
+            json_report = json.dumps(report)
+            current.set_attribute("payload_chars", len(json_report))
         try:
             if report:
-                json_io = io.StringIO(json_report)
-                df = pd.read_json(
-                    json_io, orient="records"
-                )  # Adjust 'orient' if needed
-                df.style.set_caption(str(process.email_subject))
+                with span("build_dataframe"):
+                    json_io = io.StringIO(json_report)
+                    df = pd.read_json(
+                        json_io, orient="records"
+                    )  # Adjust 'orient' if needed
+                    df.style.set_caption(str(process.email_subject))
 
                 # Check if column '0' exists and all its values are '0' (as string or int)
                 if "0" in df.columns and df["0"].astype(str).eq("0").all():
@@ -215,10 +858,14 @@ class NotificationService:
                     f"NotificationService.create_html_table: Read {record_count} rows into DataFrame."
                 )
                 if not df.empty:
-                    html_table = df.to_html(index=False, border=1, na_rep="").replace(
-                        'border="1"',
-                        'border="1" style="border-collapse: collapse; border: 1px solid black;"',
-                    )
+                    with span("to_html") as current:
+                        html_table = df.to_html(
+                            index=False, border=1, na_rep=""
+                        ).replace(
+                            'border="1"',
+                            'border="1" style="border-collapse: collapse; border: 1px solid black;"',
+                        )
+                        current.set_attribute("payload_chars", len(html_table))
                     logging.debug(
                         "NotificationService.create_html_table: Converted DataFrame to HTML string."
                     )
@@ -236,3 +883,54 @@ class NotificationService:
             )
 
         return html_table
+
+    def create_html_table_streaming(
+        self, report: dict[str, Any] | list | Iterator[Any] | None
+    ) -> str | None:
+        """
+        Create an HTML table from the report records without pandas.
+
+        Produces the same markup as create_html_table; see html_table for the
+        documented differences in value formatting. Records may be a lazily
+        streamed iterator, which is consumed exactly once.
+
+        Args:
+            report (dict[str, Any] | list | Iterator[Any] | None): The JSON report data from Azure storage service.
+
+        Returns:
+            str | None: The HTML table as a string, or None if there is no report.
+        """
+        record_count: int = 0
+
+        def count_records(records: Iterable[Any]) -> Iterator[Any]:
+            nonlocal record_count
+            for record in records:
+                record_count += 1
+                yield record
+
+        try:
+            if isinstance(report, dict) and report:
+                raise TypeError("report is not a list of records")
+
+            html_table: str | None = render_html_table(count_records(report or []))
+        except Exception as convert_err:
+            logging.error(
+                f"NotificationService.create_html_table: Failed JSON->HTML conversion: {convert_err}",
+                exc_info=True,
+            )
+            return "Error generating table from data."
+
+        if record_count == 0:
+            logging.warning(
+                "NotificationService.create_html_table: No JSON data string available for conversion."
+            )
+            return None
+
+        logging.debug(
+            f"NotificationService.create_html_table: Rendered {record_count} rows without pandas."
+        )
+
+        if html_table is None:
+            return "<i>Report generated, but contained no displayable data.</i><br>"
+
+        return html_table
@@ -1,10 +1,48 @@
 """Service class for Processes"""
 
+import logging
+
 from sqlalchemy.orm import Session
 
+from alma_item_checks_notification_service.cache import CacheStats, MISSING, TTLCache
+from alma_item_checks_notification_service.config import (
+    PROCESS_CACHE_MAX_SIZE,
+    PROCESS_CACHE_NEGATIVE_TTL_SECONDS,
+    PROCESS_CACHE_TTL_SECONDS,
+)
 from alma_item_checks_notification_service.models.process import Process
 from alma_item_checks_notification_service.repos.process_repo import ProcessRepository
 
+# Worker-wide cache of process definitions keyed by name. None marks a name
+# known not to exist and is kept for the shorter negative TTL.
+_process_cache: TTLCache[str, Process | None] = TTLCache(
+    maxsize=PROCESS_CACHE_MAX_SIZE, ttl=PROCESS_CACHE_TTL_SECONDS
+)
+
+
+def invalidate_process_cache(process_type: str | None = None) -> None:
+    """Drop a cached process definition, or all of them
+
+    Args:
+        process_type (str | None): process name to drop, or None to clear the cache
+    """
+    if process_type is None:
+        _process_cache.clear()
+    else:
+        _process_cache.invalidate(process_type)
+
+
+def process_cache_stats() -> CacheStats:
+    """Get hit/miss counters for the process cache"""
+    return _process_cache.stats()
+
+
+def _detached_copy(process: Process) -> Process:
+    """Copy a process into a transient instance that outlives its session"""
+    return Process(
+        **{column.key: getattr(process, column.key) for column in Process.__table__.c}
+    )
+
 
 class ProcessService:
     """Service class for Processes"""
@@ -25,8 +63,19 @@ class ProcessService:
 
         return process_id
 
+    def get_process_by_id(self, process_id: int) -> Process | None:
+        """Get process object by id
+
+        Args:
+            process_id (int): id of the process
+
+        Returns:
+            Process | None: process object or None
+        """
+        return self.process_repo.get_process_by_id(process_id)
+
     def get_process_by_name(self, process_type: str) -> Process | None:
-        """Get process object by name
+        """Get process object by name, reading through the worker-wide cache
 
         Args:
             process_type (str): process type
@@ -34,6 +83,21 @@ class ProcessService:
         Returns:
             Process | None: process object or None
         """
+        cached: Process | None = _process_cache.get(process_type)
+
+        if cached is not MISSING:
+            logging.debug(
+                f"ProcessService.get_process_by_name: cache hit for {process_type}"
+            )
+            return cached
+
         process: Process | None = self.process_repo.get_process_by_name(process_type)
 
+        if process is None:
+            _process_cache.set(
+                process_type, None, ttl=PROCESS_CACHE_NEGATIVE_TTL_SECONDS
+            )
+        else:
+            _process_cache.set(process_type, _detached_copy(process))
+
         return process
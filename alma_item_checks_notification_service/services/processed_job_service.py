@@ -0,0 +1,141 @@
+"""Service class for idempotent job processing"""
+
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import cast
+
+from sqlalchemy.orm import Session
+
+from alma_item_checks_notification_service.config import (
+    IDEMPOTENCY_CLAIM_TIMEOUT_SECONDS,
+    IDEMPOTENCY_RETENTION_DAYS,
+)
+from alma_item_checks_notification_service.models.base import utcnow
+from alma_item_checks_notification_service.models.processed_job import ProcessedJob
+from alma_item_checks_notification_service.repos.processed_job_repo import (
+    ProcessedJobRepository,
+)
+
+CLAIMED = "claimed"  # process the job
+COMPLETED = "completed"  # already handled; the message can be dropped
+IN_PROGRESS = "in_progress"  # claimed elsewhere; retry the message later
+
+
+class JobInProgressError(Exception):
+    """A redelivered job is still claimed by another invocation
+
+    Raised so the queue message is retried rather than deleted when it
+    can't be requeued for when the claim goes stale.
+    """
+
+
+class ProcessedJobService:
+    """Service class for idempotent job processing
+
+    Queue messages are delivered at least once. A job is claimed before its
+    report is downloaded and marked completed once its notification has been
+    handled, so a redelivered message is recognised and skipped. A message
+    redelivered while its job is still claimed must be kept for a retry, as
+    it may be the only one left for the job.
+    """
+
+    def __init__(self, session: Session):
+        self.processed_job_repo = ProcessedJobRepository(session)
+
+    def claim(self, job_id: str, now: datetime | None = None) -> str:
+        """Claim a job for processing
+
+        A claim that was never completed (the worker died mid-job, or its
+        release failed) is taken over once it is older than
+        IDEMPOTENCY_CLAIM_TIMEOUT_SECONDS. If the claim can't be recorded at
+        all the job is processed anyway: a possible duplicate email is better
+        than a lost one.
+
+        Args:
+            job_id (str): job from the queue message
+            now (datetime | None): current UTC time
+
+        Returns:
+            str: CLAIMED if the job should be processed, COMPLETED if it has
+                been handled, or IN_PROGRESS if another claim is still live
+        """
+        now = now or utcnow()
+        inserted: bool | None = self.processed_job_repo.insert_claim(job_id, now)
+
+        if inserted is None:
+            logging.warning(
+                f"ProcessedJobService.claim: could not record claim for job {job_id}, processing anyway"
+            )
+            return CLAIMED
+
+        if inserted:
+            return CLAIMED
+
+        job: ProcessedJob | None = self.processed_job_repo.get_job(job_id)
+
+        if job is not None and job.completed_at is not None:
+            logging.info(
+                f"ProcessedJobService.claim: job {job_id} already handled, skipping"
+            )
+            return COMPLETED
+
+        stale_before: datetime = now - timedelta(
+            seconds=IDEMPOTENCY_CLAIM_TIMEOUT_SECONDS
+        )
+        if self.processed_job_repo.take_over_claim(job_id, stale_before, now):
+            logging.warning(
+                f"ProcessedJobService.claim: took over abandoned claim for job {job_id}"
+            )
+            return CLAIMED
+
+        logging.info(
+            f"ProcessedJobService.claim: job {job_id} is in progress elsewhere, retrying later"
+        )
+        return IN_PROGRESS
+
+    def retry_delay(self, job_id: str, now: datetime | None = None) -> int:
+        """Seconds until a job's live claim can be taken over
+
+        Args:
+            job_id (str): job that is in progress
+            now (datetime | None): current UTC time
+
+        Returns:
+            int: seconds until the claim is older than
+                IDEMPOTENCY_CLAIM_TIMEOUT_SECONDS, at least 1
+        """
+        job: ProcessedJob | None = self.processed_job_repo.get_job(job_id)
+
+        if job is None or job.completed_at is not None:
+            return 1
+
+        age: timedelta = (now or utcnow()) - cast(datetime, job.claimed_at)
+        return max(
+            1, math.ceil(IDEMPOTENCY_CLAIM_TIMEOUT_SECONDS - age.total_seconds())
+        )
+
+    def complete(self, job_id: str, now: datetime | None = None) -> bool:
+        """Mark a claimed job as handled"""
+        return self.processed_job_repo.mark_completed(job_id, now or utcnow())
+
+    def release(self, job_id: str) -> bool:
+        """Give up a claim after a failure so the retried message is processed"""
+        return self.processed_job_repo.delete_claim(job_id)
+
+    def purge(self, now: datetime | None = None) -> int | None:
+        """Delete job records older than IDEMPOTENCY_RETENTION_DAYS
+
+        By then any redelivery of the job's message has expired, so the
+        record can no longer be needed to recognise it.
+
+        Args:
+            now (datetime | None): current UTC time
+
+        Returns:
+            int | None: number of records deleted, or None on error
+        """
+        before: datetime = (now or utcnow()) - timedelta(
+            days=IDEMPOTENCY_RETENTION_DAYS
+        )
+        return self.processed_job_repo.purge(before)
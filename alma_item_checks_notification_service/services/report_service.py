@@ -0,0 +1,93 @@
+"""Service class for report blobs"""
+
+import itertools
+import logging
+from collections.abc import Iterator, Mapping, Sequence
+from typing import TYPE_CHECKING, Any
+
+from azure.core.exceptions import ResourceNotFoundError
+
+from alma_item_checks_notification_service.json_stream import iter_json_array
+from alma_item_checks_notification_service.report_csv import (
+    CSV_CONTENT_TYPE,
+    iter_csv_chunks,
+)
+from alma_item_checks_notification_service.storage import (
+    azure_blob,
+    get_blob_service_client,
+)
+
+if TYPE_CHECKING:
+    from azure.storage.blob import BlobServiceClient
+
+_END: Any = object()
+
+
+class ReportService:
+    """Service class for report blobs"""
+
+    def __init__(self, blob_service_client: "BlobServiceClient | None" = None):
+        self.blob_service_client: "BlobServiceClient" = (
+            blob_service_client or get_blob_service_client()
+        )
+
+    def iter_report_records(
+        self, container_name: str, blob_name: str, max_rows: int | None = None
+    ) -> Iterator[Any]:
+        """Stream the records of a JSON report blob
+
+        The blob is downloaded in chunks and parsed incrementally, so peak
+        memory does not grow with the size of the report. When max_rows is
+        reached the download stops without reading the rest of the blob.
+
+        Args:
+            container_name (str): container holding the report
+            blob_name (str): name of the report blob
+            max_rows (int | None): stop after this many records, or None for all
+
+        Yields:
+            Any: report record
+        """
+        try:
+            downloader = self.blob_service_client.get_blob_client(
+                container=container_name, blob=blob_name
+            ).download_blob()
+        except ResourceNotFoundError:
+            logging.error(
+                f"ReportService.iter_report_records: report {container_name}/{blob_name} not found"
+            )
+            return
+
+        records: Iterator[Any] = iter_json_array(downloader.chunks())
+
+        if max_rows is None:
+            yield from records
+            return
+
+        yield from itertools.islice(records, max_rows)
+
+        if next(records, _END) is not _END:
+            logging.warning(
+                f"ReportService.iter_report_records: {blob_name} truncated to {max_rows} rows"
+            )
+
+    def upload_csv(
+        self,
+        container_name: str,
+        blob_name: str,
+        records: Sequence[Mapping[str, Any]],
+    ) -> None:
+        """Write report records to a CSV blob, streaming the upload in chunks
+
+        Args:
+            container_name (str): destination container
+            blob_name (str): name of the CSV blob
+            records (Sequence[Mapping[str, Any]]): report rows
+        """
+        self.blob_service_client.get_blob_client(
+            container=container_name, blob=blob_name
+        ).upload_blob(
+            iter_csv_chunks(records),
+            overwrite=True,
+            content_settings=azure_blob.ContentSettings(content_type=CSV_CONTENT_TYPE),
+        )
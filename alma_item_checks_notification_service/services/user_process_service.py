@@ -1,7 +1,19 @@
 """Service class for UserProcesses"""
 
+import logging
+from typing import Iterator
+
 from sqlalchemy.orm import Session
 
+from alma_item_checks_notification_service.cache import CacheStats, MISSING, TTLCache
+from alma_item_checks_notification_service.config import (
+    RECIPIENT_CACHE_MAX_SIZE,
+    RECIPIENT_CACHE_TTL_SECONDS,
+    RECIPIENT_TABLE_ENABLED,
+)
+from alma_item_checks_notification_service.repos.process_recipient_repo import (
+    ProcessRecipientRepository,
+)
 from alma_item_checks_notification_service.repos.user_process_repo import (
     UserProcessRepository,
 )
@@ -10,12 +22,40 @@ from alma_item_checks_notification_service.services.process_service import (
 )
 from alma_item_checks_notification_service.services.user_service import UserService
 
+# Worker-wide cache of resolved recipient lists keyed by (process_id, institution_id)
+_recipient_cache: TTLCache[tuple[int, int], tuple[str, ...]] = TTLCache(
+    maxsize=RECIPIENT_CACHE_MAX_SIZE, ttl=RECIPIENT_CACHE_TTL_SECONDS
+)
+
+
+def invalidate_recipient_cache(
+    process_id: int | None = None, institution_id: int | None = None
+) -> None:
+    """Drop a cached recipient list, or all of them
+
+    Args:
+        process_id (int | None): process id of the list to drop
+        institution_id (int | None): institution id of the list to drop
+
+    If either id is None the whole cache is cleared.
+    """
+    if process_id is None or institution_id is None:
+        _recipient_cache.clear()
+    else:
+        _recipient_cache.invalidate((process_id, institution_id))
+
+
+def recipient_cache_stats() -> CacheStats:
+    """Get hit/miss counters for the recipient cache"""
+    return _recipient_cache.stats()
+
 
 class UserProcessService:
     """Service class for UserProcesses"""
 
     def __init__(self, session: Session):
         self.process_service = ProcessService(session)
+        self.process_recipient_repo = ProcessRecipientRepository(session)
         self.user_process_repo = UserProcessRepository(session)
         self.user_service = UserService(session)
 
@@ -48,3 +88,105 @@ class UserProcessService:
                 user_emails.append(email)
 
         return user_emails
+
+    def get_recipient_emails(self, process_id: int, institution_id: int) -> list[str]:
+        """Get all user emails for a given process and institution in one query
+
+        Read from process_recipient when RECIPIENT_TABLE_ENABLED, otherwise
+        by joining user_process to user. The table is rebuilt on a timer with
+        RECIPIENT_TABLE_REBUILD_ENABLED, which can be turned on first so the
+        table is current when reads are switched to it. Results are cached
+        per worker; failed lookups are not cached.
+
+        Args:
+            process_id (int): id of the processor
+            institution_id (int): Institution id
+
+        Returns:
+            list[str]: List of user emails
+        """
+        key: tuple[int, int] = (process_id, institution_id)
+        cached: tuple[str, ...] = _recipient_cache.get(key)
+
+        if cached is not MISSING:
+            logging.debug(
+                f"UserProcessService.get_recipient_emails: cache hit for {key}"
+            )
+            return list(cached)
+
+        user_emails: list[str] | None = (
+            self.process_recipient_repo.get_recipient_emails(process_id, institution_id)
+            if RECIPIENT_TABLE_ENABLED
+            else self.user_process_repo.get_user_emails_for_process(
+                process_id, institution_id
+            )
+        )
+
+        if user_emails is None:
+            return []
+
+        recipients: list[str] = [email for email in user_emails if email]
+        _recipient_cache.set(key, tuple(recipients))
+
+        return recipients
+
+    def iter_recipient_emails(
+        self, process_id: int, institution_id: int
+    ) -> Iterator[str]:
+        """Stream all user emails for a given process and institution
+
+        Args:
+            process_id (int): id of the processor
+            institution_id (int): Institution id
+
+        Yields:
+            str: user email
+        """
+        for email in self.user_process_repo.iter_user_emails_for_process(
+            process_id, institution_id
+        ):
+            if email:
+                yield email
+
+    def subscribe(self, user_id: int, process_id: int) -> bool:
+        """Subscribe a user to a process
+
+        Args:
+            user_id (int): id of the user
+            process_id (int): id of the processor
+
+        Returns:
+            bool: whether the subscription was saved
+        """
+        subscribed: bool = self.user_process_repo.add_subscription(user_id, process_id)
+        invalidate_recipient_cache()
+        return subscribed
+
+    def unsubscribe(self, user_id: int, process_id: int) -> bool:
+        """Unsubscribe a user from a process
+
+        Args:
+            user_id (int): id of the user
+            process_id (int): id of the processor
+
+        Returns:
+            bool: whether the change was saved
+        """
+        unsubscribed: bool = self.user_process_repo.remove_subscription(
+            user_id, process_id
+        )
+        invalidate_recipient_cache()
+        return unsubscribed
+
+    def rebuild_recipients(self, process_id: int | None = None) -> int | None:
+        """Recompute the process_recipient table from user_process and user
+
+        Args:
+            process_id (int | None): process to rebuild, or None for all of them
+
+        Returns:
+            int | None: number of recipients written, or None on error
+        """
+        written: int | None = self.process_recipient_repo.rebuild(process_id)
+        invalidate_recipient_cache()
+        return written
@@ -0,0 +1,237 @@
+"""Worker-wide registry of storage clients
+
+StorageService instances are cached per connection string so the blob and
+queue clients they own, and the keep-alive HTTP connection pools behind them,
+are reused by every invocation in the worker instead of being rebuilt (with a
+fresh TLS handshake) for each message.
+
+Azure SDK clients used directly (e.g. for streamed report downloads) are cached
+the same way and all share one pooled HTTP transport.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from alma_item_checks_notification_service.config import (
+    REPORT_CHUNK_SIZE,
+    STORAGE_CONNECTION_STRING,
+    STORAGE_HTTP_POOL_SIZE,
+)
+from alma_item_checks_notification_service.lazy_imports import lazy_import
+
+if TYPE_CHECKING:
+    import requests.adapters
+    from azure.core.pipeline.transport import RequestsTransport
+    from azure.storage.blob import BlobServiceClient
+    from azure.storage.queue import QueueClient
+    from wrlc_azure_storage_service import StorageService  # type: ignore
+else:
+    requests = lazy_import("requests")
+
+# The storage SDKs are imported on first use to keep cold start short
+azure_blob = lazy_import("azure.storage.blob")
+azure_queue = lazy_import("azure.storage.queue")
+azure_transport = lazy_import("azure.core.pipeline.transport")
+wrlc_storage = lazy_import("wrlc_azure_storage_service")
+
+_storage_services: "dict[str | None, StorageService]" = {}
+_blob_service_clients: "dict[str, BlobServiceClient]" = {}
+_queue_clients: "dict[tuple[str, str], QueueClient]" = {}
+_http_session: "requests.Session | None" = None
+_lock = threading.RLock()
+_created: int = 0
+_reused: int = 0
+
+
+@dataclass(frozen=True)
+class StorageClientStats:
+    """Counters for storage client reuse"""
+
+    created: int
+    reused: int
+    clients: int
+
+
+def get_storage_service(connection_string: str | None = None) -> "StorageService":
+    """Get the worker's StorageService for a connection string, creating it if necessary
+
+    Args:
+        connection_string (str | None): storage account connection string, or
+            None for the function app's default storage account
+
+    Returns:
+        StorageService: shared storage service
+    """
+    global _created, _reused
+    with _lock:
+        storage_service: "StorageService | None" = _storage_services.get(
+            connection_string
+        )
+
+        if storage_service is None:
+            storage_service = (
+                wrlc_storage.StorageService(connection_string)
+                if connection_string
+                else wrlc_storage.StorageService()
+            )
+            _storage_services[connection_string] = storage_service
+            _created += 1
+            logging.info("storage.get_storage_service: created new storage client")
+        else:
+            _reused += 1
+
+        return storage_service
+
+
+def register_storage_service(
+    connection_string: str | None, storage_service: "StorageService"
+) -> None:
+    """Use a preconfigured storage service for a connection string
+
+    Lets local harnesses and benchmarks substitute a stand-in with the same
+    interface for the Azure-backed StorageService.
+
+    Args:
+        connection_string (str | None): connection string the service answers
+            for, or None for the function app's default storage account
+        storage_service (StorageService): service to hand out
+    """
+    with _lock:
+        _storage_services[connection_string] = storage_service
+
+
+def get_http_session() -> "requests.Session":
+    """Get the worker's shared keep-alive HTTP session, creating it if necessary"""
+    global _http_session
+    with _lock:
+        if _http_session is None:
+            _http_session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=STORAGE_HTTP_POOL_SIZE,
+                pool_maxsize=STORAGE_HTTP_POOL_SIZE,
+            )
+            _http_session.mount("https://", adapter)
+            _http_session.mount("http://", adapter)
+        return _http_session
+
+
+def get_transport() -> "RequestsTransport":
+    """Get an HTTP transport backed by the worker's shared keep-alive connection pool
+
+    Each caller gets its own transport object, but all of them share one
+    requests.Session, which the transports don't close.
+    """
+    return azure_transport.RequestsTransport(
+        session=get_http_session(), session_owner=False
+    )
+
+
+def get_blob_service_client(
+    connection_string: str | None = None,
+) -> "BlobServiceClient":
+    """Get the worker's BlobServiceClient for a connection string, creating it if necessary
+
+    Args:
+        connection_string (str | None): storage account connection string, or
+            None for the function app's default storage account
+
+    Returns:
+        BlobServiceClient: shared blob service client
+    """
+    global _created, _reused
+    connection_string = connection_string or STORAGE_CONNECTION_STRING
+
+    if not connection_string:
+        raise ValueError("Storage connection string not set")
+
+    with _lock:
+        client: "BlobServiceClient | None" = _blob_service_clients.get(
+            connection_string
+        )
+
+        if client is None:
+            client = azure_blob.BlobServiceClient.from_connection_string(
+                connection_string,
+                transport=get_transport(),
+                max_single_get_size=REPORT_CHUNK_SIZE,
+                max_chunk_get_size=REPORT_CHUNK_SIZE,
+            )
+            _blob_service_clients[connection_string] = client
+            _created += 1
+            logging.info("storage.get_blob_service_client: created new blob client")
+        else:
+            _reused += 1
+
+        return client
+
+
+def get_queue_client(
+    queue_name: str, connection_string: str | None = None
+) -> "QueueClient":
+    """Get the worker's QueueClient for a queue, creating it if necessary
+
+    Messages are base64 encoded and decoded to bytes, matching the encoding
+    the Functions host uses for queue triggers.
+
+    Args:
+        queue_name (str): queue to read from or write to
+        connection_string (str | None): storage account connection string, or
+            None for the function app's default storage account
+
+    Returns:
+        QueueClient: shared queue client
+    """
+    global _created, _reused
+    connection_string = connection_string or STORAGE_CONNECTION_STRING
+
+    if not connection_string:
+        raise ValueError("Storage connection string not set")
+
+    key: tuple[str, str] = (connection_string, queue_name)
+
+    with _lock:
+        client: "QueueClient | None" = _queue_clients.get(key)
+
+        if client is None:
+            client = azure_queue.QueueClient.from_connection_string(
+                connection_string,
+                queue_name,
+                transport=get_transport(),
+                message_encode_policy=azure_queue.BinaryBase64EncodePolicy(),
+                message_decode_policy=azure_queue.BinaryBase64DecodePolicy(),
+            )
+            _queue_clients[key] = client
+            _created += 1
+            logging.info("storage.get_queue_client: created new queue client")
+        else:
+            _reused += 1
+
+        return client
+
+
+def storage_client_stats() -> StorageClientStats:
+    """Get counters for storage client reuse vs. creation"""
+    with _lock:
+        return StorageClientStats(
+            created=_created,
+            reused=_reused,
+            clients=len(_storage_services)
+            + len(_blob_service_clients)
+            + len(_queue_clients),
+        )
+
+
+def reset_storage_clients() -> None:
+    """Drop all cached storage clients and reset counters"""
+    global _created, _reused, _http_session
+    with _lock:
+        _storage_services.clear()
+        _blob_service_clients.clear()
+        _queue_clients.clear()
+        if _http_session is not None:
+            _http_session.close()
+            _http_session = None
+        _created = 0
+        _reused = 0
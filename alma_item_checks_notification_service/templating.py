@@ -0,0 +1,192 @@
+"""Worker-wide Jinja2 environment
+
+Templates can be compiled ahead of time into Python modules as a build step:
+
+    python -m alma_item_checks_notification_service.templating
+
+When the compiled modules match the source templates they are loaded through
+a ModuleLoader, so Jinja's lexer and parser never run in the worker.
+Otherwise the environment falls back to a FileSystemLoader.
+"""
+
+import hashlib
+import json
+import logging
+import pathlib
+import shutil
+from typing import Any
+
+import jinja2
+from jinja2 import (
+    BytecodeCache,
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    ModuleLoader,
+    select_autoescape,
+)
+
+from alma_item_checks_notification_service.config import (
+    JINJA_AUTO_RELOAD,
+    JINJA_BYTECODE_CACHE_DIR,
+    JINJA_BYTECODE_CACHE_ENABLED,
+    JINJA_COMPILED_TEMPLATES_ENABLED,
+)
+
+TEMPLATE_DIR: pathlib.Path = pathlib.Path(__file__).parent / "templates"
+COMPILED_TEMPLATE_DIR: pathlib.Path = (
+    pathlib.Path(__file__).parent / "templates_compiled"
+)
+MANIFEST_NAME = "manifest.json"
+
+_jinja_env: Environment | None = None
+
+
+def _environment_options() -> dict[str, Any]:
+    """Options shared by the runtime environment and the template compiler"""
+    return {
+        "autoescape": select_autoescape(["html", "xml"]),
+        "auto_reload": JINJA_AUTO_RELOAD,
+    }
+
+
+def templates_hash(template_dir: pathlib.Path = TEMPLATE_DIR) -> str:
+    """Hash the source templates and the Jinja2 version that compiles them
+
+    Args:
+        template_dir (pathlib.Path): directory of source templates
+
+    Returns:
+        str: hex sha256 digest
+    """
+    digest = hashlib.sha256(jinja2.__version__.encode())
+
+    for path in sorted(p for p in template_dir.rglob("*") if p.is_file()):
+        digest.update(path.relative_to(template_dir).as_posix().encode())
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+
+    return digest.hexdigest()
+
+
+def compile_templates(
+    target_dir: pathlib.Path = COMPILED_TEMPLATE_DIR,
+    template_dir: pathlib.Path = TEMPLATE_DIR,
+) -> str:
+    """Compile the source templates into Python modules
+
+    Any previous output in target_dir is replaced, and a manifest recording the
+    source hash is written alongside the modules.
+
+    Args:
+        target_dir (pathlib.Path): directory to write compiled modules to
+        template_dir (pathlib.Path): directory of source templates
+
+    Returns:
+        str: hash of the compiled sources
+    """
+    if target_dir.exists():
+        shutil.rmtree(target_dir)
+    target_dir.mkdir(parents=True)
+
+    env = Environment(loader=FileSystemLoader(template_dir), **_environment_options())
+    env.compile_templates(str(target_dir), zip=None, ignore_errors=False)
+
+    source_hash: str = templates_hash(template_dir)
+    (target_dir / MANIFEST_NAME).write_text(
+        json.dumps({"source_hash": source_hash, "jinja2_version": jinja2.__version__})
+    )
+
+    return source_hash
+
+
+def compiled_templates_current(
+    compiled_dir: pathlib.Path = COMPILED_TEMPLATE_DIR,
+    template_dir: pathlib.Path = TEMPLATE_DIR,
+) -> bool:
+    """Check that compiled templates exist and match the source templates
+
+    Args:
+        compiled_dir (pathlib.Path): directory of compiled modules
+        template_dir (pathlib.Path): directory of source templates
+
+    Returns:
+        bool: True if the compiled output can be used
+    """
+    try:
+        manifest: dict[str, Any] = json.loads(
+            (compiled_dir / MANIFEST_NAME).read_text()
+        )
+    except FileNotFoundError:
+        return False
+    except (OSError, ValueError) as e:
+        logging.warning(f"templating.compiled_templates_current: bad manifest: {e}")
+        return False
+
+    if manifest.get("source_hash") != templates_hash(template_dir):
+        logging.warning(
+            f"templating.compiled_templates_current: compiled templates in {compiled_dir} are stale"
+        )
+        return False
+
+    return True
+
+
+def get_bytecode_cache() -> BytecodeCache | None:
+    """Get a filesystem bytecode cache so restarted workers skip compilation
+
+    Returns:
+        BytecodeCache | None: bytecode cache, or None if disabled or unusable
+    """
+    if not JINJA_BYTECODE_CACHE_ENABLED:
+        return None
+
+    try:
+        if JINJA_BYTECODE_CACHE_DIR:
+            pathlib.Path(JINJA_BYTECODE_CACHE_DIR).mkdir(parents=True, exist_ok=True)
+        return FileSystemBytecodeCache(directory=JINJA_BYTECODE_CACHE_DIR)
+    except Exception as e:
+        logging.warning(
+            f"templating.get_bytecode_cache: bytecode cache unavailable, compiling in memory only: {e}"
+        )
+        return None
+
+
+def get_jinja_env() -> Environment:
+    """Get the Jinja2 environment, creating it if necessary
+
+    The environment is shared by every invocation in the worker, so each
+    template is loaded at most once per process.
+    """
+    global _jinja_env
+    if _jinja_env is None:
+        if not TEMPLATE_DIR.is_dir():
+            logging.error(f"Jinja template directory not found at: {TEMPLATE_DIR}")
+            raise FileNotFoundError(
+                f"Jinja template directory not found: {TEMPLATE_DIR}"
+            )
+
+        if JINJA_COMPILED_TEMPLATES_ENABLED and compiled_templates_current(
+            COMPILED_TEMPLATE_DIR, TEMPLATE_DIR
+        ):
+            _jinja_env = Environment(
+                loader=ModuleLoader(str(COMPILED_TEMPLATE_DIR)),
+                **_environment_options(),
+            )
+            logging.info(
+                f"Jinja2 environment loaded precompiled templates from: {COMPILED_TEMPLATE_DIR}"
+            )
+        else:
+            _jinja_env = Environment(
+                loader=FileSystemLoader(TEMPLATE_DIR),
+                bytecode_cache=get_bytecode_cache(),
+                **_environment_options(),
+            )
+            logging.info(f"Jinja2 environment loaded successfully from: {TEMPLATE_DIR}")
+    return _jinja_env
+
+
+if __name__ == "__main__":  # pragma: no cover
+    compiled_hash: str = compile_templates()
+    print(f"Compiled {TEMPLATE_DIR} -> {COMPILED_TEMPLATE_DIR} ({compiled_hash})")
@@ -0,0 +1,196 @@
+"""Timing spans around the stages of the notification pipeline
+
+Stages are wrapped in span(name, **attributes). What a span does depends on
+TRACING_BACKEND:
+
+- none: nothing; the default, and cheap enough to leave in the hot path
+- logging: log each stage's duration and attributes
+- opentelemetry: record OpenTelemetry spans on the global tracer provider.
+  With TRACING_AZURE_MONITOR_ENABLED, configure_tracing() sets that provider
+  up to export to Application Insights (needs azure-monitor-opentelemetry).
+
+The job_id, process_type and institution_id of an enclosing span are copied
+onto the spans nested in it, so every stage of a notification can be found by
+job. Attributes are kept in a context variable, so they follow the work into
+asyncio tasks and into threads started with a copied context.
+"""
+
+import contextlib
+import contextvars
+import importlib
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any, Protocol
+
+from alma_item_checks_notification_service.config import (
+    TRACING_AZURE_MONITOR_ENABLED,
+    TRACING_BACKEND,
+)
+
+INHERITED_ATTRIBUTES: tuple[str, ...] = ("job_id", "process_type", "institution_id")
+
+_inherited: contextvars.ContextVar[dict[str, Any] | None] = contextvars.ContextVar(
+    "tracing_inherited_attributes", default=None
+)
+_tracer: "Tracer | None" = None
+_lock = threading.Lock()
+
+
+class Span(Protocol):
+    """A stage being timed"""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach a value known only once the stage has run, e.g. a row count"""
+
+
+class Tracer(Protocol):
+    """Backend that times spans"""
+
+    def start_span(
+        self, name: str, attributes: dict[str, Any]
+    ) -> contextlib.AbstractContextManager[Span]:
+        """Time the enclosed block as a span"""
+
+
+class NoOpSpan:
+    """Span that records nothing"""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Ignore the attribute"""
+
+
+_NOOP_SPAN = NoOpSpan()
+
+
+class NoOpTracer:
+    """Tracer that records nothing"""
+
+    @contextlib.contextmanager
+    def start_span(self, name: str, attributes: dict[str, Any]) -> Iterator[Span]:
+        """Run the block untimed"""
+        yield _NOOP_SPAN
+
+
+class LoggingSpan:
+    """Span whose attributes are logged with its duration"""
+
+    def __init__(self, attributes: dict[str, Any]):
+        self.attributes = dict(attributes)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Add an attribute to the log line"""
+        self.attributes[key] = value
+
+
+class LoggingTracer:
+    """Tracer that logs each span's duration"""
+
+    @contextlib.contextmanager
+    def start_span(self, name: str, attributes: dict[str, Any]) -> Iterator[Span]:
+        """Time the block and log it when it ends"""
+        span = LoggingSpan(attributes)
+        start: float = time.perf_counter()
+        try:
+            yield span
+        finally:
+            elapsed_ms: float = (time.perf_counter() - start) * 1000
+            logging.info(f"tracing: {name} {elapsed_ms:.1f} ms {span.attributes}")
+
+
+class OpenTelemetryTracer:
+    """Tracer that records OpenTelemetry spans"""
+
+    def __init__(self) -> None:
+        trace = importlib.import_module("opentelemetry.trace")
+        self._tracer = trace.get_tracer("alma_item_checks_notification_service")
+
+    def start_span(
+        self, name: str, attributes: dict[str, Any]
+    ) -> contextlib.AbstractContextManager[Span]:
+        """Start a span as the current one, nested in any enclosing span"""
+        return self._tracer.start_as_current_span(name, attributes=attributes)
+
+
+def configure_tracing() -> None:
+    """Set up span export for the configured backend
+
+    Call once at startup. With the opentelemetry backend and
+    TRACING_AZURE_MONITOR_ENABLED, spans are exported to the Application
+    Insights resource named by APPLICATIONINSIGHTS_CONNECTION_STRING.
+    """
+    if TRACING_BACKEND != "opentelemetry" or not TRACING_AZURE_MONITOR_ENABLED:
+        return
+    try:
+        azure_monitor = importlib.import_module("azure.monitor.opentelemetry")
+        azure_monitor.configure_azure_monitor()
+    except Exception as e:
+        logging.error(f"tracing.configure_tracing: Azure Monitor not configured: {e}")
+
+
+def get_tracer() -> "Tracer":
+    """Get the worker's tracer for TRACING_BACKEND, creating it if necessary"""
+    global _tracer
+    if _tracer is None:
+        with _lock:
+            if _tracer is None:
+                _tracer = _create_tracer(TRACING_BACKEND)
+    return _tracer
+
+
+def set_tracer(tracer: "Tracer | None") -> None:
+    """Use a tracer for all spans, or None to go back to TRACING_BACKEND's"""
+    global _tracer
+    with _lock:
+        _tracer = tracer
+
+
+def _create_tracer(backend: str) -> "Tracer":
+    """Build the tracer for a backend name, falling back to no-op"""
+    if backend == "logging":
+        return LoggingTracer()
+    if backend == "opentelemetry":
+        try:
+            return OpenTelemetryTracer()
+        except ImportError as e:
+            logging.error(f"tracing.get_tracer: OpenTelemetry not available: {e}")
+    elif backend != "none":
+        logging.error(f"tracing.get_tracer: unknown TRACING_BACKEND {backend}")
+    return NoOpTracer()
+
+
+def tracing_enabled() -> bool:
+    """Whether spans are recorded, for attributes that are costly to compute"""
+    return not isinstance(get_tracer(), NoOpTracer)
+
+
+@contextlib.contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span]:
+    """Time a stage of the pipeline
+
+    Args:
+        name (str): stage name
+        **attributes: span attributes; None values are dropped
+
+    Yields:
+        Span: the span, for attributes known only after the stage has run
+    """
+    tracer: Tracer = get_tracer()
+    if isinstance(tracer, NoOpTracer):
+        yield _NOOP_SPAN
+        return
+
+    inherited: dict[str, Any] = _inherited.get() or {}
+    merged: dict[str, Any] = {
+        **inherited,
+        **{key: value for key, value in attributes.items() if value is not None},
+    }
+    token = _inherited.set(
+        {key: merged[key] for key in INHERITED_ATTRIBUTES if key in merged}
+    )
+    try:
+        with tracer.start_span(name, merged) as current:
+            yield current
+    finally:
+        _inherited.reset(token)
@@ -0,0 +1 @@
+"""Local performance benchmarks for the notification function app"""
@@ -0,0 +1,312 @@
+"""Shared fixtures for the benchmarks: local storage, SQLite seed data, reports
+
+Benchmarks run the real function code against stand-ins that need no Azure
+resources: a filesystem-backed storage service and a SQLite database.
+"""
+
+import asyncio
+import json
+import math
+import os
+import time
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+PROCESS_NAME = "benchmark_process"
+INSTITUTION_ID = 1
+ACS_CONNECTION_STRING = "local-acs-storage"
+REPORTS_CONTAINER = "reports-container"
+ACS_SENDER_CONTAINER = "acs-sender-container"
+ACS_SENDER_QUEUE = "acs-sender-queue"
+
+
+class LocalStorageService:
+    """Filesystem stand-in for wrlc_azure_storage_service.StorageService
+
+    Blobs are files under root/<container>/<blob>; queue messages are
+    appended as JSON lines to root/queues/<queue>.jsonl. latency_ms adds a
+    fixed delay to every call to stand in for the network round trip.
+    """
+
+    def __init__(self, root: Path, latency_ms: float = 0.0):
+        self.root = Path(root)
+        self.latency_ms = latency_ms
+
+    def _blob_path(self, container_name: str, blob_name: str) -> Path:
+        return self.root / container_name / blob_name
+
+    def _round_trip(self) -> None:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+    def download_blob_as_json(self, container_name: str, blob_name: str) -> Any:
+        """Read a blob and parse it as JSON"""
+        self._round_trip()
+        return json.loads(self._blob_path(container_name, blob_name).read_bytes())
+
+    def upload_blob_data(
+        self, container_name: str, blob_name: str, data: str | bytes, **kwargs: Any
+    ) -> None:
+        """Write a blob, replacing any existing one"""
+        self._round_trip()
+        path = self._blob_path(container_name, blob_name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data.encode() if isinstance(data, str) else data)
+
+    def send_queue_message(
+        self, queue_name: str, message_content: dict | str, **kwargs: Any
+    ) -> None:
+        """Append a message to a queue file"""
+        self._round_trip()
+        path = self.root / "queues" / f"{queue_name}.jsonl"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a") as f:
+            f.write(json.dumps(message_content) + "\n")
+
+
+class LocalAsyncStorageService:
+    """Asyncio stand-in for aio_storage.AsyncStorageService over LocalStorageService
+
+    The simulated round trip is awaited, so concurrent calls overlap; the file
+    access itself is done inline.
+    """
+
+    def __init__(self, local_storage: LocalStorageService):
+        self.local_storage = local_storage
+
+    async def _round_trip(self) -> None:
+        if self.local_storage.latency_ms:
+            await asyncio.sleep(self.local_storage.latency_ms / 1000)
+
+    async def download_blob_as_json(self, container_name: str, blob_name: str) -> Any:
+        """Read a blob and parse it as JSON"""
+        await self._round_trip()
+        return json.loads(
+            self.local_storage._blob_path(container_name, blob_name).read_bytes()
+        )
+
+    async def upload_blob_data(
+        self, container_name: str, blob_name: str, data: str | bytes, **kwargs: Any
+    ) -> None:
+        """Write a blob, replacing any existing one"""
+        await self._round_trip()
+        path = self.local_storage._blob_path(container_name, blob_name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data.encode() if isinstance(data, str) else data)
+
+    async def send_queue_message(
+        self, queue_name: str, message_content: dict | str, **kwargs: Any
+    ) -> None:
+        """Append a message to a queue file"""
+        await self._round_trip()
+        path = self.local_storage.root / "queues" / f"{queue_name}.jsonl"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a") as f:
+            f.write(json.dumps(message_content) + "\n")
+
+
+def configure_environment(workdir: Path) -> dict[str, str]:
+    """Environment for running the function app against local stand-ins
+
+    Must be applied before the package is imported, since config is read at
+    import time.
+    """
+    env: dict[str, str] = {
+        "SQLALCHEMY_CONNECTION_STRING": f"sqlite:///{workdir / 'benchmark.db'}",
+        "AzureWebJobsStorage": "local-storage",
+        "ACS_STORAGE_CONNECTION_STRING": ACS_CONNECTION_STRING,
+        "ACS_SENDER_CONTAINER_NAME": ACS_SENDER_CONTAINER,
+        "ACS_SENDER_QUEUE_NAME": ACS_SENDER_QUEUE,
+        "REPORTS_CONTAINER": REPORTS_CONTAINER,
+    }
+    os.environ.update(env)
+    return env
+
+
+def install_local_storage(
+    workdir: Path, latency_ms: float = 0.0
+) -> LocalStorageService:
+    """Serve every storage connection string, sync and async, from local stand-ins"""
+    from alma_item_checks_notification_service.aio_storage import (
+        register_async_storage_service,
+    )
+    from alma_item_checks_notification_service.storage import (
+        register_storage_service,
+    )
+
+    local_storage = LocalStorageService(workdir / "storage", latency_ms)
+    local_async_storage = LocalAsyncStorageService(local_storage)
+    for connection_string in (None, ACS_CONNECTION_STRING):
+        register_storage_service(connection_string, local_storage)
+        register_async_storage_service(connection_string, local_async_storage)
+    return local_storage
+
+
+def seed_database(connection_string: str, recipients: int = 10) -> None:
+    """Create the schema and a process with recipients at one institution"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from alma_item_checks_notification_service.models import (
+        Base,
+        Process,
+        User,
+        UserProcess,
+    )
+
+    engine = create_engine(connection_string)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        process = Process(
+            name=PROCESS_NAME,
+            email_subject="Benchmark report",
+            email_body="Items needing attention are listed below.",
+            email_addendum="Generated by the benchmark harness.",
+        )
+        session.add(process)
+        session.flush()
+
+        for i in range(recipients):
+            user = User(email=f"user{i}@example.org", institution_id=INSTITUTION_ID)
+            session.add(user)
+            session.flush()
+            session.add(UserProcess(user_id=user.id, process_id=process.id))
+
+        session.commit()
+
+    engine.dispose()
+
+
+def seed_volumes(
+    connection_string: str,
+    processes: int,
+    institutions: int,
+    users: int,
+    subscriptions: int,
+    seed: int = 0,
+) -> list[str]:
+    """Create the schema with many processes, institutions and subscribers
+
+    Users are spread evenly over institutions and each subscribes to
+    `subscriptions` processes picked at random, so every (process,
+    institution) pair has a realistic, uneven recipient list.
+
+    Returns:
+        list[str]: process names
+    """
+    import random
+
+    from sqlalchemy import create_engine, insert
+    from sqlalchemy.orm import Session
+
+    from alma_item_checks_notification_service.models import (
+        Base,
+        Process,
+        User,
+        UserProcess,
+    )
+    from alma_item_checks_notification_service.repos.process_recipient_repo import (
+        ProcessRecipientRepository,
+    )
+
+    rng = random.Random(seed)
+    engine = create_engine(connection_string)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    names: list[str] = [f"{PROCESS_NAME}_{p}" for p in range(processes)]
+    with Session(engine) as session:
+        session.execute(
+            insert(Process),
+            [
+                {
+                    "id": p + 1,
+                    "name": name,
+                    "email_subject": f"Benchmark report {p}",
+                    "email_body": "Items needing attention are listed below.",
+                    "email_addendum": "Generated by the benchmark harness.",
+                }
+                for p, name in enumerate(names)
+            ],
+        )
+        session.execute(
+            insert(User),
+            [
+                {
+                    "id": u + 1,
+                    "email": f"user{u}@example.org",
+                    "institution_id": u % institutions + 1,
+                }
+                for u in range(users)
+            ],
+        )
+        session.execute(
+            insert(UserProcess),
+            [
+                {"user_id": u + 1, "process_id": p + 1}
+                for u in range(users)
+                for p in rng.sample(range(processes), min(subscriptions, processes))
+            ],
+        )
+        session.commit()
+        ProcessRecipientRepository(session).rebuild()
+
+    engine.dispose()
+    return names
+
+
+def make_report(rows: int, columns: int = 8) -> list[dict[str, str]]:
+    """Synthetic item-check report rows of string values"""
+    return [
+        {f"Column {c}": f"value {r}-{c} <&>" for c in range(columns)}
+        for r in range(rows)
+    ]
+
+
+def write_report(
+    local_storage: LocalStorageService, job_id: str, report: list[dict[str, str]]
+) -> None:
+    """Store a report where the function expects to find it"""
+    local_storage.upload_blob_data(
+        REPORTS_CONTAINER, f"{job_id}.json", json.dumps(report)
+    )
+
+
+def make_queue_message(
+    job_id: str,
+    process_type: str = PROCESS_NAME,
+    institution_id: int = INSTITUTION_ID,
+) -> Any:
+    """Build the queue message that triggers a notification"""
+    import azure.functions as func
+
+    return func.QueueMessage(
+        body=json.dumps(
+            {
+                "job_id": job_id,
+                "institution_id": institution_id,
+                "process_type": process_type,
+            }
+        ).encode()
+    )
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Percentile of a sample, interpolating between closest ranks"""
+    if not values:
+        return math.nan
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(
+    name: str, values: Sequence[float], unit: str = "ms", pcts=(50, 90, 99)
+) -> str:
+    """One report line: name, sample size and percentiles"""
+    stats = "  ".join(f"p{p}={percentile(values, p):9.2f}" for p in pcts)
+    return f"{name:<28} n={len(values):<5} {stats}  max={max(values, default=math.nan):9.2f} {unit}"
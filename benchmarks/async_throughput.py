@@ -0,0 +1,148 @@
+"""Throughput benchmark: synchronous vs asyncio notification pipelines
+
+Drives a batch of messages through send_notification against local storage
+with a simulated network round trip per storage call and a SQLite database,
+in three ways:
+
+- sync, sequential: one message at a time, as a single-threaded worker would
+- sync, threads: --concurrency messages at once on a thread pool, as the
+  Functions host runs synchronous functions
+- async: --concurrency messages at once on one event loop
+
+Usage:
+
+    python -m benchmarks.async_throughput [--messages 200] [--concurrency 16]
+        [--latency-ms 20] [--rows 200]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from benchmarks import _support
+
+
+def job_id(mode: str, index: int) -> str:
+    """Distinct job per message and mode, so idempotency doesn't skip repeats"""
+    return f"benchmark-{mode}-{index}"
+
+
+def timed(call: Callable[[], None], latencies: list[float]) -> None:
+    """Run a call, recording its latency in milliseconds"""
+    start: float = time.perf_counter()
+    call()
+    latencies.append((time.perf_counter() - start) * 1000)
+
+
+def run_sync(messages: list, concurrency: int) -> tuple[float, list[float]]:
+    """Send messages through the synchronous blueprint function"""
+    from alma_item_checks_notification_service.blueprints.bp_notification import (
+        send_notification,
+    )
+
+    latencies: list[float] = []
+    start: float = time.perf_counter()
+    if concurrency == 1:
+        for message in messages:
+            timed(lambda: send_notification(message), latencies)
+    else:
+        with ThreadPoolExecutor(concurrency) as executor:
+            list(
+                executor.map(
+                    lambda message: timed(
+                        lambda: send_notification(message), latencies
+                    ),
+                    messages,
+                )
+            )
+    return time.perf_counter() - start, latencies
+
+
+def run_async(messages: list, concurrency: int) -> tuple[float, list[float]]:
+    """Send messages through the asyncio blueprint function"""
+    from alma_item_checks_notification_service.blueprints.bp_notification_async import (
+        send_notification,
+    )
+
+    latencies: list[float] = []
+
+    async def send(message, semaphore: asyncio.Semaphore) -> None:
+        async with semaphore:
+            start: float = time.perf_counter()
+            await send_notification(message)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    async def send_all() -> None:
+        semaphore = asyncio.Semaphore(concurrency)
+        await asyncio.gather(*(send(message, semaphore) for message in messages))
+
+    start: float = time.perf_counter()
+    asyncio.run(send_all())
+    return time.perf_counter() - start, latencies
+
+
+def main() -> None:
+    """Run the benchmark and print throughput and latency percentiles"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200, help="per mode")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--latency-ms", type=float, default=20.0, help="per storage call"
+    )
+    parser.add_argument("--rows", type=int, default=200, help="report rows")
+    parser.add_argument("--recipients", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        env: dict[str, str] = _support.configure_environment(workdir)
+        _support.seed_database(env["SQLALCHEMY_CONNECTION_STRING"], args.recipients)
+
+        from alma_item_checks_notification_service.database import (
+            pool_stats,
+            reset_pool_stats,
+        )
+
+        local_storage = _support.install_local_storage(workdir, args.latency_ms)
+        report = _support.make_report(args.rows)
+
+        modes: list[tuple[str, Callable, int]] = [
+            ("sync, sequential", run_sync, 1),
+            (f"sync, {args.concurrency} threads", run_sync, args.concurrency),
+            (f"async, {args.concurrency} in flight", run_async, args.concurrency),
+        ]
+
+        print(
+            f"throughput: {args.messages} messages per mode, {args.rows}-row report, "
+            f"{args.latency_ms:g} ms per storage call, {args.recipients} recipients"
+        )
+        for index, (name, run, concurrency) in enumerate(modes):
+            mode: str = f"mode{index}"
+            for i in range(args.messages):
+                _support.write_report(local_storage, job_id(mode, i), report)
+            messages = [
+                _support.make_queue_message(job_id(mode, i))
+                for i in range(args.messages)
+            ]
+
+            reset_pool_stats()
+            elapsed, latencies = run(messages, concurrency)
+            stats = pool_stats()
+            print(
+                f"{name:<28} {args.messages / elapsed:8.1f} msg/s  "
+                f"total {elapsed:7.2f} s"
+            )
+            print(_support.summarize("  latency", latencies))
+            print(
+                f"  db pool: peak {stats.peak_in_use} in use, {stats.overflows} "
+                f"overflows, {stats.timeouts} timeouts, checkout wait "
+                f"mean {stats.mean_wait_ms:.2f} ms max {stats.max_wait_ms:.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Cold-start benchmark for the notification function app
+
+Each run launches a fresh interpreter that imports function_app and drives
+send_notification through local storage and a SQLite database, measuring:
+
+- interpreter startup: process spawn until benchmark code runs
+- import: `import function_app`
+- first invocation: the first send_notification call
+- steady state: every later call in the same interpreter
+
+Usage:
+
+    python -m benchmarks.cold_start [--runs 10] [--steady 20] [--rows 200]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks import _support
+
+JOB_ID = "benchmark-job"
+
+
+def job_id(index: int) -> str:
+    """Distinct job per message, so idempotency doesn't skip repeats"""
+    return f"{JOB_ID}-{index}"
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def child(workdir: Path, result_path: Path, spawned_at: float, steady: int) -> None:
+    """Measure one cold start; runs inside the freshly launched interpreter"""
+    started_at: float = time.time()
+    _support.configure_environment(workdir)
+
+    start: float = time.perf_counter()
+    import function_app  # noqa: F401
+
+    import_ms: float = (time.perf_counter() - start) * 1000
+
+    from alma_item_checks_notification_service.blueprints.bp_notification import (
+        send_notification,
+    )
+
+    _support.install_local_storage(workdir)
+
+    latencies: list[float] = []
+    for index in range(steady + 1):
+        message = _support.make_queue_message(job_id(index))
+        start = time.perf_counter()
+        send_notification(message)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    result_path.write_text(
+        json.dumps(
+            {
+                "interpreter_ms": (started_at - spawned_at) * 1000,
+                "import_ms": import_ms,
+                "first_ms": latencies[0],
+                "steady_ms": latencies[1:],
+            }
+        )
+    )
+
+
+def run_once(workdir: Path, steady: int, env: dict[str, str]) -> dict:
+    """Launch one interpreter and collect its measurements"""
+    result_path: Path = workdir / "result.json"
+    log_path: Path = workdir / "child.log"
+    result_path.unlink(missing_ok=True)
+    with log_path.open("w") as log:
+        completed = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.cold_start",
+                "--child",
+                str(workdir),
+                str(result_path),
+                repr(time.time()),
+                str(steady),
+            ],
+            cwd=REPO_ROOT,
+            env=env,
+            stdout=log,
+            stderr=log,
+        )
+    if completed.returncode != 0:
+        raise SystemExit(f"benchmark run failed:\n{log_path.read_text()[-4000:]}")
+    return json.loads(result_path.read_text())
+
+
+def main() -> None:
+    """Run the benchmark and print percentiles"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="fresh interpreters")
+    parser.add_argument(
+        "--steady", type=int, default=20, help="messages after the first, per run"
+    )
+    parser.add_argument("--rows", type=int, default=200, help="report rows")
+    parser.add_argument("--recipients", type=int, default=10)
+    parser.add_argument(
+        "--no-warmup", action="store_true", help="disable background import warm-up"
+    )
+    parser.add_argument("--child", nargs=4, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        workdir, result_path, spawned_at, steady = args.child
+        child(Path(workdir), Path(result_path), float(spawned_at), int(steady))
+        return
+
+    interpreter: list[float] = []
+    imports: list[float] = []
+    first: list[float] = []
+    steady_state: list[float] = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        env: dict[str, str] = {**os.environ}
+        env.update(_support.configure_environment(workdir))
+        if args.no_warmup:
+            env["IMPORT_WARMUP_ENABLED"] = "false"
+
+        local_storage = _support.LocalStorageService(workdir / "storage")
+        report = _support.make_report(args.rows)
+        for index in range(args.steady + 1):
+            _support.write_report(local_storage, job_id(index), report)
+
+        for _ in range(args.runs):
+            _support.seed_database(env["SQLALCHEMY_CONNECTION_STRING"], args.recipients)
+            result = run_once(workdir, args.steady, env)
+            interpreter.append(result["interpreter_ms"])
+            imports.append(result["import_ms"])
+            first.append(result["first_ms"])
+            steady_state.extend(result["steady_ms"])
+
+    cold: list[float] = [i + m + f for i, m, f in zip(interpreter, imports, first)]
+
+    print(
+        f"cold start: {args.runs} runs, {args.steady} steady-state messages per run, "
+        f"{args.rows}-row report, {args.recipients} recipients"
+    )
+    print(_support.summarize("interpreter startup", interpreter))
+    print(_support.summarize("import function_app", imports))
+    print(_support.summarize("first invocation", first))
+    print(_support.summarize("steady-state invocation", steady_state))
+    print(_support.summarize("start to first message", cold))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""End-to-end load test: synthetic messages through the notification blueprint
+
+Generates --messages notification messages for random (process, institution)
+pairs, each with its own report blob of a random size, against a
+filesystem-backed storage stand-in and a SQLite database seeded with
+--processes processes and --users users spread over --institutions
+institutions. The messages are then driven through the real send_notification
+blueprint function at --concurrency, as the Functions host would run them, and
+the run reports throughput, latency percentiles and errors.
+
+Everything random is drawn from --seed, so a run is reproducible: the same
+arguments on the same build give a comparable capacity number. --missing-rate
+leaves some report blobs unwritten to check that failures are counted.
+
+Usage:
+
+    python -m benchmarks.load_test [--messages 2000] [--concurrency 16]
+        [--rows 50] [--latency-ms 5] [--async] [--output results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from benchmarks import _support
+
+
+@dataclass
+class Outcome:
+    """What happened to the messages in one run"""
+
+    latencies: list[float] = field(default_factory=list)
+    errors: Counter = field(default_factory=Counter)
+
+
+@dataclass(frozen=True)
+class Job:
+    """One synthetic notification"""
+
+    job_id: str
+    process_type: str
+    institution_id: int
+    rows: int
+    has_report: bool
+
+
+def generate_jobs(
+    rng: random.Random,
+    count: int,
+    process_names: list[str],
+    institutions: int,
+    median_rows: int,
+    max_rows: int,
+    missing_rate: float,
+) -> list[Job]:
+    """Random jobs; report sizes are log-normal around median_rows"""
+    return [
+        Job(
+            job_id=f"load-{index}",
+            process_type=rng.choice(process_names),
+            institution_id=rng.randint(1, institutions),
+            rows=max(1, min(max_rows, round(rng.lognormvariate(0, 1) * median_rows))),
+            has_report=rng.random() >= missing_rate,
+        )
+        for index in range(count)
+    ]
+
+
+def timed(call: Callable[[], None], outcome: Outcome) -> None:
+    """Run one message, recording its latency or its error"""
+    start: float = time.perf_counter()
+    try:
+        call()
+    except Exception as e:
+        outcome.errors[type(e).__name__] += 1
+    else:
+        outcome.latencies.append((time.perf_counter() - start) * 1000)
+
+
+def run_sync(messages: list, concurrency: int) -> tuple[float, Outcome]:
+    """Send messages through the synchronous blueprint on a thread pool"""
+    from alma_item_checks_notification_service.blueprints.bp_notification import (
+        send_notification,
+    )
+
+    outcome = Outcome()
+    start: float = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        list(
+            executor.map(
+                lambda message: timed(lambda: send_notification(message), outcome),
+                messages,
+            )
+        )
+    return time.perf_counter() - start, outcome
+
+
+def run_async(messages: list, concurrency: int) -> tuple[float, Outcome]:
+    """Send messages through the asyncio blueprint on one event loop"""
+    from alma_item_checks_notification_service.blueprints.bp_notification_async import (
+        send_notification,
+    )
+
+    outcome = Outcome()
+
+    async def send(message, semaphore: asyncio.Semaphore) -> None:
+        async with semaphore:
+            start: float = time.perf_counter()
+            try:
+                await send_notification(message)
+            except Exception as e:
+                outcome.errors[type(e).__name__] += 1
+            else:
+                outcome.latencies.append((time.perf_counter() - start) * 1000)
+
+    async def send_all() -> None:
+        semaphore = asyncio.Semaphore(concurrency)
+        await asyncio.gather(*(send(message, semaphore) for message in messages))
+
+    start: float = time.perf_counter()
+    asyncio.run(send_all())
+    return time.perf_counter() - start, outcome
+
+
+def count_lines(path: Path) -> int:
+    """Lines in a file, or 0 if it doesn't exist"""
+    if not path.exists():
+        return 0
+    with path.open() as f:
+        return sum(1 for _ in f)
+
+
+def main() -> None:
+    """Run the load test and print its capacity numbers"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=20, help="untimed messages")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--async", dest="use_async", action="store_true", help="asyncio pipeline"
+    )
+    parser.add_argument("--rows", type=int, default=50, help="median report rows")
+    parser.add_argument("--max-rows", type=int, default=5000)
+    parser.add_argument(
+        "--latency-ms", type=float, default=5.0, help="per storage call"
+    )
+    parser.add_argument("--processes", type=int, default=25)
+    parser.add_argument("--institutions", type=int, default=20)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument(
+        "--subscriptions", type=int, default=3, help="processes per user"
+    )
+    parser.add_argument(
+        "--missing-rate", type=float, default=0.0, help="share without a report"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        env: dict[str, str] = _support.configure_environment(workdir)
+        process_names: list[str] = _support.seed_volumes(
+            env["SQLALCHEMY_CONNECTION_STRING"],
+            processes=args.processes,
+            institutions=args.institutions,
+            users=args.users,
+            subscriptions=args.subscriptions,
+            seed=args.seed,
+        )
+
+        from alma_item_checks_notification_service.database import (
+            pool_stats,
+            reset_pool_stats,
+        )
+
+        local_storage = _support.install_local_storage(workdir, args.latency_ms)
+
+        jobs: list[Job] = generate_jobs(
+            rng,
+            args.warmup + args.messages,
+            process_names,
+            args.institutions,
+            args.rows,
+            args.max_rows,
+            args.missing_rate,
+        )
+        for job in jobs:
+            if job.has_report:
+                _support.write_report(
+                    local_storage, job.job_id, _support.make_report(job.rows)
+                )
+        messages: list = [
+            _support.make_queue_message(
+                job.job_id, job.process_type, job.institution_id
+            )
+            for job in jobs
+        ]
+
+        run: Callable[[list, int], tuple[float, Outcome]] = (
+            run_async if args.use_async else run_sync
+        )
+        run(messages[: args.warmup], args.concurrency)
+
+        reset_pool_stats()
+        sent_before: int = count_lines(
+            local_storage.root / "queues" / f"{_support.ACS_SENDER_QUEUE}.jsonl"
+        )
+        elapsed, outcome = run(messages[args.warmup :], args.concurrency)
+        emails: int = (
+            count_lines(
+                local_storage.root / "queues" / f"{_support.ACS_SENDER_QUEUE}.jsonl"
+            )
+            - sent_before
+        )
+        stats = pool_stats()
+
+    rows: list[int] = [job.rows for job in jobs[args.warmup :]]
+    result: dict[str, Any] = {
+        "arguments": {
+            key: str(value) if isinstance(value, Path) else value
+            for key, value in vars(args).items()
+        },
+        "messages": args.messages,
+        "elapsed_s": elapsed,
+        "messages_per_s": args.messages / elapsed,
+        "latency_ms": {
+            f"p{pct}": _support.percentile(outcome.latencies, pct)
+            for pct in (50, 95, 99)
+        },
+        "succeeded": len(outcome.latencies),
+        "errors": sum(outcome.errors.values()),
+        "errors_by_type": dict(outcome.errors),
+        "emails_queued": emails,
+        "report_rows_median": _support.percentile(rows, 50),
+        "db_pool": {**asdict(stats), "mean_wait_ms": stats.mean_wait_ms},
+    }
+
+    print(
+        f"load test: {args.messages} messages ({args.warmup} warm-up), "
+        f"{'async' if args.use_async else 'sync threads'}, concurrency "
+        f"{args.concurrency}, {args.latency_ms:g} ms per storage call, "
+        f"{args.processes} processes x {args.institutions} institutions, "
+        f"{args.users} users, seed {args.seed}"
+    )
+    print(
+        f"throughput {result['messages_per_s']:8.1f} msg/s  "
+        f"total {elapsed:7.2f} s  emails queued {emails}"
+    )
+    print(_support.summarize("latency", outcome.latencies, pcts=(50, 95, 99)))
+    print(
+        f"errors {result['errors']}"
+        + "".join(f"  {name}={n}" for name, n in outcome.errors.most_common())
+    )
+    print(
+        f"db pool: peak {stats.peak_in_use} in use, {stats.overflows} overflows, "
+        f"{stats.timeouts} timeouts, checkout wait mean {stats.mean_wait_ms:.2f} ms"
+    )
+
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2))
+        print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
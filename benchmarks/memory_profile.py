@@ -0,0 +1,386 @@
+"""Peak memory profile of send_notification by report size
+
+Each report size runs in fresh interpreters, through the real blueprint against
+local storage and SQLite, twice:
+
+- traced: tracemalloc follows the pipeline's tracing spans, giving the peak
+  and retained Python allocations of each stage (decoded report JSON, the
+  re-dumped JSON string, the DataFrame, the HTML table, the rendered template,
+  the serialized EmailMessage, ...)
+- untraced: the process's peak RSS over its RSS before the message, which is
+  what an instance's memory limit applies to
+
+Report prefetch is turned off so the stages run one at a time on one thread.
+The RSS growth per row across sizes gives the largest report each Functions
+SKU can take, with --headroom of its memory left spare and
+--concurrent-invocations messages in flight on one instance.
+
+Usage:
+
+    python -m benchmarks.memory_profile [--rows 1000,10000,100000]
+        [--columns 8] [--renderer pandas] [--output results.json]
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from benchmarks import _support
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+WARMUP_JOB = "memory-warmup"
+MIB = 1024 * 1024
+
+# Memory available to one instance, in MiB
+SKUS: dict[str, int] = {
+    "Consumption": 1536,
+    "Flex Consumption 2 GB": 2048,
+    "Flex Consumption 4 GB": 4096,
+    "Premium EP1": 3584,
+    "Premium EP2": 7168,
+    "Premium EP3": 14336,
+}
+
+
+def job_id(rows: int) -> str:
+    """Job whose report has this many rows"""
+    return f"memory-{rows}"
+
+
+class MemorySpan:
+    """Span that keeps its attributes for the memory record"""
+
+    def __init__(self, attributes: dict[str, Any]):
+        self.attributes = dict(attributes)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Keep the attribute"""
+        self.attributes[key] = value
+
+
+class MemoryTracer:
+    """Tracer recording tracemalloc peak and retained bytes per span
+
+    tracemalloc has a single peak, so it is reset when a span starts and the
+    peak seen by a nested span is carried up to the span enclosing it.
+    """
+
+    def __init__(self) -> None:
+        self.stack: list[dict[str, Any]] = []
+        self.records: list[dict[str, Any]] = []
+
+    @contextlib.contextmanager
+    def start_span(self, name: str, attributes: dict[str, Any]) -> Iterator[Any]:
+        """Measure allocations while the span runs"""
+        current, peak = tracemalloc.get_traced_memory()
+        if self.stack:
+            self.stack[-1]["peak"] = max(self.stack[-1]["peak"], peak)
+        tracemalloc.reset_peak()
+
+        frame: dict[str, Any] = {"start": current, "peak": current}
+        record: dict[str, Any] = {"stage": name, "depth": len(self.stack)}
+        self.records.append(record)  # in start order, so stages nest when listed
+        self.stack.append(frame)
+        span = MemorySpan(attributes)
+        try:
+            yield span
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            self.stack.pop()
+            frame["peak"] = max(frame["peak"], peak)
+            if self.stack:
+                self.stack[-1]["peak"] = max(self.stack[-1]["peak"], frame["peak"])
+            record.update(
+                peak_bytes=frame["peak"] - frame["start"],
+                retained_bytes=current - frame["start"],
+                payload_chars=span.attributes.get("payload_chars"),
+            )
+
+
+def current_rss() -> int:
+    """Resident set size of this process in bytes"""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def peak_rss() -> int:
+    """Highest resident set size of this process so far, in bytes"""
+    import resource
+
+    peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def child(workdir: Path, result_path: Path, rows: int, traced: bool) -> None:
+    """Send one report and measure memory; runs in a fresh interpreter"""
+    _support.configure_environment(workdir)
+
+    from alma_item_checks_notification_service.blueprints.bp_notification import (
+        send_notification,
+    )
+    from alma_item_checks_notification_service.tracing import set_tracer
+
+    _support.install_local_storage(workdir)
+
+    # Load modules, templates and a database connection before measuring
+    send_notification(_support.make_queue_message(WARMUP_JOB))
+    gc.collect()
+
+    tracer = MemoryTracer()
+    if traced:
+        set_tracer(tracer)
+        tracemalloc.start()
+
+    baseline: int = current_rss()
+    start: float = time.perf_counter()
+    send_notification(_support.make_queue_message(job_id(rows)))
+    elapsed_ms: float = (time.perf_counter() - start) * 1000
+
+    if traced:
+        tracemalloc.stop()
+
+    result_path.write_text(
+        json.dumps(
+            {
+                "rows": rows,
+                "traced": traced,
+                "elapsed_ms": elapsed_ms,
+                "baseline_rss_bytes": baseline,
+                "peak_rss_bytes": peak_rss(),
+                "stages": tracer.records,
+            }
+        )
+    )
+
+
+def run_child(workdir: Path, rows: int, traced: bool, env: dict[str, str]) -> dict:
+    """Launch one interpreter and collect its measurements"""
+    result_path: Path = workdir / "result.json"
+    log_path: Path = workdir / "child.log"
+    result_path.unlink(missing_ok=True)
+    with log_path.open("w") as log:
+        completed = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.memory_profile",
+                "--child",
+                str(workdir),
+                str(result_path),
+                str(rows),
+                "1" if traced else "0",
+            ],
+            cwd=REPO_ROOT,
+            env=env,
+            stdout=log,
+            stderr=log,
+        )
+    if completed.returncode != 0:
+        raise SystemExit(f"benchmark run failed:\n{log_path.read_text()[-4000:]}")
+    return json.loads(result_path.read_text())
+
+
+def bytes_per_row(points: list[tuple[int, int]]) -> tuple[float, float]:
+    """Least-squares fit of bytes against rows
+
+    Returns:
+        tuple[float, float]: slope in bytes per row and intercept in bytes
+    """
+    if len(points) == 1:
+        rows, size = points[0]
+        return size / rows, 0.0
+    n: int = len(points)
+    mean_rows: float = sum(rows for rows, _ in points) / n
+    mean_size: float = sum(size for _, size in points) / n
+    covariance: float = sum(
+        (rows - mean_rows) * (size - mean_size) for rows, size in points
+    )
+    variance: float = sum((rows - mean_rows) ** 2 for rows, _ in points)
+    slope: float = covariance / variance if variance else 0.0
+    return slope, mean_size - slope * mean_rows
+
+
+def max_safe_rows(
+    limit_mib: int,
+    headroom: float,
+    baseline_bytes: int,
+    slope: float,
+    intercept: float,
+    concurrent_invocations: int,
+) -> int:
+    """Largest report an instance can take with its invocations all that size"""
+    budget: float = limit_mib * MIB * (1 - headroom) - baseline_bytes
+    per_invocation_rows: float = (
+        (budget / concurrent_invocations - intercept) / slope if slope > 0 else 0
+    )
+    return max(0, int(per_invocation_rows))
+
+
+def main() -> None:
+    """Profile each report size and print per-stage and per-SKU tables"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--rows", default="1000,10000,50000,100000", help="comma-separated"
+    )
+    parser.add_argument("--columns", type=int, default=8)
+    parser.add_argument("--renderer", default="pandas", choices=("pandas", "streaming"))
+    parser.add_argument(
+        "--headroom", type=float, default=0.2, help="share of memory kept spare"
+    )
+    parser.add_argument(
+        "--concurrent-invocations",
+        type=int,
+        default=1,
+        help="messages in flight per instance",
+    )
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--child", nargs=4, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        workdir, result_path, rows, traced = args.child
+        child(Path(workdir), Path(result_path), int(rows), traced == "1")
+        return
+
+    rows_list: list[int] = [int(rows) for rows in args.rows.split(",")]
+    results: list[dict[str, Any]] = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        env: dict[str, str] = {**os.environ}
+        env.update(_support.configure_environment(workdir))
+        env.update(
+            {
+                "HTML_TABLE_RENDERER": args.renderer,
+                "REPORT_PREFETCH_ENABLED": "false",
+                "IDEMPOTENCY_ENABLED": "false",
+                "IMPORT_WARMUP_ENABLED": "false",
+            }
+        )
+
+        _support.seed_database(env["SQLALCHEMY_CONNECTION_STRING"])
+        local_storage = _support.LocalStorageService(workdir / "storage")
+        _support.write_report(
+            local_storage, WARMUP_JOB, _support.make_report(10, args.columns)
+        )
+
+        for rows in rows_list:
+            _support.write_report(
+                local_storage, job_id(rows), _support.make_report(rows, args.columns)
+            )
+            traced: dict = run_child(workdir, rows, True, env)
+            untraced: dict = run_child(workdir, rows, False, env)
+            results.append(
+                {
+                    "rows": rows,
+                    "elapsed_ms": untraced["elapsed_ms"],
+                    "baseline_rss_bytes": untraced["baseline_rss_bytes"],
+                    "peak_rss_bytes": untraced["peak_rss_bytes"],
+                    "rss_increase_bytes": max(
+                        0,
+                        untraced["peak_rss_bytes"] - untraced["baseline_rss_bytes"],
+                    ),
+                    "stages": traced["stages"],
+                }
+            )
+            print(f"profiled {rows} rows", file=sys.stderr)
+
+    print(
+        f"memory profile: {args.columns}-column reports, {args.renderer} renderer; "
+        "peak bytes per row allocated by each stage (tracemalloc)"
+    )
+    stage_names: list[str] = list(
+        dict.fromkeys(
+            f"{'  ' * stage['depth']}{stage['stage']}"
+            for result in results
+            for stage in result["stages"]
+        )
+    )
+    print(f"{'stage':<28}" + "".join(f"{rows:>12}" for rows in rows_list))
+    for name in stage_names:
+        cells: list[str] = []
+        for result in results:
+            stage: dict | None = next(
+                (
+                    stage
+                    for stage in result["stages"]
+                    if f"{'  ' * stage['depth']}{stage['stage']}" == name
+                ),
+                None,
+            )
+            cells.append(
+                f"{stage['peak_bytes'] / result['rows']:12.0f}" if stage else " " * 12
+            )
+        print(f"{name:<28}" + "".join(cells))
+
+    print()
+    print(
+        f"{'rows':>10} {'RSS before MiB':>15} {'RSS peak MiB':>13} "
+        f"{'increase MiB':>13} {'bytes/row':>10} {'time ms':>9}"
+    )
+    for result in results:
+        print(
+            f"{result['rows']:>10} {result['baseline_rss_bytes'] / MIB:15.1f} "
+            f"{result['peak_rss_bytes'] / MIB:13.1f} "
+            f"{result['rss_increase_bytes'] / MIB:13.1f} "
+            f"{result['rss_increase_bytes'] / result['rows']:10.0f} "
+            f"{result['elapsed_ms']:9.1f}"
+        )
+
+    slope, intercept = bytes_per_row(
+        [(result["rows"], result["rss_increase_bytes"]) for result in results]
+    )
+    baseline_bytes: int = max(result["baseline_rss_bytes"] for result in results)
+    safe_rows: dict[str, int] = {
+        sku: max_safe_rows(
+            limit,
+            args.headroom,
+            baseline_bytes,
+            slope,
+            intercept,
+            args.concurrent_invocations,
+        )
+        for sku, limit in SKUS.items()
+    }
+
+    print()
+    print(
+        f"RSS growth {slope:.0f} bytes/row; largest safe report with "
+        f"{args.headroom:.0%} headroom and {args.concurrent_invocations} "
+        "concurrent invocation(s):"
+    )
+    for sku, limit in SKUS.items():
+        print(f"  {sku:<24} {limit:>6} MiB  {safe_rows[sku]:>12,} rows")
+
+    if args.output:
+        args.output.write_text(
+            json.dumps(
+                {
+                    "arguments": {
+                        key: str(value) if isinstance(value, Path) else value
+                        for key, value in vars(args).items()
+                        if key != "child"
+                    },
+                    "bytes_per_row": slope,
+                    "intercept_bytes": intercept,
+                    "max_safe_rows": safe_rows,
+                    "results": results,
+                },
+                indent=2,
+            )
+        )
+        print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
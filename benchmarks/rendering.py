@@ -0,0 +1,309 @@
+"""Rendering microbenchmark: create_html_table and render_email_body
+
+Times both table renderers (pandas and streaming) and the email template on
+synthetic reports of several shapes and sizes:
+
+- narrow: four short item-check columns
+- wide: 40 columns
+- long_text: narrow plus a 1,000-character note with markup characters
+- nulls: eight mixed string/number columns, a third of the cells null
+- zero_column: narrow plus the all-"0" placeholder column the renderer drops
+
+For each case it records wall time over --repeat runs, peak memory allocated
+during one run (tracemalloc, measured separately so it doesn't skew timing)
+and output size. Cases over --max-cells are skipped.
+
+Results can be written as JSON and compared against an earlier run:
+
+    python -m benchmarks.rendering [--rows 10,1000,100000] [--shapes narrow,wide]
+        [--renderers pandas,streaming] [--repeat 5] [--output results.json]
+        [--compare baseline.json]
+"""
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from benchmarks import _support
+
+DEFAULT_ROWS = "10,100,1000,10000,100000,1000000"
+RENDERERS = ("pandas", "streaming")
+WIDE_COLUMNS = 40
+LONG_TEXT = ("Shelf check note <b>&</b> " * 40)[:1000]
+TIMED_CELLS = 1_000_000  # cases larger than this are timed once
+
+
+def narrow_row(r: int) -> dict[str, Any]:
+    """Item-check row with four short columns"""
+    return {
+        "Barcode": f"3{r:013d}",
+        "Title": f"Title of item {r}",
+        "Location": "Main Stacks",
+        "Status": "Missing" if r % 2 else "Damaged",
+    }
+
+
+def wide_row(r: int) -> dict[str, Any]:
+    """Row with many short columns"""
+    return {f"Field {c}": f"value {r}-{c}" for c in range(WIDE_COLUMNS)}
+
+
+def long_text_row(r: int) -> dict[str, Any]:
+    """Narrow row with a long free-text note"""
+    return {**narrow_row(r), "Note": LONG_TEXT}
+
+
+def nulls_row(r: int) -> dict[str, Any]:
+    """Row of mixed strings and numbers where a third of the cells are null"""
+    return {
+        f"Column {c}": None
+        if (r + c) % 3 == 0
+        else (r * c if c % 2 else f"value {r}-{c}")
+        for c in range(8)
+    }
+
+
+def zero_column_row(r: int) -> dict[str, Any]:
+    """Narrow row with the "0" placeholder column"""
+    return {"0": "0", **narrow_row(r)}
+
+
+SHAPES: dict[str, Callable[[int], dict[str, Any]]] = {
+    "narrow": narrow_row,
+    "wide": wide_row,
+    "long_text": long_text_row,
+    "nulls": nulls_row,
+    "zero_column": zero_column_row,
+}
+
+
+def make_report(shape: str, rows: int) -> list[dict[str, Any]]:
+    """Synthetic report of a shape"""
+    make_row = SHAPES[shape]
+    return [make_row(r) for r in range(rows)]
+
+
+def measure(call: Callable[[], Any], repeat: int) -> tuple[list[float], int, Any]:
+    """Time a call, then measure its peak allocation in one more run
+
+    Returns:
+        tuple[list[float], int, Any]: wall times in ms, peak bytes allocated,
+            and the call's result
+    """
+    times: list[float] = []
+    result: Any = None
+    for _ in range(repeat):
+        gc.collect()
+        start: float = time.perf_counter()
+        result = call()
+        times.append((time.perf_counter() - start) * 1000)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return times, peak, result
+
+
+def output_bytes(output: str | None) -> int:
+    """Size of rendered output, UTF-8 encoded"""
+    return len(output.encode("utf-8")) if output else 0
+
+
+def record(
+    function: str,
+    renderer: str,
+    shape: str,
+    rows: int,
+    columns: int,
+    times: list[float],
+    peak: int,
+    size: int,
+) -> dict[str, Any]:
+    """One machine-readable result"""
+    return {
+        "function": function,
+        "renderer": renderer,
+        "shape": shape,
+        "rows": rows,
+        "columns": columns,
+        "repeat": len(times),
+        "wall_ms_min": min(times),
+        "wall_ms_median": statistics.median(times),
+        "wall_ms_max": max(times),
+        "peak_alloc_bytes": peak,
+        "output_bytes": size,
+    }
+
+
+def run_case(
+    service: Any, process: Any, renderer: str, shape: str, rows: int, repeat: int
+) -> list[dict[str, Any]]:
+    """Benchmark the table and the email body for one report"""
+    report: list[dict[str, Any]] = make_report(shape, rows)
+    columns: int = len(report[0]) if report else 0
+    repeat = max(1, repeat if rows * columns <= TIMED_CELLS else 1)
+
+    with patch(
+        "alma_item_checks_notification_service.services.notification_service.HTML_TABLE_RENDERER",
+        renderer,
+    ):
+        table_times, table_peak, html_table = measure(
+            lambda: service.create_html_table(report=report, process=process), repeat
+        )
+
+    body_times, body_peak, body = measure(
+        lambda: service.render_email_body(
+            template_name="email_template.html.j2",
+            process=process,
+            html_table=html_table,
+        ),
+        repeat,
+    )
+
+    return [
+        record(
+            "create_html_table",
+            renderer,
+            shape,
+            rows,
+            columns,
+            table_times,
+            table_peak,
+            output_bytes(html_table),
+        ),
+        record(
+            "render_email_body",
+            renderer,
+            shape,
+            rows,
+            columns,
+            body_times,
+            body_peak,
+            output_bytes(body),
+        ),
+    ]
+
+
+def result_key(result: dict[str, Any]) -> tuple:
+    """Identity of a case, for comparing runs"""
+    return result["function"], result["renderer"], result["shape"], result["rows"]
+
+
+def format_result(result: dict[str, Any], baseline: dict[str, Any] | None) -> str:
+    """One report line, with the change from the baseline if there is one"""
+    line: str = (
+        f"{result['function']:<18} {result['renderer']:<9} {result['shape']:<11} "
+        f"{result['rows']:>8} rows  median {result['wall_ms_median']:10.2f} ms  "
+        f"peak {result['peak_alloc_bytes'] / 1024 / 1024:8.2f} MiB  "
+        f"out {result['output_bytes'] / 1024:10.1f} KiB"
+    )
+    if baseline:
+        change: float = (
+            result["wall_ms_median"] / baseline["wall_ms_median"] - 1
+            if baseline["wall_ms_median"]
+            else 0.0
+        )
+        line += f"  {change:+7.1%} vs baseline"
+    return line
+
+
+def environment() -> dict[str, Any]:
+    """Versions and platform recorded with the results"""
+    import jinja2
+    import pandas
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "pandas": pandas.__version__,
+        "jinja2": jinja2.__version__,
+    }
+
+
+def main() -> None:
+    """Run the benchmark, print a table and optionally save JSON results"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", default=DEFAULT_ROWS, help="comma-separated")
+    parser.add_argument("--shapes", default=",".join(SHAPES), help="comma-separated")
+    parser.add_argument(
+        "--renderers", default=",".join(RENDERERS), help="comma-separated"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case")
+    parser.add_argument(
+        "--max-cells", type=int, default=10_000_000, help="skip larger reports"
+    )
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--compare", type=Path, help="JSON results to compare with")
+    args = parser.parse_args()
+
+    rows_list: list[int] = [int(rows) for rows in args.rows.split(",")]
+    shapes: list[str] = args.shapes.split(",")
+    renderers: list[str] = args.renderers.split(",")
+    for shape in shapes:
+        if shape not in SHAPES:
+            parser.error(f"unknown shape {shape}; choose from {', '.join(SHAPES)}")
+
+    baseline: dict[tuple, dict[str, Any]] = {}
+    if args.compare:
+        baseline = {
+            result_key(result): result
+            for result in json.loads(args.compare.read_text())["results"]
+        }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        _support.configure_environment(workdir)
+        _support.install_local_storage(workdir)
+
+        from alma_item_checks_notification_service.models.process import Process
+        from alma_item_checks_notification_service.services.notification_service import (
+            NotificationService,
+        )
+
+        service = NotificationService()
+        process = Process(
+            name=_support.PROCESS_NAME,
+            email_subject="Benchmark report",
+            email_body="Items needing attention are listed below.",
+            email_addendum="Generated by the benchmark harness.",
+        )
+
+        results: list[dict[str, Any]] = []
+        for shape in shapes:
+            columns: int = len(SHAPES[shape](0))
+            for rows in rows_list:
+                if rows * columns > args.max_cells:
+                    print(f"skipped {shape} {rows} rows: over --max-cells")
+                    continue
+                for renderer in renderers:
+                    for result in run_case(
+                        service, process, renderer, shape, rows, args.repeat
+                    ):
+                        results.append(result)
+                        print(format_result(result, baseline.get(result_key(result))))
+
+    if args.output:
+        args.output.write_text(
+            json.dumps({"environment": environment(), "results": results}, indent=2)
+        )
+        print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,58 @@
 
 import azure.functions as func
 
-from alma_item_checks_notification_service.blueprints.bp_notification import (
-    bp as bp_notification,
+from alma_item_checks_notification_service.config import (
+    DIGEST_FLUSH_ENABLED,
+    IDEMPOTENCY_ENABLED,
+    IMPORT_WARMUP_ENABLED,
+    NOTIFICATION_ASYNC_ENABLED,
+    NOTIFICATION_BATCH_ENABLED,
+    RECIPIENT_TABLE_REBUILD_ENABLED,
 )
+from alma_item_checks_notification_service.lazy_imports import warm_imports
+from alma_item_checks_notification_service.tracing import configure_tracing
+
+configure_tracing()  # before any spans are recorded
 
 app = func.FunctionApp()
 
+# One consumer of the notification queue: a timer draining it in batches, or a
+# queue trigger per message
+if NOTIFICATION_BATCH_ENABLED:
+    from alma_item_checks_notification_service.blueprints.bp_notification_batch import (
+        bp as bp_notification,
+    )
+elif NOTIFICATION_ASYNC_ENABLED:
+    from alma_item_checks_notification_service.blueprints.bp_notification_async import (
+        bp as bp_notification,
+    )
+else:
+    from alma_item_checks_notification_service.blueprints.bp_notification import (
+        bp as bp_notification,
+    )
+
 app.register_blueprint(bp_notification)
+
+if DIGEST_FLUSH_ENABLED:
+    from alma_item_checks_notification_service.blueprints.bp_digest import (
+        bp as bp_digest,
+    )
+
+    app.register_blueprint(bp_digest)
+
+if RECIPIENT_TABLE_REBUILD_ENABLED:
+    from alma_item_checks_notification_service.blueprints.bp_recipients import (
+        bp as bp_recipients,
+    )
+
+    app.register_blueprint(bp_recipients)
+
+if IDEMPOTENCY_ENABLED:
+    from alma_item_checks_notification_service.blueprints.bp_processed_jobs import (
+        bp as bp_processed_jobs,
+    )
+
+    app.register_blueprint(bp_processed_jobs)
+
+if IMPORT_WARMUP_ENABLED:
+    warm_imports()  # load deferred dependencies in the background once indexed
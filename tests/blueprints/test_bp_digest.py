@@ -0,0 +1,31 @@
+"""Tests for bp_digest blueprint"""
+
+from unittest.mock import Mock, patch
+
+from alma_item_checks_notification_service.blueprints.bp_digest import flush_digests
+
+
+class TestBpDigest:
+    """Tests for bp_digest blueprint"""
+
+    @patch("alma_item_checks_notification_service.blueprints.bp_digest.SessionMaker")
+    @patch(
+        "alma_item_checks_notification_service.blueprints.bp_digest.NotificationService"
+    )
+    def test_flush_digests(self, mock_notification_service_class, mock_session_maker):
+        """Test the timer flushes due digests in one session"""
+        mock_session = Mock()
+        mock_session_maker.return_value.__enter__.return_value = mock_session
+        mock_notification_service_class.return_value.flush_digests.return_value = 2
+
+        with patch(
+            "alma_item_checks_notification_service.blueprints.bp_digest.logging"
+        ) as mock_logging:
+            flush_digests(Mock())
+
+            mock_logging.info.assert_called_once_with("flush_digests: sent 2 digests")
+
+        mock_notification_service_class.assert_called_once_with()
+        mock_notification_service_class.return_value.flush_digests.assert_called_once_with(
+            mock_session
+        )
@@ -0,0 +1,35 @@
+"""Tests for bp_notification_async blueprint"""
+
+import asyncio
+import inspect
+from unittest.mock import AsyncMock, Mock, patch
+
+import azure.functions as func
+
+from alma_item_checks_notification_service.blueprints.bp_notification_async import (
+    send_notification,
+)
+
+
+class TestBpNotificationAsync:
+    """Tests for bp_notification_async blueprint"""
+
+    def test_send_notification_returns_coroutine(self):
+        """Test send_notification runs on the event loop"""
+        result = send_notification(Mock(spec=func.QueueMessage))
+
+        assert inspect.iscoroutine(result)
+        result.close()
+
+    @patch(
+        "alma_item_checks_notification_service.blueprints.bp_notification_async.AsyncNotificationService"
+    )
+    def test_send_notification(self, mock_service_class):
+        """Test send_notification awaits the async service"""
+        mock_message = Mock(spec=func.QueueMessage)
+        mock_service_class.return_value.send_notification_async = AsyncMock()
+
+        asyncio.run(send_notification(mock_message))
+
+        mock_service_class.assert_called_once_with(mock_message)
+        mock_service_class.return_value.send_notification_async.assert_awaited_once()
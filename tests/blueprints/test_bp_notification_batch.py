@@ -0,0 +1,38 @@
+"""Tests for bp_notification_batch blueprint"""
+
+from unittest.mock import Mock, patch
+
+from alma_item_checks_notification_service.blueprints.bp_notification_batch import (
+    drain_notification_batch_queue,
+)
+
+
+class TestBpNotificationBatch:
+    """Tests for bp_notification_batch blueprint"""
+
+    @patch(
+        "alma_item_checks_notification_service.blueprints.bp_notification_batch.get_queue_client"
+    )
+    @patch(
+        "alma_item_checks_notification_service.blueprints.bp_notification_batch.SessionMaker"
+    )
+    @patch(
+        "alma_item_checks_notification_service.blueprints.bp_notification_batch.BatchNotificationService"
+    )
+    def test_drain_notification_batch_queue(
+        self, mock_batch_service_class, mock_session_maker, mock_get_queue_client
+    ):
+        """Test the timer drains the notification queue in one session"""
+        mock_session = Mock()
+        mock_session_maker.return_value.__enter__.return_value = mock_session
+        mock_get_queue_client.side_effect = lambda name: name
+
+        drain_notification_batch_queue(Mock())
+
+        mock_batch_service_class.assert_called_once_with(mock_session)
+        mock_batch_service_class.return_value.drain_queue.assert_called_once_with(
+            queue_client="notification-queue",
+            poison_queue_client="notification-queue-poison",
+            batch_size=256,
+            max_messages=5000,
+        )
@@ -0,0 +1,35 @@
+"""Tests for bp_processed_jobs blueprint"""
+
+from unittest.mock import Mock, patch
+
+from alma_item_checks_notification_service.blueprints.bp_processed_jobs import (
+    purge_processed_jobs,
+)
+
+
+class TestBpProcessedJobs:
+    """Tests for bp_processed_jobs blueprint"""
+
+    @patch(
+        "alma_item_checks_notification_service.blueprints.bp_processed_jobs.SessionMaker"
+    )
+    @patch(
+        "alma_item_checks_notification_service.blueprints.bp_processed_jobs.ProcessedJobService"
+    )
+    def test_purge_processed_jobs(self, mock_service_class, mock_session_maker):
+        """Test the timer purges old job records in one session"""
+        mock_session = Mock()
+        mock_session_maker.return_value.__enter__.return_value = mock_session
+        mock_service_class.return_value.purge.return_value = 40
+
+        with patch(
+            "alma_item_checks_notification_service.blueprints.bp_processed_jobs.logging"
+        ) as mock_logging:
+            purge_processed_jobs(Mock())
+
+            mock_logging.info.assert_called_once_with(
+                "purge_processed_jobs: deleted 40 job records"
+            )
+
+        mock_service_class.assert_called_once_with(mock_session)
+        mock_service_class.return_value.purge.assert_called_once_with()
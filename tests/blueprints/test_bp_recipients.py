@@ -0,0 +1,35 @@
+"""Tests for bp_recipients blueprint"""
+
+from unittest.mock import Mock, patch
+
+from alma_item_checks_notification_service.blueprints.bp_recipients import (
+    rebuild_recipients,
+)
+
+
+class TestBpRecipients:
+    """Tests for bp_recipients blueprint"""
+
+    @patch(
+        "alma_item_checks_notification_service.blueprints.bp_recipients.SessionMaker"
+    )
+    @patch(
+        "alma_item_checks_notification_service.blueprints.bp_recipients.UserProcessService"
+    )
+    def test_rebuild_recipients(self, mock_service_class, mock_session_maker):
+        """Test the timer rebuilds the recipient table in one session"""
+        mock_session = Mock()
+        mock_session_maker.return_value.__enter__.return_value = mock_session
+        mock_service_class.return_value.rebuild_recipients.return_value = 12
+
+        with patch(
+            "alma_item_checks_notification_service.blueprints.bp_recipients.logging"
+        ) as mock_logging:
+            rebuild_recipients(Mock())
+
+            mock_logging.info.assert_called_once_with(
+                "rebuild_recipients: wrote 12 recipients"
+            )
+
+        mock_service_class.assert_called_once_with(mock_session)
+        mock_service_class.return_value.rebuild_recipients.assert_called_once_with()
@@ -1,5 +1,6 @@
 """Pytest configuration and fixtures"""
 
+import contextlib
 import json
 import tempfile
 from pathlib import Path
@@ -13,6 +14,7 @@ from alma_item_checks_notification_service.models.base import Base
 from alma_item_checks_notification_service.models.user import User
 from alma_item_checks_notification_service.models.process import Process
 from alma_item_checks_notification_service.models.user_process import UserProcess
+from alma_item_checks_notification_service.tracing import set_tracer
 
 
 @pytest.fixture(scope="function")
@@ -155,3 +157,46 @@ def reset_global_variables():
     yield
     db_module._db_engine = None
     db_module._session_maker = None
+
+
+@pytest.fixture(autouse=True)
+def clear_worker_caches():
+    """Clear worker-wide caches so cached lookups don't leak between tests"""
+    from alma_item_checks_notification_service.services.process_service import (
+        invalidate_process_cache,
+    )
+    from alma_item_checks_notification_service.services.user_process_service import (
+        invalidate_recipient_cache,
+    )
+
+    invalidate_process_cache()
+    invalidate_recipient_cache()
+    yield
+    invalidate_process_cache()
+    invalidate_recipient_cache()
+
+
+class RecordingTracer:
+    """Tracer that keeps each span's name and attributes"""
+
+    def __init__(self):
+        self.spans: list[tuple[str, dict]] = []
+
+    @contextlib.contextmanager
+    def start_span(self, name, attributes):
+        """Record the span; attributes set on it update the record"""
+        recorded = Mock()
+        recorded.set_attribute.side_effect = lambda key, value: attributes.update(
+            {key: value}
+        )
+        self.spans.append((name, attributes))
+        yield recorded
+
+
+@pytest.fixture
+def recording_tracer():
+    """Record spans for the duration of a test"""
+    tracer = RecordingTracer()
+    set_tracer(tracer)
+    yield tracer
+    set_tracer(None)
@@ -1,6 +1,6 @@
 """Tests for base model"""
 
-from alma_item_checks_notification_service.models.base import Base
+from alma_item_checks_notification_service.models.base import Base, utcnow
 
 
 class TestBase:
@@ -16,3 +16,7 @@ class TestBase:
         from sqlalchemy.orm import DeclarativeBase
 
         assert issubclass(Base, DeclarativeBase)
+
+    def test_utcnow_is_naive(self):
+        """Test timestamps are stored as naive UTC"""
+        assert utcnow().tzinfo is None
@@ -0,0 +1,29 @@
+"""Tests for DigestEntry model"""
+
+from datetime import datetime
+
+from alma_item_checks_notification_service.models.digest_entry import DigestEntry
+
+
+class TestDigestEntry:
+    """Tests for DigestEntry model"""
+
+    def test_digest_entry_creation(self, db_session, sample_process):
+        """Test DigestEntry model creation"""
+        entry = DigestEntry(
+            process_id=sample_process.id,
+            institution_id=123,
+            job_id="job-1",
+            row_count=10,
+            created_at=datetime(2026, 1, 1, 12, 0),
+        )
+        db_session.add(entry)
+        db_session.commit()
+
+        assert entry.id is not None
+        assert entry.job_id == "job-1"
+        assert entry.created_at == datetime(2026, 1, 1, 12, 0)
+
+    def test_digest_entry_table_name(self):
+        """Test DigestEntry model table name"""
+        assert DigestEntry.__tablename__ == "digest_entry"
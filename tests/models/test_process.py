@@ -1,6 +1,7 @@
 """Tests for Process model"""
 
 import pytest
+from sqlalchemy.exc import IntegrityError
 
 from alma_item_checks_notification_service.models.process import Process
 
@@ -69,3 +70,23 @@ class TestProcess:
         db_session.add(process)
         with pytest.raises(Exception):  # Should raise integrity error
             db_session.commit()
+
+    def test_process_digest_defaults(self, db_session):
+        """Test digest mode is off by default and uses the global window and cap"""
+        process = Process(name="digest", email_subject="Subject", email_body="Body")
+        db_session.add(process)
+        db_session.commit()
+
+        assert process.digest_enabled is False
+        assert process.digest_window_minutes is None
+        assert process.digest_max_rows is None
+        assert process.attachment_threshold_rows is None
+
+    def test_process_name_unique(self, db_session):
+        """Test two processes cannot share a name"""
+        db_session.add(Process(name="dup", email_subject="Subject", email_body="Body"))
+        db_session.commit()
+
+        db_session.add(Process(name="dup", email_subject="Other", email_body="Body"))
+        with pytest.raises(IntegrityError):
+            db_session.commit()
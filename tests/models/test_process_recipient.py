@@ -0,0 +1,48 @@
+"""Tests for ProcessRecipient model"""
+
+import pytest
+
+from alma_item_checks_notification_service.models.process_recipient import (
+    ProcessRecipient,
+)
+
+
+class TestProcessRecipient:
+    """Tests for ProcessRecipient model"""
+
+    def test_process_recipient_creation(self, db_session, sample_process):
+        """Test ProcessRecipient model creation"""
+        recipient = ProcessRecipient(
+            process_id=sample_process.id, institution_id=123, email="a@example.com"
+        )
+        db_session.add(recipient)
+        db_session.commit()
+
+        assert db_session.get(
+            ProcessRecipient, (sample_process.id, 123, "a@example.com")
+        )
+
+    def test_process_recipient_table_name(self):
+        """Test ProcessRecipient model table name"""
+        assert ProcessRecipient.__tablename__ == "process_recipient"
+
+    def test_process_recipient_primary_key(self):
+        """Test the primary key leads with the lookup columns"""
+        assert [column.name for column in ProcessRecipient.__table__.primary_key] == [
+            "process_id",
+            "institution_id",
+            "email",
+        ]
+
+    def test_process_recipient_duplicate(self, db_session, sample_process):
+        """Test a recipient is listed once per process and institution"""
+        for _ in range(2):
+            db_session.add(
+                ProcessRecipient(
+                    process_id=sample_process.id,
+                    institution_id=123,
+                    email="a@example.com",
+                )
+            )
+        with pytest.raises(Exception):
+            db_session.commit()
@@ -0,0 +1,28 @@
+"""Tests for ProcessedJob model"""
+
+from datetime import datetime
+
+import pytest
+
+from alma_item_checks_notification_service.models.processed_job import ProcessedJob
+
+
+class TestProcessedJob:
+    """Tests for ProcessedJob model"""
+
+    def test_processed_job_creation(self, db_session):
+        """Test ProcessedJob model creation"""
+        job = ProcessedJob(job_id="job-1", claimed_at=datetime(2026, 1, 1))
+        db_session.add(job)
+        db_session.commit()
+
+        assert job.completed_at is None
+
+    def test_processed_job_unique(self, db_session):
+        """Test a job can only be recorded once"""
+        db_session.add(ProcessedJob(job_id="job-1", claimed_at=datetime(2026, 1, 1)))
+        db_session.commit()
+
+        db_session.add(ProcessedJob(job_id="job-1", claimed_at=datetime(2026, 1, 2)))
+        with pytest.raises(Exception):
+            db_session.commit()
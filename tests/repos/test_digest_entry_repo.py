@@ -0,0 +1,149 @@
+"""Tests for DigestEntryRepository"""
+
+from datetime import datetime
+from unittest.mock import patch
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from alma_item_checks_notification_service.models.digest_entry import DigestEntry
+from alma_item_checks_notification_service.models.process import Process
+from alma_item_checks_notification_service.repos.digest_entry_repo import (
+    DigestEntryRepository,
+)
+
+T0 = datetime(2026, 1, 1, 12, 0)
+
+
+def _entry(process_id, institution_id=123, job_id="job", row_count=1, minute=0):
+    """Build a digest entry"""
+    return DigestEntry(
+        process_id=process_id,
+        institution_id=institution_id,
+        job_id=job_id,
+        row_count=row_count,
+        created_at=T0.replace(minute=minute),
+    )
+
+
+class TestDigestEntryRepository:
+    """Tests for DigestEntryRepository"""
+
+    def test_add_and_get_entries(self, db_session, sample_process):
+        """Test entries are stored and returned oldest first for their group"""
+        repo = DigestEntryRepository(db_session)
+
+        assert repo.add_entries(
+            [
+                _entry(sample_process.id, job_id="a"),
+                _entry(sample_process.id, institution_id=456, job_id="other"),
+                _entry(sample_process.id, job_id="b"),
+            ]
+        )
+
+        entries = repo.get_entries(sample_process.id, 123)
+        assert [entry.job_id for entry in entries] == ["a", "b"]
+
+    @patch("alma_item_checks_notification_service.repos.digest_entry_repo.logging")
+    def test_add_entries_sqlalchemy_error(self, mock_logging, db_session):
+        """Test add_entries rolls back and reports failure"""
+        repo = DigestEntryRepository(db_session)
+
+        with patch.object(db_session, "commit", side_effect=SQLAlchemyError("boom")):
+            with patch.object(db_session, "rollback") as mock_rollback:
+                assert repo.add_entries([_entry(1)]) is False
+                mock_rollback.assert_called_once()
+
+        mock_logging.error.assert_called_with(
+            "DigestEntryRepository.add_entries: SQLAlchemyError: boom"
+        )
+
+    @patch("alma_item_checks_notification_service.repos.digest_entry_repo.logging")
+    def test_add_entries_general_exception(self, mock_logging, db_session):
+        """Test add_entries handles general exceptions"""
+        repo = DigestEntryRepository(db_session)
+
+        with patch.object(db_session, "add_all", side_effect=Exception("boom")):
+            assert repo.add_entries([_entry(1)]) is False
+
+        mock_logging.error.assert_called_with(
+            "DigestEntryRepository.add_entries: Exception: boom"
+        )
+
+    @patch("alma_item_checks_notification_service.repos.digest_entry_repo.logging")
+    def test_get_entries_errors(self, mock_logging, db_session):
+        """Test get_entries returns None on errors"""
+        repo = DigestEntryRepository(db_session)
+
+        with patch.object(db_session, "execute", side_effect=SQLAlchemyError("boom")):
+            assert repo.get_entries(1, 123) is None
+        with patch.object(db_session, "execute", side_effect=Exception("boom")):
+            assert repo.get_entries(1, 123) is None
+
+        assert mock_logging.error.call_count == 2
+
+    def test_get_pending_groups(self, db_session, sample_process):
+        """Test buffered jobs are summarized per process and institution"""
+        sample_process.digest_window_minutes = 30
+        other = Process(
+            name="other", email_subject="s", email_body="b", digest_max_rows=50
+        )
+        db_session.add(other)
+        db_session.commit()
+        repo = DigestEntryRepository(db_session)
+        repo.add_entries(
+            [
+                _entry(sample_process.id, row_count=3, minute=5),
+                _entry(sample_process.id, row_count=4, minute=1),
+                _entry(sample_process.id, institution_id=456, row_count=2),
+                _entry(other.id, row_count=7),
+            ]
+        )
+
+        groups = {
+            (row.process_id, row.institution_id): row
+            for row in repo.get_pending_groups()
+        }
+
+        assert len(groups) == 3
+        group = groups[(sample_process.id, 123)]
+        assert (group.oldest, group.row_count, group.job_count) == (
+            T0.replace(minute=1),
+            7,
+            2,
+        )
+        assert (group.digest_window_minutes, group.digest_max_rows) == (30, None)
+        assert groups[(other.id, 123)].digest_max_rows == 50
+
+    @patch("alma_item_checks_notification_service.repos.digest_entry_repo.logging")
+    def test_get_pending_groups_errors(self, mock_logging, db_session):
+        """Test get_pending_groups returns None on errors"""
+        repo = DigestEntryRepository(db_session)
+
+        with patch.object(db_session, "execute", side_effect=SQLAlchemyError("boom")):
+            assert repo.get_pending_groups() is None
+        with patch.object(db_session, "execute", side_effect=Exception("boom")):
+            assert repo.get_pending_groups() is None
+
+        assert mock_logging.error.call_count == 2
+
+    def test_claim_entries(self, db_session, sample_process):
+        """Test only entries still present are claimed"""
+        repo = DigestEntryRepository(db_session)
+        repo.add_entries([_entry(sample_process.id, job_id=str(i)) for i in range(3)])
+        ids = [entry.id for entry in repo.get_entries(sample_process.id, 123)]
+
+        assert repo.claim_entries(ids[:1]) == ids[:1]
+        assert repo.claim_entries(ids) == ids[1:]
+        assert repo.get_entries(sample_process.id, 123) == []
+
+    @patch("alma_item_checks_notification_service.repos.digest_entry_repo.logging")
+    def test_claim_entries_errors(self, mock_logging, db_session):
+        """Test claim_entries rolls back and returns None on errors"""
+        repo = DigestEntryRepository(db_session)
+
+        with patch.object(db_session, "execute", side_effect=SQLAlchemyError("boom")):
+            assert repo.claim_entries([1]) is None
+        with patch.object(db_session, "execute", side_effect=Exception("boom")):
+            assert repo.claim_entries([1]) is None
+
+        assert mock_logging.error.call_count == 2
@@ -0,0 +1,137 @@
+"""Tests for ProcessRecipientRepository"""
+
+from unittest.mock import patch
+
+import pytest
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from alma_item_checks_notification_service.models.process import Process
+from alma_item_checks_notification_service.models.process_recipient import (
+    ProcessRecipient,
+)
+from alma_item_checks_notification_service.models.user import User
+from alma_item_checks_notification_service.models.user_process import UserProcess
+from alma_item_checks_notification_service.repos.process_recipient_repo import (
+    ProcessRecipientRepository,
+)
+
+
+def seed_subscriptions(db_session) -> None:
+    """Two processes with users at two institutions"""
+    db_session.add_all(
+        [
+            Process(id=1, name="one", email_subject="Subject", email_body="Body"),
+            Process(id=2, name="two", email_subject="Subject", email_body="Body"),
+            User(id=1, email="a@example.com", institution_id=123),
+            User(id=2, email="b@example.com", institution_id=123),
+            User(id=3, email="c@example.com", institution_id=456),
+        ]
+    )
+    db_session.flush()
+    db_session.add_all(
+        [
+            UserProcess(user_id=1, process_id=1),
+            UserProcess(user_id=2, process_id=1),
+            UserProcess(user_id=3, process_id=1),
+            UserProcess(user_id=1, process_id=2),
+        ]
+    )
+    db_session.commit()
+
+
+class TestProcessRecipientRepository:
+    """Tests for ProcessRecipientRepository"""
+
+    def test_init(self, db_session):
+        """Test ProcessRecipientRepository initialization"""
+        repo = ProcessRecipientRepository(db_session)
+        assert repo.session is db_session
+
+    def test_rebuild_all(self, db_session):
+        """Test rebuild derives every recipient from user_process and user"""
+        seed_subscriptions(db_session)
+        repo = ProcessRecipientRepository(db_session)
+
+        assert repo.rebuild() == 4
+        assert sorted(repo.get_recipient_emails(1, 123)) == [
+            "a@example.com",
+            "b@example.com",
+        ]
+        assert repo.get_recipient_emails(1, 456) == ["c@example.com"]
+        assert repo.get_recipient_emails(2, 123) == ["a@example.com"]
+        assert repo.get_recipient_emails(2, 456) == []
+
+    def test_rebuild_replaces_stale_rows(self, db_session):
+        """Test rebuild drops recipients no longer subscribed"""
+        seed_subscriptions(db_session)
+        db_session.add(
+            ProcessRecipient(process_id=2, institution_id=456, email="old@example.com")
+        )
+        db_session.commit()
+        repo = ProcessRecipientRepository(db_session)
+
+        repo.rebuild()
+
+        assert repo.get_recipient_emails(2, 456) == []
+
+    def test_rebuild_one_process(self, db_session):
+        """Test rebuild of one process leaves the others alone"""
+        seed_subscriptions(db_session)
+        db_session.add(
+            ProcessRecipient(process_id=2, institution_id=456, email="old@example.com")
+        )
+        db_session.commit()
+        repo = ProcessRecipientRepository(db_session)
+
+        assert repo.rebuild(1) == 3
+        assert repo.get_recipient_emails(2, 456) == ["old@example.com"]
+
+    def test_rebuild_matches_join(self, db_session):
+        """Test the table agrees with the joined recipient query"""
+        from alma_item_checks_notification_service.repos.user_process_repo import (
+            UserProcessRepository,
+        )
+
+        seed_subscriptions(db_session)
+        repo = ProcessRecipientRepository(db_session)
+        repo.rebuild()
+
+        for process_id in (1, 2):
+            for institution_id in (123, 456):
+                assert sorted(
+                    repo.get_recipient_emails(process_id, institution_id)
+                ) == sorted(
+                    UserProcessRepository(db_session).get_user_emails_for_process(
+                        process_id, institution_id
+                    )
+                )
+
+    @pytest.mark.parametrize(
+        "error", [SQLAlchemyError("Database error"), Exception("boom")]
+    )
+    def test_rebuild_error_rolls_back(self, error, db_session):
+        """Test rebuild returns None and rolls back on errors"""
+        repo = ProcessRecipientRepository(db_session)
+
+        with patch.object(db_session, "execute", side_effect=error):
+            with patch.object(db_session, "rollback") as mock_rollback:
+                with patch(
+                    "alma_item_checks_notification_service.repos.process_recipient_repo.logging"
+                ) as mock_logging:
+                    assert repo.rebuild() is None
+
+                    mock_rollback.assert_called_once()
+                    mock_logging.error.assert_called_once()
+
+    def test_get_recipient_emails_error(self, db_session):
+        """Test get_recipient_emails returns None on database errors"""
+        repo = ProcessRecipientRepository(db_session)
+
+        with patch.object(
+            db_session, "execute", side_effect=SQLAlchemyError("Database error")
+        ):
+            assert repo.get_recipient_emails(1, 123) is None
+
+        with patch.object(db_session, "execute", side_effect=Exception("boom")):
+            assert repo.get_recipient_emails(1, 123) is None
@@ -195,3 +195,43 @@ class TestProcessRepository:
         assert found_process1.name == "process1"
         assert found_process2.name == "process2"
         assert found_process1.id != found_process2.id
+
+    def test_get_process_by_id_success(self, db_session, sample_process):
+        """Test get_process_by_id returns the process"""
+        repo = ProcessRepository(db_session)
+
+        assert repo.get_process_by_id(sample_process.id) is sample_process
+
+    @patch("alma_item_checks_notification_service.repos.process_repo.logging")
+    def test_get_process_by_id_not_found(self, mock_logging, db_session):
+        """Test get_process_by_id logs and returns None for a missing process"""
+        repo = ProcessRepository(db_session)
+
+        assert repo.get_process_by_id(999) is None
+        mock_logging.error.assert_called_with(
+            "ProcessRepository.get_process_by_id: process 999 not found"
+        )
+
+    @patch("alma_item_checks_notification_service.repos.process_repo.logging")
+    def test_get_process_by_id_sqlalchemy_error(self, mock_logging, db_session):
+        """Test get_process_by_id handles SQLAlchemyError"""
+        repo = ProcessRepository(db_session)
+
+        with patch.object(db_session, "get", side_effect=SQLAlchemyError("boom")):
+            assert repo.get_process_by_id(1) is None
+
+        mock_logging.error.assert_called_with(
+            "ProcessRepository.get_process_by_id: SQLAlchemyError: boom"
+        )
+
+    @patch("alma_item_checks_notification_service.repos.process_repo.logging")
+    def test_get_process_by_id_general_exception(self, mock_logging, db_session):
+        """Test get_process_by_id handles general exceptions"""
+        repo = ProcessRepository(db_session)
+
+        with patch.object(db_session, "get", side_effect=Exception("boom")):
+            assert repo.get_process_by_id(1) is None
+
+        mock_logging.error.assert_called_with(
+            "ProcessRepository.get_process_by_id: Exception: boom"
+        )
@@ -0,0 +1,105 @@
+"""Tests for ProcessedJobRepository"""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+
+from alma_item_checks_notification_service.models.processed_job import ProcessedJob
+from alma_item_checks_notification_service.repos.processed_job_repo import (
+    ProcessedJobRepository,
+)
+
+T0 = datetime(2026, 1, 1, 12, 0)
+
+
+class TestProcessedJobRepository:
+    """Tests for ProcessedJobRepository"""
+
+    def test_insert_claim(self, db_session):
+        """Test a job can be claimed only once"""
+        repo = ProcessedJobRepository(db_session)
+
+        assert repo.insert_claim("job-1", T0) is True
+        assert repo.insert_claim("job-1", T0) is False
+        assert db_session.get(ProcessedJob, "job-1").claimed_at == T0
+
+    def test_take_over_claim(self, db_session):
+        """Test only stale, unfinished claims can be taken over"""
+        repo = ProcessedJobRepository(db_session)
+        repo.insert_claim("job-1", T0)
+
+        assert not repo.take_over_claim("job-1", T0, T0 + timedelta(minutes=1))
+        assert repo.take_over_claim(
+            "job-1", T0 + timedelta(seconds=1), T0 + timedelta(minutes=1)
+        )
+        assert db_session.get(ProcessedJob, "job-1").claimed_at == T0 + timedelta(
+            minutes=1
+        )
+
+        repo.mark_completed("job-1", T0)
+        assert not repo.take_over_claim("job-1", T0 + timedelta(hours=1), T0)
+
+    def test_mark_completed(self, db_session):
+        """Test a claimed job is marked completed"""
+        repo = ProcessedJobRepository(db_session)
+        repo.insert_claim("job-1", T0)
+
+        assert repo.mark_completed("job-1", T0 + timedelta(seconds=5))
+        assert not repo.mark_completed("unknown", T0)
+        assert db_session.get(ProcessedJob, "job-1").completed_at == T0 + timedelta(
+            seconds=5
+        )
+
+    def test_get_job(self, db_session):
+        """Test a job's record is returned, or None if it has none"""
+        repo = ProcessedJobRepository(db_session)
+        repo.insert_claim("job-1", T0)
+
+        assert repo.get_job("job-1").claimed_at == T0
+        assert repo.get_job("job-2") is None
+
+    def test_delete_claim(self, db_session):
+        """Test only unfinished claims are deleted"""
+        repo = ProcessedJobRepository(db_session)
+        repo.insert_claim("job-1", T0)
+        repo.insert_claim("job-2", T0)
+        repo.mark_completed("job-2", T0)
+
+        assert repo.delete_claim("job-1")
+        assert not repo.delete_claim("job-2")
+        assert db_session.get(ProcessedJob, "job-1") is None
+
+    def test_purge(self, db_session):
+        """Test finished and abandoned records before the cutoff are deleted"""
+        repo = ProcessedJobRepository(db_session)
+        repo.insert_claim("old-completed", T0)
+        repo.mark_completed("old-completed", T0)
+        repo.insert_claim("old-abandoned", T0)
+        repo.insert_claim("recent-completed", T0)
+        repo.mark_completed("recent-completed", T0 + timedelta(days=2))
+        repo.insert_claim("recent-claim", T0 + timedelta(days=2))
+
+        assert repo.purge(T0 + timedelta(days=1)) == 2
+        assert {job.job_id for job in db_session.query(ProcessedJob)} == {
+            "recent-completed",
+            "recent-claim",
+        }
+
+    @pytest.mark.parametrize("error", [SQLAlchemyError("boom"), Exception("boom")])
+    @patch("alma_item_checks_notification_service.repos.processed_job_repo.logging")
+    def test_errors(self, mock_logging, error, db_session):
+        """Test database errors are logged and reported as failures"""
+        repo = ProcessedJobRepository(db_session)
+
+        with patch.object(db_session, "commit", side_effect=error):
+            assert repo.insert_claim("job-1", T0) is None
+        with patch.object(db_session, "execute", side_effect=error):
+            assert repo.get_job("job-1") is None
+            assert repo.take_over_claim("job-1", T0, T0) is False
+            assert repo.mark_completed("job-1", T0) is False
+            assert repo.delete_claim("job-1") is False
+            assert repo.purge(T0) is None
+
+        assert mock_logging.error.call_count == 6
@@ -0,0 +1,53 @@
+"""Tests for the indexes behind the notification lookup queries"""
+
+from sqlalchemy import Select, text
+
+from alma_item_checks_notification_service.models.process import Process
+from alma_item_checks_notification_service.models.process_recipient import (
+    ProcessRecipient,
+)
+from alma_item_checks_notification_service.repos.user_process_repo import (
+    UserProcessRepository,
+)
+
+
+def query_plan(db_engine, stmt: Select) -> list[str]:
+    """Get the SQLite query plan details for a statement"""
+    sql: str = str(stmt.compile(db_engine, compile_kwargs={"literal_binds": True}))
+    with db_engine.connect() as connection:
+        rows = connection.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    return [row[-1] for row in rows]
+
+
+class TestQueryPlans:
+    """Tests for the indexes behind the notification lookup queries"""
+
+    def test_process_lookup_uses_name_index(self, db_engine):
+        """Test the process lookup searches ix_process_name instead of scanning"""
+        plan = query_plan(db_engine, Select(Process).where(Process.name == "test"))
+
+        assert plan == ["SEARCH process USING INDEX ix_process_name (name=?)"]
+
+    def test_recipient_query_uses_indexes(self, db_engine):
+        """Test the recipient query searches user_process and user without scans"""
+        plan = query_plan(db_engine, UserProcessRepository._user_emails_stmt(1, 123))
+
+        assert not any(step.startswith("SCAN") for step in plan)
+        assert any(
+            "user_process USING COVERING INDEX ix_user_process_process_user" in step
+            for step in plan
+        )
+        assert any(step.startswith("SEARCH user ") for step in plan)
+
+    def test_recipient_table_lookup_is_range_scan(self, db_engine):
+        """Test the process_recipient lookup searches its primary key"""
+        plan = query_plan(
+            db_engine,
+            Select(ProcessRecipient.email).where(
+                ProcessRecipient.process_id == 1, ProcessRecipient.institution_id == 123
+            ),
+        )
+
+        assert len(plan) == 1
+        assert plan[0].startswith("SEARCH process_recipient USING")
+        assert "(process_id=? AND institution_id=?)" in plan[0]
@@ -1,16 +1,27 @@
 """Tests for UserProcessRepository"""
 
-from unittest.mock import patch
+from unittest.mock import Mock, patch
+
+import pytest
 from sqlalchemy.exc import NoResultFound, SQLAlchemyError
 
 from alma_item_checks_notification_service.models.user import User
 from alma_item_checks_notification_service.models.process import Process
 from alma_item_checks_notification_service.models.user_process import UserProcess
+from alma_item_checks_notification_service.repos.process_recipient_repo import (
+    ProcessRecipientRepository,
+)
 from alma_item_checks_notification_service.repos.user_process_repo import (
     UserProcessRepository,
 )
 
 
+def _failing_after(rows, error):
+    """Yield rows, then raise error, like a cursor dropped mid-stream"""
+    yield from rows
+    raise error
+
+
 class TestUserProcessRepository:
     """Tests for UserProcessRepository"""
 
@@ -155,3 +166,276 @@ class TestUserProcessRepository:
         assert user_ids_process1 == [user1.id]
         assert user_ids_process2 == [user2.id]
         assert user_ids_process1 != user_ids_process2
+
+    def test_get_user_emails_for_process_success(
+        self, db_session, sample_user_process, sample_user
+    ):
+        """Test get_user_emails_for_process returns emails for valid process"""
+        repo = UserProcessRepository(db_session)
+
+        emails = repo.get_user_emails_for_process(
+            sample_user_process.process_id, sample_user.institution_id
+        )
+
+        assert emails == [sample_user.email]
+
+    def test_get_user_emails_for_process_filters_institution(
+        self, db_session, sample_process
+    ):
+        """Test get_user_emails_for_process only returns users at the institution"""
+        user1 = User(email="user1@example.com", institution_id=401)
+        user2 = User(email="user2@example.com", institution_id=401)
+        user3 = User(email="user3@example.com", institution_id=402)
+        db_session.add_all([user1, user2, user3])
+        db_session.commit()
+
+        db_session.add_all(
+            [
+                UserProcess(user_id=user.id, process_id=sample_process.id)
+                for user in (user1, user2, user3)
+            ]
+        )
+        db_session.commit()
+
+        repo = UserProcessRepository(db_session)
+
+        emails = repo.get_user_emails_for_process(sample_process.id, 401)
+
+        assert emails is not None
+        assert sorted(emails) == ["user1@example.com", "user2@example.com"]
+
+    def test_get_user_emails_for_process_single_query(
+        self, db_session, db_engine, sample_process
+    ):
+        """Test get_user_emails_for_process issues one query regardless of subscriber count"""
+        from sqlalchemy import event
+
+        users = [
+            User(email=f"user{i}@example.com", institution_id=500) for i in range(25)
+        ]
+        db_session.add_all(users)
+        db_session.commit()
+        db_session.add_all(
+            [
+                UserProcess(user_id=user.id, process_id=sample_process.id)
+                for user in users
+            ]
+        )
+        db_session.commit()
+
+        process_id = sample_process.id
+        statements: list[str] = []
+
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db_engine, "before_cursor_execute", _count)
+        try:
+            repo = UserProcessRepository(db_session)
+            emails = repo.get_user_emails_for_process(process_id, 500)
+        finally:
+            event.remove(db_engine, "before_cursor_execute", _count)
+
+        assert emails is not None
+        assert len(emails) == 25
+        assert len(statements) == 1
+
+    def test_get_user_emails_for_process_no_users(self, db_session, sample_process):
+        """Test get_user_emails_for_process returns empty list when no users found"""
+        repo = UserProcessRepository(db_session)
+
+        emails = repo.get_user_emails_for_process(sample_process.id, 123)
+
+        assert emails == []
+
+    @patch("alma_item_checks_notification_service.repos.user_process_repo.logging")
+    def test_get_user_emails_for_process_no_result_found(
+        self, mock_logging, db_session
+    ):
+        """Test get_user_emails_for_process handles NoResultFound exception"""
+        repo = UserProcessRepository(db_session)
+
+        with patch.object(db_session, "execute", side_effect=NoResultFound()):
+            emails = repo.get_user_emails_for_process(1, 123)
+
+            assert emails is None
+            mock_logging.error.assert_called_with(
+                "UserProcessRepository.get_user_emails_for_process: NoResultFound"
+            )
+
+    @patch("alma_item_checks_notification_service.repos.user_process_repo.logging")
+    def test_get_user_emails_for_process_sqlalchemy_error(
+        self, mock_logging, db_session
+    ):
+        """Test get_user_emails_for_process handles SQLAlchemyError"""
+        repo = UserProcessRepository(db_session)
+        error_msg = "Database connection error"
+
+        with patch.object(
+            db_session, "execute", side_effect=SQLAlchemyError(error_msg)
+        ):
+            emails = repo.get_user_emails_for_process(1, 123)
+
+            assert emails is None
+            mock_logging.error.assert_called_with(
+                f"UserProcessRepository.get_user_emails_for_process: SQLAlchemyError: {error_msg}"
+            )
+
+    @patch("alma_item_checks_notification_service.repos.user_process_repo.logging")
+    def test_get_user_emails_for_process_general_exception(
+        self, mock_logging, db_session
+    ):
+        """Test get_user_emails_for_process handles general exceptions"""
+        repo = UserProcessRepository(db_session)
+        error_msg = "Unexpected error"
+
+        with patch.object(db_session, "execute", side_effect=Exception(error_msg)):
+            emails = repo.get_user_emails_for_process(1, 123)
+
+            assert emails is None
+            mock_logging.error.assert_called_with(
+                f"UserProcessRepository.get_user_emails_for_process: Exception: {error_msg}"
+            )
+
+    def test_iter_user_emails_for_process_success(
+        self, db_session, sample_user_process, sample_user
+    ):
+        """Test iter_user_emails_for_process yields emails for valid process"""
+        repo = UserProcessRepository(db_session)
+
+        emails = list(
+            repo.iter_user_emails_for_process(
+                sample_user_process.process_id, sample_user.institution_id, batch_size=1
+            )
+        )
+
+        assert emails == [sample_user.email]
+
+    @patch("alma_item_checks_notification_service.repos.user_process_repo.logging")
+    def test_iter_user_emails_for_process_fails_midstream(
+        self, mock_logging, db_session, sample_user_process, sample_user
+    ):
+        """Test an error after the first rows fails the stream instead of ending it"""
+        repo = UserProcessRepository(db_session)
+        result = Mock()
+        result.scalars.return_value = _failing_after(
+            [sample_user.email], SQLAlchemyError("connection lost")
+        )
+
+        with patch.object(db_session, "execute", return_value=result):
+            emails = repo.iter_user_emails_for_process(1, 123)
+
+            assert next(emails) == sample_user.email
+            with pytest.raises(SQLAlchemyError):
+                next(emails)
+
+    @patch("alma_item_checks_notification_service.repos.user_process_repo.logging")
+    def test_iter_user_emails_for_process_sqlalchemy_error(
+        self, mock_logging, db_session
+    ):
+        """Test iter_user_emails_for_process logs and re-raises SQLAlchemyError"""
+        repo = UserProcessRepository(db_session)
+        error_msg = "Database connection error"
+
+        with patch.object(
+            db_session, "execute", side_effect=SQLAlchemyError(error_msg)
+        ):
+            with pytest.raises(SQLAlchemyError):
+                list(repo.iter_user_emails_for_process(1, 123))
+
+            mock_logging.error.assert_called_with(
+                f"UserProcessRepository.iter_user_emails_for_process: SQLAlchemyError: {error_msg}"
+            )
+
+    @patch("alma_item_checks_notification_service.repos.user_process_repo.logging")
+    def test_iter_user_emails_for_process_general_exception(
+        self, mock_logging, db_session
+    ):
+        """Test iter_user_emails_for_process logs and re-raises general exceptions"""
+        repo = UserProcessRepository(db_session)
+        error_msg = "Unexpected error"
+
+        with patch.object(db_session, "execute", side_effect=Exception(error_msg)):
+            with pytest.raises(Exception, match=error_msg):
+                list(repo.iter_user_emails_for_process(1, 123))
+
+            mock_logging.error.assert_called_with(
+                f"UserProcessRepository.iter_user_emails_for_process: Exception: {error_msg}"
+            )
+
+    def test_add_subscription(self, db_session, sample_user, sample_process):
+        """Test add_subscription writes user_process and process_recipient"""
+        repo = UserProcessRepository(db_session)
+
+        assert repo.add_subscription(sample_user.id, sample_process.id) is True
+        assert repo.add_subscription(sample_user.id, sample_process.id) is True
+
+        assert db_session.get(UserProcess, (sample_user.id, sample_process.id))
+        assert ProcessRecipientRepository(db_session).get_recipient_emails(
+            sample_process.id, sample_user.institution_id
+        ) == [sample_user.email]
+
+    @patch("alma_item_checks_notification_service.repos.user_process_repo.logging")
+    def test_add_subscription_unknown_user(
+        self, mock_logging, db_session, sample_process
+    ):
+        """Test add_subscription refuses users that don't exist"""
+        repo = UserProcessRepository(db_session)
+
+        assert repo.add_subscription(999, sample_process.id) is False
+        mock_logging.error.assert_called_once_with(
+            "UserProcessRepository.add_subscription: user 999 not found"
+        )
+
+    @pytest.mark.parametrize(
+        "error", [SQLAlchemyError("Database error"), Exception("boom")]
+    )
+    @patch("alma_item_checks_notification_service.repos.user_process_repo.logging")
+    def test_add_subscription_error_rolls_back(
+        self, mock_logging, error, db_session, sample_user, sample_process
+    ):
+        """Test add_subscription leaves both tables unchanged on errors"""
+        repo = UserProcessRepository(db_session)
+
+        with patch(
+            "alma_item_checks_notification_service.repos.user_process_repo.ProcessRecipientRepository.add_recipient",
+            side_effect=error,
+        ):
+            assert repo.add_subscription(sample_user.id, sample_process.id) is False
+
+        assert db_session.get(UserProcess, (sample_user.id, sample_process.id)) is None
+
+    def test_remove_subscription(self, db_session, sample_user, sample_process):
+        """Test remove_subscription deletes from user_process and process_recipient"""
+        repo = UserProcessRepository(db_session)
+        repo.add_subscription(sample_user.id, sample_process.id)
+
+        assert repo.remove_subscription(sample_user.id, sample_process.id) is True
+        assert repo.remove_subscription(sample_user.id, sample_process.id) is True
+
+        assert db_session.get(UserProcess, (sample_user.id, sample_process.id)) is None
+        assert (
+            ProcessRecipientRepository(db_session).get_recipient_emails(
+                sample_process.id, sample_user.institution_id
+            )
+            == []
+        )
+
+    @pytest.mark.parametrize(
+        "error,message",
+        [
+            (SQLAlchemyError("Database error"), "SQLAlchemyError: Database error"),
+            (Exception("boom"), "Exception: boom"),
+        ],
+    )
+    @patch("alma_item_checks_notification_service.repos.user_process_repo.logging")
+    def test_remove_subscription_error(self, mock_logging, error, message, db_session):
+        """Test remove_subscription returns False on errors"""
+        repo = UserProcessRepository(db_session)
+
+        with patch.object(db_session, "execute", side_effect=error):
+            assert repo.remove_subscription(1, 1) is False
+
+        mock_logging.error.assert_called_once_with(
+            f"UserProcessRepository.remove_subscription: {message}"
+        )
@@ -0,0 +1,263 @@
+"""Tests for AsyncNotificationService"""
+
+import asyncio
+import json
+import threading
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from alma_item_checks_notification_service.models.processed_job import ProcessedJob
+from alma_item_checks_notification_service.services.async_notification_service import (
+    AsyncNotificationService,
+)
+from alma_item_checks_notification_service.services.digest_service import (
+    DigestService,
+)
+from alma_item_checks_notification_service.services.processed_job_service import (
+    JobInProgressError,
+    ProcessedJobService,
+)
+from alma_item_checks_notification_service.storage import reset_storage_clients
+
+REPORT = [{"Item": "a"}, {"Item": "b"}]
+
+
+def _message(job_id: str = "job-1", process_type: str = "test_process") -> Mock:
+    """Build a notification queue message"""
+    message = Mock()
+    message.get_body.return_value.decode.return_value = json.dumps(
+        {"job_id": job_id, "institution_id": 123, "process_type": process_type}
+    )
+    return message
+
+
+class TestAsyncNotificationService:
+    """Tests for AsyncNotificationService"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, db_engine):
+        """Serve storage from an async stand-in and the database from SQLite"""
+        reset_storage_clients()
+        self.storage = Mock()
+        self.storage.download_blob_as_json = AsyncMock(return_value=REPORT)
+        self.storage.upload_blob_data = AsyncMock()
+        self.storage.send_queue_message = AsyncMock()
+        self.session_maker = sessionmaker(bind=db_engine)
+
+        with (
+            patch(
+                "alma_item_checks_notification_service.services.async_notification_service.get_async_storage_service",
+                return_value=self.storage,
+            ),
+            patch(
+                "alma_item_checks_notification_service.services.notification_service.get_storage_service"
+            ),
+            patch(
+                "alma_item_checks_notification_service.services.notification_service.email_model"
+            ) as mock_email_model,
+        ):
+            self.email_model = mock_email_model
+            mock_email_model.EmailMessage.return_value.model_dump_json.return_value = (
+                '{"html": "<table/>"}'
+            )
+            yield
+
+    def _send(self, message: Mock) -> AsyncNotificationService:
+        """Run one notification through the async pipeline"""
+        service = AsyncNotificationService(message, session_maker=self.session_maker)
+        asyncio.run(service.send_notification_async())
+        return service
+
+    def test_send_notification(self, sample_process, sample_user, sample_user_process):
+        """Test the report is downloaded, rendered, uploaded and queued"""
+        self._send(_message())
+
+        self.storage.download_blob_as_json.assert_awaited_once()
+        assert (
+            self.storage.download_blob_as_json.await_args.kwargs["blob_name"]
+            == "job-1.json"
+        )
+        assert self.email_model.EmailMessage.call_args.kwargs["to"] == [
+            sample_user.email
+        ]
+        assert "<td>b</td>" in self.email_model.EmailMessage.call_args.kwargs["html"]
+        upload = self.storage.upload_blob_data.await_args.kwargs
+        assert upload["blob_name"] == "job-1.json"
+        assert upload["data"] == '{"html": "<table/>"}'
+        self.storage.send_queue_message.assert_awaited_once()
+        assert self.storage.send_queue_message.await_args.kwargs["message_content"] == {
+            "blob_name": "job-1.json"
+        }
+
+    def test_send_notification_spans(
+        self, sample_process, sample_user_process, recording_tracer
+    ):
+        """Test the async stages are timed under the job's span"""
+        self._send(_message())
+
+        spans = dict(recording_tracer.spans)
+        assert set(spans) == {
+            "notification",
+            "download_report",
+            "lookup_process",
+            "resolve_recipients",
+            "render_table",
+            "serialize_report",
+            "build_dataframe",
+            "to_html",
+            "render_template",
+            "serialize_email",
+            "store_payload",
+            "send_queue_message",
+        }
+        for attributes in spans.values():
+            assert attributes["job_id"] == "job-1"
+        assert spans["download_report"]["row_count"] == len(REPORT)
+        assert "cache_hit_ratio" in spans["resolve_recipients"]
+        assert spans["store_payload"]["payload_chars"] == len('{"html": "<table/>"}')
+
+    def test_untraced_payload_not_sized(self, sample_process, sample_user_process):
+        """Test the queue message isn't serialized for a span that isn't recorded"""
+        with patch(
+            "alma_item_checks_notification_service.services.async_notification_service.queue_message_bytes"
+        ) as mock_queue_message_bytes:
+            self._send(_message())
+
+        mock_queue_message_bytes.assert_not_called()
+        self.storage.send_queue_message.assert_awaited_once()
+
+    def test_download_overlaps_lookups(self, sample_process):
+        """Test the report download runs while the database lookups do"""
+        lookup_started = threading.Event()
+
+        async def download(**kwargs):
+            # Only completes if the lookup thread starts while this is pending
+            await asyncio.to_thread(lookup_started.wait, 5)
+            return REPORT
+
+        self.storage.download_blob_as_json.side_effect = download
+        resolve = AsyncNotificationService.resolve_recipients
+
+        def resolve_recipients(*args):
+            lookup_started.set()
+            return resolve(*args)
+
+        with patch.object(
+            AsyncNotificationService,
+            "resolve_recipients",
+            side_effect=resolve_recipients,
+        ):
+            self._send(_message())
+
+        assert lookup_started.is_set()
+        self.storage.send_queue_message.assert_awaited_once()
+
+    def test_duplicate_skipped(self, db_session, sample_process):
+        """Test a redelivered message is skipped before any work is done"""
+        self._send(_message())
+        self._send(_message())
+
+        self.storage.download_blob_as_json.assert_awaited_once()
+        assert db_session.get(ProcessedJob, "job-1").completed_at is not None
+
+    def test_failure_releases_claim(self, db_session, sample_process):
+        """Test a failed job can be retried"""
+        self.storage.send_queue_message.side_effect = [RuntimeError("down"), None]
+
+        with pytest.raises(RuntimeError):
+            self._send(_message())
+        self._send(_message())
+
+        assert self.storage.send_queue_message.await_count == 2
+
+    def test_redelivered_in_progress_requeued(self, db_session, sample_process):
+        """Test a message redelivered while its job is claimed comes back later"""
+        ProcessedJobService(db_session).claim("job-1")
+
+        with patch.object(
+            AsyncNotificationService, "requeue", return_value=True
+        ) as mock_requeue:
+            self._send(_message())
+
+        (delay,) = mock_requeue.call_args.args
+        assert 890 <= delay <= 900
+        self.storage.download_blob_as_json.assert_not_awaited()
+
+    def test_redelivered_in_progress_retried(self, db_session, sample_process):
+        """Test a message that can't be requeued is retried, not dropped"""
+        ProcessedJobService(db_session).claim("job-1")
+
+        with (
+            patch.object(AsyncNotificationService, "requeue", return_value=False),
+            pytest.raises(JobInProgressError),
+        ):
+            self._send(_message())
+
+        self.storage.download_blob_as_json.assert_not_awaited()
+        assert db_session.get(ProcessedJob, "job-1").completed_at is None
+
+    def test_process_not_found(self, db_session):
+        """Test a job for an unknown process sends nothing and isn't retried"""
+        with patch(
+            "alma_item_checks_notification_service.services.async_notification_service.logging"
+        ) as mock_logging:
+            self._send(_message(process_type="unknown"))
+
+            mock_logging.error.assert_called_once()
+        self.storage.download_blob_as_json.assert_not_awaited()
+        self.storage.send_queue_message.assert_not_awaited()
+        assert db_session.get(ProcessedJob, "job-1").completed_at is not None
+
+    @patch(
+        "alma_item_checks_notification_service.services.digest_service.DIGEST_FLUSH_ENABLED",
+        True,
+    )
+    def test_digest_jobs_buffered(self, db_session, sample_process):
+        """Test digest processes buffer the downloaded report instead of sending"""
+        sample_process.digest_enabled = True
+        db_session.commit()
+
+        service = AsyncNotificationService(_message(), session_maker=self.session_maker)
+        service.download_report = Mock()
+        asyncio.run(service.send_notification_async())
+
+        service.download_report.assert_not_called()
+        self.storage.send_queue_message.assert_not_awaited()
+        assert DigestService(db_session).buffered_rows(sample_process.id, 123) == 2
+
+    @patch(
+        "alma_item_checks_notification_service.services.notification_service.EMAIL_PAYLOAD_INLINE_ENABLED",
+        True,
+    )
+    def test_inline_payload(self, sample_process):
+        """Test small emails are carried in the queue message without a blob"""
+        self._send(_message())
+
+        self.storage.upload_blob_data.assert_not_awaited()
+        message_content = self.storage.send_queue_message.await_args.kwargs[
+            "message_content"
+        ]
+        assert message_content == {"email": {"html": "<table/>"}, "version": 3}
+
+    @patch(
+        "alma_item_checks_notification_service.services.async_notification_service.EMAIL_PAYLOAD_COMPRESSION_ENABLED",
+        True,
+    )
+    def test_compressed_payload(self, sample_process):
+        """Test compressed payloads are uploaded with gzip content settings"""
+        with patch(
+            "alma_item_checks_notification_service.services.async_notification_service.azure_blob"
+        ) as mock_azure_blob:
+            self._send(_message())
+
+        upload = self.storage.upload_blob_data.await_args.kwargs
+        assert upload["blob_name"] == "job-1.json.gz"
+        assert (
+            upload["content_settings"] is mock_azure_blob.ContentSettings.return_value
+        )
+        assert self.storage.send_queue_message.await_args.kwargs["message_content"] == {
+            "blob_name": "job-1.json.gz",
+            "version": 2,
+        }
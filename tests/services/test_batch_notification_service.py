@@ -0,0 +1,442 @@
+"""Tests for BatchNotificationService"""
+
+import json
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+import azure.functions as func
+import pytest
+from azure.core.exceptions import (
+    HttpResponseError,
+    ResourceExistsError,
+    ResourceNotFoundError,
+)
+
+from alma_item_checks_notification_service.models.processed_job import ProcessedJob
+from alma_item_checks_notification_service.services.batch_notification_service import (
+    FAILED,
+    SENT,
+    SKIPPED,
+    BatchNotificationService,
+    DrainStats,
+    NotificationResult,
+)
+from alma_item_checks_notification_service.services.processed_job_service import (
+    ProcessedJobService,
+)
+
+
+def _message(msg_id, job_id=None, institution_id=123, process_type="test_process"):
+    """Build a notification queue message, for job "job-<msg_id>" by default"""
+    if job_id is None:
+        job_id = f"job-{msg_id}"
+    return func.QueueMessage(
+        id=msg_id,
+        body=json.dumps(
+            {
+                "job_id": job_id,
+                "institution_id": institution_id,
+                "process_type": process_type,
+            }
+        ).encode(),
+    )
+
+
+def _queue_message(msg_id, dequeue_count=1, **fields):
+    """Build a message as returned by QueueClient.receive_messages"""
+    queue_message = Mock()
+    queue_message.id = msg_id
+    queue_message.pop_receipt = f"receipt-{msg_id}"
+    queue_message.dequeue_count = dequeue_count
+    queue_message.content = _message(msg_id, **fields).get_body()
+    return queue_message
+
+
+class TestBatchNotificationService:
+    """Tests for BatchNotificationService"""
+
+    def setup_method(self):
+        """Setup for each test method"""
+        self.storage_patcher = patch(
+            "alma_item_checks_notification_service.services.notification_service.get_storage_service"
+        )
+        self.storage_patcher.start()
+        self.deliver_patcher = patch(
+            "alma_item_checks_notification_service.services.notification_service.NotificationService.deliver",
+            autospec=True,
+        )
+        self.mock_deliver = self.deliver_patcher.start()
+
+    def teardown_method(self):
+        """Teardown for each test method"""
+        self.deliver_patcher.stop()
+        self.storage_patcher.stop()
+
+    def test_send_notifications_groups_lookups(
+        self, db_session, sample_process, sample_user, sample_user_process
+    ):
+        """Test each process/institution group resolves process and recipients once"""
+        messages = [_message(str(i), job_id=f"job-{i}") for i in range(5)]
+        service = BatchNotificationService(db_session)
+
+        with patch(
+            "alma_item_checks_notification_service.services.batch_notification_service.ProcessService"
+        ) as mock_ps:
+            with patch(
+                "alma_item_checks_notification_service.services.batch_notification_service.UserProcessService"
+            ) as mock_ups:
+                mock_ps.return_value.get_process_by_name.return_value = sample_process
+                mock_ups.return_value.get_recipient_emails.return_value = [
+                    sample_user.email
+                ]
+
+                results = service.send_notifications(messages)
+
+                mock_ps.return_value.get_process_by_name.assert_called_once_with(
+                    "test_process"
+                )
+                mock_ups.return_value.get_recipient_emails.assert_called_once_with(
+                    sample_process.id, 123
+                )
+
+        assert results == [NotificationResult(str(i), SENT) for i in range(5)]
+        assert [call.kwargs["job_id"] for call in self.mock_deliver.call_args_list] == [
+            f"job-{i}" for i in range(5)
+        ]
+        assert self.mock_deliver.call_args.kwargs["user_emails"] == [sample_user.email]
+
+    def test_send_notifications_separate_groups(
+        self, db_session, sample_process, sample_user, sample_user_process
+    ):
+        """Test messages for different institutions are resolved separately"""
+        messages = [
+            _message("a", institution_id=123),
+            _message("b", institution_id=456),
+            _message("c", institution_id=123),
+        ]
+
+        results = BatchNotificationService(db_session).send_notifications(messages)
+
+        assert [r.status for r in results] == [SENT, SENT, SENT]
+        recipients = {
+            call.args[0].msg.id: call.kwargs["user_emails"]
+            for call in self.mock_deliver.call_args_list
+        }
+        assert recipients == {
+            "a": [sample_user.email],
+            "b": [],
+            "c": [sample_user.email],
+        }
+
+    def test_send_notifications_isolates_failures(self, db_session, sample_process):
+        """Test one message failing doesn't affect the rest of its group"""
+        self.mock_deliver.side_effect = [None, RuntimeError("upload failed"), None]
+        messages = [_message(str(i)) for i in range(3)]
+
+        with patch(
+            "alma_item_checks_notification_service.services.batch_notification_service.logging"
+        ):
+            results = BatchNotificationService(db_session).send_notifications(messages)
+
+        assert results == [
+            NotificationResult("0", SENT),
+            NotificationResult("1", FAILED, "upload failed"),
+            NotificationResult("2", SENT),
+        ]
+
+    def test_send_notifications_recipient_failure(self, db_session, sample_process):
+        """Test a failed recipient lookup fails its group and releases the claims"""
+        service = BatchNotificationService(db_session)
+
+        with (
+            patch(
+                "alma_item_checks_notification_service.services.batch_notification_service.UserProcessService"
+            ) as mock_ups,
+            patch(
+                "alma_item_checks_notification_service.services.batch_notification_service.logging"
+            ),
+        ):
+            mock_ups.return_value.get_recipient_emails.side_effect = RuntimeError(
+                "database down"
+            )
+            results = service.send_notifications([_message("a"), _message("b")])
+
+        assert results == [
+            NotificationResult("a", FAILED, "database down"),
+            NotificationResult("b", FAILED, "database down"),
+        ]
+        self.mock_deliver.assert_not_called()
+        assert service.send_notifications([_message("a")])[0].status == SENT
+
+    def test_send_notifications_buffers_digest_jobs(self, db_session, sample_process):
+        """Test jobs for digest processes are buffered rather than delivered"""
+        sample_process.digest_enabled = True
+        db_session.commit()
+
+        with patch(
+            "alma_item_checks_notification_service.services.notification_service.NotificationService.buffer_for_digest",
+            return_value=True,
+        ) as mock_buffer:
+            results = BatchNotificationService(db_session).send_notifications(
+                [_message("a")]
+            )
+
+            session, process, institution_id, job_id = mock_buffer.call_args.args
+            assert session is db_session
+            assert process.name == sample_process.name
+            assert (institution_id, job_id) == (123, "job-a")
+
+        assert results == [NotificationResult("a", SENT)]
+        self.mock_deliver.assert_not_called()
+
+    def test_send_notifications_skips_invalid_messages(
+        self, db_session, sample_process
+    ):
+        """Test unreadable, incomplete and unknown-process messages are skipped"""
+        messages = [
+            func.QueueMessage(id="bad", body=b"not json"),
+            _message("incomplete", job_id=""),
+            _message("unknown", process_type="no_such_process"),
+            _message("ok"),
+        ]
+
+        with patch(
+            "alma_item_checks_notification_service.services.batch_notification_service.logging"
+        ):
+            results = BatchNotificationService(db_session).send_notifications(messages)
+
+        assert [(r.message_id, r.status) for r in results] == [
+            ("bad", SKIPPED),
+            ("incomplete", SKIPPED),
+            ("unknown", SKIPPED),
+            ("ok", SENT),
+        ]
+        assert results[2].error == "process type no_such_process not found"
+        self.mock_deliver.assert_called_once()
+
+    def test_send_notifications_skips_duplicates(self, db_session, sample_process):
+        """Test jobs already handled are skipped and jobs in progress kept for a retry"""
+        service = BatchNotificationService(db_session)
+        service.send_notifications([_message("a", job_id="job-1")])
+
+        results = service.send_notifications(
+            [_message("b", job_id="job-1"), _message("c", job_id="job-2")]
+            + [_message("d", job_id="job-2")]
+        )
+
+        assert [(r.message_id, r.status) for r in results] == [
+            ("b", SKIPPED),
+            ("c", SENT),
+            ("d", FAILED),
+        ]
+        assert self.mock_deliver.call_count == 2
+
+    def test_send_notifications_retries_in_progress(self, db_session, sample_process):
+        """Test a message redelivered while its job is claimed is retried, not dropped"""
+        ProcessedJobService(db_session).claim("job-a")
+        service = BatchNotificationService(db_session)
+
+        assert service.send_notifications([_message("a")])[0].status == FAILED
+        self.mock_deliver.assert_not_called()
+
+        db_session.get(ProcessedJob, "job-a").claimed_at -= timedelta(seconds=901)
+        db_session.commit()
+
+        assert service.send_notifications([_message("a")])[0].status == SENT
+
+    def test_send_notifications_failure_releases_claim(
+        self, db_session, sample_process
+    ):
+        """Test a failed job is processed again when the message is retried"""
+        self.mock_deliver.side_effect = [RuntimeError("upload failed"), None]
+        service = BatchNotificationService(db_session)
+
+        with patch(
+            "alma_item_checks_notification_service.services.batch_notification_service.logging"
+        ):
+            first = service.send_notifications([_message("a")])
+        second = service.send_notifications([_message("a")])
+
+        assert (first[0].status, second[0].status) == (FAILED, SENT)
+
+
+class TestDrainQueue:
+    """Tests for BatchNotificationService.drain_queue"""
+
+    def test_drain_queue(self):
+        """Test messages are received in batches and settled by outcome"""
+        pages = [
+            [
+                _queue_message("sent"),
+                _queue_message("skipped"),
+                _queue_message("retry", dequeue_count=1),
+                _queue_message("poison", dequeue_count=5),
+            ],
+            [],
+        ]
+        queue_client = Mock()
+        queue_client.receive_messages.side_effect = pages
+        poison_queue_client = Mock()
+        service = BatchNotificationService(Mock())
+
+        with patch.object(
+            service,
+            "send_notifications",
+            side_effect=lambda messages: [
+                NotificationResult(msg.id, status)
+                for msg, status in zip(messages, [SENT, SKIPPED, FAILED, FAILED])
+            ],
+        ):
+            stats = service.drain_queue(queue_client, poison_queue_client, 10, 100)
+
+        assert stats == DrainStats(
+            received=4, sent=1, skipped=1, failed=2, poisoned=1, undeleted=0
+        )
+        deleted = [
+            call.args[0].id for call in queue_client.delete_message.call_args_list
+        ]
+        assert deleted == ["sent", "skipped", "poison"]
+        poison_queue_client.send_message.assert_called_once_with(pages[0][3].content)
+
+    def test_drain_queue_stops_at_max_messages(self):
+        """Test the drain stops once max_messages have been received"""
+        queue_client = Mock()
+        queue_client.receive_messages.side_effect = lambda **kwargs: [
+            _queue_message(str(i)) for i in range(kwargs["max_messages"])
+        ]
+        service = BatchNotificationService(Mock())
+
+        with patch.object(
+            service,
+            "send_notifications",
+            side_effect=lambda messages: [
+                NotificationResult(msg.id, SENT) for msg in messages
+            ],
+        ):
+            stats = service.drain_queue(queue_client, Mock(), 40, 100)
+
+        assert stats.received == 100
+        assert [
+            call.kwargs["max_messages"]
+            for call in queue_client.receive_messages.call_args_list
+        ] == [40, 40, 20]
+        assert queue_client.receive_messages.call_args.kwargs["messages_per_page"] == 20
+
+    @pytest.mark.parametrize(
+        "create_error", [None, ResourceExistsError("queue already exists")]
+    )
+    def test_drain_queue_creates_missing_poison_queue(self, create_error):
+        """Test the poison queue is created, or found created, when a message is moved"""
+        queue_client = Mock()
+        queue_client.receive_messages.side_effect = [
+            [_queue_message("poison", dequeue_count=5)],
+            [],
+        ]
+        poison_queue_client = Mock()
+        poison_queue_client.send_message.side_effect = [
+            ResourceNotFoundError("queue not found"),
+            None,
+        ]
+        poison_queue_client.create_queue.side_effect = create_error
+        service = BatchNotificationService(Mock())
+
+        with patch.object(
+            service,
+            "send_notifications",
+            return_value=[NotificationResult("poison", FAILED)],
+        ):
+            stats = service.drain_queue(queue_client, poison_queue_client, 10, 100)
+
+        assert stats.poisoned == 1
+        poison_queue_client.create_queue.assert_called_once_with()
+        assert poison_queue_client.send_message.call_count == 2
+        queue_client.delete_message.assert_called_once()
+
+    def test_drain_queue_poison_failure_keeps_message(self):
+        """Test a message that can't be moved stays queued and the drain goes on"""
+        queue_client = Mock()
+        queue_client.receive_messages.side_effect = [
+            [
+                _queue_message("poison", dequeue_count=5),
+                _queue_message("sent", dequeue_count=None),
+            ],
+            [],
+        ]
+        poison_queue_client = Mock()
+        poison_queue_client.send_message.side_effect = RuntimeError("unavailable")
+        service = BatchNotificationService(Mock())
+
+        with patch.object(
+            service,
+            "send_notifications",
+            return_value=[
+                NotificationResult("poison", FAILED),
+                NotificationResult("sent", SENT),
+            ],
+        ):
+            with patch(
+                "alma_item_checks_notification_service.services.batch_notification_service.logging"
+            ) as mock_logging:
+                stats = service.drain_queue(queue_client, poison_queue_client, 10, 100)
+
+        assert stats == DrainStats(
+            received=2, sent=1, skipped=0, failed=1, poisoned=0, undeleted=0
+        )
+        deleted = [
+            call.args[0].id for call in queue_client.delete_message.call_args_list
+        ]
+        assert deleted == ["sent"]
+        mock_logging.error.assert_called_once()
+
+    def test_drain_queue_delete_failure_continues(self):
+        """Test a message that can't be deleted is counted and the drain goes on"""
+        queue_client = Mock()
+        queue_client.receive_messages.side_effect = [
+            [_queue_message("stale"), _queue_message("gone"), _queue_message("sent")],
+            [],
+        ]
+        queue_client.delete_message.side_effect = [
+            HttpResponseError("pop receipt mismatch"),
+            ResourceNotFoundError("message not found"),
+            None,
+        ]
+        service = BatchNotificationService(Mock())
+
+        with patch.object(
+            service,
+            "send_notifications",
+            side_effect=lambda messages: [
+                NotificationResult(msg.id, SENT) for msg in messages
+            ],
+        ):
+            with patch(
+                "alma_item_checks_notification_service.services.batch_notification_service.logging"
+            ) as mock_logging:
+                stats = service.drain_queue(queue_client, Mock(), 10, 100)
+
+        assert stats == DrainStats(
+            received=3, sent=3, skipped=0, failed=0, poisoned=0, undeleted=2
+        )
+        assert queue_client.delete_message.call_count == 3
+        assert mock_logging.error.call_count == 2
+
+    def test_drain_queue_unknown_dequeue_count(self):
+        """Test a failed message without a dequeue count is retried"""
+        queue_client = Mock()
+        queue_client.receive_messages.side_effect = [
+            [_queue_message("retry", dequeue_count=None)],
+            [],
+        ]
+        poison_queue_client = Mock()
+        service = BatchNotificationService(Mock())
+
+        with patch.object(
+            service,
+            "send_notifications",
+            return_value=[NotificationResult("retry", FAILED)],
+        ):
+            stats = service.drain_queue(queue_client, poison_queue_client, 10, 100)
+
+        assert stats.poisoned == 0
+        poison_queue_client.send_message.assert_not_called()
+        queue_client.delete_message.assert_not_called()
@@ -0,0 +1,142 @@
+"""Tests for DigestService"""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from alma_item_checks_notification_service.services.digest_service import (
+    BufferedJob,
+    DigestGroup,
+    DigestService,
+    digest_max_rows,
+)
+
+T0 = datetime(2026, 1, 1, 12, 0)
+
+
+def _group(**overrides):
+    """Build a digest group due at T0 + 10 minutes or 100 rows"""
+    fields = dict(
+        process_id=1,
+        institution_id=123,
+        oldest=T0,
+        row_count=10,
+        job_count=2,
+        window_minutes=10,
+        max_rows=100,
+    )
+    fields.update(overrides)
+    return DigestGroup(**fields)
+
+
+class TestDigestGroup:
+    """Tests for DigestGroup"""
+
+    def test_is_due_after_window(self):
+        """Test a group is due once its window has elapsed"""
+        assert not _group().is_due(T0 + timedelta(minutes=9))
+        assert _group().is_due(T0 + timedelta(minutes=10))
+
+    def test_is_due_at_row_cap(self):
+        """Test a group is due as soon as it reaches its row cap"""
+        assert _group(row_count=100).is_due(T0)
+
+
+class TestDigestService:
+    """Tests for DigestService"""
+
+    def test_digest_max_rows(self, sample_process):
+        """Test the process row cap falls back to DIGEST_MAX_ROWS"""
+        assert digest_max_rows(sample_process) == 5000
+        sample_process.digest_max_rows = 20
+        assert digest_max_rows(sample_process) == 20
+
+    def test_buffer_job(self, db_session, sample_process):
+        """Test buffered jobs count towards the group's rows"""
+        service = DigestService(db_session)
+
+        assert service.buffer_job(sample_process, 123, "job-1", 5, now=T0)
+        assert service.buffer_job(sample_process, 123, "job-2", 7)
+        assert service.buffer_job(sample_process, 456, "job-3", 9)
+
+        assert service.buffered_rows(sample_process.id, 123) == 12
+        assert service.buffered_rows(sample_process.id, 789) == 0
+
+    def test_get_due_groups(self, db_session, sample_process):
+        """Test only groups past their window or row cap are due"""
+        service = DigestService(db_session)
+        service.buffer_job(sample_process, 123, "old", 1, now=T0)
+        service.buffer_job(sample_process, 456, "new", 1, now=T0 + timedelta(minutes=8))
+        service.buffer_job(
+            sample_process, 789, "big", 6000, now=T0 + timedelta(minutes=9)
+        )
+
+        due = service.get_due_groups(now=T0 + timedelta(minutes=10))
+
+        assert sorted(group.institution_id for group in due) == [123, 789]
+
+    def test_get_due_groups_uses_process_settings(self, db_session, sample_process):
+        """Test per-process window and row cap override the defaults"""
+        sample_process.digest_window_minutes = 60
+        sample_process.digest_max_rows = 3
+        db_session.commit()
+        service = DigestService(db_session)
+        service.buffer_job(sample_process, 123, "job", 2, now=T0)
+        service.buffer_job(sample_process, 456, "job", 3, now=T0)
+
+        due = service.get_due_groups(now=T0 + timedelta(minutes=30))
+
+        assert [(group.institution_id, group.window_minutes) for group in due] == [
+            (456, 60)
+        ]
+
+    def test_get_due_groups_repo_error(self, db_session):
+        """Test a failed summary query yields no groups"""
+        service = DigestService(db_session)
+
+        with patch.object(
+            service.digest_entry_repo, "get_pending_groups", return_value=None
+        ):
+            assert service.get_due_groups() == []
+
+    def test_claim_and_restore_jobs(self, db_session, sample_process):
+        """Test claimed jobs leave the buffer and can be put back"""
+        service = DigestService(db_session)
+        service.buffer_job(sample_process, 123, "job-1", 5, now=T0)
+        service.buffer_job(sample_process, 123, "job-2", 7, now=T0)
+
+        jobs = service.claim_jobs(sample_process.id, 123)
+
+        assert jobs == [BufferedJob("job-1", 5, T0), BufferedJob("job-2", 7, T0)]
+        assert service.claim_jobs(sample_process.id, 123) == []
+
+        assert service.restore_jobs(sample_process.id, 123, jobs)
+        assert service.buffered_rows(sample_process.id, 123) == 12
+
+    def test_claim_jobs_partially_claimed(self, db_session, sample_process):
+        """Test jobs taken by a concurrent flush are left out"""
+        service = DigestService(db_session)
+        service.buffer_job(sample_process, 123, "job-1", 5, now=T0)
+        service.buffer_job(sample_process, 123, "job-2", 7, now=T0)
+        first_id = service.digest_entry_repo.get_entries(sample_process.id, 123)[0].id
+
+        with patch.object(
+            service.digest_entry_repo, "claim_entries", return_value=[first_id]
+        ):
+            with patch(
+                "alma_item_checks_notification_service.services.digest_service.logging"
+            ) as mock_logging:
+                jobs = service.claim_jobs(sample_process.id, 123)
+
+                mock_logging.warning.assert_called_once()
+
+        assert [job.job_id for job in jobs] == ["job-1"]
+
+    def test_claim_jobs_repo_error(self, db_session, sample_process):
+        """Test a failed claim returns no jobs"""
+        service = DigestService(db_session)
+        service.buffer_job(sample_process, 123, "job-1", 5, now=T0)
+
+        with patch.object(
+            service.digest_entry_repo, "claim_entries", return_value=None
+        ):
+            assert service.claim_jobs(sample_process.id, 123) == []
@@ -1,13 +1,28 @@
 """Tests for NotificationService"""
 
+import base64
+import gzip
 import json
-from pathlib import Path
+import threading
+from datetime import datetime, timedelta
 from unittest.mock import Mock, patch, MagicMock
+
+import pytest
 from jinja2 import TemplateNotFound
 
+from alma_item_checks_notification_service.models.processed_job import ProcessedJob
 from alma_item_checks_notification_service.services.notification_service import (
     NotificationService,
+    queue_message_bytes,
+)
+from alma_item_checks_notification_service.services.digest_service import (
+    DigestService,
 )
+from alma_item_checks_notification_service.services.processed_job_service import (
+    JobInProgressError,
+    ProcessedJobService,
+)
+from alma_item_checks_notification_service.storage import reset_storage_clients
 
 
 class TestNotificationService:
@@ -15,6 +30,7 @@ class TestNotificationService:
 
     def setup_method(self):
         """Setup for each test method"""
+        reset_storage_clients()
         self.mock_message = Mock()
         self.mock_message.get_body.return_value.decode.return_value = json.dumps(
             {
@@ -26,54 +42,57 @@ class TestNotificationService:
 
     def test_init_success(self):
         """Test NotificationService initialization success"""
-        # Test basic initialization success path by mocking the template directory check
         with patch(
-            "alma_item_checks_notification_service.services.notification_service.pathlib.Path"
-        ):
+            "alma_item_checks_notification_service.services.notification_service.get_jinja_env"
+        ) as mock_get_env:
             with patch(
-                "alma_item_checks_notification_service.services.notification_service.Environment"
-            ) as mock_env:
-                with patch(
-                    "alma_item_checks_notification_service.services.notification_service.StorageService"
-                ) as mock_storage:
-                    # Mock the template dir to exist
-                    with patch(
-                        "alma_item_checks_notification_service.services.notification_service.logging"
-                    ):
-                        mock_jinja_env = Mock()
-                        mock_env.return_value = mock_jinja_env
+                "alma_item_checks_notification_service.services.notification_service.get_storage_service"
+            ) as mock_storage:
+                mock_jinja_env = Mock()
+                mock_get_env.return_value = mock_jinja_env
+
+                service = NotificationService(self.mock_message)
 
-                        # Mock the path chain to succeed
-                        with patch.object(Path, "is_dir", return_value=True):
-                            service = NotificationService(self.mock_message)
+                assert service.msg is self.mock_message
+                assert service.jinja_env is mock_jinja_env
+                mock_storage.assert_called_once()
 
-                            assert service.msg is self.mock_message
-                            mock_storage.assert_called_once()
+    def test_init_reuses_worker_jinja_env(self):
+        """Test every NotificationService shares the worker-wide Jinja2 environment"""
+        with patch(
+            "alma_item_checks_notification_service.services.notification_service.get_storage_service"
+        ):
+            first = NotificationService(self.mock_message)
+            second = NotificationService(self.mock_message)
+
+            assert first.jinja_env is not None
+            assert first.jinja_env is second.jinja_env
 
     def test_init_template_directory_not_found(self):
         """Test initialization with missing template directory"""
-        # Test the path where template directory doesn't exist
         with patch(
-            "alma_item_checks_notification_service.services.notification_service.StorageService"
+            "alma_item_checks_notification_service.services.notification_service.get_storage_service"
         ):
-            with patch.object(Path, "is_dir", return_value=False):
+            with patch(
+                "alma_item_checks_notification_service.services.notification_service.get_jinja_env",
+                side_effect=FileNotFoundError("Jinja template directory not found"),
+            ):
                 with patch(
                     "alma_item_checks_notification_service.services.notification_service.logging"
                 ) as mock_logging:
                     # The service catches the FileNotFoundError and logs it, setting jinja_env to None
                     service = NotificationService(self.mock_message)
                     assert service.jinja_env is None
-                    mock_logging.error.assert_called()
                     mock_logging.exception.assert_called()
 
     def test_init_exception_handling(self):
         """Test initialization handles exceptions gracefully"""
         with patch(
-            "alma_item_checks_notification_service.services.notification_service.pathlib.Path",
+            "alma_item_checks_notification_service.services.notification_service.get_jinja_env",
             side_effect=Exception("Path error"),
         ):
             with patch(
-                "alma_item_checks_notification_service.services.notification_service.StorageService"
+                "alma_item_checks_notification_service.services.notification_service.get_storage_service"
             ):
                 with patch(
                     "alma_item_checks_notification_service.services.notification_service.logging"
@@ -81,6 +100,19 @@ class TestNotificationService:
                     service = NotificationService(self.mock_message)
                     assert service.jinja_env is None
 
+    def test_storage_clients_reused_across_messages(self):
+        """Test storage clients are shared by every message in the worker"""
+        with patch(
+            "alma_item_checks_notification_service.storage.wrlc_storage.StorageService"
+        ) as mock_storage_class:
+            mock_storage_class.side_effect = lambda *args: Mock()
+
+            first = NotificationService(self.mock_message)
+            second = NotificationService(self.mock_message)
+
+            assert first.storage_service is second.storage_service
+            mock_storage_class.assert_called_once_with()
+
     def test_send_notification_missing_fields(self):
         """Test send_notification with missing required fields"""
         mock_message = Mock()
@@ -89,7 +121,7 @@ class TestNotificationService:
         )
 
         with patch(
-            "alma_item_checks_notification_service.services.notification_service.StorageService"
+            "alma_item_checks_notification_service.services.notification_service.get_storage_service"
         ):
             with patch(
                 "alma_item_checks_notification_service.services.notification_service.logging"
@@ -104,10 +136,22 @@ class TestNotificationService:
                     "NotificationService.send_notification: message body missing required fields"
                 )
 
+    def test_parse_message_without_message(self):
+        """Test a service built without a queue message can't parse or requeue one"""
+        with patch(
+            "alma_item_checks_notification_service.services.notification_service.get_storage_service"
+        ):
+            service = NotificationService()
+
+        with pytest.raises(ValueError):
+            service.parse_message()
+        with pytest.raises(ValueError):
+            service.requeue(1)
+
     def test_send_notification_process_not_found(self):
         """Test send_notification with non-existent process"""
         with patch(
-            "alma_item_checks_notification_service.services.notification_service.StorageService"
+            "alma_item_checks_notification_service.services.notification_service.get_storage_service"
         ):
             with patch(
                 "alma_item_checks_notification_service.services.notification_service.ProcessService"
@@ -132,7 +176,7 @@ class TestNotificationService:
     def test_send_notification_success(self, sample_process, sample_user):
         """Test successful send_notification flow"""
         with patch(
-            "alma_item_checks_notification_service.services.notification_service.StorageService"
+            "alma_item_checks_notification_service.services.notification_service.get_storage_service"
         ) as mock_storage_class:
             # Setup storage service mocks
             mock_blob_storage = Mock()
@@ -165,7 +209,7 @@ class TestNotificationService:
                     mock_ps.return_value = mock_process_service
 
                     mock_user_process_service = Mock()
-                    mock_user_process_service.get_user_emails_for_process.return_value = [
+                    mock_user_process_service.get_recipient_emails.return_value = [
                         sample_user.email
                     ]
                     mock_ups.return_value = mock_user_process_service
@@ -187,11 +231,14 @@ class TestNotificationService:
                         mock_blob_storage.download_blob_as_json.assert_called_once()
                         mock_acs_storage.upload_blob_data.assert_called_once()
                         mock_acs_storage.send_queue_message.assert_called_once()
+                        mock_user_process_service.get_recipient_emails.assert_called_once_with(
+                            sample_process.id, 123
+                        )
 
     def test_render_email_body_no_jinja_env(self):
         """Test render_email_body with no Jinja environment"""
         with patch(
-            "alma_item_checks_notification_service.services.notification_service.StorageService"
+            "alma_item_checks_notification_service.services.notification_service.get_storage_service"
         ):
             with patch(
                 "alma_item_checks_notification_service.services.notification_service.logging"
@@ -209,7 +256,7 @@ class TestNotificationService:
     def test_render_email_body_template_not_found(self):
         """Test render_email_body with template not found"""
         with patch(
-            "alma_item_checks_notification_service.services.notification_service.StorageService"
+            "alma_item_checks_notification_service.services.notification_service.get_storage_service"
         ):
             service = NotificationService(self.mock_message)
 
@@ -232,7 +279,7 @@ class TestNotificationService:
     def test_render_email_body_render_exception(self):
         """Test render_email_body with rendering exception"""
         with patch(
-            "alma_item_checks_notification_service.services.notification_service.StorageService"
+            "alma_item_checks_notification_service.services.notification_service.get_storage_service"
         ):
             service = NotificationService(self.mock_message)
 
@@ -256,7 +303,7 @@ class TestNotificationService:
     def test_render_email_body_success(self):
         """Test successful render_email_body"""
         with patch(
-            "alma_item_checks_notification_service.services.notification_service.StorageService"
+            "alma_item_checks_notification_service.services.notification_service.get_storage_service"
         ):
             service = NotificationService(self.mock_message)
 
@@ -281,7 +328,7 @@ class TestNotificationService:
     def test_create_html_table_success(self):
         """Test create_html_table with valid data"""
         with patch(
-            "alma_item_checks_notification_service.services.notification_service.StorageService"
+            "alma_item_checks_notification_service.services.notification_service.get_storage_service"
         ):
             service = NotificationService(self.mock_message)
 
@@ -311,7 +358,7 @@ class TestNotificationService:
     def test_create_html_table_with_zero_column_removal(self):
         """Test create_html_table removes zero column"""
         with patch(
-            "alma_item_checks_notification_service.services.notification_service.StorageService"
+            "alma_item_checks_notification_service.services.notification_service.get_storage_service"
         ):
             service = NotificationService(self.mock_message)
 
@@ -340,7 +387,7 @@ class TestNotificationService:
     def test_create_html_table_empty_dataframe(self):
         """Test create_html_table with empty DataFrame"""
         with patch(
-            "alma_item_checks_notification_service.services.notification_service.StorageService"
+            "alma_item_checks_notification_service.services.notification_service.get_storage_service"
         ):
             service = NotificationService(self.mock_message)
 
@@ -363,7 +410,7 @@ class TestNotificationService:
     def test_create_html_table_none_report(self):
         """Test create_html_table with None report"""
         with patch(
-            "alma_item_checks_notification_service.services.notification_service.StorageService"
+            "alma_item_checks_notification_service.services.notification_service.get_storage_service"
         ):
             service = NotificationService(self.mock_message)
 
@@ -380,7 +427,7 @@ class TestNotificationService:
     def test_create_html_table_conversion_exception(self):
         """Test create_html_table handles conversion exceptions"""
         with patch(
-            "alma_item_checks_notification_service.services.notification_service.StorageService"
+            "alma_item_checks_notification_service.services.notification_service.get_storage_service"
         ):
             service = NotificationService(self.mock_message)
 
@@ -398,3 +445,952 @@ class TestNotificationService:
                         "Failed JSON->HTML conversion" in str(call)
                         for call in mock_logging.error.call_args_list
                     )
+
+
+STRING_REPORTS = [
+    [
+        {"Item ID": "123", "Title": "Test Book", "Status": "Available"},
+        {"Item ID": "456", "Title": "Another Book", "Status": "Checked Out"},
+    ],
+    [
+        {"0": "0", "Barcode": "A1", "Title": "Book & <Journal>"},
+        {"0": "0", "Barcode": "B2", "Title": "  padded\ttitle  "},
+    ],
+    [
+        {"Barcode": "A1", "Note": None},
+        {"Barcode": "B2", "Note": "late", "Extra": "x"},
+    ],
+    [{}],
+]
+
+
+class TestCreateHtmlTableRenderers:
+    """Golden tests comparing the pandas and streaming table renderers"""
+
+    def setup_method(self):
+        """Setup for each test method"""
+        reset_storage_clients()
+        with patch(
+            "alma_item_checks_notification_service.services.notification_service.get_storage_service"
+        ):
+            self.service = NotificationService(Mock())
+        self.process = Mock(email_subject="Subject")
+
+    def _render(self, renderer, report):
+        with patch(
+            "alma_item_checks_notification_service.services.notification_service.HTML_TABLE_RENDERER",
+            renderer,
+        ):
+            return self.service.create_html_table(report, self.process)
+
+    @pytest.mark.parametrize("report", STRING_REPORTS)
+    def test_streaming_matches_pandas(self, report):
+        """Test the streaming renderer is byte-for-byte identical for string reports"""
+        assert self._render("streaming", report) == self._render("pandas", report)
+
+    @pytest.mark.parametrize("report", [None, [], {"a": 1}])
+    def test_streaming_matches_pandas_edge_cases(self, report):
+        """Test the streaming renderer handles empty and invalid reports like pandas"""
+        assert self._render("streaming", report) == self._render("pandas", report)
+
+    @pytest.mark.parametrize(
+        "report, streaming_cell, pandas_cell",
+        [
+            ([{"Barcode": "00456"}], "<td>00456</td>", "<td>456</td>"),
+            ([{"n": 1}, {"n": None}], "<td>1</td>", "<td>1.0</td>"),
+            (
+                [{"date": "2024-01-01T10:00:00"}],
+                "<td>2024-01-01T10:00:00</td>",
+                "<td>2024-01-01 10:00:00</td>",
+            ),
+        ],
+    )
+    def test_documented_differences(self, report, streaming_cell, pandas_cell):
+        """Test the documented type-inference differences from the pandas path"""
+        assert streaming_cell in self._render("streaming", report)
+        assert pandas_cell in self._render("pandas", report)
+
+    def test_streaming_renderer_used_when_configured(self):
+        """Test create_html_table dispatches to the streaming renderer"""
+        with patch(
+            "alma_item_checks_notification_service.services.notification_service.pd"
+        ) as mock_pd:
+            html = self._render("streaming", STRING_REPORTS[0])
+
+            mock_pd.read_json.assert_not_called()
+            assert html.startswith("<table")
+
+
+class TestDownloadReport:
+    """Tests for NotificationService.download_report"""
+
+    def setup_method(self):
+        """Setup for each test method"""
+        reset_storage_clients()
+        with patch(
+            "alma_item_checks_notification_service.services.notification_service.get_storage_service"
+        ):
+            self.service = NotificationService(Mock())
+
+    def test_download_report_default(self):
+        """Test reports are downloaded whole when streaming is disabled"""
+        self.service.storage_service.download_blob_as_json.return_value = [{"a": 1}]
+
+        report = self.service.download_report("job")
+
+        assert report == [{"a": 1}]
+        self.service.storage_service.download_blob_as_json.assert_called_once_with(
+            container_name="reports-container", blob_name="job.json"
+        )
+
+    @patch(
+        "alma_item_checks_notification_service.services.notification_service.REPORT_STREAMING_ENABLED",
+        True,
+    )
+    @patch(
+        "alma_item_checks_notification_service.services.notification_service.REPORT_MAX_ROWS",
+        10,
+    )
+    @patch(
+        "alma_item_checks_notification_service.services.notification_service.ReportService"
+    )
+    def test_download_report_streaming_pandas(self, mock_report_service):
+        """Test streamed records are collected for the pandas renderer"""
+        mock_report_service.return_value.iter_report_records.return_value = iter(
+            [{"a": 1}]
+        )
+
+        report = self.service.download_report("job")
+
+        assert report == [{"a": 1}]
+        mock_report_service.return_value.iter_report_records.assert_called_once_with(
+            container_name="reports-container", blob_name="job.json", max_rows=10
+        )
+        self.service.storage_service.download_blob_as_json.assert_not_called()
+
+    @patch(
+        "alma_item_checks_notification_service.services.notification_service.REPORT_STREAMING_ENABLED",
+        True,
+    )
+    @patch(
+        "alma_item_checks_notification_service.services.notification_service.HTML_TABLE_RENDERER",
+        "streaming",
+    )
+    @patch(
+        "alma_item_checks_notification_service.services.notification_service.ReportService"
+    )
+    def test_download_report_streaming_renderer(self, mock_report_service):
+        """Test the streaming renderer receives the lazy record iterator"""
+        records = iter([{"a": 1}])
+        mock_report_service.return_value.iter_report_records.return_value = records
+
+        assert self.service.download_report("job") is records
+        assert (
+            mock_report_service.return_value.iter_report_records.call_args.kwargs[
+                "max_rows"
+            ]
+            is None
+        )
+
+    def test_streaming_table_from_iterator(self, sample_report_data):
+        """Test the streaming renderer consumes a lazy record iterator"""
+        html = self.service.create_html_table_streaming(
+            record for record in sample_report_data
+        )
+
+        assert html.count("<tr>") == 2
+
+    def test_streaming_table_from_empty_iterator(self):
+        """Test an empty record stream is treated as no report"""
+        with patch(
+            "alma_item_checks_notification_service.services.notification_service.logging"
+        ) as mock_logging:
+            assert self.service.create_html_table_streaming(iter([])) is None
+            mock_logging.warning.assert_called_once()
+
+    def test_streaming_table_empty_dict(self):
+        """Test an empty dict report is treated as no report"""
+        assert self.service.create_html_table_streaming({}) is None
+
+    def test_streaming_table_stream_error(self):
+        """Test a malformed record stream produces the error message"""
+
+        def records():
+            yield {"a": 1}
+            raise ValueError("Invalid JSON array element")
+
+        assert (
+            self.service.create_html_table_streaming(records())
+            == "Error generating table from data."
+        )
+
+
+class TestDigestMode:
+    """Tests for digest buffering and flushing in NotificationService"""
+
+    def setup_method(self):
+        """Setup for each test method"""
+        reset_storage_clients()
+        self.flush_patcher = patch(
+            "alma_item_checks_notification_service.services.digest_service.DIGEST_FLUSH_ENABLED",
+            True,
+        )
+        self.flush_patcher.start()
+        with patch(
+            "alma_item_checks_notification_service.services.notification_service.get_storage_service"
+        ):
+            self.service = NotificationService()
+        self.reports = {
+            "job-1": [{"Item": "a"}, {"Item": "b"}],
+            "job-2": [{"Item": "c"}],
+        }
+        self.service.download_report = Mock(side_effect=self.reports.get)
+        self.service.send_email = Mock()
+
+    def teardown_method(self):
+        """Teardown for each test method"""
+        self.flush_patcher.stop()
+
+    def test_buffer_for_digest_disabled(self, db_session, sample_process):
+        """Test jobs for processes without digest mode are sent immediately"""
+        assert not self.service.buffer_for_digest(
+            db_session, sample_process, 123, "job-1"
+        )
+        self.service.download_report.assert_not_called()
+
+    def test_buffer_for_digest(self, db_session, sample_process):
+        """Test jobs for digest processes are buffered with their row counts"""
+        sample_process.digest_enabled = True
+
+        assert self.service.buffer_for_digest(db_session, sample_process, 123, "job-1")
+
+        assert DigestService(db_session).buffered_rows(sample_process.id, 123) == 2
+        self.service.send_email.assert_not_called()
+
+    def test_buffer_for_digest_flushes_at_row_cap(
+        self, db_session, sample_process, sample_user, sample_user_process
+    ):
+        """Test reaching the row cap sends the digest straight away"""
+        sample_process.digest_enabled = True
+        sample_process.digest_max_rows = 3
+
+        self.service.buffer_for_digest(db_session, sample_process, 123, "job-1")
+        self.service.send_email.assert_not_called()
+        self.service.buffer_for_digest(db_session, sample_process, 123, "job-2")
+
+        self.service.send_email.assert_called_once_with(
+            process=sample_process,
+            report=[{"Item": "a"}, {"Item": "b"}, {"Item": "c"}],
+            blob_name="digest-job-1.json",
+            user_emails=[sample_user.email],
+        )
+        assert DigestService(db_session).buffered_rows(sample_process.id, 123) == 0
+
+    def test_buffer_for_digest_failure_sends_now(self, db_session, sample_process):
+        """Test a job is sent immediately if it can't be buffered"""
+        sample_process.digest_enabled = True
+
+        with patch(
+            "alma_item_checks_notification_service.services.notification_service.DigestService"
+        ) as mock_digest_service:
+            mock_digest_service.return_value.buffer_job.return_value = False
+
+            assert not self.service.buffer_for_digest(
+                db_session, sample_process, 123, "job-1"
+            )
+
+    def test_send_notification_buffers_digest_jobs(self, db_session, sample_process):
+        """Test send_notification buffers instead of delivering for digest processes"""
+        sample_process.digest_enabled = True
+        db_session.commit()
+        self.service.msg = Mock()
+        self.service.msg.get_body.return_value.decode.return_value = json.dumps(
+            {"job_id": "job-1", "institution_id": 123, "process_type": "test_process"}
+        )
+        self.service.deliver = Mock()
+
+        self.service.send_notification(db_session)
+
+        self.service.deliver.assert_not_called()
+        assert DigestService(db_session).buffered_rows(sample_process.id, 123) == 2
+
+    def test_send_notification_streamed_report_sent_when_not_buffered(
+        self, db_session, sample_process
+    ):
+        """Test a streamed report counted for the digest is still sent in full"""
+        sample_process.digest_enabled = True
+        db_session.commit()
+        self.service.msg = Mock()
+        self.service.msg.get_body.return_value.decode.return_value = json.dumps(
+            {"job_id": "job-1", "institution_id": 123, "process_type": "test_process"}
+        )
+        self.service.download_report = Mock(
+            side_effect=lambda job_id: iter(self.reports[job_id])
+        )
+        self.service.deliver = Mock()
+
+        with patch(
+            "alma_item_checks_notification_service.services.notification_service.DigestService"
+        ) as mock_digest_service:
+            mock_digest_service.return_value.buffer_job.return_value = False
+            with patch(
+                "alma_item_checks_notification_service.services.notification_service.logging"
+            ):
+                self.service.send_notification(db_session)
+
+        mock_digest_service.return_value.buffer_job.assert_called_once_with(
+            sample_process, 123, "job-1", 2
+        )
+        self.service.download_report.assert_called_once_with("job-1")
+        assert self.service.deliver.call_args.kwargs["report"] == self.reports["job-1"]
+
+    def test_send_notification_digest_without_flush_timer(
+        self, db_session, sample_process
+    ):
+        """Test digest jobs are sent now when no flush timer would send them"""
+        sample_process.digest_enabled = True
+        db_session.commit()
+        self.service.msg = Mock()
+        self.service.msg.get_body.return_value.decode.return_value = json.dumps(
+            {"job_id": "job-1", "institution_id": 123, "process_type": "test_process"}
+        )
+        self.service.deliver = Mock()
+
+        with patch(
+            "alma_item_checks_notification_service.services.digest_service.DIGEST_FLUSH_ENABLED",
+            False,
+        ):
+            self.service.send_notification(db_session)
+
+        self.service.deliver.assert_called_once()
+        assert DigestService(db_session).buffered_rows(sample_process.id, 123) == 0
+
+    def test_send_digest_nothing_buffered(self, db_session, sample_process):
+        """Test no email is sent when nothing is buffered"""
+        assert not self.service.send_digest(db_session, sample_process, 123)
+        self.service.send_email.assert_not_called()
+
+    def test_send_digest_restores_jobs_on_failure(self, db_session, sample_process):
+        """Test claimed jobs go back in the buffer if the email fails"""
+        digest_service = DigestService(db_session)
+        digest_service.buffer_job(sample_process, 123, "job-1", 2)
+        self.service.send_email.side_effect = RuntimeError("upload failed")
+
+        with patch(
+            "alma_item_checks_notification_service.services.notification_service.logging"
+        ):
+            assert not self.service.send_digest(db_session, sample_process, 123)
+
+        assert digest_service.buffered_rows(sample_process.id, 123) == 2
+
+    def test_flush_digests(self, db_session, sample_process):
+        """Test due digests are sent by the flush"""
+        digest_service = DigestService(db_session)
+        digest_service.buffer_job(
+            sample_process, 123, "job-1", 2, now=datetime(2000, 1, 1)
+        )
+        digest_service.buffer_job(sample_process, 456, "job-2", 1)
+
+        assert self.service.flush_digests(db_session) == 1
+        assert self.service.send_email.call_args.kwargs["blob_name"] == (
+            "digest-job-1.json"
+        )
+        assert digest_service.buffered_rows(sample_process.id, 456) == 1
+
+    def test_flush_digests_process_missing(self, db_session):
+        """Test groups whose process can't be loaded are skipped"""
+        group = Mock(process_id=99, institution_id=123)
+
+        with patch(
+            "alma_item_checks_notification_service.services.notification_service.DigestService"
+        ) as mock_digest_service:
+            mock_digest_service.return_value.get_due_groups.return_value = [group]
+            with patch(
+                "alma_item_checks_notification_service.services.notification_service.logging"
+            ) as mock_logging:
+                assert self.service.flush_digests(db_session) == 0
+                mock_logging.error.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "report, records",
+        [
+            (None, []),
+            ({}, []),
+            ({"a": 1}, [{"a": 1}]),
+            ([{"a": 1}], [{"a": 1}]),
+            (iter([{"a": 1}]), [{"a": 1}]),
+        ],
+    )
+    def test_report_records(self, report, records):
+        """Test downloaded reports of every shape are collected as records"""
+        assert NotificationService.report_records(report) == records
+
+
+class TestIdempotency:
+    """Tests for duplicate message handling in NotificationService"""
+
+    def setup_method(self):
+        """Setup for each test method"""
+        reset_storage_clients()
+        self.message = Mock()
+        self.message.get_body.return_value.decode.return_value = json.dumps(
+            {"job_id": "job-1", "institution_id": 123, "process_type": "test_process"}
+        )
+        with patch(
+            "alma_item_checks_notification_service.services.notification_service.get_storage_service"
+        ):
+            self.service = NotificationService(self.message)
+        self.service.deliver = Mock()
+
+    def test_duplicate_skipped_before_download(self, db_session, sample_process):
+        """Test a redelivered message is skipped before any work is done"""
+        self.service.send_notification(db_session)
+        self.service.send_notification(db_session)
+
+        self.service.deliver.assert_called_once()
+        assert db_session.get(ProcessedJob, "job-1").completed_at is not None
+
+    def test_failure_releases_claim(self, db_session, sample_process):
+        """Test a failed job can be retried"""
+        self.service.deliver.side_effect = [RuntimeError("upload failed"), None]
+
+        with pytest.raises(RuntimeError):
+            self.service.send_notification(db_session)
+        self.service.send_notification(db_session)
+
+        assert self.service.deliver.call_count == 2
+
+    @patch(
+        "alma_item_checks_notification_service.services.notification_service.get_queue_client"
+    )
+    def test_redelivered_in_progress_requeued(
+        self, mock_get_queue_client, db_session, sample_process
+    ):
+        """Test a message redelivered while its job is claimed comes back when the claim goes stale"""
+        ProcessedJobService(db_session).claim("job-1")
+
+        self.service.send_notification(db_session)
+
+        self.service.deliver.assert_not_called()
+        mock_get_queue_client.assert_called_once_with("notification-queue")
+        send_message = mock_get_queue_client.return_value.send_message
+        assert send_message.call_args.args == (self.message.get_body.return_value,)
+        assert 890 <= send_message.call_args.kwargs["visibility_timeout"] <= 900
+
+    @patch(
+        "alma_item_checks_notification_service.services.notification_service.get_queue_client"
+    )
+    def test_redelivered_in_progress_retried(
+        self, mock_get_queue_client, db_session, sample_process
+    ):
+        """Test a message that can't be requeued is retried, not dropped"""
+        mock_get_queue_client.return_value.send_message.side_effect = RuntimeError(
+            "unavailable"
+        )
+        ProcessedJobService(db_session).claim("job-1")
+
+        with (
+            patch(
+                "alma_item_checks_notification_service.services.notification_service.logging"
+            ),
+            pytest.raises(JobInProgressError),
+        ):
+            self.service.send_notification(db_session)
+        self.service.deliver.assert_not_called()
+
+        # Once the claim is abandoned, the retried message sends the email
+        db_session.get(ProcessedJob, "job-1").claimed_at -= timedelta(seconds=901)
+        db_session.commit()
+        self.service.send_notification(db_session)
+
+        self.service.deliver.assert_called_once()
+        assert db_session.get(ProcessedJob, "job-1").completed_at is not None
+
+    def test_process_not_found_completes(self, db_session):
+        """Test a job for an unknown process isn't retried"""
+        with patch(
+            "alma_item_checks_notification_service.services.notification_service.logging"
+        ):
+            self.service.send_notification(db_session)
+
+        assert db_session.get(ProcessedJob, "job-1").completed_at is not None
+
+    @patch(
+        "alma_item_checks_notification_service.services.notification_service.IDEMPOTENCY_ENABLED",
+        False,
+    )
+    def test_idempotency_disabled(self, db_session, sample_process):
+        """Test every delivery is processed when idempotency is off"""
+        self.service.send_notification(db_session)
+        self.service.send_notification(db_session)
+
+        assert self.service.deliver.call_count == 2
+        assert db_session.get(ProcessedJob, "job-1") is None
+
+
+class TestAttachmentMode:
+    """Tests for sending large reports as a CSV attachment"""
+
+    def setup_method(self):
+        """Setup for each test method"""
+        reset_storage_clients()
+        self.storage_patcher = patch(
+            "alma_item_checks_notification_service.services.notification_service.get_storage_service"
+        )
+        self.mock_storage = self.storage_patcher.start().return_value
+        self.service = NotificationService()
+        self.report = [{"Item": f"item-{i}"} for i in range(5)]
+
+    def teardown_method(self):
+        """Teardown for each test method"""
+        self.storage_patcher.stop()
+
+    def _send(self, process):
+        """Send the report, returning the ReportService and EmailMessage mocks"""
+        with (
+            patch(
+                "alma_item_checks_notification_service.services.notification_service.ReportService"
+            ) as mock_report_service,
+            patch(
+                "alma_item_checks_notification_service.services.notification_service.get_blob_service_client"
+            ),
+            patch(
+                "alma_item_checks_notification_service.services.notification_service.email_model"
+            ) as mock_email_model,
+            patch(
+                "alma_item_checks_notification_service.services.notification_service.REPORT_ATTACHMENT_PREVIEW_ROWS",
+                2,
+            ),
+        ):
+            self.service.send_email(
+                process=process,
+                report=list(self.report),
+                blob_name="job-1.json",
+                user_emails=["user@example.com"],
+            )
+        return mock_report_service.return_value, mock_email_model.EmailMessage
+
+    def test_inline_by_default(self, sample_process):
+        """Test reports are inline when no threshold is set"""
+        report_service, email_message = self._send(sample_process)
+
+        report_service.upload_csv.assert_not_called()
+        html = email_message.call_args.kwargs["html"]
+        assert "item-4" in html
+        assert "attached" not in html
+        self.mock_storage.send_queue_message.assert_called_once_with(
+            queue_name="", message_content={"blob_name": "job-1.json"}
+        )
+
+    def test_below_threshold_inline(self, sample_process):
+        """Test reports within the threshold stay inline"""
+        sample_process.attachment_threshold_rows = 5
+
+        report_service, email_message = self._send(sample_process)
+
+        report_service.upload_csv.assert_not_called()
+        assert "item-4" in email_message.call_args.kwargs["html"]
+
+    def test_above_threshold_attached(self, sample_process):
+        """Test large reports are attached as CSV with a preview table"""
+        sample_process.attachment_threshold_rows = 4
+
+        report_service, email_message = self._send(sample_process)
+
+        report_service.upload_csv.assert_called_once_with(
+            container_name="", blob_name="job-1.csv", records=self.report
+        )
+        html = email_message.call_args.kwargs["html"]
+        assert "item-1" in html
+        assert "item-2" not in html
+        assert "full report of 5 rows is attached" in html
+        self.mock_storage.send_queue_message.assert_called_once_with(
+            queue_name="",
+            message_content={
+                "blob_name": "job-1.json",
+                "attachment_blob_name": "job-1.csv",
+                "attachment_content_type": "text/csv; charset=utf-8",
+            },
+        )
+
+    @patch(
+        "alma_item_checks_notification_service.services.notification_service.REPORT_ATTACHMENT_THRESHOLD_ROWS",
+        3,
+    )
+    def test_global_threshold(self, sample_process):
+        """Test the configured threshold applies to processes without their own"""
+        report_service, _ = self._send(sample_process)
+
+        report_service.upload_csv.assert_called_once()
+
+    @patch(
+        "alma_item_checks_notification_service.services.notification_service.REPORT_ATTACHMENT_THRESHOLD_ROWS",
+        3,
+    )
+    def test_process_can_opt_out(self, sample_process):
+        """Test a process threshold of 0 keeps its reports inline"""
+        sample_process.attachment_threshold_rows = 0
+
+        report_service, _ = self._send(sample_process)
+
+        report_service.upload_csv.assert_not_called()
+
+
+class TestEmailPayloadCompression:
+    """Tests for gzip-compressed email payloads"""
+
+    def setup_method(self):
+        """Setup for each test method"""
+        reset_storage_clients()
+        with patch(
+            "alma_item_checks_notification_service.services.notification_service.get_storage_service"
+        ):
+            self.service = NotificationService()
+        self.storage_service = Mock()
+        self.email_json = json.dumps({"html": "<td>row</td>" * 1000})
+
+    def test_plain_by_default(self):
+        """Test payloads are uploaded uncompressed with an unversioned message"""
+        with patch(
+            "alma_item_checks_notification_service.services.notification_service.get_blob_service_client"
+        ) as mock_get_client:
+            fields = self.service.store_email_payload(
+                self.storage_service, "job-1.json", self.email_json
+            )
+
+        assert fields == {"blob_name": "job-1.json"}
+        self.storage_service.upload_blob_data.assert_called_once_with(
+            container_name="", blob_name="job-1.json", data=self.email_json
+        )
+        mock_get_client.assert_not_called()
+
+    @patch(
+        "alma_item_checks_notification_service.services.notification_service.EMAIL_PAYLOAD_COMPRESSION_ENABLED",
+        True,
+    )
+    def test_compressed(self):
+        """Test payloads are gzipped with content-encoding metadata and versioned"""
+        with (
+            patch(
+                "alma_item_checks_notification_service.services.notification_service.get_blob_service_client"
+            ) as mock_get_client,
+            patch(
+                "alma_item_checks_notification_service.services.notification_service.azure_blob"
+            ) as mock_azure_blob,
+        ):
+            fields = self.service.store_email_payload(
+                self.storage_service, "job-1.json", self.email_json
+            )
+
+        assert fields == {"blob_name": "job-1.json.gz", "version": 2}
+        self.storage_service.upload_blob_data.assert_not_called()
+        blob_client = mock_get_client.return_value.get_blob_client
+        blob_client.assert_called_once_with(container="", blob="job-1.json.gz")
+        upload = blob_client.return_value.upload_blob
+        (data,) = upload.call_args.args
+        assert gzip.decompress(data).decode() == self.email_json
+        assert len(data) < len(self.email_json) / 10
+        assert upload.call_args.kwargs["overwrite"] is True
+        mock_azure_blob.ContentSettings.assert_called_once_with(
+            content_type="application/json", content_encoding="gzip"
+        )
+
+    @patch(
+        "alma_item_checks_notification_service.services.notification_service.EMAIL_PAYLOAD_COMPRESSION_ENABLED",
+        True,
+    )
+    def test_send_email_queues_versioned_message(self, sample_process):
+        """Test the sender queue message points at the compressed blob"""
+        with (
+            patch(
+                "alma_item_checks_notification_service.services.notification_service.get_storage_service"
+            ) as mock_get_storage,
+            patch(
+                "alma_item_checks_notification_service.services.notification_service.get_blob_service_client"
+            ),
+            patch(
+                "alma_item_checks_notification_service.services.notification_service.azure_blob"
+            ),
+            patch(
+                "alma_item_checks_notification_service.services.notification_service.email_model"
+            ) as mock_email_model,
+        ):
+            mock_email_model.EmailMessage.return_value.model_dump_json.return_value = (
+                self.email_json
+            )
+            self.service.send_email(
+                process=sample_process,
+                report=[{"Item": "a"}],
+                blob_name="job-1.json",
+                user_emails=["user@example.com"],
+            )
+
+        mock_get_storage.return_value.send_queue_message.assert_called_once_with(
+            queue_name="",
+            message_content={"blob_name": "job-1.json.gz", "version": 2},
+        )
+
+
+class TestEmailPayloadInline:
+    """Tests for embedding small emails in the sender queue message"""
+
+    def setup_method(self):
+        """Setup for each test method"""
+        reset_storage_clients()
+        with patch(
+            "alma_item_checks_notification_service.services.notification_service.get_storage_service"
+        ):
+            self.service = NotificationService()
+        self.storage_service = Mock()
+        self.email = {"to": ["user@example.com"], "subject": "S", "html": "<p>é</p>"}
+
+    @patch(
+        "alma_item_checks_notification_service.services.notification_service.EMAIL_PAYLOAD_INLINE_ENABLED",
+        True,
+    )
+    def test_small_payload_inlined(self):
+        """Test small emails are embedded and no blob is written"""
+        fields = self.service.store_email_payload(
+            self.storage_service, "job-1.json", json.dumps(self.email)
+        )
+
+        assert fields == {"email": self.email, "version": 3}
+        self.storage_service.upload_blob_data.assert_not_called()
+
+    @patch(
+        "alma_item_checks_notification_service.services.notification_service.EMAIL_PAYLOAD_INLINE_ENABLED",
+        True,
+    )
+    @patch(
+        "alma_item_checks_notification_service.services.notification_service.EMAIL_PAYLOAD_INLINE_MAX_BYTES",
+        64,
+    )
+    def test_large_payload_uses_blob(self):
+        """Test emails over the inline limit are still uploaded as blobs"""
+        email_json = json.dumps({**self.email, "html": "x" * 64})
+
+        fields = self.service.store_email_payload(
+            self.storage_service, "job-1.json", email_json
+        )
+
+        assert fields == {"blob_name": "job-1.json"}
+        self.storage_service.upload_blob_data.assert_called_once_with(
+            container_name="", blob_name="job-1.json", data=email_json
+        )
+
+    @patch(
+        "alma_item_checks_notification_service.services.notification_service.EMAIL_PAYLOAD_INLINE_ENABLED",
+        True,
+    )
+    def test_non_ascii_payload_sized_as_sent(self):
+        """Test the limit applies to the escaped, base64 encoded queue message"""
+        # About 47 KB of UTF-8, but over 120 KB once escaped and encoded
+        email_json = json.dumps(
+            {**self.email, "html": "図書館の資料" * 2600}, ensure_ascii=False
+        )
+        assert len(email_json.encode("utf-8")) < 64 * 1024
+
+        fields = self.service.store_email_payload(
+            self.storage_service, "job-1.json", email_json
+        )
+
+        assert fields == {"blob_name": "job-1.json"}
+        self.storage_service.upload_blob_data.assert_called_once()
+
+    @patch(
+        "alma_item_checks_notification_service.services.notification_service.EMAIL_PAYLOAD_INLINE_ENABLED",
+        True,
+    )
+    def test_attachment_fields_counted(self):
+        """Test attachment fields are part of the message that has to fit"""
+        email_json = json.dumps(self.email)
+        attachment = {"attachment_blob_name": "job-1.csv"}
+        inline = {"email": self.email, "version": 3, **attachment}
+        limit = queue_message_bytes(inline)
+
+        with patch(
+            "alma_item_checks_notification_service.services.notification_service.EMAIL_PAYLOAD_INLINE_MAX_BYTES",
+            limit,
+        ):
+            assert (
+                self.service.store_email_payload(
+                    self.storage_service, "job-1.json", email_json, attachment
+                )
+                == inline
+            )
+            attachment["attachment_blob_name"] = "job-1-longer-name.csv"
+            fields = self.service.store_email_payload(
+                self.storage_service, "job-1.json", email_json, attachment
+            )
+
+        assert fields == {"blob_name": "job-1.json", **attachment}
+
+    def test_queue_message_bytes(self):
+        """Test queue message size is measured after escaping and base64 encoding"""
+        message = {"html": "é"}
+
+        assert queue_message_bytes(message) == len(
+            base64.b64encode(json.dumps(message).encode("utf-8"))
+        )
+        assert queue_message_bytes(message) > len(
+            json.dumps(message, ensure_ascii=False)
+        )
+
+    def test_disabled_by_default(self):
+        """Test small emails are uploaded as blobs unless inlining is enabled"""
+        fields = self.service.store_email_payload(
+            self.storage_service, "job-1.json", json.dumps(self.email)
+        )
+
+        assert fields == {"blob_name": "job-1.json"}
+        self.storage_service.upload_blob_data.assert_called_once()
+
+
+class TestReportPrefetch:
+    """Tests for downloading the report while the database lookups run"""
+
+    def setup_method(self):
+        """Setup for each test method"""
+        reset_storage_clients()
+        self.message = Mock()
+        self.message.get_body.return_value.decode.return_value = json.dumps(
+            {"job_id": "job-1", "institution_id": 123, "process_type": "test_process"}
+        )
+        with patch(
+            "alma_item_checks_notification_service.services.notification_service.get_storage_service"
+        ):
+            self.service = NotificationService(self.message)
+        self.service.send_email = Mock()
+        self.report = [{"Item": "a"}]
+
+    def test_download_overlaps_lookups(self, db_session, sample_process):
+        """Test the download is in flight while recipients are looked up"""
+        lookup_done = threading.Event()
+
+        def download(job_id):
+            # Only succeeds if the lookup finishes while this is running
+            assert lookup_done.wait(5)
+            return self.report
+
+        self.service.download_report = Mock(side_effect=download)
+
+        with patch(
+            "alma_item_checks_notification_service.services.notification_service.UserProcessService"
+        ) as mock_ups:
+            mock_ups.return_value.get_recipient_emails.side_effect = lambda *args: (
+                lookup_done.set() or ["user@example.com"]
+            )
+            self.service.send_notification(db_session)
+
+        self.service.download_report.assert_called_once_with("job-1")
+        assert self.service.send_email.call_args.kwargs["report"] == self.report
+
+    def test_unknown_process_not_downloaded(self, db_session):
+        """Test a job for an unknown process is dropped before its report is fetched"""
+        self.service.download_report = Mock()
+
+        with patch(
+            "alma_item_checks_notification_service.services.notification_service.logging"
+        ):
+            self.service.send_notification(db_session)
+
+        self.service.download_report.assert_not_called()
+        self.service.send_email.assert_not_called()
+
+    @patch(
+        "alma_item_checks_notification_service.services.notification_service.REPORT_PREFETCH_ENABLED",
+        False,
+    )
+    def test_prefetch_disabled(self, db_session, sample_process):
+        """Test the report is downloaded after the lookups when prefetch is off"""
+        self.service.download_report = Mock(return_value=self.report)
+
+        assert self.service.prefetch_report("job-1") is None
+        self.service.send_notification(db_session)
+
+        self.service.download_report.assert_called_once_with("job-1")
+        assert self.service.send_email.call_args.kwargs["report"] == self.report
+
+    def test_download_failure_raised(self, db_session, sample_process):
+        """Test a failed download fails the message as before"""
+        self.service.download_report = Mock(side_effect=RuntimeError("blob gone"))
+
+        with pytest.raises(RuntimeError, match="blob gone"):
+            self.service.send_notification(db_session)
+
+        self.service.send_email.assert_not_called()
+
+    def test_download_ignored_for_unknown_process(self, db_session):
+        """Test a job for an unknown process sends nothing"""
+        self.service.download_report = Mock(side_effect=RuntimeError("blob gone"))
+
+        with patch(
+            "alma_item_checks_notification_service.services.notification_service.logging"
+        ):
+            self.service.send_notification(db_session)
+
+        self.service.send_email.assert_not_called()
+
+
+class TestTracingSpans:
+    """Tests for the timing spans around each stage of send_notification"""
+
+    def setup_method(self):
+        """Setup for each test method"""
+        reset_storage_clients()
+        self.message = Mock()
+        self.message.get_body.return_value.decode.return_value = json.dumps(
+            {"job_id": "job-1", "institution_id": 123, "process_type": "test_process"}
+        )
+
+    def test_send_notification_spans(
+        self, db_session, sample_process, sample_user_process, recording_tracer
+    ):
+        """Test every stage is timed with the job's identifiers and sizes"""
+        mock_storage = Mock()
+        mock_storage.download_blob_as_json.return_value = [
+            {"Item": "a"},
+            {"Item": "b"},
+        ]
+        with patch(
+            "alma_item_checks_notification_service.services.notification_service.get_storage_service",
+            return_value=mock_storage,
+        ):
+            NotificationService(self.message).send_notification(db_session)
+
+        spans = dict(recording_tracer.spans)
+        assert [
+            name for name, _ in recording_tracer.spans if name != "download_report"
+        ] == [
+            "notification",
+            "lookup_process",
+            "resolve_recipients",
+            "render_table",
+            "serialize_report",
+            "build_dataframe",
+            "to_html",
+            "render_template",
+            "serialize_email",
+            "store_payload",
+            "send_queue_message",
+        ]
+        for attributes in spans.values():
+            assert attributes["job_id"] == "job-1"
+            assert attributes["process_type"] == "test_process"
+            assert attributes["institution_id"] == 123
+        assert spans["download_report"]["row_count"] == 2
+        assert spans["resolve_recipients"]["recipient_count"] == 1
+        assert 0 <= spans["resolve_recipients"]["cache_hit_ratio"] <= 1
+        assert spans["resolve_recipients"]["cache_size"] >= 1
+        assert spans["render_table"]["row_count"] == 2
+        assert spans["render_template"]["payload_chars"] > 0
+        assert (
+            spans["serialize_email"]["payload_chars"]
+            == spans["store_payload"]["payload_chars"]
+        )
+        assert spans["store_payload"]["payload_chars"] == len(
+            mock_storage.upload_blob_data.call_args.kwargs["data"]
+        )
+        assert spans["send_queue_message"]["payload_bytes"] == queue_message_bytes(
+            mock_storage.send_queue_message.call_args.kwargs["message_content"]
+        )
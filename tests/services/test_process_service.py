@@ -5,6 +5,8 @@ from unittest.mock import Mock, patch
 
 from alma_item_checks_notification_service.services.process_service import (
     ProcessService,
+    invalidate_process_cache,
+    process_cache_stats,
 )
 from alma_item_checks_notification_service.repos.process_repo import ProcessRepository
 from alma_item_checks_notification_service.models.process import Process
@@ -133,3 +135,92 @@ class TestProcessService:
         assert found_process1.name == "process1"
         assert found_process2.name == "process2"
         assert found_process1.id != found_process2.id
+
+    def test_get_process_by_name_cached(self, db_session, sample_process):
+        """Test get_process_by_name serves repeat lookups from the cache"""
+        service = ProcessService(db_session)
+        service.get_process_by_name(sample_process.name)
+
+        with patch.object(service.process_repo, "get_process_by_name") as mock_get:
+            process = service.get_process_by_name(sample_process.name)
+
+            mock_get.assert_not_called()
+            assert process is not None
+            assert process.id == sample_process.id
+            assert process.email_subject == sample_process.email_subject
+
+        stats = process_cache_stats()
+        assert stats.hits == 1
+        assert stats.misses == 1
+
+    def test_get_process_by_name_cache_outlives_session(
+        self, db_engine, db_session, sample_process
+    ):
+        """Test cached processes stay readable after the loading session closes"""
+        from sqlalchemy.orm import sessionmaker
+
+        other_session = sessionmaker(bind=db_engine)()
+        ProcessService(other_session).get_process_by_name(sample_process.name)
+        other_session.close()
+
+        process = ProcessService(db_session).get_process_by_name(sample_process.name)
+
+        assert process is not None
+        assert process.name == sample_process.name
+        assert process.email_body == sample_process.email_body
+
+    def test_get_process_by_name_negative_cache(self, db_session):
+        """Test not-found lookups are cached"""
+        service = ProcessService(db_session)
+
+        with patch.object(
+            service.process_repo, "get_process_by_name", return_value=None
+        ) as mock_get:
+            assert service.get_process_by_name("bad_process") is None
+            assert service.get_process_by_name("bad_process") is None
+
+            mock_get.assert_called_once_with("bad_process")
+
+    def test_get_process_by_name_negative_cache_expires(self, db_session):
+        """Test not-found lookups use the shorter negative ttl"""
+        service = ProcessService(db_session)
+
+        with patch(
+            "alma_item_checks_notification_service.services.process_service.PROCESS_CACHE_NEGATIVE_TTL_SECONDS",
+            0,
+        ):
+            with patch.object(
+                service.process_repo, "get_process_by_name", return_value=None
+            ) as mock_get:
+                service.get_process_by_name("bad_process")
+                service.get_process_by_name("bad_process")
+
+                assert mock_get.call_count == 2
+
+    def test_invalidate_process_cache_single(self, db_session, sample_process):
+        """Test invalidate_process_cache drops a single process"""
+        service = ProcessService(db_session)
+        service.get_process_by_name(sample_process.name)
+
+        invalidate_process_cache(sample_process.name)
+
+        with patch.object(
+            service.process_repo, "get_process_by_name", return_value=None
+        ) as mock_get:
+            assert service.get_process_by_name(sample_process.name) is None
+            mock_get.assert_called_once()
+
+    def test_invalidate_process_cache_all(self, db_session, sample_process):
+        """Test invalidate_process_cache with no name clears everything"""
+        service = ProcessService(db_session)
+        service.get_process_by_name(sample_process.name)
+
+        invalidate_process_cache()
+
+        assert process_cache_stats().size == 0
+
+    def test_get_process_by_id(self, db_session, sample_process):
+        """Test get_process_by_id delegates to the repository"""
+        service = ProcessService(db_session)
+
+        assert service.get_process_by_id(sample_process.id) is sample_process
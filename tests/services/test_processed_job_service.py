@@ -0,0 +1,91 @@
+"""Tests for ProcessedJobService"""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from alma_item_checks_notification_service.models.processed_job import ProcessedJob
+from alma_item_checks_notification_service.services.processed_job_service import (
+    CLAIMED,
+    COMPLETED,
+    IN_PROGRESS,
+    ProcessedJobService,
+)
+
+T0 = datetime(2026, 1, 1, 12, 0)
+
+
+class TestProcessedJobService:
+    """Tests for ProcessedJobService"""
+
+    def test_claim_new_job(self, db_session):
+        """Test a new job is claimed"""
+        assert ProcessedJobService(db_session).claim("job-1", now=T0) == CLAIMED
+
+    def test_claim_completed_job(self, db_session):
+        """Test a completed job is a duplicate"""
+        service = ProcessedJobService(db_session)
+        service.claim("job-1", now=T0)
+        service.complete("job-1", now=T0)
+
+        assert service.claim("job-1", now=T0 + timedelta(days=1)) == COMPLETED
+
+    def test_claim_in_progress_job(self, db_session):
+        """Test a job claimed by another invocation is kept for a retry"""
+        service = ProcessedJobService(db_session)
+        service.claim("job-1", now=T0)
+
+        assert service.claim("job-1", now=T0 + timedelta(minutes=1)) == IN_PROGRESS
+        assert db_session.get(ProcessedJob, "job-1").claimed_at == T0
+
+    def test_claim_abandoned_job(self, db_session):
+        """Test an unfinished claim past the timeout is taken over"""
+        service = ProcessedJobService(db_session)
+        service.claim("job-1", now=T0)
+
+        assert service.claim("job-1", now=T0 + timedelta(seconds=901)) == CLAIMED
+
+    def test_claim_released_job(self, db_session):
+        """Test a released job can be claimed again"""
+        service = ProcessedJobService(db_session)
+        service.claim("job-1", now=T0)
+
+        assert service.release("job-1")
+        assert service.claim("job-1", now=T0) == CLAIMED
+
+    def test_claim_fails_open(self, db_session):
+        """Test a job is processed if its claim can't be recorded"""
+        service = ProcessedJobService(db_session)
+
+        with patch.object(
+            service.processed_job_repo, "insert_claim", return_value=None
+        ):
+            assert service.claim("job-1") == CLAIMED
+
+    def test_retry_delay(self, db_session):
+        """Test the delay runs until the claim can be taken over"""
+        service = ProcessedJobService(db_session)
+        service.claim("job-1", now=T0)
+
+        assert service.retry_delay("job-1", now=T0 + timedelta(seconds=100)) == 800
+        assert service.retry_delay("job-1", now=T0 + timedelta(seconds=901)) == 1
+        assert service.retry_delay("unknown", now=T0) == 1
+
+    def test_complete(self, db_session):
+        """Test completion is recorded"""
+        service = ProcessedJobService(db_session)
+        service.claim("job-1", now=T0)
+
+        assert service.complete("job-1")
+        assert db_session.get(ProcessedJob, "job-1").completed_at is not None
+
+    def test_purge(self, db_session):
+        """Test records older than the retention period are purged"""
+        service = ProcessedJobService(db_session)
+        service.claim("job-1", now=T0)
+        service.complete("job-1", now=T0)
+        service.claim("job-2", now=T0 + timedelta(days=6))
+        service.complete("job-2", now=T0 + timedelta(days=6))
+
+        assert service.purge(now=T0 + timedelta(days=7, seconds=1)) == 1
+        assert db_session.get(ProcessedJob, "job-1") is None
+        assert db_session.get(ProcessedJob, "job-2") is not None
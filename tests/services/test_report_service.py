@@ -0,0 +1,113 @@
+"""Tests for ReportService"""
+
+import json
+from unittest.mock import Mock, patch
+
+from azure.core.exceptions import ResourceNotFoundError
+
+from alma_item_checks_notification_service.services.report_service import (
+    ReportService,
+)
+
+
+def _blob_client_returning(data: bytes, chunk_size: int = 8):
+    """Build a mock BlobServiceClient whose download yields data in chunks"""
+    pulled: list[bytes] = []
+
+    def chunks():
+        for i in range(0, len(data), chunk_size):
+            pulled.append(data[i : i + chunk_size])
+            yield data[i : i + chunk_size]
+
+    blob_service_client = Mock()
+    downloader = (
+        blob_service_client.get_blob_client.return_value.download_blob.return_value
+    )
+    downloader.chunks.side_effect = chunks
+    return blob_service_client, pulled
+
+
+class TestReportService:
+    """Tests for ReportService"""
+
+    def test_init_uses_shared_blob_client(self):
+        """Test ReportService defaults to the worker's shared blob client"""
+        with patch(
+            "alma_item_checks_notification_service.services.report_service.get_blob_service_client"
+        ) as mock_get_client:
+            service = ReportService()
+
+            assert service.blob_service_client is mock_get_client.return_value
+
+    def test_iter_report_records(self, sample_report_data):
+        """Test records are streamed from the report blob"""
+        client, _ = _blob_client_returning(json.dumps(sample_report_data).encode())
+        service = ReportService(client)
+
+        records = list(service.iter_report_records("reports", "job.json"))
+
+        assert records == sample_report_data
+        client.get_blob_client.assert_called_once_with(
+            container="reports", blob="job.json"
+        )
+
+    def test_iter_report_records_max_rows(self):
+        """Test reading stops once max_rows records have been yielded"""
+        data = json.dumps([{"row": i} for i in range(200)]).encode()
+        client, pulled = _blob_client_returning(data)
+        service = ReportService(client)
+
+        with patch(
+            "alma_item_checks_notification_service.services.report_service.logging"
+        ) as mock_logging:
+            records = list(service.iter_report_records("reports", "job.json", 5))
+
+            assert records == [{"row": i} for i in range(5)]
+            assert len(pulled) < len(data) / 8 / 10
+            mock_logging.warning.assert_called_once()
+
+    def test_iter_report_records_max_rows_not_reached(self):
+        """Test no truncation warning when the report fits within max_rows"""
+        client, _ = _blob_client_returning(b"[1, null]")
+        service = ReportService(client)
+
+        with patch(
+            "alma_item_checks_notification_service.services.report_service.logging"
+        ) as mock_logging:
+            assert list(service.iter_report_records("r", "b", 2)) == [1, None]
+            mock_logging.warning.assert_not_called()
+
+    def test_iter_report_records_not_found(self):
+        """Test a missing report yields no records"""
+        client = Mock()
+        client.get_blob_client.return_value.download_blob.side_effect = (
+            ResourceNotFoundError("missing")
+        )
+        service = ReportService(client)
+
+        with patch(
+            "alma_item_checks_notification_service.services.report_service.logging"
+        ) as mock_logging:
+            assert list(service.iter_report_records("reports", "job.json")) == []
+            mock_logging.error.assert_called_once()
+
+    def test_upload_csv(self):
+        """Test records are uploaded as a CSV blob"""
+        client = Mock()
+        service = ReportService(client)
+
+        with patch(
+            "alma_item_checks_notification_service.services.report_service.azure_blob"
+        ) as mock_azure_blob:
+            service.upload_csv("sender", "job.csv", [{"Item": "a"}])
+
+            client.get_blob_client.assert_called_once_with(
+                container="sender", blob="job.csv"
+            )
+            upload = client.get_blob_client.return_value.upload_blob
+            (chunks,) = upload.call_args.args
+            assert b"".join(chunks) == b"\xef\xbb\xbfItem\r\na\r\n"
+            assert upload.call_args.kwargs["overwrite"] is True
+            mock_azure_blob.ContentSettings.assert_called_once_with(
+                content_type="text/csv; charset=utf-8"
+            )
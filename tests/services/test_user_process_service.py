@@ -5,6 +5,11 @@ from unittest.mock import patch
 
 from alma_item_checks_notification_service.services.user_process_service import (
     UserProcessService,
+    invalidate_recipient_cache,
+    recipient_cache_stats,
+)
+from alma_item_checks_notification_service.repos.process_recipient_repo import (
+    ProcessRecipientRepository,
 )
 from alma_item_checks_notification_service.repos.user_process_repo import (
     UserProcessRepository,
@@ -23,6 +28,7 @@ class TestUserProcessService:
         service = UserProcessService(db_session)
         assert isinstance(service.process_service, ProcessService)
         assert isinstance(service.user_process_repo, UserProcessRepository)
+        assert isinstance(service.process_recipient_repo, ProcessRecipientRepository)
         assert isinstance(service.user_service, UserService)
         assert service.user_process_repo.session is db_session
 
@@ -189,3 +195,168 @@ class TestUserProcessService:
 
                 # Should only include non-None, non-empty emails
                 assert emails == ["valid@example.com", "another@example.com"]
+
+    def test_get_recipient_emails_success(
+        self, db_session, sample_user_process, sample_user, sample_process
+    ):
+        """Test get_recipient_emails returns emails for valid process"""
+        service = UserProcessService(db_session)
+
+        emails = service.get_recipient_emails(
+            sample_process.id, sample_user.institution_id
+        )
+
+        assert emails == [sample_user.email]
+
+    def test_get_recipient_emails_uses_single_query(self, db_session):
+        """Test get_recipient_emails uses the joined repository query"""
+        service = UserProcessService(db_session)
+
+        with patch.object(
+            service.user_process_repo,
+            "get_user_emails_for_process",
+            return_value=["a@example.com", "", "b@example.com"],
+        ) as mock_get_emails:
+            with patch.object(service.user_service, "get_user_email") as mock_get_email:
+                emails = service.get_recipient_emails(1, 123)
+
+                mock_get_emails.assert_called_once_with(1, 123)
+                mock_get_email.assert_not_called()
+                assert emails == ["a@example.com", "b@example.com"]
+
+    def test_get_recipient_emails_repo_returns_none(self, db_session):
+        """Test get_recipient_emails returns empty list when repo returns None"""
+        service = UserProcessService(db_session)
+
+        with patch.object(
+            service.user_process_repo, "get_user_emails_for_process", return_value=None
+        ):
+            assert service.get_recipient_emails(1, 123) == []
+
+    def test_iter_recipient_emails(self, db_session):
+        """Test iter_recipient_emails streams non-empty emails from the repository"""
+        service = UserProcessService(db_session)
+
+        with patch.object(
+            service.user_process_repo,
+            "iter_user_emails_for_process",
+            return_value=iter(["a@example.com", "", "b@example.com"]),
+        ) as mock_iter:
+            emails = list(service.iter_recipient_emails(1, 123))
+
+            mock_iter.assert_called_once_with(1, 123)
+            assert emails == ["a@example.com", "b@example.com"]
+
+    def test_get_recipient_emails_cached(self, db_session):
+        """Test repeat lookups for the same process and institution are cached"""
+        service = UserProcessService(db_session)
+
+        with patch.object(
+            service.user_process_repo,
+            "get_user_emails_for_process",
+            return_value=["a@example.com"],
+        ) as mock_get_emails:
+            first = service.get_recipient_emails(1, 123)
+            first.append("mutated@example.com")
+            second = UserProcessService(db_session).get_recipient_emails(1, 123)
+            other = service.get_recipient_emails(1, 456)
+
+            assert second == ["a@example.com"]
+            assert other == ["a@example.com"]
+            assert mock_get_emails.call_count == 2
+
+        stats = recipient_cache_stats()
+        assert stats.hits == 1
+        assert stats.misses == 2
+        assert stats.size == 2
+
+    def test_get_recipient_emails_failure_not_cached(self, db_session):
+        """Test failed repository lookups are retried rather than cached"""
+        service = UserProcessService(db_session)
+
+        with patch.object(
+            service.user_process_repo,
+            "get_user_emails_for_process",
+            side_effect=[None, ["a@example.com"]],
+        ):
+            assert service.get_recipient_emails(1, 123) == []
+            assert service.get_recipient_emails(1, 123) == ["a@example.com"]
+
+    def test_invalidate_recipient_cache(self, db_session):
+        """Test invalidate_recipient_cache drops one list or all of them"""
+        service = UserProcessService(db_session)
+
+        with patch.object(
+            service.user_process_repo,
+            "get_user_emails_for_process",
+            return_value=["a@example.com"],
+        ) as mock_get_emails:
+            service.get_recipient_emails(1, 123)
+            service.get_recipient_emails(2, 123)
+
+            invalidate_recipient_cache(1, 123)
+            assert recipient_cache_stats().size == 1
+
+            service.get_recipient_emails(1, 123)
+            assert mock_get_emails.call_count == 3
+
+            invalidate_recipient_cache()
+            assert recipient_cache_stats().size == 0
+
+    def test_get_recipient_emails_from_table(self, db_session):
+        """Test get_recipient_emails reads process_recipient when enabled"""
+        service = UserProcessService(db_session)
+
+        with patch(
+            "alma_item_checks_notification_service.services.user_process_service.RECIPIENT_TABLE_ENABLED",
+            True,
+        ):
+            with patch.object(
+                service.process_recipient_repo,
+                "get_recipient_emails",
+                return_value=["a@example.com"],
+            ) as mock_table:
+                with patch.object(
+                    service.user_process_repo, "get_user_emails_for_process"
+                ) as mock_join:
+                    assert service.get_recipient_emails(1, 123) == ["a@example.com"]
+
+                    mock_table.assert_called_once_with(1, 123)
+                    mock_join.assert_not_called()
+
+    def test_subscribe_and_unsubscribe(self, db_session, sample_user, sample_process):
+        """Test subscription changes show up in the next lookup"""
+        service = UserProcessService(db_session)
+
+        with patch(
+            "alma_item_checks_notification_service.services.user_process_service.RECIPIENT_TABLE_ENABLED",
+            True,
+        ):
+            assert service.get_recipient_emails(sample_process.id, 123) == []
+
+            assert service.subscribe(sample_user.id, sample_process.id) is True
+            assert service.get_recipient_emails(sample_process.id, 123) == [
+                sample_user.email
+            ]
+
+            assert service.unsubscribe(sample_user.id, sample_process.id) is True
+            assert service.get_recipient_emails(sample_process.id, 123) == []
+
+    def test_rebuild_recipients(self, db_session):
+        """Test rebuild_recipients rebuilds the table and clears the cache"""
+        service = UserProcessService(db_session)
+
+        with patch.object(
+            service.user_process_repo,
+            "get_user_emails_for_process",
+            return_value=["a@example.com"],
+        ):
+            service.get_recipient_emails(1, 123)
+
+        with patch.object(
+            service.process_recipient_repo, "rebuild", return_value=4
+        ) as mock_rebuild:
+            assert service.rebuild_recipients(1) == 4
+
+            mock_rebuild.assert_called_once_with(1)
+            assert recipient_cache_stats().size == 0
@@ -0,0 +1,144 @@
+"""Tests for aio_storage module"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from alma_item_checks_notification_service import aio_storage
+
+
+@pytest.fixture(autouse=True)
+def reset_registry():
+    """Reset the async storage registry between tests"""
+    aio_storage.reset_async_storage_services()
+    yield
+    aio_storage.reset_async_storage_services()
+
+
+class TestAsyncTransport:
+    """Tests for get_async_transport"""
+
+    @patch("alma_item_checks_notification_service.aio_storage.importlib.util.find_spec")
+    def test_aiohttp_installed(self, mock_find_spec):
+        """Test the SDK's own aiohttp transport is used when available"""
+        mock_find_spec.return_value = Mock()
+
+        assert aio_storage.get_async_transport() is None
+
+    @patch("alma_item_checks_notification_service.aio_storage.importlib.util.find_spec")
+    @patch("alma_item_checks_notification_service.aio_storage.get_http_session")
+    def test_requests_fallback(self, mock_get_session, mock_find_spec):
+        """Test requests on the shared session are used without aiohttp"""
+        mock_find_spec.return_value = None
+
+        transport = aio_storage.get_async_transport()
+
+        assert type(transport).__name__ == "AsyncioRequestsTransport"
+        assert transport.session is mock_get_session.return_value
+
+
+class TestGetAsyncStorageService:
+    """Tests for the async storage service registry"""
+
+    def test_reused_per_connection_string(self):
+        """Test services are cached per connection string"""
+        service = aio_storage.get_async_storage_service("conn-a")
+
+        assert aio_storage.get_async_storage_service("conn-a") is service
+        assert aio_storage.get_async_storage_service("conn-b") is not service
+        assert service.connection_string == "conn-a"
+
+    @patch(
+        "alma_item_checks_notification_service.aio_storage.STORAGE_CONNECTION_STRING",
+        "default-conn",
+    )
+    def test_default_account(self):
+        """Test no connection string means the function app's storage account"""
+        assert aio_storage.get_async_storage_service().connection_string == (
+            "default-conn"
+        )
+
+    @patch(
+        "alma_item_checks_notification_service.aio_storage.STORAGE_CONNECTION_STRING",
+        None,
+    )
+    def test_missing_connection_string(self):
+        """Test a missing connection string is an error"""
+        with pytest.raises(ValueError, match="connection string not set"):
+            aio_storage.get_async_storage_service()
+
+    def test_register(self):
+        """Test a registered stand-in is returned for its connection string"""
+        stand_in = Mock()
+        aio_storage.register_async_storage_service("conn-a", stand_in)
+
+        assert aio_storage.get_async_storage_service("conn-a") is stand_in
+
+
+class TestAsyncStorageService:
+    """Tests for AsyncStorageService"""
+
+    def setup_method(self):
+        """Setup for each test method"""
+        self.service = aio_storage.AsyncStorageService("conn")
+        self.blob_service_client = Mock()
+        self.blob_client = self.blob_service_client.get_blob_client.return_value
+        self.service._blob_service_client = self.blob_service_client
+
+    def test_download_blob_as_json(self):
+        """Test a blob is downloaded and parsed"""
+        downloader = Mock()
+        downloader.readall = AsyncMock(return_value=b'[{"Item": "a"}]')
+        self.blob_client.download_blob = AsyncMock(return_value=downloader)
+
+        result = asyncio.run(self.service.download_blob_as_json("reports", "job.json"))
+
+        assert result == [{"Item": "a"}]
+        self.blob_service_client.get_blob_client.assert_called_once_with(
+            container="reports", blob="job.json"
+        )
+
+    def test_upload_blob_data(self):
+        """Test blobs are uploaded with overwrite and content settings"""
+        self.blob_client.upload_blob = AsyncMock()
+        settings = Mock()
+
+        asyncio.run(self.service.upload_blob_data("sender", "job.json", "{}", settings))
+
+        self.blob_client.upload_blob.assert_awaited_once_with(
+            "{}", overwrite=True, content_settings=settings
+        )
+
+    @patch(
+        "alma_item_checks_notification_service.aio_storage.azure_queue_aio.QueueClient"
+    )
+    def test_send_queue_message(self, mock_queue_client_class):
+        """Test dict messages are sent as JSON through a cached queue client"""
+        queue_client = mock_queue_client_class.from_connection_string.return_value
+        queue_client.send_message = AsyncMock()
+
+        async def send_twice():
+            await self.service.send_queue_message("q", {"blob_name": "a.json"})
+            await self.service.send_queue_message("q", "plain")
+
+        asyncio.run(send_twice())
+
+        mock_queue_client_class.from_connection_string.assert_called_once()
+        sent = [c.args[0] for c in queue_client.send_message.await_args_list]
+        assert json.loads(sent[0]) == {"blob_name": "a.json"}
+        assert sent[1] == b"plain"
+
+    def test_close(self):
+        """Test close releases the clients it created"""
+        self.blob_service_client.close = AsyncMock()
+        queue_client = Mock(close=AsyncMock())
+        self.service._queue_clients["q"] = queue_client
+
+        asyncio.run(self.service.close())
+
+        self.blob_service_client.close.assert_awaited_once()
+        queue_client.close.assert_awaited_once()
+        assert self.service._blob_service_client is None
+        assert self.service._queue_clients == {}
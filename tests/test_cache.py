@@ -0,0 +1,150 @@
+"""Tests for cache module"""
+
+import threading
+
+from alma_item_checks_notification_service.cache import MISSING, CacheStats, TTLCache
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache:
+    """Tests for TTLCache"""
+
+    def test_get_miss_returns_missing(self):
+        """Test get returns the MISSING sentinel for absent keys"""
+        cache = TTLCache(maxsize=2, ttl=10)
+
+        assert cache.get("absent") is MISSING
+        assert cache.get("absent", None) is None
+        assert cache.stats().misses == 2
+
+    def test_set_and_get(self):
+        """Test values are returned until they expire"""
+        clock = FakeClock()
+        cache = TTLCache(maxsize=2, ttl=10, clock=clock)
+
+        cache.set("a", 1)
+        clock.now = 9.9
+
+        assert cache.get("a") == 1
+        assert cache.stats().hits == 1
+
+    def test_caches_none_values(self):
+        """Test None is a cacheable value distinct from a miss"""
+        cache = TTLCache(maxsize=2, ttl=10)
+
+        cache.set("a", None)
+
+        assert cache.get("a") is None
+
+    def test_entry_expires(self):
+        """Test expired entries are dropped and counted"""
+        clock = FakeClock()
+        cache = TTLCache(maxsize=2, ttl=10, clock=clock)
+
+        cache.set("a", 1)
+        clock.now = 10
+
+        assert cache.get("a") is MISSING
+        stats = cache.stats()
+        assert stats.expirations == 1
+        assert stats.size == 0
+
+    def test_per_entry_ttl(self):
+        """Test a per-entry ttl overrides the cache ttl"""
+        clock = FakeClock()
+        cache = TTLCache(maxsize=2, ttl=100, clock=clock)
+
+        cache.set("short", "x", ttl=1)
+        cache.set("long", "y")
+        clock.now = 2
+
+        assert cache.get("short") is MISSING
+        assert cache.get("long") == "y"
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted when full"""
+        cache = TTLCache(maxsize=2, ttl=10)
+
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is MISSING
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats().evictions == 1
+
+    def test_disabled_cache_stores_nothing(self):
+        """Test a zero ttl or maxsize disables the cache"""
+        for cache in (TTLCache(maxsize=0, ttl=10), TTLCache(maxsize=2, ttl=0)):
+            cache.set("a", 1)
+
+            assert not cache.enabled
+            assert cache.get("a") is MISSING
+
+    def test_zero_entry_ttl_is_not_stored(self):
+        """Test an entry with a zero ttl is not stored"""
+        cache = TTLCache(maxsize=2, ttl=10)
+
+        cache.set("a", 1, ttl=0)
+
+        assert cache.get("a") is MISSING
+
+    def test_invalidate(self):
+        """Test invalidate drops a single key"""
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        cache.invalidate("a")
+        cache.invalidate("missing")
+
+        assert cache.get("a") is MISSING
+        assert cache.get("b") == 2
+
+    def test_clear_resets_entries_and_counters(self):
+        """Test clear drops everything and resets counters"""
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("b")
+
+        cache.clear()
+
+        assert cache.stats() == CacheStats(
+            hits=0, misses=0, evictions=0, expirations=0, size=0, maxsize=2
+        )
+
+    def test_hit_ratio(self):
+        """Test hit_ratio is computed from hits and misses"""
+        assert CacheStats(0, 0, 0, 0, 0, 1).hit_ratio == 0.0
+        assert CacheStats(3, 1, 0, 0, 0, 1).hit_ratio == 0.75
+
+    def test_concurrent_access(self):
+        """Test concurrent writers never exceed maxsize"""
+        cache = TTLCache(maxsize=50, ttl=10)
+
+        def worker(offset):
+            for i in range(500):
+                cache.set(offset + i, i)
+                cache.get(offset + i // 2)
+
+        threads = [threading.Thread(target=worker, args=(n * 1000,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = cache.stats()
+        assert stats.size == 50
+        assert stats.hits + stats.misses == 8 * 500
@@ -149,3 +149,289 @@ class TestConfig:
 
         assert isinstance(config.API_CLIENT_TIMEOUT, int)
         assert config.API_CLIENT_TIMEOUT == 30
+
+    def test_process_cache_defaults(self, monkeypatch):
+        """Test process cache settings have default values"""
+        monkeypatch.delenv("PROCESS_CACHE_TTL_SECONDS", raising=False)
+        monkeypatch.delenv("PROCESS_CACHE_NEGATIVE_TTL_SECONDS", raising=False)
+        monkeypatch.delenv("PROCESS_CACHE_MAX_SIZE", raising=False)
+
+        import importlib
+
+        importlib.reload(config)
+
+        assert config.PROCESS_CACHE_TTL_SECONDS == 300
+        assert config.PROCESS_CACHE_NEGATIVE_TTL_SECONDS == 30
+        assert config.PROCESS_CACHE_MAX_SIZE == 256
+
+    def test_process_cache_from_env(self, monkeypatch):
+        """Test process cache settings read from environment"""
+        monkeypatch.setenv("PROCESS_CACHE_TTL_SECONDS", "60")
+        monkeypatch.setenv("PROCESS_CACHE_NEGATIVE_TTL_SECONDS", "5")
+        monkeypatch.setenv("PROCESS_CACHE_MAX_SIZE", "16")
+
+        import importlib
+
+        importlib.reload(config)
+
+        assert config.PROCESS_CACHE_TTL_SECONDS == 60.0
+        assert config.PROCESS_CACHE_NEGATIVE_TTL_SECONDS == 5.0
+        assert config.PROCESS_CACHE_MAX_SIZE == 16
+
+    def test_recipient_cache_defaults(self, monkeypatch):
+        """Test recipient cache settings have default values"""
+        monkeypatch.delenv("RECIPIENT_CACHE_TTL_SECONDS", raising=False)
+        monkeypatch.delenv("RECIPIENT_CACHE_MAX_SIZE", raising=False)
+
+        import importlib
+
+        importlib.reload(config)
+
+        assert config.RECIPIENT_CACHE_TTL_SECONDS == 300
+        assert config.RECIPIENT_CACHE_MAX_SIZE == 1024
+
+    def test_jinja_defaults(self, monkeypatch):
+        """Test Jinja2 settings have default values"""
+        monkeypatch.delenv("JINJA_AUTO_RELOAD", raising=False)
+        monkeypatch.delenv("JINJA_BYTECODE_CACHE_ENABLED", raising=False)
+        monkeypatch.delenv("JINJA_BYTECODE_CACHE_DIR", raising=False)
+        monkeypatch.delenv("JINJA_COMPILED_TEMPLATES_ENABLED", raising=False)
+
+        import importlib
+
+        importlib.reload(config)
+
+        assert config.JINJA_AUTO_RELOAD is False
+        assert config.JINJA_BYTECODE_CACHE_ENABLED is True
+        assert config.JINJA_BYTECODE_CACHE_DIR is None
+        assert config.JINJA_COMPILED_TEMPLATES_ENABLED is True
+
+    def test_jinja_from_env(self, monkeypatch):
+        """Test Jinja2 boolean settings parse from environment"""
+        monkeypatch.setenv("JINJA_AUTO_RELOAD", "True")
+        monkeypatch.setenv("JINJA_BYTECODE_CACHE_ENABLED", "0")
+        monkeypatch.setenv("JINJA_BYTECODE_CACHE_DIR", "/tmp/jinja")
+
+        import importlib
+
+        importlib.reload(config)
+
+        assert config.JINJA_AUTO_RELOAD is True
+        assert config.JINJA_BYTECODE_CACHE_ENABLED is False
+        assert config.JINJA_BYTECODE_CACHE_DIR == "/tmp/jinja"
+
+    def test_html_table_renderer_default(self, monkeypatch):
+        """Test HTML_TABLE_RENDERER defaults to pandas"""
+        monkeypatch.delenv("HTML_TABLE_RENDERER", raising=False)
+
+        import importlib
+
+        importlib.reload(config)
+
+        assert config.HTML_TABLE_RENDERER == "pandas"
+
+    def test_report_streaming_defaults(self, monkeypatch):
+        """Test report streaming settings have default values"""
+        for name in (
+            "REPORT_STREAMING_ENABLED",
+            "REPORT_MAX_ROWS",
+            "REPORT_CHUNK_SIZE",
+            "STORAGE_HTTP_POOL_SIZE",
+        ):
+            monkeypatch.delenv(name, raising=False)
+
+        import importlib
+
+        importlib.reload(config)
+
+        assert config.REPORT_STREAMING_ENABLED is False
+        assert config.REPORT_MAX_ROWS == 0
+        assert config.REPORT_CHUNK_SIZE == 4 * 1024 * 1024
+        assert config.STORAGE_HTTP_POOL_SIZE == 20
+
+    def test_import_warmup_enabled_default(self, monkeypatch):
+        """Test the import warm-up is on by default"""
+        monkeypatch.delenv("IMPORT_WARMUP_ENABLED", raising=False)
+
+        import importlib
+
+        importlib.reload(config)
+
+        assert config.IMPORT_WARMUP_ENABLED is True
+
+    def test_notification_batch_defaults(self, monkeypatch):
+        """Test batch notification settings have default values"""
+        for name in (
+            "NOTIFICATION_QUEUE",
+            "NOTIFICATION_BATCH_ENABLED",
+            "NOTIFICATION_BATCH_QUEUE",
+            "NOTIFICATION_BATCH_SCHEDULE",
+            "NOTIFICATION_BATCH_SIZE",
+            "NOTIFICATION_BATCH_MAX_MESSAGES",
+            "NOTIFICATION_BATCH_VISIBILITY_TIMEOUT",
+            "NOTIFICATION_BATCH_MAX_DEQUEUE_COUNT",
+        ):
+            monkeypatch.delenv(name, raising=False)
+
+        import importlib
+
+        importlib.reload(config)
+
+        assert config.NOTIFICATION_BATCH_ENABLED is False
+        assert config.NOTIFICATION_BATCH_QUEUE == "notification-queue"
+        assert config.NOTIFICATION_BATCH_SCHEDULE == "0 */5 * * * *"
+        assert config.NOTIFICATION_BATCH_SIZE == 256
+        assert config.NOTIFICATION_BATCH_MAX_MESSAGES == 5000
+        assert config.NOTIFICATION_BATCH_VISIBILITY_TIMEOUT == 600
+        assert config.NOTIFICATION_BATCH_MAX_DEQUEUE_COUNT == 5
+
+    def test_digest_defaults(self, monkeypatch):
+        """Test digest settings have default values"""
+        for name in (
+            "DIGEST_FLUSH_ENABLED",
+            "DIGEST_FLUSH_SCHEDULE",
+            "DIGEST_WINDOW_MINUTES",
+            "DIGEST_MAX_ROWS",
+        ):
+            monkeypatch.delenv(name, raising=False)
+
+        import importlib
+
+        importlib.reload(config)
+
+        assert config.DIGEST_FLUSH_ENABLED is False
+        assert config.DIGEST_FLUSH_SCHEDULE == "0 */1 * * * *"
+        assert config.DIGEST_WINDOW_MINUTES == 10
+        assert config.DIGEST_MAX_ROWS == 5000
+
+    def test_idempotency_defaults(self, monkeypatch):
+        """Test idempotency settings have default values"""
+        monkeypatch.delenv("IDEMPOTENCY_ENABLED", raising=False)
+        monkeypatch.delenv("IDEMPOTENCY_CLAIM_TIMEOUT_SECONDS", raising=False)
+        monkeypatch.delenv("IDEMPOTENCY_RETENTION_DAYS", raising=False)
+        monkeypatch.delenv("IDEMPOTENCY_PURGE_SCHEDULE", raising=False)
+
+        import importlib
+
+        importlib.reload(config)
+
+        assert config.IDEMPOTENCY_ENABLED is True
+        assert config.IDEMPOTENCY_CLAIM_TIMEOUT_SECONDS == 900
+        assert config.IDEMPOTENCY_RETENTION_DAYS == 7
+        assert config.IDEMPOTENCY_PURGE_SCHEDULE == "0 30 2 * * *"
+
+    def test_report_attachment_defaults(self, monkeypatch):
+        """Test reports are inline unless an attachment threshold is set"""
+        monkeypatch.delenv("REPORT_ATTACHMENT_THRESHOLD_ROWS", raising=False)
+        monkeypatch.delenv("REPORT_ATTACHMENT_PREVIEW_ROWS", raising=False)
+
+        import importlib
+
+        importlib.reload(config)
+
+        assert config.REPORT_ATTACHMENT_THRESHOLD_ROWS == 0
+        assert config.REPORT_ATTACHMENT_PREVIEW_ROWS == 100
+
+    def test_email_payload_compression_defaults(self, monkeypatch):
+        """Test email payloads are uncompressed blobs by default"""
+        monkeypatch.delenv("EMAIL_PAYLOAD_COMPRESSION_ENABLED", raising=False)
+        monkeypatch.delenv("EMAIL_PAYLOAD_COMPRESSION_LEVEL", raising=False)
+        monkeypatch.delenv("EMAIL_PAYLOAD_INLINE_ENABLED", raising=False)
+        monkeypatch.delenv("EMAIL_PAYLOAD_INLINE_MAX_BYTES", raising=False)
+
+        import importlib
+
+        importlib.reload(config)
+
+        assert config.EMAIL_PAYLOAD_COMPRESSION_ENABLED is False
+        assert config.EMAIL_PAYLOAD_COMPRESSION_LEVEL == 6
+        assert config.EMAIL_PAYLOAD_INLINE_ENABLED is False
+        assert config.EMAIL_PAYLOAD_INLINE_MAX_BYTES == 64 * 1024
+
+    def test_notification_async_default(self, monkeypatch):
+        """Test the synchronous pipeline is used by default"""
+        monkeypatch.delenv("NOTIFICATION_ASYNC_ENABLED", raising=False)
+
+        import importlib
+
+        importlib.reload(config)
+
+        assert config.NOTIFICATION_ASYNC_ENABLED is False
+
+    def test_report_prefetch_defaults(self, monkeypatch):
+        """Test reports are prefetched by default"""
+        monkeypatch.delenv("REPORT_PREFETCH_ENABLED", raising=False)
+        monkeypatch.delenv("REPORT_PREFETCH_WORKERS", raising=False)
+
+        import importlib
+
+        importlib.reload(config)
+
+        assert config.REPORT_PREFETCH_ENABLED is True
+        assert config.REPORT_PREFETCH_WORKERS == 8
+
+    def test_database_pool_defaults(self, monkeypatch):
+        """Test database pool settings have default values"""
+        for name in (
+            "DB_ECHO",
+            "DB_POOL_SIZE",
+            "DB_MAX_OVERFLOW",
+            "DB_POOL_TIMEOUT",
+            "DB_POOL_RECYCLE",
+            "DB_POOL_PRE_PING",
+            "DB_POOL_PRE_PING_IDLE_SECONDS",
+            "DB_POOL_SLOW_CHECKOUT_MS",
+            "DB_POOL_STATS_LOG_SECONDS",
+        ):
+            monkeypatch.delenv(name, raising=False)
+
+        import importlib
+
+        importlib.reload(config)
+
+        assert config.DB_ECHO is False
+        assert config.DB_POOL_SIZE == 5
+        assert config.DB_MAX_OVERFLOW == 10
+        assert config.DB_POOL_TIMEOUT == 30
+        assert config.DB_POOL_RECYCLE == 1800
+        assert config.DB_POOL_PRE_PING == "idle"
+        assert config.DB_POOL_PRE_PING_IDLE_SECONDS == 60
+        assert config.DB_POOL_SLOW_CHECKOUT_MS == 100
+        assert config.DB_POOL_STATS_LOG_SECONDS == 300
+
+    def test_recipient_table_defaults(self, monkeypatch):
+        """Test recipient table settings have default values"""
+        monkeypatch.delenv("RECIPIENT_TABLE_ENABLED", raising=False)
+        monkeypatch.delenv("RECIPIENT_TABLE_REBUILD_ENABLED", raising=False)
+        monkeypatch.delenv("RECIPIENT_TABLE_REBUILD_SCHEDULE", raising=False)
+
+        import importlib
+
+        importlib.reload(config)
+
+        assert config.RECIPIENT_TABLE_ENABLED is False
+        assert config.RECIPIENT_TABLE_REBUILD_ENABLED is False
+        assert config.RECIPIENT_TABLE_REBUILD_SCHEDULE == "0 0 * * * *"
+
+    def test_recipient_table_rebuild_follows_reads(self, monkeypatch):
+        """Test the table is rebuilt by default once it is read"""
+        monkeypatch.setenv("RECIPIENT_TABLE_ENABLED", "true")
+        monkeypatch.delenv("RECIPIENT_TABLE_REBUILD_ENABLED", raising=False)
+
+        import importlib
+
+        importlib.reload(config)
+
+        assert config.RECIPIENT_TABLE_REBUILD_ENABLED is True
+
+    def test_tracing_defaults(self, monkeypatch):
+        """Test tracing settings have default values"""
+        monkeypatch.delenv("TRACING_BACKEND", raising=False)
+        monkeypatch.delenv("TRACING_AZURE_MONITOR_ENABLED", raising=False)
+
+        import importlib
+
+        importlib.reload(config)
+
+        assert config.TRACING_BACKEND == "none"
+        assert config.TRACING_AZURE_MONITOR_ENABLED is True
@@ -2,6 +2,7 @@
 
 import pytest
 from unittest.mock import patch, Mock
+from sqlalchemy import create_engine, exc, text
 
 from alma_item_checks_notification_service import database
 
@@ -35,9 +36,14 @@ class TestDatabase:
             "alma_item_checks_notification_service.database.SQLALCHEMY_CONNECTION_STRING",
             "sqlite:///:memory:",
         ):
-            with patch(
-                "alma_item_checks_notification_service.database.create_engine"
-            ) as mock_create_engine:
+            with (
+                patch(
+                    "alma_item_checks_notification_service.database.create_engine"
+                ) as mock_create_engine,
+                patch(
+                    "alma_item_checks_notification_service.database._ping_idle_connections"
+                ) as mock_ping_idle,
+            ):
                 mock_engine = Mock()
                 mock_create_engine.return_value = mock_engine
 
@@ -46,8 +52,12 @@ class TestDatabase:
                 assert engine is mock_engine
                 assert database._db_engine is mock_engine
                 mock_create_engine.assert_called_once_with(
-                    "sqlite:///:memory:", echo=True, pool_pre_ping=True
+                    "sqlite:///:memory:",
+                    echo=False,
+                    pool_pre_ping=False,
+                    pool_recycle=1800,
                 )
+                mock_ping_idle.assert_called_once_with(mock_engine, 60)
 
     def test_get_engine_reuses_existing(self):
         """Test get_engine reuses existing engine"""
@@ -72,9 +82,14 @@ class TestDatabase:
             with patch(
                 "alma_item_checks_notification_service.database.create_engine"
             ) as mock_create_engine:
-                with patch(
-                    "alma_item_checks_notification_service.database.sessionmaker"
-                ) as mock_sessionmaker:
+                with (
+                    patch(
+                        "alma_item_checks_notification_service.database.sessionmaker"
+                    ) as mock_sessionmaker,
+                    patch(
+                        "alma_item_checks_notification_service.database._ping_idle_connections"
+                    ),
+                ):
                     mock_engine = Mock()
                     mock_session_maker = Mock()
                     mock_create_engine.return_value = mock_engine
@@ -106,3 +121,181 @@ class TestDatabase:
 
         assert session is mock_session
         mock_session_maker.assert_called_once()
+
+
+class TestEngineOptions:
+    """Tests for engine_options"""
+
+    def test_server_database_pool(self):
+        """Test server databases get a sized, instrumented pool"""
+        options = database.engine_options("mysql+pymysql://u:p@host/db")
+
+        assert options == {
+            "echo": False,
+            "pool_pre_ping": False,
+            "pool_recycle": 1800,
+            "poolclass": database.InstrumentedQueuePool,
+            "pool_size": 5,
+            "max_overflow": 10,
+            "pool_timeout": 30,
+        }
+
+    @patch("alma_item_checks_notification_service.database.DB_POOL_PRE_PING", "always")
+    @patch("alma_item_checks_notification_service.database.DB_ECHO", True)
+    def test_always_pre_ping_and_echo(self):
+        """Test pre-ping on every checkout and statement echo can be turned on"""
+        options = database.engine_options("mysql+pymysql://u:p@host/db")
+
+        assert options["pool_pre_ping"] is True
+        assert options["echo"] is True
+
+    @patch(
+        "alma_item_checks_notification_service.database.DB_POOL_PRE_PING", "sometimes"
+    )
+    def test_unknown_pre_ping_rejected(self):
+        """Test a misspelled pre-ping mode fails instead of turning pre-ping off"""
+        with pytest.raises(ValueError, match="DB_POOL_PRE_PING"):
+            database.engine_options("mysql+pymysql://u:p@host/db")
+
+
+class TestInstrumentedQueuePool:
+    """Tests for connection pool instrumentation"""
+
+    @pytest.fixture(autouse=True)
+    def reset_stats(self):
+        """Reset the pool counters between tests"""
+        database.reset_pool_stats()
+        yield
+        database.reset_pool_stats()
+
+    @pytest.fixture
+    def engine(self, tmp_path):
+        """A file-backed SQLite engine with a one-connection pool"""
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'pool.db'}",
+            poolclass=database.InstrumentedQueuePool,
+            pool_size=1,
+            max_overflow=1,
+            pool_timeout=0.05,
+        )
+        yield engine
+        engine.dispose()
+
+    def test_checkouts_and_overflow(self, engine):
+        """Test checkouts, connections in use and overflow are counted"""
+        first = engine.connect()
+        second = engine.connect()
+
+        stats = database.pool_stats()
+        assert stats.checkouts == 2
+        assert stats.overflows == 1
+        assert stats.in_use == 2
+        assert stats.peak_in_use == 2
+
+        first.close()
+        second.close()
+
+        stats = database.pool_stats()
+        assert stats.in_use == 0
+        assert stats.peak_in_use == 2
+        assert stats.max_wait_ms >= stats.mean_wait_ms >= 0
+
+    def test_timeout(self, engine):
+        """Test checkouts that give up waiting are counted and logged"""
+        connections = [engine.connect(), engine.connect()]
+
+        with patch(
+            "alma_item_checks_notification_service.database.logging"
+        ) as mock_logging:
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+
+            mock_logging.warning.assert_called_once()
+        assert database.pool_stats().timeouts == 1
+
+        for connection in connections:
+            connection.close()
+
+    def test_mean_wait_without_checkouts(self):
+        """Test the mean wait is zero before any checkout"""
+        assert database.pool_stats().mean_wait_ms == 0.0
+
+    def test_checkout_span(self, engine, recording_tracer):
+        """Test each checkout is traced with its wait and connections in use"""
+        with engine.connect():
+            pass
+
+        name, attributes = recording_tracer.spans[0]
+        assert name == "db_checkout"
+        assert attributes["in_use"] == 1
+        assert attributes["overflowed"] is False
+        assert attributes["wait_ms"] >= 0
+
+    @patch(
+        "alma_item_checks_notification_service.database.DB_POOL_STATS_LOG_SECONDS",
+        1e-9,
+    )
+    def test_stats_logged_periodically(self, engine):
+        """Test the pool counters are logged once the interval has passed"""
+        with patch(
+            "alma_item_checks_notification_service.database.logging"
+        ) as mock_logging:
+            with engine.connect():
+                pass
+
+        mock_logging.info.assert_called_once()
+        assert "checkouts=1" in mock_logging.info.call_args.args[0]
+
+    @patch(
+        "alma_item_checks_notification_service.database.DB_POOL_STATS_LOG_SECONDS", 0
+    )
+    def test_stats_log_disabled(self, engine):
+        """Test an interval of 0 turns the periodic log off"""
+        with patch(
+            "alma_item_checks_notification_service.database.logging"
+        ) as mock_logging:
+            with engine.connect():
+                pass
+
+        mock_logging.info.assert_not_called()
+
+
+class TestIdlePing:
+    """Tests for pinging connections that sat idle in the pool"""
+
+    def test_dead_idle_connection_replaced(self, tmp_path):
+        """Test an idle connection that fails its ping is swapped for a new one"""
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'ping.db'}",
+            poolclass=database.InstrumentedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+        )
+        database._ping_idle_connections(engine, 0)
+
+        with engine.connect() as connection:
+            dead = connection.connection.dbapi_connection
+        dead.close()  # as if the server dropped it while idle
+
+        with engine.connect() as connection:
+            assert connection.execute(text("SELECT 1")).scalar() == 1
+            assert connection.connection.dbapi_connection is not dead
+
+        engine.dispose()
+
+    def test_recent_connection_not_pinged(self, tmp_path):
+        """Test connections returned recently are reused without a ping"""
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'ping.db'}",
+            poolclass=database.InstrumentedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+        )
+        database._ping_idle_connections(engine, 3600)
+
+        with engine.connect() as connection:
+            first = connection.connection.dbapi_connection
+        with engine.connect() as connection:
+            assert connection.connection.dbapi_connection is first
+
+        engine.dispose()
@@ -0,0 +1,135 @@
+"""Tests for html_table module"""
+
+import pytest
+
+from alma_item_checks_notification_service.html_table import (
+    format_cell,
+    render_html_table,
+)
+
+GOLDEN_TABLE = """\
+<table border="1" style="border-collapse: collapse; border: 1px solid black;" class="dataframe">
+  <thead>
+    <tr style="text-align: right;">
+      <th>Item ID</th>
+      <th>Title</th>
+      <th>Status</th>
+    </tr>
+  </thead>
+  <tbody>
+    <tr>
+      <td>123</td>
+      <td>Test Book</td>
+      <td>Available</td>
+    </tr>
+    <tr>
+      <td>456</td>
+      <td>Another Book</td>
+      <td>Checked Out</td>
+    </tr>
+  </tbody>
+</table>"""
+
+
+class TestFormatCell:
+    """Tests for format_cell"""
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            (None, ""),
+            (float("nan"), ""),
+            ("plain", "plain"),
+            ("  padded  ", "padded"),
+            ("a & <b>", "a &amp; &lt;b&gt;"),
+            ("quotes \"'", "quotes \"'"),
+            ("tab\there\nline\r", "tab\\there\\nline\\r"),
+            (12, "12"),
+            (1.5, "1.5"),
+            (True, "True"),
+            ([1, 2], "[1, 2]"),
+            ({"x": 1}, "{'x': 1}"),
+        ],
+    )
+    def test_format_cell(self, value, expected):
+        """Test cells are formatted the way pandas renders them"""
+        assert format_cell(value) == expected
+
+
+class TestRenderHtmlTable:
+    """Tests for render_html_table"""
+
+    def test_golden_output(self, sample_report_data):
+        """Test rendered markup matches the golden table"""
+        assert render_html_table(sample_report_data) == GOLDEN_TABLE
+
+    def test_accepts_generator(self, sample_report_data):
+        """Test records can be streamed from a generator"""
+        assert (
+            render_html_table(record for record in sample_report_data) == GOLDEN_TABLE
+        )
+
+    def test_columns_in_order_of_first_appearance(self):
+        """Test later columns are appended and earlier rows padded"""
+        html = render_html_table([{"a": "1"}, {"b": "2", "a": "3"}])
+
+        assert html is not None
+        assert html.index("<th>a</th>") < html.index("<th>b</th>")
+        assert "<tr>\n      <td>1</td>\n      <td></td>\n    </tr>\n" in html
+        assert "<tr>\n      <td>3</td>\n      <td>2</td>\n    </tr>\n" in html
+
+    def test_drops_placeholder_column(self):
+        """Test column '0' is dropped when every value is '0'"""
+        html = render_html_table([{"0": "0", "a": "x"}, {"0": 0, "a": "y"}])
+
+        assert html is not None
+        assert "<th>0</th>" not in html
+        assert "<td>0</td>" not in html
+
+    @pytest.mark.parametrize(
+        "records",
+        [
+            [{"0": "0"}, {"0": "1"}],
+            [{"0": "0"}, {"0": None}],
+            [{"0": "0"}, {"a": "x"}],
+        ],
+    )
+    def test_keeps_placeholder_column_with_other_values(self, records):
+        """Test column '0' is kept unless every row has a '0' value"""
+        html = render_html_table(records)
+
+        assert html is not None
+        assert "<th>0</th>" in html
+
+    def test_placeholder_column_shown_after_rows_written(self):
+        """Test rows written while column '0' was hidden get their '0' back"""
+        html = render_html_table([{"0": "0", "a": "x"}, {"0": "1", "a": "y"}])
+
+        assert html is not None
+        assert "<tr>\n      <td>0</td>\n      <td>x</td>\n    </tr>\n" in html
+        assert "<tr>\n      <td>1</td>\n      <td>y</td>\n    </tr>\n" in html
+
+    def test_late_placeholder_column_padded_empty(self):
+        """Test a column '0' first seen in a later row is empty in earlier rows"""
+        html = render_html_table([{"a": "x"}, {"a": "y", "0": "0"}])
+
+        assert html is not None
+        assert "<tr>\n      <td>x</td>\n      <td></td>\n    </tr>\n" in html
+        assert "<tr>\n      <td>y</td>\n      <td>0</td>\n    </tr>\n" in html
+
+    def test_no_rows(self):
+        """Test an empty report has nothing to display"""
+        assert render_html_table([]) is None
+
+    def test_no_columns(self):
+        """Test rows without keys have nothing to display"""
+        assert render_html_table([{}, {}]) is None
+
+    def test_only_placeholder_column(self):
+        """Test a report of only the placeholder column has nothing to display"""
+        assert render_html_table([{"0": "0"}]) is None
+
+    def test_non_mapping_record(self):
+        """Test non-object records are rejected"""
+        with pytest.raises(TypeError, match="report record is not an object"):
+            render_html_table(["not a record"])
@@ -0,0 +1,75 @@
+"""Tests for json_stream module"""
+
+import json
+
+import pytest
+
+from alma_item_checks_notification_service.json_stream import iter_json_array
+
+DOCUMENTS = [
+    [],
+    [1, 2.5, -3e2, 1.5e-10, True, False, None, "x", 12345678901234567890],
+    [{"Barcode": "é日本", "Nested": [1, {"c": None}]}, {"0": "0"}] * 3,
+    [[], {}, "", 'a "quoted" \\ string'],
+]
+
+
+def _chunked(data: bytes, size: int) -> list[bytes]:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+class TestIterJsonArray:
+    """Tests for iter_json_array"""
+
+    @pytest.mark.parametrize("document", DOCUMENTS)
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_every_chunk_boundary(self, document, indent):
+        """Test elements parse identically however the bytes are split"""
+        data = json.dumps(document, ensure_ascii=False, indent=indent).encode()
+
+        for size in range(1, len(data) + 1):
+            assert list(iter_json_array(_chunked(data, size))) == document
+
+    def test_utf8_bom(self):
+        """Test a leading byte order mark is ignored"""
+        data = "﻿[1, 2]".encode()
+
+        assert list(iter_json_array(_chunked(data, 1))) == [1, 2]
+
+    def test_str_chunks(self):
+        """Test already-decoded text chunks are accepted"""
+        assert list(iter_json_array(['[{"a"', ": 1}]"])) == [{"a": 1}]
+
+    def test_stops_reading_when_closed_early(self):
+        """Test the source is only read as far as the consumed elements"""
+        data = json.dumps([{"row": i} for i in range(100)]).encode()
+        pulled = []
+
+        def source():
+            for chunk in _chunked(data, 16):
+                pulled.append(chunk)
+                yield chunk
+
+        records = iter_json_array(source())
+        first = [next(records) for _ in range(3)]
+        records.close()
+
+        assert first == [{"row": 0}, {"row": 1}, {"row": 2}]
+        assert len(pulled) < len(_chunked(data, 16)) / 4
+
+    @pytest.mark.parametrize(
+        "document, message",
+        [
+            ('{"a": 1}', "not an array"),
+            ("", "not an array"),
+            ("[1, 2", "truncated"),
+            ("[1,", "truncated"),
+            ("[1 2]", "Expected ','"),
+            ("[1,]", "Invalid JSON array element"),
+            ('[{"a": }]', "Invalid JSON array element"),
+        ],
+    )
+    def test_malformed(self, document, message):
+        """Test malformed documents raise ValueError"""
+        with pytest.raises(ValueError, match=message):
+            list(iter_json_array([document.encode()]))
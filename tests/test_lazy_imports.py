@@ -0,0 +1,131 @@
+"""Tests for lazy_imports.py"""
+
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from alma_item_checks_notification_service import lazy_imports
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      2500 |       4000 |     heavy.sub
+import time:       500 |       4500 |   heavy
+import time:       300 |       4920 | target
+"""
+
+
+@pytest.fixture
+def fake_module(tmp_path, monkeypatch):
+    """A throwaway importable module that hasn't been imported yet"""
+    (tmp_path / "lazy_fake_module.py").write_text("VALUE = 42\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "lazy_fake_module"
+    sys.modules.pop("lazy_fake_module", None)
+
+
+@pytest.fixture
+def reset_warm_thread():
+    """Allow each test to start its own warm-up thread"""
+    lazy_imports._warm_thread = None
+    yield
+    lazy_imports._warm_thread = None
+
+
+class TestLazyImport:
+    """Tests for lazy_import"""
+
+    def test_import_deferred_until_attribute_access(self, fake_module):
+        """Test the module isn't imported until an attribute is used"""
+        module = lazy_imports.lazy_import(fake_module)
+
+        assert isinstance(module, lazy_imports.LazyModule)
+        assert not lazy_imports.is_loaded(fake_module)
+
+        assert module.VALUE == 42
+        assert lazy_imports.is_loaded(fake_module)
+        assert "VALUE" in dir(module)
+
+    def test_loaded_module_returned_directly(self):
+        """Test an already imported module is returned as-is"""
+        assert lazy_imports.lazy_import("json") is sys.modules["json"]
+
+    def test_patch_shadows_attribute(self, fake_module):
+        """Test patching an attribute on the proxy leaves the real module alone"""
+        module = lazy_imports.lazy_import(fake_module)
+
+        with patch.object(module, "VALUE", 7):
+            assert module.VALUE == 7
+            assert sys.modules[fake_module].VALUE == 42
+
+        assert module.VALUE == 42
+
+    def test_missing_module(self):
+        """Test a missing module only fails when first used"""
+        module = lazy_imports.lazy_import("no_such_module_for_tests")
+
+        with pytest.raises(ModuleNotFoundError):
+            module.anything
+
+
+class TestWarmImports:
+    """Tests for warm_imports"""
+
+    def test_warm_imports(self, fake_module, reset_warm_thread):
+        """Test deferred modules are imported in the background"""
+        thread = lazy_imports.warm_imports((fake_module,))
+        thread.join(timeout=5)
+
+        assert thread.daemon
+        assert lazy_imports.is_loaded(fake_module)
+
+    def test_warm_imports_started_once(self, reset_warm_thread):
+        """Test only one warm-up thread is started per worker"""
+        first = lazy_imports.warm_imports(())
+        first.join(timeout=5)
+
+        assert lazy_imports.warm_imports(()) is None
+
+    def test_warm_imports_failure_logged(self, reset_warm_thread):
+        """Test an import failure is logged and doesn't stop the warm-up"""
+        with patch(
+            "alma_item_checks_notification_service.lazy_imports.logging"
+        ) as mock_logging:
+            thread = lazy_imports.warm_imports(("no_such_module_for_tests", "json"))
+            thread.join(timeout=5)
+
+            mock_logging.warning.assert_called_once()
+
+
+class TestImportTimeReport:
+    """Tests for the import-time report"""
+
+    def test_parse_importtime(self):
+        """Test python -X importtime output is parsed into timings"""
+        timings = lazy_imports.parse_importtime(IMPORTTIME_OUTPUT)
+
+        assert [t.module for t in timings] == ["_io", "heavy.sub", "heavy", "target"]
+        assert timings[1] == lazy_imports.ImportTime("heavy.sub", 2.5, 4.0)
+
+    def test_import_time_report(self):
+        """Test the report lists the most expensive modules first"""
+        with patch(
+            "alma_item_checks_notification_service.lazy_imports.subprocess.run"
+        ) as mock_run:
+            mock_run.return_value.stderr = IMPORTTIME_OUTPUT
+
+            report = lazy_imports.import_time_report("target", limit=2)
+
+        lines = report.splitlines()
+        assert lines[0] == "import target: 4.9 ms, 4 modules"
+        assert lines[2].split() == ["4.9", "0.3", "target"]
+        assert lines[3].split() == ["4.5", "0.5", "heavy"]
+        assert len(lines) == 4
+        assert mock_run.call_args.kwargs["env"]["IMPORT_WARMUP_ENABLED"] == "false"
+
+    def test_function_app_defers_heavy_imports(self):
+        """Test importing the function app doesn't import pandas"""
+        report = lazy_imports.import_time_report("function_app", limit=1000)
+
+        assert " pandas\n" not in report + "\n"
@@ -0,0 +1,83 @@
+"""Tests for report_csv module"""
+
+import csv
+import io
+
+from alma_item_checks_notification_service.report_csv import (
+    iter_csv_chunks,
+    report_columns,
+)
+
+
+def _read_csv(chunks) -> list[list[str]]:
+    """Join CSV chunks and parse them back into rows"""
+    data: bytes = b"".join(chunks)
+    assert data.startswith(b"\xef\xbb\xbf")
+    return list(csv.reader(io.StringIO(data.decode("utf-8-sig"), newline="")))
+
+
+class TestReportColumns:
+    """Tests for report_columns"""
+
+    def test_first_appearance_order(self):
+        """Test columns are ordered by first appearance across records"""
+        records = [{"b": 1, "a": 2}, {"c": 3, "a": 4}]
+
+        assert report_columns(records) == ["b", "a", "c"]
+
+    def test_placeholder_column_dropped(self):
+        """Test the all-"0" placeholder column is dropped"""
+        assert report_columns([{"0": "0", "Item": "a"}, {"0": 0, "Item": "b"}]) == [
+            "Item"
+        ]
+
+    def test_placeholder_column_kept_with_data(self):
+        """Test a "0" column with real values is kept"""
+        assert report_columns([{"0": "0"}, {"0": "x"}]) == ["0"]
+
+    def test_empty(self):
+        """Test an empty report has no columns"""
+        assert report_columns([]) == []
+
+
+class TestIterCsvChunks:
+    """Tests for iter_csv_chunks"""
+
+    def test_rows(self, sample_report_data):
+        """Test records are written under a header row"""
+        rows = _read_csv(iter_csv_chunks(sample_report_data))
+
+        assert rows == [
+            ["Item ID", "Title", "Status"],
+            ["123", "Test Book", "Available"],
+            ["456", "Another Book", "Checked Out"],
+        ]
+
+    def test_missing_and_null_values(self):
+        """Test missing keys, nulls and NaN become empty cells"""
+        records = [{"a": None, "b": 1.5}, {"b": float("nan"), "c": "x"}]
+
+        assert _read_csv(iter_csv_chunks(records)) == [
+            ["a", "b", "c"],
+            ["", "1.5", ""],
+            ["", "", "x"],
+        ]
+
+    def test_quoting(self):
+        """Test delimiters, quotes and newlines survive a round trip"""
+        records = [{"Title": 'A "quoted", multi\nline title', "Note": "é"}]
+
+        assert _read_csv(iter_csv_chunks(records))[1] == [
+            'A "quoted", multi\nline title',
+            "é",
+        ]
+
+    def test_chunked(self):
+        """Test large reports are yielded in several chunks"""
+        records = [{"row": i, "text": "x" * 50} for i in range(100)]
+
+        chunks = list(iter_csv_chunks(records, chunk_size=512))
+
+        assert len(chunks) > 5
+        assert all(len(chunk) < 1024 for chunk in chunks)
+        assert len(_read_csv(chunks)) == 101
@@ -0,0 +1,186 @@
+"""Tests for storage module"""
+
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from alma_item_checks_notification_service import storage
+
+
+@pytest.fixture(autouse=True)
+def reset_registry():
+    """Reset the storage client registry between tests"""
+    storage.reset_storage_clients()
+    yield
+    storage.reset_storage_clients()
+
+
+class TestStorage:
+    """Tests for storage module"""
+
+    @patch("alma_item_checks_notification_service.storage.wrlc_storage.StorageService")
+    def test_get_storage_service_default_account(self, mock_storage_class):
+        """Test the default account is built without a connection string"""
+        service = storage.get_storage_service()
+
+        mock_storage_class.assert_called_once_with()
+        assert service is mock_storage_class.return_value
+
+    @patch("alma_item_checks_notification_service.storage.wrlc_storage.StorageService")
+    def test_get_storage_service_connection_string(self, mock_storage_class):
+        """Test a connection string is passed to the StorageService"""
+        storage.get_storage_service("conn-a")
+
+        mock_storage_class.assert_called_once_with("conn-a")
+
+    @patch("alma_item_checks_notification_service.storage.wrlc_storage.StorageService")
+    def test_get_storage_service_reuses_clients(self, mock_storage_class):
+        """Test clients are reused per connection string"""
+        mock_storage_class.side_effect = lambda *args: object()
+
+        default_1 = storage.get_storage_service()
+        acs_1 = storage.get_storage_service("acs")
+        default_2 = storage.get_storage_service()
+        acs_2 = storage.get_storage_service("acs")
+
+        assert default_1 is default_2
+        assert acs_1 is acs_2
+        assert default_1 is not acs_1
+        assert mock_storage_class.call_count == 2
+        assert storage.storage_client_stats() == storage.StorageClientStats(
+            created=2, reused=2, clients=2
+        )
+
+    @patch("alma_item_checks_notification_service.storage.wrlc_storage.StorageService")
+    def test_get_storage_service_thread_safe(self, mock_storage_class):
+        """Test concurrent callers share a single client"""
+        mock_storage_class.side_effect = lambda *args: object()
+        results = []
+
+        def worker():
+            results.append(storage.get_storage_service("acs"))
+
+        threads = [threading.Thread(target=worker) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len({id(result) for result in results}) == 1
+        assert storage.storage_client_stats().created == 1
+
+    @patch("alma_item_checks_notification_service.storage.wrlc_storage.StorageService")
+    def test_reset_storage_clients(self, mock_storage_class):
+        """Test reset drops clients and counters"""
+        storage.get_storage_service()
+
+        storage.reset_storage_clients()
+
+        assert storage.storage_client_stats() == storage.StorageClientStats(
+            created=0, reused=0, clients=0
+        )
+
+    @patch("alma_item_checks_notification_service.storage.azure_blob.BlobServiceClient")
+    def test_get_blob_service_client_reuses_client(self, mock_blob_class):
+        """Test blob clients are cached per connection string"""
+        mock_blob_class.from_connection_string.side_effect = lambda *a, **kw: object()
+
+        first = storage.get_blob_service_client("conn-a")
+        second = storage.get_blob_service_client("conn-a")
+        other = storage.get_blob_service_client("conn-b")
+
+        assert first is second
+        assert first is not other
+        assert storage.storage_client_stats() == storage.StorageClientStats(
+            created=2, reused=1, clients=2
+        )
+
+    @patch("alma_item_checks_notification_service.storage.azure_blob.BlobServiceClient")
+    def test_get_blob_service_client_shares_transport_session(self, mock_blob_class):
+        """Test every blob client uses the shared keep-alive HTTP session"""
+        storage.get_blob_service_client("conn-a")
+        storage.get_blob_service_client("conn-b")
+
+        transports = [
+            call.kwargs["transport"]
+            for call in mock_blob_class.from_connection_string.call_args_list
+        ]
+        assert transports[0].session is transports[1].session
+        assert transports[0].session is storage._http_session
+
+    @patch("alma_item_checks_notification_service.storage.azure_blob.BlobServiceClient")
+    def test_get_blob_service_client_default_connection(self, mock_blob_class):
+        """Test the default account uses the AzureWebJobsStorage connection string"""
+        with patch.object(storage, "STORAGE_CONNECTION_STRING", "default-conn"):
+            storage.get_blob_service_client()
+
+        assert (
+            mock_blob_class.from_connection_string.call_args.args[0] == "default-conn"
+        )
+
+    def test_get_blob_service_client_missing_connection(self):
+        """Test a missing connection string raises"""
+        with patch.object(storage, "STORAGE_CONNECTION_STRING", None):
+            with pytest.raises(ValueError, match="Storage connection string not set"):
+                storage.get_blob_service_client()
+
+    def test_get_blob_service_client_real_client(self):
+        """Test a real BlobServiceClient is built from a connection string"""
+        client = storage.get_blob_service_client(
+            "DefaultEndpointsProtocol=https;AccountName=test;AccountKey=dGVzdA==;EndpointSuffix=core.windows.net"
+        )
+
+        assert client.account_name == "test"
+
+    def test_reset_closes_http_session(self):
+        """Test reset closes and drops the shared HTTP session"""
+        storage.get_transport()
+        session = storage._http_session
+
+        with patch.object(session, "close") as mock_close:
+            storage.reset_storage_clients()
+
+            mock_close.assert_called_once()
+        assert storage._http_session is None
+
+    def test_register_storage_service(self):
+        """Test a registered storage service is handed out for its connection string"""
+        local_service = object()
+
+        storage.register_storage_service("conn-a", local_service)
+
+        assert storage.get_storage_service("conn-a") is local_service
+        assert storage.storage_client_stats().created == 0
+
+    @patch("alma_item_checks_notification_service.storage.azure_queue.QueueClient")
+    def test_get_queue_client_reuses_client(self, mock_queue_class):
+        """Test queue clients are cached per connection string and queue"""
+        mock_queue_class.from_connection_string.side_effect = lambda *a, **kw: object()
+
+        first = storage.get_queue_client("queue-a", "conn")
+        second = storage.get_queue_client("queue-a", "conn")
+        other = storage.get_queue_client("queue-b", "conn")
+
+        assert first is second
+        assert first is not other
+        assert (
+            mock_queue_class.from_connection_string.call_args.kwargs["transport"].session
+            is storage._http_session
+        )
+
+    def test_get_queue_client_real_client(self):
+        """Test a real QueueClient decodes base64 message bodies to bytes"""
+        client = storage.get_queue_client(
+            "notification-batch-queue",
+            "DefaultEndpointsProtocol=https;AccountName=test;AccountKey=dGVzdA==;EndpointSuffix=core.windows.net",
+        )
+
+        assert client.queue_name == "notification-batch-queue"
+        assert type(client._message_decode_policy).__name__ == "BinaryBase64DecodePolicy"
+
+    def test_get_queue_client_missing_connection(self):
+        """Test a missing connection string raises"""
+        with patch.object(storage, "STORAGE_CONNECTION_STRING", None):
+            with pytest.raises(ValueError, match="Storage connection string not set"):
+                storage.get_queue_client("queue-a")
@@ -0,0 +1,218 @@
+"""Tests for templating module"""
+
+import json
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from jinja2 import FileSystemBytecodeCache, FileSystemLoader, ModuleLoader
+
+from alma_item_checks_notification_service import templating
+
+
+@pytest.fixture
+def reset_jinja_env(tmp_path):
+    """Reset the worker-wide Jinja2 environment between tests
+
+    Compiled templates are pointed at an empty directory so a local build
+    artifact doesn't change which loader the tests see.
+    """
+    templating._jinja_env = None
+    with patch.object(templating, "COMPILED_TEMPLATE_DIR", tmp_path / "no-compiled"):
+        yield
+    templating._jinja_env = None
+
+
+@pytest.fixture
+def template_copy(tmp_path):
+    """Copy the packaged templates somewhere they can be modified"""
+    template_dir = tmp_path / "templates"
+    shutil.copytree(templating.TEMPLATE_DIR, template_dir)
+    return template_dir
+
+
+def _render(env):
+    return env.get_template("email_template.html.j2").render(
+        email_caption="Caption",
+        email_body="Body <b>",
+        body_addendum=None,
+        data_table_html="<table></table>",
+    )
+
+
+class TestTemplating:
+    """Tests for templating module"""
+
+    def test_get_jinja_env_creates_environment(self, reset_jinja_env):
+        """Test get_jinja_env builds a production environment"""
+        env = templating.get_jinja_env()
+
+        assert env.auto_reload is False
+        assert env.autoescape("template.html") is True
+        assert templating._jinja_env is env
+
+    def test_get_jinja_env_reuses_existing(self, reset_jinja_env):
+        """Test get_jinja_env returns the same environment on every call"""
+        env = templating.get_jinja_env()
+
+        assert templating.get_jinja_env() is env
+
+    def test_get_jinja_env_caches_compiled_template(self, reset_jinja_env):
+        """Test templates are compiled once per worker"""
+        env = templating.get_jinja_env()
+
+        assert env.get_template("email_template.html.j2") is env.get_template(
+            "email_template.html.j2"
+        )
+
+    def test_get_jinja_env_missing_template_dir(self, reset_jinja_env, tmp_path):
+        """Test get_jinja_env raises when the template directory is missing"""
+        with patch.object(templating, "TEMPLATE_DIR", tmp_path / "missing"):
+            with pytest.raises(
+                FileNotFoundError, match="Jinja template directory not found"
+            ):
+                templating.get_jinja_env()
+
+        assert templating._jinja_env is None
+
+    def test_get_jinja_env_auto_reload_setting(self, reset_jinja_env):
+        """Test JINJA_AUTO_RELOAD is passed to the environment"""
+        with patch.object(templating, "JINJA_AUTO_RELOAD", True):
+            assert templating.get_jinja_env().auto_reload is True
+
+    def test_bytecode_cache_written_to_directory(self, reset_jinja_env, tmp_path):
+        """Test compiled bytecode is persisted for restarted workers"""
+        cache_dir = tmp_path / "jinja-cache"
+
+        with patch.object(templating, "JINJA_BYTECODE_CACHE_DIR", str(cache_dir)):
+            env = templating.get_jinja_env()
+            env.get_template("email_template.html.j2")
+
+        assert isinstance(env.bytecode_cache, FileSystemBytecodeCache)
+        assert any(Path(cache_dir).iterdir())
+
+    def test_get_bytecode_cache_default_directory(self):
+        """Test the bytecode cache defaults to a temp directory"""
+        with patch.object(templating, "JINJA_BYTECODE_CACHE_DIR", None):
+            cache = templating.get_bytecode_cache()
+
+        assert isinstance(cache, FileSystemBytecodeCache)
+
+    def test_get_bytecode_cache_disabled(self):
+        """Test the bytecode cache can be disabled"""
+        with patch.object(templating, "JINJA_BYTECODE_CACHE_ENABLED", False):
+            assert templating.get_bytecode_cache() is None
+
+    def test_get_bytecode_cache_unusable_directory(self, tmp_path):
+        """Test an unusable cache directory falls back to no bytecode cache"""
+        blocker = tmp_path / "file"
+        blocker.write_text("not a directory")
+
+        with patch.object(
+            templating, "JINJA_BYTECODE_CACHE_DIR", str(blocker / "cache")
+        ):
+            with patch.object(templating, "logging") as mock_logging:
+                assert templating.get_bytecode_cache() is None
+                mock_logging.warning.assert_called_once()
+
+    def test_compile_templates_writes_modules_and_manifest(
+        self, tmp_path, template_copy
+    ):
+        """Test compile_templates writes compiled modules and a manifest"""
+        target = tmp_path / "compiled"
+
+        source_hash = templating.compile_templates(target, template_copy)
+
+        manifest = json.loads((target / templating.MANIFEST_NAME).read_text())
+        assert manifest["source_hash"] == source_hash
+        assert list(target.glob("tmpl_*.py"))
+        assert templating.compiled_templates_current(target, template_copy)
+
+    def test_compile_templates_replaces_previous_output(
+        self, tmp_path, template_copy
+    ):
+        """Test compile_templates clears stale modules from an earlier build"""
+        target = tmp_path / "compiled"
+        target.mkdir()
+        (target / "tmpl_stale.py").write_text("")
+
+        templating.compile_templates(target, template_copy)
+
+        assert not (target / "tmpl_stale.py").exists()
+
+    def test_templates_hash_changes_with_source(self, template_copy):
+        """Test templates_hash changes when a template changes"""
+        before = templating.templates_hash(template_copy)
+        (template_copy / "email_template.html.j2").write_text("changed")
+
+        assert templating.templates_hash(template_copy) != before
+
+    def test_compiled_templates_stale(self, tmp_path, template_copy):
+        """Test compiled output is stale once the source templates change"""
+        target = tmp_path / "compiled"
+        templating.compile_templates(target, template_copy)
+        (template_copy / "email_template.html.j2").write_text("changed")
+
+        assert not templating.compiled_templates_current(target, template_copy)
+
+    def test_compiled_templates_missing(self, tmp_path, template_copy):
+        """Test missing compiled output is not current"""
+        assert not templating.compiled_templates_current(
+            tmp_path / "missing", template_copy
+        )
+
+    def test_compiled_templates_bad_manifest(self, tmp_path, template_copy):
+        """Test an unreadable manifest is not current"""
+        target = tmp_path / "compiled"
+        target.mkdir()
+        (target / templating.MANIFEST_NAME).write_text("{not json")
+
+        assert not templating.compiled_templates_current(target, template_copy)
+
+    def test_get_jinja_env_uses_compiled_templates(self, reset_jinja_env, tmp_path):
+        """Test get_jinja_env loads current compiled templates through a ModuleLoader"""
+        target = tmp_path / "compiled"
+        templating.compile_templates(target)
+
+        with patch.object(templating, "COMPILED_TEMPLATE_DIR", target):
+            env = templating.get_jinja_env()
+
+        assert isinstance(env.loader, ModuleLoader)
+        with patch.object(
+            env, "parse", side_effect=AssertionError("template was parsed")
+        ):
+            compiled_output = _render(env)
+
+        source_env = templating.Environment(
+            loader=FileSystemLoader(templating.TEMPLATE_DIR),
+            **templating._environment_options(),
+        )
+        assert compiled_output == _render(source_env)
+
+    def test_get_jinja_env_falls_back_when_stale(
+        self, reset_jinja_env, tmp_path, template_copy
+    ):
+        """Test get_jinja_env falls back to the FileSystemLoader for stale output"""
+        target = tmp_path / "compiled"
+        templating.compile_templates(target, template_copy)
+        (template_copy / "email_template.html.j2").write_text("changed")
+
+        with patch.object(templating, "COMPILED_TEMPLATE_DIR", target):
+            with patch.object(templating, "TEMPLATE_DIR", template_copy):
+                env = templating.get_jinja_env()
+
+        assert isinstance(env.loader, FileSystemLoader)
+
+    def test_get_jinja_env_compiled_templates_disabled(
+        self, reset_jinja_env, tmp_path
+    ):
+        """Test compiled templates are ignored when disabled"""
+        target = tmp_path / "compiled"
+        templating.compile_templates(target)
+
+        with patch.object(templating, "COMPILED_TEMPLATE_DIR", target):
+            with patch.object(templating, "JINJA_COMPILED_TEMPLATES_ENABLED", False):
+                env = templating.get_jinja_env()
+
+        assert isinstance(env.loader, FileSystemLoader)
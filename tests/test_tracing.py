@@ -0,0 +1,192 @@
+"""Tests for tracing module"""
+
+import asyncio
+import contextvars
+import threading
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from alma_item_checks_notification_service import tracing
+from alma_item_checks_notification_service.tracing import (
+    LoggingTracer,
+    NoOpTracer,
+    OpenTelemetryTracer,
+    configure_tracing,
+    get_tracer,
+    set_tracer,
+    span,
+    tracing_enabled,
+)
+
+
+class TestTracing:
+    """Tests for tracing module"""
+
+    def teardown_method(self):
+        """Go back to the configured tracer"""
+        set_tracer(None)
+
+    @pytest.mark.parametrize(
+        "backend,tracer_class",
+        [("none", NoOpTracer), ("logging", LoggingTracer), ("bogus", NoOpTracer)],
+    )
+    def test_get_tracer_backend(self, backend, tracer_class):
+        """Test get_tracer builds the tracer for TRACING_BACKEND once"""
+        with patch(
+            "alma_item_checks_notification_service.tracing.TRACING_BACKEND", backend
+        ):
+            tracer = get_tracer()
+
+            assert isinstance(tracer, tracer_class)
+            assert get_tracer() is tracer
+
+    def test_get_tracer_opentelemetry_missing(self):
+        """Test the opentelemetry backend falls back to no-op when not installed"""
+        with patch(
+            "alma_item_checks_notification_service.tracing.TRACING_BACKEND",
+            "opentelemetry",
+        ):
+            with patch(
+                "alma_item_checks_notification_service.tracing.importlib"
+            ) as mock_importlib:
+                mock_importlib.import_module.side_effect = ImportError("opentelemetry")
+                with patch(
+                    "alma_item_checks_notification_service.tracing.logging"
+                ) as mock_logging:
+                    assert isinstance(get_tracer(), NoOpTracer)
+                    mock_logging.error.assert_called_once()
+
+    def test_opentelemetry_tracer(self):
+        """Test OpenTelemetry spans are started as the current span"""
+        mock_trace = MagicMock()
+        with patch(
+            "alma_item_checks_notification_service.tracing.importlib"
+        ) as mock_importlib:
+            mock_importlib.import_module.return_value = mock_trace
+            tracer = OpenTelemetryTracer()
+
+        with tracer.start_span("stage", {"job_id": "job-1"}):
+            pass
+
+        mock_trace.get_tracer.return_value.start_as_current_span.assert_called_once_with(
+            "stage", attributes={"job_id": "job-1"}
+        )
+
+    def test_noop_span(self):
+        """Test the default tracer runs the block and ignores attributes"""
+        set_tracer(NoOpTracer())
+
+        with span("stage", job_id="job-1") as current:
+            current.set_attribute("row_count", 3)
+
+    def test_tracing_enabled(self):
+        """Test costly attributes are only wanted when spans are recorded"""
+        set_tracer(NoOpTracer())
+        assert tracing_enabled() is False
+
+        set_tracer(LoggingTracer())
+        assert tracing_enabled() is True
+
+    def test_logging_tracer(self):
+        """Test the logging tracer logs the duration and attributes"""
+        set_tracer(LoggingTracer())
+
+        with patch("alma_item_checks_notification_service.tracing.logging") as mock_log:
+            with span("render_table", job_id="job-1") as current:
+                current.set_attribute("row_count", 3)
+
+        message = mock_log.info.call_args.args[0]
+        assert message.startswith("tracing: render_table ")
+        assert "'job_id': 'job-1'" in message
+        assert "'row_count': 3" in message
+
+    def test_logging_tracer_logs_failures(self):
+        """Test a stage that raises is still logged"""
+        set_tracer(LoggingTracer())
+
+        with patch("alma_item_checks_notification_service.tracing.logging") as mock_log:
+            with pytest.raises(RuntimeError):
+                with span("download_report"):
+                    raise RuntimeError("blob gone")
+
+        mock_log.info.assert_called_once()
+
+    def test_span_inherits_job_attributes(self, recording_tracer):
+        """Test nested spans carry the enclosing job's identifiers only"""
+        with span("notification", job_id="job-1", process_type="p", extra=1):
+            with span("download_report", row_count=None):
+                pass
+        with span("after"):
+            pass
+
+        assert recording_tracer.spans == [
+            ("notification", {"job_id": "job-1", "process_type": "p", "extra": 1}),
+            ("download_report", {"job_id": "job-1", "process_type": "p"}),
+            ("after", {}),
+        ]
+
+    def test_span_inheritance_follows_context(self, recording_tracer):
+        """Test job attributes reach copied-context threads and asyncio tasks"""
+
+        def in_thread():
+            with span("thread_stage"):
+                pass
+
+        async def in_task():
+            with span("task_stage"):
+                pass
+
+        async def run():
+            with span("notification", job_id="job-2"):
+                await asyncio.gather(asyncio.create_task(in_task()))
+
+        with span("notification", job_id="job-1"):
+            thread = threading.Thread(
+                target=contextvars.copy_context().run, args=(in_thread,)
+            )
+            thread.start()
+            thread.join()
+        asyncio.run(run())
+
+        attributes = dict(recording_tracer.spans)
+        assert attributes["thread_stage"] == {"job_id": "job-1"}
+        assert attributes["task_stage"] == {"job_id": "job-2"}
+
+    def test_configure_tracing_azure_monitor(self):
+        """Test Azure Monitor is set up only for the opentelemetry backend"""
+        mock_azure_monitor = Mock()
+        with patch(
+            "alma_item_checks_notification_service.tracing.importlib"
+        ) as mock_importlib:
+            mock_import = mock_importlib.import_module
+            mock_import.return_value = mock_azure_monitor
+            with patch(
+                "alma_item_checks_notification_service.tracing.TRACING_BACKEND", "none"
+            ):
+                configure_tracing()
+                mock_import.assert_not_called()
+
+            with patch(
+                "alma_item_checks_notification_service.tracing.TRACING_BACKEND",
+                "opentelemetry",
+            ):
+                configure_tracing()
+
+        mock_import.assert_called_once_with("azure.monitor.opentelemetry")
+        mock_azure_monitor.configure_azure_monitor.assert_called_once_with()
+
+    def test_configure_tracing_failure_logged(self):
+        """Test a missing exporter is logged rather than failing startup"""
+        with patch(
+            "alma_item_checks_notification_service.tracing.TRACING_BACKEND",
+            "opentelemetry",
+        ):
+            with patch(
+                "alma_item_checks_notification_service.tracing.importlib"
+            ) as mock_importlib:
+                mock_importlib.import_module.side_effect = ImportError("azure.monitor")
+                with patch.object(tracing, "logging") as mock_logging:
+                    configure_tracing()
+
+                    mock_logging.error.assert_called_once()